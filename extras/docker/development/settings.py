@@ -94,11 +94,14 @@ WGER_SETTINGS["ALLOW_REGISTRATION"] = env.bool("ALLOW_REGISTRATION", True)
 WGER_SETTINGS["ALLOW_UPLOAD_VIDEOS"] = env.bool("ALLOW_UPLOAD_VIDEOS", True)
 WGER_SETTINGS["DOWNLOAD_INGREDIENTS_FROM"] = env.str("DOWNLOAD_INGREDIENTS_FROM", "WGER")
 WGER_SETTINGS["EXERCISE_CACHE_TTL"] = env.int("EXERCISE_CACHE_TTL", 3600)
+WGER_SETTINGS["INSTRUMENTATION"] = env.bool("INSTRUMENTATION", False)
+WGER_SETTINGS["INSTRUMENTATION_SLOW_REQUEST_MS"] = env.int("INSTRUMENTATION_SLOW_REQUEST_MS", 1000)
 WGER_SETTINGS["MIN_ACCOUNT_AGE_TO_TRUST"] = env.int("MIN_ACCOUNT_AGE_TO_TRUST", 21)  # in days
 WGER_SETTINGS["SYNC_EXERCISES_CELERY"] = env.bool("SYNC_EXERCISES_CELERY", False)
 WGER_SETTINGS["SYNC_EXERCISE_IMAGES_CELERY"] = env.bool("SYNC_EXERCISE_IMAGES_CELERY", False)
 WGER_SETTINGS["SYNC_EXERCISE_VIDEOS_CELERY"] = env.bool("SYNC_EXERCISE_VIDEOS_CELERY", False)
 WGER_SETTINGS["USE_CELERY"] = env.bool("USE_CELERY", False)
+WGER_SETTINGS["WRITE_SNAPSHOT_CELERY"] = env.bool("WRITE_SNAPSHOT_CELERY", False)
 
 # Cache
 if os.environ.get("DJANGO_CACHE_BACKEND"):
@@ -0,0 +1,535 @@
+# -*- coding: utf-8 -*-
+
+# This file is part of wger Workout Manager.
+#
+# wger Workout Manager is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# wger Workout Manager is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+
+"""
+High-throughput generator for load testing datasets
+
+Users are generated with their whole object graph (profile, workouts, days,
+sets, settings, schedules, workout logs, sessions, weight entries, nutrition
+plans and diary entries) and written with chunked bulk_create calls, so the
+number of queries only depends on the number of chunks.
+
+Every user has its own random generator seeded with the global seed and the
+user's index, and fixed blocks of primary keys for the objects that others
+point to. The generated data is therefore the same regardless of the batch
+size or the number of processes, and no IDs need to be read back from the
+database.
+
+This module must be imported after django.setup() was called.
+"""
+
+# Standard Library
+import collections
+import csv
+import datetime
+import multiprocessing
+import os
+import random
+import time
+from decimal import Decimal
+
+# Django
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.management.color import no_style
+from django.db import (
+    connection,
+    connections,
+    transaction,
+)
+from django.db.models import Max
+from django.utils import timezone
+from django.utils.text import slugify
+
+# wger
+from wger.core.models import (
+    Language,
+    UserCache,
+    UserProfile,
+)
+from wger.exercises.models import Exercise
+from wger.gym.models import (
+    Gym,
+    GymUserConfig,
+)
+from wger.manager.models import (
+    Day,
+    Schedule,
+    ScheduleStep,
+    Set,
+    Setting,
+    Workout,
+    WorkoutLog,
+    WorkoutSession,
+)
+from wger.manager.stats import rebuild_log_stats
+from wger.nutrition.models import (
+    Ingredient,
+    LogItem,
+    Meal,
+    MealItem,
+    NutritionPlan,
+)
+from wger.utils.constants import ENGLISH_SHORT_NAME
+from wger.weight.models import WeightEntry
+
+
+MAX_DAYS = 5
+MAX_EXERCISES = 10
+MEALS_PER_PLAN = 4
+INGREDIENT_POOL_SIZE = 1000
+
+INSERT_ORDER = (
+    User,
+    UserProfile,
+    UserCache,
+    GymUserConfig,
+    Workout,
+    Day,
+    Day.day.through,
+    Set,
+    Setting,
+    Schedule,
+    ScheduleStep,
+    WorkoutLog,
+    WorkoutSession,
+    WeightEntry,
+    NutritionPlan,
+    Meal,
+    MealItem,
+    LogItem,
+)
+"""
+Models in the order they are inserted, parents before children
+"""
+
+ROW_FIELDS = {
+    WorkoutLog: (
+        'user',
+        'exercise_base',
+        'workout',
+        'repetition_unit',
+        'weight_unit',
+        'reps',
+        'weight',
+        'date',
+    ),
+    LogItem: ('plan', 'ingredient', 'datetime', 'amount'),
+}
+"""
+The high-volume models, which are generated as plain tuples with these fields
+and inserted with executemany, without creating model instances
+"""
+
+
+def get_block_sizes(options):
+    """
+    Returns the number of primary keys reserved per user for the models that
+    are referenced by other generated objects
+    """
+    return {
+        User: 1,
+        Workout: options.workouts,
+        Day: options.workouts * MAX_DAYS,
+        Set: options.workouts * MAX_DAYS * MAX_EXERCISES,
+        Schedule: 1,
+        NutritionPlan: options.nutrition_plans,
+        Meal: options.nutrition_plans * MEALS_PER_PLAN,
+    }
+
+
+class IdPool:
+    """
+    Hands out the primary keys of one user, taken from a fixed block per model
+    """
+
+    def __init__(self, starts, block_sizes, index):
+        self.counters = {
+            model: iter(range(starts[model] + index * size, starts[model] + (index + 1) * size))
+            for model, size in block_sizes.items()
+        }
+
+    def next(self, model):
+        return next(self.counters[model])
+
+
+def load_references(options):
+    """
+    Loads everything the generated objects point to, once
+    """
+    with open(os.path.join('csv', f'first_names_{options.country}.csv')) as name_file:
+        first_names = [row for row in csv.reader(name_file) if row]
+    with open(os.path.join('csv', f'last_names_{options.country}.csv')) as name_file:
+        last_names = [row[0] for row in csv.reader(name_file) if row]
+
+    try:
+        gym_ids = [int(options.add_to_gym)]
+    except ValueError:
+        gym_ids = [] if options.add_to_gym == 'none' else list(
+            Gym.objects.values_list('pk', flat=True)
+        )
+
+    return {
+        'first_names': first_names,
+        'last_names': last_names,
+        'gym_ids': gym_ids,
+        'exercise_base_ids': sorted(
+            Exercise.objects.filter(language__short_name=ENGLISH_SHORT_NAME).values_list(
+                'exercise_base_id', flat=True
+            ).distinct()
+        ),
+        'ingredient_ids': list(
+            Ingredient.objects.order_by('pk').values_list('pk', flat=True)[:INGREDIENT_POOL_SIZE]
+        ),
+        'language_id': Language.objects.get(short_name=ENGLISH_SHORT_NAME).pk,
+        'password': make_password(options.password),
+        'today': datetime.date.today(),
+    }
+
+
+def insert_rows(model, rows, chunk_size):
+    """
+    Inserts the given tuples, with the values of ROW_FIELDS, into the model's table
+    """
+    quote_name = connection.ops.quote_name
+    fields = ROW_FIELDS[model]
+    columns = ', '.join(quote_name(model._meta.get_field(name).column) for name in fields)
+    placeholders = ', '.join(['%s'] * len(fields))
+    sql = f'INSERT INTO {quote_name(model._meta.db_table)} ({columns}) VALUES ({placeholders})'
+
+    with connection.cursor() as cursor:
+        for i in range(0, len(rows), chunk_size):
+            cursor.executemany(sql, rows[i:i + chunk_size])
+
+
+def build_user(index, options, refs, pool, objects):
+    """
+    Creates the objects of one user and appends them to the objects lists
+    """
+    rng = random.Random(f'{options.seed}-{index}')
+    today = refs['today']
+    adapt_date = connection.ops.adapt_datefield_value
+    adapt_datetime = connection.ops.adapt_datetimefield_value
+
+    # User, profile, cache and gym
+    first_name, gender = rng.choice(refs['first_names'])[:2]
+    last_name = rng.choice(refs['last_names'])
+    user_id = pool.next(User)
+    username = slugify(f'{options.prefix} {index}')
+    objects[User].append(
+        User(
+            id=user_id,
+            username=username,
+            email=f'{username}@example.com',
+            password=refs['password'],
+            first_name=first_name[:150],
+            last_name=last_name[:150],
+        )
+    )
+    gym_id = rng.choice(refs['gym_ids']) if refs['gym_ids'] else None
+    objects[UserProfile].append(
+        UserProfile(
+            user_id=user_id,
+            gym_id=gym_id,
+            gender=UserProfile.GENDER_MALE if gender == 'm' else UserProfile.GENDER_FEMALE,
+            age=rng.randint(18, 45),
+        )
+    )
+    if gym_id:
+        objects[GymUserConfig].append(GymUserConfig(gym_id=gym_id, user_id=user_id))
+
+    # Workouts with their days, sets and settings
+    workouts = []
+    for i in range(options.workouts):
+        workout_id = pool.next(Workout)
+        objects[Workout].append(
+            Workout(
+                id=workout_id,
+                user_id=user_id,
+                name=f'Dummy workout - {i + 1}',
+            )
+        )
+
+        days = []
+        for weekday in sorted(rng.sample(range(1, 8), rng.randint(1, MAX_DAYS))):
+            day_id = pool.next(Day)
+            objects[Day].append(
+                Day(id=day_id, training_id=workout_id, description=f'Dummy day - {weekday}')
+            )
+            objects[Day.day.through].append(Day.day.through(day_id=day_id, daysofweek_id=weekday))
+
+            settings = []
+            exercises = rng.sample(
+                refs['exercise_base_ids'],
+                min(rng.randint(3, MAX_EXERCISES), len(refs['exercise_base_ids'])),
+            )
+            for order, base_id in enumerate(exercises, 1):
+                set_id = pool.next(Set)
+                sets = rng.randint(2, 4)
+                reps = rng.choice([1, 3, 5, 8, 10, 12, 15])
+                objects[Set].append(Set(id=set_id, exerciseday_id=day_id, sets=sets, order=order))
+                objects[Setting].append(
+                    Setting(set_id=set_id, exercise_base_id=base_id, reps=reps, order=order)
+                )
+                settings.append((base_id, sets, reps))
+            days.append((weekday, settings))
+        workouts.append((workout_id, days))
+
+    # A schedule looping over all workouts
+    if workouts:
+        schedule_id = pool.next(Schedule)
+        objects[Schedule].append(
+            Schedule(
+                id=schedule_id,
+                user_id=user_id,
+                name='Dummy schedule',
+                start_date=today - datetime.timedelta(days=rng.randint(0, 30)),
+                is_active=True,
+                is_loop=True,
+            )
+        )
+        for order, (workout_id, days) in enumerate(workouts, 1):
+            objects[ScheduleStep].append(
+                ScheduleStep(
+                    schedule_id=schedule_id,
+                    workout_id=workout_id,
+                    duration=rng.randint(1, 4),
+                    order=order,
+                )
+            )
+
+    # Workout logs and sessions, one entry per set on each training day of
+    # the last weeks
+    sessions = {}
+    monday = today - datetime.timedelta(days=today.weekday())
+    for week in range(options.logs):
+        week_start = monday - datetime.timedelta(weeks=week)
+        for workout_id, days in workouts:
+            for weekday, settings in days:
+                date = week_start + datetime.timedelta(days=weekday - 1)
+                if date > today:
+                    continue
+
+                sessions.setdefault(date, workout_id)
+                db_date = adapt_date(date)
+                for base_id, sets, reps in settings:
+                    weight = rng.randint(20, 100)
+                    for _ in range(sets):
+                        objects[WorkoutLog].append(
+                            (
+                                user_id,
+                                base_id,
+                                workout_id,
+                                1,
+                                1,
+                                reps,
+                                weight + rng.randint(-5, 5),
+                                db_date,
+                            )
+                        )
+
+    for date, workout_id in sessions.items():
+        start = datetime.datetime.combine(date, datetime.time(hour=rng.randint(8, 20)))
+        end = start + datetime.timedelta(minutes=rng.randint(40, 120))
+        objects[WorkoutSession].append(
+            WorkoutSession(
+                user_id=user_id,
+                workout_id=workout_id,
+                date=date,
+                time_start=start.time(),
+                time_end=end.time(),
+                impression=rng.choice(
+                    [
+                        WorkoutSession.IMPRESSION_GOOD,
+                        WorkoutSession.IMPRESSION_NEUTRAL,
+                        WorkoutSession.IMPRESSION_BAD,
+                    ]
+                ),
+            )
+        )
+    objects[UserCache].append(UserCache(user_id=user_id, last_activity=max(sessions, default=None)))
+
+    # Weight entries
+    base_weight = rng.randint(60, 100)
+    for i in range(options.weight):
+        objects[WeightEntry].append(
+            WeightEntry(
+                user_id=user_id,
+                weight=Decimal(base_weight + 0.5 * i + rng.randint(1, 3)),
+                date=today - datetime.timedelta(days=i),
+            )
+        )
+
+    # Nutrition plans, meals and diary entries
+    for i in range(options.nutrition_plans):
+        plan_id = pool.next(NutritionPlan)
+        objects[NutritionPlan].append(
+            NutritionPlan(
+                id=plan_id,
+                user_id=user_id,
+                language_id=refs['language_id'],
+                description=f'Dummy nutrition plan - {i + 1}',
+            )
+        )
+        if not refs['ingredient_ids']:
+            continue
+
+        for order in range(1, MEALS_PER_PLAN + 1):
+            meal_id = pool.next(Meal)
+            objects[Meal].append(
+                Meal(
+                    id=meal_id,
+                    plan_id=plan_id,
+                    order=order,
+                    time=datetime.time(hour=rng.randint(6, 22), minute=rng.randint(0, 59)),
+                )
+            )
+            for item_order in range(1, rng.randint(1, 5) + 1):
+                objects[MealItem].append(
+                    MealItem(
+                        meal_id=meal_id,
+                        ingredient_id=rng.choice(refs['ingredient_ids']),
+                        order=item_order,
+                        amount=rng.randint(10, 250),
+                    )
+                )
+
+        for day in range(1, options.diary_days + 1):
+            date = timezone.now() - datetime.timedelta(days=day)
+            for _ in range(rng.randint(1, 5)):
+                objects[LogItem].append(
+                    (
+                        plan_id,
+                        rng.choice(refs['ingredient_ids']),
+                        adapt_datetime(
+                            date.replace(hour=rng.randint(6, 22), minute=rng.randint(0, 59))
+                        ),
+                        rng.randint(10, 300),
+                    )
+                )
+
+
+def get_first_index(prefix):
+    """
+    Returns the index after the highest numbered existing user of the prefix,
+    so that another run does not create the same usernames again
+    """
+    # The username of index 0, without the number
+    base = slugify(f'{prefix} 0')[:-1]
+
+    highest = -1
+    usernames = User.objects.filter(username__startswith=base) \
+        .values_list('username', flat=True) \
+        .iterator()
+    for username in usernames:
+        number = username[len(base):]
+        if number.isdigit():
+            highest = max(highest, int(number))
+    return highest + 1
+
+
+def generate_range(start, stop, first_index, options, refs, starts):
+    """
+    Generates the users with the given indexes and writes them in one transaction
+
+    :param first_index: the index of the first user of this run, which gets
+                        the first block of primary keys
+    :return: dictionary with the number of created objects per model name
+    """
+    objects = collections.defaultdict(list)
+    block_sizes = get_block_sizes(options)
+    for index in range(start, stop):
+        pool = IdPool(starts, block_sizes, index - first_index)
+        build_user(index, options, refs, pool, objects)
+
+    with transaction.atomic():
+        for model in INSERT_ORDER:
+            if model in ROW_FIELDS:
+                insert_rows(model, objects[model], options.chunk_size)
+            else:
+                model.objects.bulk_create(objects[model], batch_size=options.chunk_size)
+
+        # The statistics are normally maintained by WorkoutLog.save()
+        if not options.skip_log_stats:
+            rebuild_log_stats([user.id for user in objects[User]])
+
+    return {model.__name__: len(objects[model]) for model in INSERT_ORDER if objects[model]}
+
+
+def _generate_range_process(args):
+    """
+    Entry point for the worker processes of generate
+    """
+    try:
+        return generate_range(*args)
+    finally:
+        connections.close_all()
+
+
+def generate(options, print_fn=print):
+    """
+    Generates the given number of users in batches, optionally spread over
+    several processes. These should only be used with a database that allows
+    concurrent writes, such as PostgreSQL.
+    """
+    start_time = time.monotonic()
+    refs = load_references(options)
+
+    # The ID blocks start after the highest existing primary key
+    starts = {
+        model: (model.objects.aggregate(max_pk=Max('pk'))['max_pk'] or 0) + 1
+        for model in get_block_sizes(options)
+    }
+
+    # The numbering continues after the users of earlier runs
+    first_index = get_first_index(options.prefix)
+    if first_index:
+        print_fn(f'   Users with the prefix exist, starting at number {first_index}')
+
+    stop = first_index + options.number_bulk_users
+    ranges = [
+        (start, min(start + options.batch_size, stop), first_index, options, refs, starts)
+        for start in range(first_index, stop, options.batch_size)
+    ]
+
+    totals = collections.Counter()
+    if options.processes > 1 and len(ranges) > 1:
+        # The forked processes must open their own database connections
+        connections.close_all()
+        with multiprocessing.get_context('fork').Pool(options.processes) as pool:
+            for counts in pool.imap_unordered(_generate_range_process, ranges):
+                totals.update(counts)
+                print_fn(f'   - {totals["User"]} users')
+    else:
+        for args in ranges:
+            totals.update(generate_range(*args))
+            print_fn(f'   - {totals["User"]} users')
+
+    # Explicit primary keys don't advance the sequences on e.g. PostgreSQL
+    with connection.cursor() as cursor:
+        for sql in connection.ops.sequence_reset_sql(no_style(), list(starts)):
+            cursor.execute(sql)
+
+    duration = time.monotonic() - start_time
+    if options.skip_log_stats:
+        print_fn('   Run the rebuild-log-stats command to compute the workout log statistics')
+    for name, count in totals.items():
+        print_fn(f'   {name}: {count}')
+    print_fn(
+        f'** Created {sum(totals.values())} objects in {duration:.1f}s '
+        f'({sum(totals.values()) / duration:.0f} objects/s)'
+    )
+    return totals
@@ -205,6 +205,114 @@ nutrition_parser.add_argument(
     help='Add to the specified user-ID, not all existing users',
 )
 
+# Bulk options
+bulk_parser = subparsers.add_parser(
+    'bulk',
+    help='Create users with workouts, logs, weight entries and nutrition plans, '
+    'using bulk inserts. Meant for large load testing datasets',
+)
+bulk_parser.add_argument(
+    'number_bulk_users',
+    action='store',
+    help='Number of users to create',
+    type=int,
+)
+bulk_parser.add_argument(
+    '--workouts',
+    action='store',
+    help='Number of workouts per user, default: 3',
+    type=int,
+    default=3,
+)
+bulk_parser.add_argument(
+    '--logs',
+    action='store',
+    help='Number of weeks with workout logs, default: 10',
+    type=int,
+    default=10,
+)
+bulk_parser.add_argument(
+    '--weight',
+    action='store',
+    help='Number of weight entries per user, default: 30',
+    type=int,
+    default=30,
+)
+bulk_parser.add_argument(
+    '--nutrition-plans',
+    action='store',
+    help='Number of nutrition plans per user, default: 1',
+    type=int,
+    default=1,
+)
+bulk_parser.add_argument(
+    '--diary-days',
+    action='store',
+    help='Number of days with nutrition diary entries per plan, default: 30',
+    type=int,
+    default=30,
+)
+bulk_parser.add_argument(
+    '--add-to-gym',
+    action='store',
+    default='auto',
+    help='Gym to assign the users to. Allowed values: auto, none, <gym_id>. '
+    'Default: auto'
+)
+bulk_parser.add_argument(
+    '--country',
+    action='store',
+    default='germany',
+    help='What country the generated users should belong to. Default: Germany',
+    choices=['germany', 'ukraine', 'spain', 'usa']
+)
+bulk_parser.add_argument(
+    '--prefix',
+    action='store',
+    help='Prefix of the usernames, which are numbered. Default: dummy',
+    default='dummy',
+)
+bulk_parser.add_argument(
+    '--password',
+    action='store',
+    help='Password of all generated users. Default: dummy-password',
+    default='dummy-password',
+)
+bulk_parser.add_argument(
+    '--seed',
+    action='store',
+    help='Seed of the random data, the same seed always generates the same data. Default: 0',
+    default=0,
+)
+bulk_parser.add_argument(
+    '--skip-log-stats',
+    action='store_true',
+    help='Do not compute the workout log statistics, these can be rebuilt afterwards '
+    'with the rebuild-log-stats command',
+)
+bulk_parser.add_argument(
+    '--batch-size',
+    action='store',
+    help='Number of users written in one transaction, default: 100',
+    type=int,
+    default=100,
+)
+bulk_parser.add_argument(
+    '--chunk-size',
+    action='store',
+    help='Number of rows per insert, default: 5000',
+    type=int,
+    default=5000,
+)
+bulk_parser.add_argument(
+    '--processes',
+    action='store',
+    help='Number of processes generating batches in parallel. Only use this with a database '
+    'that allows concurrent writes such as PostgreSQL. Default: 1',
+    type=int,
+    default=1,
+)
+
 args = parser.parse_args()
 # print(args)
 
@@ -271,6 +379,16 @@ if hasattr(args, 'number_users'):
 
         print('   - {0}, {1}'.format(name, surname))
 
+#
+# Bulk generator
+#
+if hasattr(args, 'number_bulk_users'):
+    # Local
+    from bulk import generate
+
+    print("** Generating {0} users in bulk".format(args.number_bulk_users))
+    generate(args)
+
 #
 # Gym generator
 #
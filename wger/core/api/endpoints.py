@@ -1,2 +1,3 @@
 LANGUAGE_ENDPOINT = "language"
 LICENSE_ENDPOINT = "license"
+SNAPSHOT_ENDPOINT = "snapshot"
@@ -16,12 +16,16 @@
 # along with Workout Manager.  If not, see <http://www.gnu.org/licenses/>.
 
 # Standard Library
+import hashlib
+import json
 import logging
 
 # Django
 from django.conf import settings
 from django.contrib.auth.models import User
+from django.utils.cache import get_conditional_response
 from django.utils.decorators import method_decorator
+from django.utils.http import quote_etag
 from django.views.decorators.cache import cache_page
 
 # Third Party
@@ -64,6 +68,7 @@ from wger.core.api.serializers import (
     UserprofileSerializer,
     UserRegistrationSerializer,
 )
+from wger.core.dashboard import get_dashboard_summary
 from wger.core.forms import UserLoginForm
 from wger.core.models import (
     DaysOfWeek,
@@ -73,6 +78,7 @@ from wger.core.models import (
     UserProfile,
     WeightUnit,
 )
+from wger.core.snapshots import read_manifest
 from wger.utils.api_token import create_token
 from wger.utils.permissions import WgerPermission
 
@@ -243,6 +249,64 @@ class RequiredApplicationVersionView(viewsets.ViewSet):
         return Response(get_version(MIN_APP_VERSION, True))
 
 
+class SnapshotView(viewsets.ViewSet):
+    """
+    Returns the manifest of the snapshot of the exercises and ingredients
+
+    The manifest lists the compressed NDJSON files of the snapshot with their
+    checksums and download URLs, other instances use it to synchronize the
+    files that changed since their last run.
+    """
+    permission_classes = (AllowAny, )
+
+    @staticmethod
+    @extend_schema(
+        parameters=[],
+        responses={
+            200: OpenApiTypes.OBJECT,
+            404: OpenApiResponse(description='No snapshot was written on this server'),
+        },
+    )
+    def get(request):
+        manifest = read_manifest()
+        if manifest is None:
+            return Response(
+                'No snapshot was written on this server',
+                status=status.HTTP_404_NOT_FOUND,
+            )
+
+        # The ETag only covers the files, so a snapshot without changes is not
+        # downloaded again
+        etag = quote_etag(hashlib.md5(json.dumps(manifest['chunks']).encode()).hexdigest())
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            for chunk in manifest['chunks']:
+                chunk['url'] = request.build_absolute_uri(
+                    f'{settings.MEDIA_URL}snapshots/{chunk["file"]}'
+                )
+            response = Response(manifest)
+        response['ETag'] = etag
+        return response
+
+
+class DashboardView(viewsets.ViewSet):
+    """
+    Returns a summary of the current workout and schedule, the last nutrition
+    plan and the last weight entries of the user, as shown on the dashboard
+    """
+    permission_classes = (IsAuthenticated, )
+
+    @staticmethod
+    @extend_schema(
+        parameters=[],
+        responses={
+            200: OpenApiTypes.OBJECT,
+        },
+    )
+    def get(request):
+        return Response(get_dashboard_summary(request.user))
+
+
 class UserAPILoginView(viewsets.ViewSet):
     """
     API login endpoint. Returns a token that can subsequently passed in the
@@ -0,0 +1,323 @@
+# -*- coding: utf-8 -*-
+
+# This file is part of wger Workout Manager.
+#
+# wger Workout Manager is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# wger Workout Manager is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+
+# Standard Library
+import datetime
+import logging
+import platform
+import statistics
+import time
+import tracemalloc
+import uuid
+
+# Django
+import django
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import Client
+from django.test.utils import (
+    CaptureQueriesContext,
+    override_settings,
+)
+from django.urls import reverse
+from django.utils import timezone
+
+# wger
+from wger import get_version
+
+
+logger = logging.getLogger(__name__)
+
+BENCHMARK_USERNAME_PREFIX = 'benchmark-'
+"""
+Prefix of the users created for the benchmarks
+"""
+
+
+def seed_benchmark_data(scale=1):
+    """
+    Creates a user with a workout, workout logs, a nutritional plan, diary and
+    weight entries, all growing linearly with the scale
+
+    The existing exercises and ingredients are used, so these must be loaded.
+
+    :return: dictionary with the created user, workout and plan, and the
+             number of created objects
+    """
+    # wger
+    from wger.exercises.models import Exercise
+    from wger.manager.models import (
+        Day,
+        Set,
+        Setting,
+        Workout,
+        WorkoutLog,
+    )
+    from wger.manager.stats import rebuild_log_stats
+    from wger.nutrition.models import (
+        Ingredient,
+        LogItem,
+        Meal,
+        MealItem,
+        NutritionPlan,
+    )
+    from wger.utils.constants import ENGLISH_SHORT_NAME
+    from wger.weight.models import WeightEntry
+
+    exercises = list(
+        Exercise.objects.filter(language__short_name=ENGLISH_SHORT_NAME)
+        .order_by('pk').values_list('exercise_base_id', 'name')[:8 * scale]
+    )
+    ingredients = list(Ingredient.objects.order_by('pk').values_list('pk', 'name')[:10 * scale])
+    if not exercises or not ingredients:
+        raise ValueError('The benchmarks need exercises and ingredients in the database')
+
+    today = datetime.date.today()
+    user = User.objects.create_user(f'{BENCHMARK_USERNAME_PREFIX}{uuid.uuid4().hex[:8]}')
+
+    # Workout with five days, each day with all the exercises
+    workout = Workout.objects.create(user=user, name='Benchmark workout')
+    days = []
+    for weekday in range(1, 6):
+        day = Day.objects.create(training=workout, description=f'Benchmark day {weekday}')
+        day.day.add(weekday)
+        days.append((weekday, day))
+
+    sets = Set.objects.bulk_create(
+        [
+            Set(exerciseday=day, sets=3, order=order)
+            for weekday, day in days
+            for order in range(1, len(exercises) + 1)
+        ]
+    )
+    Setting.objects.bulk_create(
+        [
+            Setting(set=day_set, exercise_base_id=exercises[i % len(exercises)][0], reps=10, order=1)
+            for i, day_set in enumerate(sets)
+        ]
+    )
+
+    # Three logged sets per exercise on each training day
+    monday = today - datetime.timedelta(days=today.weekday())
+    logs = []
+    for week in range(4 * scale):
+        for weekday, day in days:
+            date = monday - datetime.timedelta(weeks=week, days=1 - weekday)
+            if date > today:
+                continue
+            for base_id, name in exercises:
+                for weight in (50, 55, 60):
+                    logs.append(
+                        WorkoutLog(
+                            user=user,
+                            workout=workout,
+                            exercise_base_id=base_id,
+                            reps=10,
+                            weight=weight,
+                            date=date,
+                        )
+                    )
+    WorkoutLog.objects.bulk_create(logs)
+    rebuild_log_stats([user.pk])
+
+    # Nutritional plan with five meals and diary entries for every day
+    plan = NutritionPlan.objects.create(user=user, description='Benchmark plan', language_id=2)
+    meals = [Meal.objects.create(plan=plan, order=order) for order in range(1, 6)]
+    MealItem.objects.bulk_create(
+        [
+            MealItem(meal=meal, ingredient_id=ingredient_id, order=order, amount=100)
+            for meal in meals
+            for order, (ingredient_id, name) in enumerate(ingredients, 1)
+        ]
+    )
+    now = timezone.now()
+    LogItem.objects.bulk_create(
+        [
+            LogItem(
+                plan=plan,
+                ingredient_id=ingredient_id,
+                datetime=now - datetime.timedelta(days=i),
+                amount=150,
+            )
+            for i in range(30 * scale)
+            for ingredient_id, name in ingredients[:5]
+        ]
+    )
+
+    WeightEntry.objects.bulk_create(
+        [
+            WeightEntry(user=user, date=today - datetime.timedelta(days=i), weight=80 + i % 5)
+            for i in range(30 * scale)
+        ]
+    )
+
+    return {
+        'user': user,
+        'workout': workout,
+        'plan': plan,
+        'exercise_term': exercises[0][1][:4],
+        'ingredient_term': ingredients[0][1][:4],
+        'objects': {
+            'sets': len(sets),
+            'workout_logs': len(logs),
+            'meal_items': len(meals) * len(ingredients),
+            'diary_entries': 30 * scale * len(ingredients[:5]),
+            'weight_entries': 30 * scale,
+        },
+    }
+
+
+def get_scenarios(data):
+    """
+    Returns the benchmarked requests as a dictionary of name and a function
+    that receives a logged-in client and returns the status code
+    """
+    workout = data['workout']
+    plan = data['plan']
+    today = datetime.date.today()
+
+    def get(url, **params):
+        return lambda client: client.get(url, params).status_code
+
+    def canonical_form(client):
+        workout.refresh_from_db()
+        workout.canonical_representation
+        return 200
+
+    return {
+        'dashboard': get(reverse('core:dashboard')),
+        'dashboard-api': get(reverse('dashboard')),
+        'workout-canonical-form': canonical_form,
+        'workout-view': get(reverse('manager:workout:view', kwargs={'pk': workout.pk})),
+        'log-calendar': get(
+            reverse('manager:workout:calendar', kwargs={
+                'year': today.year,
+                'month': today.month
+            })
+        ),
+        'nutrition-values': get(reverse('nutritionplan-nutritional-values', kwargs={'pk': plan.pk})),
+        'nutrition-diary': get(reverse('nutrition:log:overview', kwargs={'pk': plan.pk})),
+        'ingredient-search': get(reverse('ingredient-search'), term=data['ingredient_term']),
+        'exercise-search': get(reverse('exercise-search'), term=data['exercise_term']),
+        'exerciseinfo-list': get(reverse('exercisebaseinfo-list'), limit=20),
+        'workout-pdf': get(reverse('manager:workout:pdf-log', kwargs={'id': workout.pk})),
+        'nutrition-pdf': get(reverse('nutrition:plan:export-pdf', kwargs={'id': plan.pk})),
+        'workout-ical': get(reverse('manager:workout:ical', kwargs={'pk': workout.pk})),
+    }
+
+
+def measure(fn, iterations):
+    """
+    Runs a function several times and returns its latency, queries and memory
+
+    The first run is reported separately, since it fills the caches.
+    """
+    durations = []
+    queries = []
+    statuses = set()
+    for i in range(max(iterations, 1) + 1):
+        with CaptureQueriesContext(connection) as captured:
+            start = time.perf_counter()
+            statuses.add(fn())
+            durations.append((time.perf_counter() - start) * 1000)
+        queries.append(len(captured))
+
+    tracemalloc.start()
+    fn()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    warm = sorted(durations[1:])
+    return {
+        'status': sorted(statuses),
+        'first_ms': round(durations[0], 3),
+        'min_ms': round(warm[0], 3),
+        'median_ms': round(statistics.median(warm), 3),
+        'mean_ms': round(statistics.mean(warm), 3),
+        'p95_ms': round(warm[min(len(warm) - 1, int(len(warm) * 0.95))], 3),
+        'queries_first': queries[0],
+        'queries': queries[-1],
+        'peak_memory_kib': round(peak / 1024, 1),
+    }
+
+
+def run_benchmarks(scale=1, iterations=10, scenarios=None, keep=False, progress_fn=None):
+    """
+    Seeds the benchmark data, measures the scenarios and deletes the data again
+
+    :param scenarios: names of the scenarios to run, default: all
+    :param keep: keep the seeded data
+    :param progress_fn: function called with the name and result of each scenario
+    :return: dictionary with information about the run and the results
+    """
+    data = seed_benchmark_data(scale)
+    user = data['user']
+    try:
+        client = Client()
+        client.force_login(user)
+        available = get_scenarios(data)
+
+        results = {}
+        wger_settings = {**settings.WGER_SETTINGS, 'USE_CELERY': False}
+        with override_settings(
+            ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, 'testserver'],
+            WGER_SETTINGS=wger_settings,
+        ):
+            for name, fn in available.items():
+                if scenarios and name not in scenarios:
+                    continue
+                results[name] = measure(lambda: fn(client), iterations)
+                if progress_fn:
+                    progress_fn(name, results[name])
+    finally:
+        if not keep:
+            user.delete()
+
+    return {
+        'meta': {
+            'date': timezone.now().isoformat(),
+            'wger': get_version(),
+            'django': django.get_version(),
+            'python': platform.python_version(),
+            'database': connection.vendor,
+            'cache': settings.CACHES['default']['BACKEND'],
+            'scale': scale,
+            'iterations': iterations,
+            'objects': data['objects'],
+        },
+        'results': results,
+    }
+
+
+def compare_results(baseline, current):
+    """
+    Compares the results of two runs
+
+    :return: dictionary with the relative change of the median latency and the
+             difference of queries of each scenario present in both runs
+    """
+    out = {}
+    for name, result in current['results'].items():
+        before = baseline.get('results', {}).get(name)
+        if not before:
+            continue
+        out[name] = {
+            'median_change': round(result['median_ms'] / before['median_ms'] - 1, 3)
+            if before['median_ms'] else None,
+            'queries_change': result['queries'] - before['queries'],
+        }
+    return out
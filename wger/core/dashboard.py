@@ -0,0 +1,169 @@
+# -*- coding: utf-8 -*-
+
+# This file is part of wger Workout Manager.
+#
+# wger Workout Manager is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# wger Workout Manager is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+
+# Standard Library
+import datetime
+import logging
+
+# Django
+from django.core.cache import cache
+from django.db.models import Prefetch
+
+# wger
+from wger.utils.cache import cache_mapper
+
+
+logger = logging.getLogger(__name__)
+
+DASHBOARD_WEIGHT_ENTRIES = 5
+"""
+Number of weight entries shown on the dashboard
+"""
+
+
+def build_dashboard_summary(user):
+    """
+    Collects the data shown on the dashboard
+
+    Everything is loaded with prefetches, so the number of queries does not
+    depend on the number of days, meals or ingredients. The result only
+    contains plain data so that it can be cached and serialized as is.
+    """
+    # wger
+    from wger.core.models import DaysOfWeek
+    from wger.manager.models import (
+        Day,
+        Schedule,
+    )
+    from wger.nutrition.models import (
+        Meal,
+        MealItem,
+        NutritionPlan,
+    )
+    from wger.weight.models import WeightEntry
+
+    summary = {
+        'workout': None,
+        'schedule': None,
+        'weekdays': [],
+        'plan': None,
+        'weight_entries': [],
+    }
+
+    # Current workout, either from a schedule or a 'regular' one
+    (workout, schedule) = Schedule.objects.get_current_workout(user)
+    used_days = {}
+    if workout:
+        days = Day.objects.filter(training=workout).prefetch_related('day')
+        summary['workout'] = {
+            'id': workout.id,
+            'name': workout.name,
+            'creation_date': workout.creation_date,
+            'is_template': workout.is_template,
+            'days': [
+                {
+                    'id': day.id,
+                    'description': day.description,
+                    'days_of_week': [d.id for d in day.day.all()],
+                } for day in days
+            ],
+        }
+        for day in summary['workout']['days']:
+            for day_of_week in day['days_of_week']:
+                used_days[day_of_week] = day['description']
+
+    if schedule:
+        summary['schedule'] = {'id': schedule.id, 'name': schedule.name}
+
+    summary['weekdays'] = [
+        {
+            'id': day.id,
+            'day_of_week': day.day_of_week,
+            'description': used_days.get(day.id),
+        } for day in DaysOfWeek.objects.all()
+    ]
+
+    # Last nutritional plan
+    plan = NutritionPlan.objects.filter(user=user).select_related('user__userprofile') \
+        .prefetch_related(
+            Prefetch(
+                'meal_set',
+                queryset=Meal.objects.prefetch_related(
+                    Prefetch(
+                        'mealitem_set',
+                        queryset=MealItem.objects.select_related('ingredient', 'weight_unit'),
+                    )
+                ),
+            )
+        ).order_by('-creation_date', '-id').first()
+
+    if plan:
+        use_metric = plan.user.userprofile.use_metric
+        summary['plan'] = {
+            'id': plan.id,
+            'description': plan.description,
+            'creation_date': plan.creation_date,
+            'meals': [
+                {
+                    'id': meal.id,
+                    'time': meal.time,
+                    'energy': meal.get_nutritional_values(use_metric=use_metric)['energy'],
+                    'items': [item.ingredient.name for item in meal.mealitem_set.all()],
+                } for meal in plan.meal_set.all()
+            ],
+            'nutritional_values': plan.get_nutritional_values()['total'],
+        }
+
+    # Last weight entries, with the change to the previous one
+    entries = list(
+        WeightEntry.objects.filter(user=user).order_by('-date').values('date', 'weight')
+        [:DASHBOARD_WEIGHT_ENTRIES + 1]
+    )
+    for entry, previous in zip(entries, entries[1:] + [None]):
+        summary['weight_entries'].append(
+            {
+                'date': entry['date'],
+                'weight': entry['weight'],
+                'weight_diff': entry['weight'] - previous['weight'] if previous else None,
+                'day_diff': (entry['date'] - previous['date']).days if previous else None,
+            }
+        )
+    summary['weight_entries'] = summary['weight_entries'][:DASHBOARD_WEIGHT_ENTRIES]
+
+    return summary
+
+
+def get_dashboard_summary(user):
+    """
+    Returns the cached dashboard summary of a user
+
+    The cache key contains the current date, since the current workout of a
+    schedule changes over time. Changes to the underlying objects reset the
+    entry (see wger.core.signals).
+    """
+    key = cache_mapper.get_dashboard_key(user.id, datetime.date.today())
+    summary = cache.get(key)
+    if summary is None:
+        summary = build_dashboard_summary(user)
+        cache.set(key, summary)
+    return summary
+
+
+def reset_dashboard_cache(user_id):
+    """
+    Deletes the cached dashboard summary of a user
+    """
+    cache.delete(cache_mapper.get_dashboard_key(user_id, datetime.date.today()))
@@ -0,0 +1,156 @@
+# This file is part of wger Workout Manager.
+#
+# wger Workout Manager is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# wger Workout Manager is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+
+# Standard Library
+import statistics
+import time
+import tracemalloc
+from functools import partial
+
+# Django
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+# wger
+from wger.manager.pdf import render_workout_pdf
+from wger.manager.models import Workout
+from wger.nutrition.models import NutritionPlan
+from wger.nutrition.pdf import render_plan_pdf
+from wger.utils.pdf import (
+    get_pdf_render_key,
+    store_pdf,
+)
+
+
+class Command(BaseCommand):
+    """
+    Measures the render time and memory of the workout and nutritional plan PDFs
+    """
+
+    help = 'Measures the render time and peak memory of the workout and nutritional plan ' \
+           'PDFs, as well as the time needed to read them from the PDF cache'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--workout',
+            action='append',
+            dest='workouts',
+            type=int,
+            default=[],
+            help='ID of a workout to render, can be used more than once',
+        )
+
+        parser.add_argument(
+            '--plan',
+            action='append',
+            dest='plans',
+            type=int,
+            default=[],
+            help='ID of a nutritional plan to render, can be used more than once',
+        )
+
+        parser.add_argument(
+            '--iterations',
+            action='store',
+            dest='iterations',
+            type=int,
+            default=5,
+            help='Number of renders per document, default is 5',
+        )
+
+        parser.add_argument(
+            '--images',
+            action='store_true',
+            dest='images',
+            default=False,
+            help='Render the workouts with exercise images',
+        )
+
+        parser.add_argument(
+            '--comments',
+            action='store_true',
+            dest='comments',
+            default=False,
+            help='Render the workouts with exercise comments',
+        )
+
+    def handle(self, **options):
+        site_url = getattr(settings, 'SITE_URL', '')
+
+        for workout in Workout.objects.select_related('user').filter(pk__in=options['workouts']):
+            url = site_url + workout.get_absolute_url()
+            for only_table in (False, True):
+                key = get_pdf_render_key(
+                    'workout',
+                    workout.pk,
+                    url=url,
+                    images=options['images'],
+                    comments=options['comments'],
+                    only_table=only_table,
+                )
+                self.benchmark(
+                    'Workout {0} ({1})'.format(workout.pk, 'table' if only_table else 'log'),
+                    key,
+                    partial(
+                        render_workout_pdf,
+                        workout,
+                        url,
+                        options['images'],
+                        options['comments'],
+                        only_table,
+                    ),
+                    options['iterations'],
+                )
+
+        for plan in NutritionPlan.objects.select_related('user').filter(pk__in=options['plans']):
+            url = site_url + plan.get_absolute_url()
+            self.benchmark(
+                f'Nutritional plan {plan.pk}',
+                get_pdf_render_key('nutrition-plan', plan.pk, url=url),
+                partial(render_plan_pdf, plan, url),
+                options['iterations'],
+            )
+
+    def benchmark(self, label, key, render_fn, iterations):
+        """
+        Renders a document several times and reads it back from the cache
+        """
+        durations = []
+        for i in range(max(iterations, 1)):
+            start = time.perf_counter()
+            render_fn()
+            durations.append(time.perf_counter() - start)
+
+        # Queries and memory of a single render
+        tracemalloc.start()
+        with CaptureQueriesContext(connection) as queries:
+            content = render_fn()
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+        store_pdf(key, content)
+        start = time.perf_counter()
+        cache.get(key)
+        cached = time.perf_counter() - start
+
+        self.stdout.write(
+            f'{label}: {len(content)} bytes, {len(queries)} queries, '
+            f'render {statistics.mean(durations) * 1000:.1f} ms '
+            f'(min {min(durations) * 1000:.1f} ms), '
+            f'peak memory {peak / 1024 / 1024:.1f} MiB, '
+            f'cached {cached * 1000:.2f} ms'
+        )
@@ -0,0 +1,122 @@
+# -*- coding: utf-8 -*-
+
+# This file is part of wger Workout Manager.
+#
+# wger Workout Manager is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# wger Workout Manager is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+
+# Standard Library
+import json
+
+# Django
+from django.core.management.base import (
+    BaseCommand,
+    CommandError,
+)
+
+# wger
+from wger.core.benchmark import (
+    compare_results,
+    run_benchmarks,
+)
+
+
+class Command(BaseCommand):
+    """
+    Measures the latency, queries and memory of the most used pages and API endpoints
+    """
+
+    help = 'Creates a user with a workout, logs, a nutritional plan and diary entries, ' \
+           'measures the latency, number of queries and peak memory of the most used ' \
+           'pages and API endpoints and deletes the user again. The results are written ' \
+           'as JSON. The exercises and ingredients must already be loaded.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--scale',
+            action='store',
+            type=int,
+            default=1,
+            help='Size of the generated data, the number of exercises, logs, meal items '
+            'and diary entries grows linearly with it. Default: 1',
+        )
+
+        parser.add_argument(
+            '--iterations',
+            action='store',
+            type=int,
+            default=10,
+            help='Number of measured requests per scenario, after a first one that fills '
+            'the caches. Default: 10',
+        )
+
+        parser.add_argument(
+            '--scenario',
+            action='append',
+            dest='scenarios',
+            default=[],
+            help='Only run this scenario, can be used more than once',
+        )
+
+        parser.add_argument(
+            '--output',
+            action='store',
+            help='Write the results to this file instead of the standard output',
+        )
+
+        parser.add_argument(
+            '--compare',
+            action='store',
+            help='JSON file of an earlier run, the changes are added to the results',
+        )
+
+        parser.add_argument(
+            '--keep',
+            action='store_true',
+            default=False,
+            help='Do not delete the generated user and data',
+        )
+
+    def handle(self, **options):
+        baseline = None
+        if options['compare']:
+            with open(options['compare']) as baseline_file:
+                baseline = json.load(baseline_file)
+
+        def progress(name, result):
+            self.stderr.write(
+                f"{name}: median {result['median_ms']:.1f} ms "
+                f"(first {result['first_ms']:.1f} ms), {result['queries']} queries, "
+                f"status {result['status']}"
+            )
+
+        try:
+            report = run_benchmarks(
+                scale=options['scale'],
+                iterations=options['iterations'],
+                scenarios=options['scenarios'],
+                keep=options['keep'],
+                progress_fn=progress,
+            )
+        except ValueError as e:
+            raise CommandError(e)
+
+        if baseline:
+            report['comparison'] = compare_results(baseline, report)
+
+        output = json.dumps(report, indent=2, sort_keys=True)
+        if options['output']:
+            with open(options['output'], 'w') as output_file:
+                output_file.write(output)
+            self.stderr.write(self.style.SUCCESS(f"Results written to {options['output']}"))
+        else:
+            self.stdout.write(output)
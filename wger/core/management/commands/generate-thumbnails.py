@@ -0,0 +1,105 @@
+# This file is part of wger Workout Manager.
+#
+# wger Workout Manager is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# wger Workout Manager is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+
+# Standard Library
+import multiprocessing
+import time
+
+# Django
+from django.apps import apps
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+# wger
+from wger.exercises.search import reset_search_index
+from wger.utils.thumbnails import (
+    THUMBNAIL_MODELS,
+    generate_thumbnails,
+)
+
+
+def generate_model_thumbnails(args):
+    """
+    Generates the thumbnails of one model instance
+    """
+    model_label, pk, force = args
+    instance = apps.get_model(model_label).objects.filter(pk=pk).first()
+    if not instance or not instance.image:
+        return 0
+    return generate_thumbnails(instance.image, force=force)
+
+
+def _generate_process(args):
+    """
+    Entry point for the worker processes
+    """
+    try:
+        return generate_model_thumbnails(args)
+    finally:
+        connections.close_all()
+
+
+class Command(BaseCommand):
+    """
+    Generates the missing thumbnails of the existing images
+    """
+
+    help = 'Generates the missing thumbnails of all exercise and ingredient images'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--processes',
+            action='store',
+            dest='processes',
+            type=int,
+            default=multiprocessing.cpu_count(),
+            help='Number of worker processes, default is the number of CPUs',
+        )
+
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            dest='force',
+            default=False,
+            help='Generate the thumbnails again, also if they already exist',
+        )
+
+    def handle(self, **options):
+        start = time.monotonic()
+
+        jobs = []
+        for model_label in THUMBNAIL_MODELS:
+            model = apps.get_model(model_label)
+            pks = model.objects.exclude(image='').values_list('pk', flat=True)
+            jobs += [(model_label, pk, options['force']) for pk in pks]
+
+        if options['processes'] > 1 and len(jobs) > 1:
+            # The forked processes must open their own database connections
+            connections.close_all()
+            with multiprocessing.Pool(options['processes']) as pool:
+                counts = list(pool.imap(_generate_process, jobs))
+        else:
+            counts = [generate_model_thumbnails(job) for job in jobs]
+        count = sum(counts)
+
+        # Rebuild the search index once, so that it contains the new thumbnails
+        if any(n and job[0] == 'exercises.ExerciseImage' for job, n in zip(jobs, counts)):
+            reset_search_index()
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'Generated {count} thumbnails for {len(jobs)} images in '
+                f'{time.monotonic() - start:.2f}s'
+            )
+        )
@@ -0,0 +1,139 @@
+# This file is part of wger Workout Manager.
+#
+# wger Workout Manager is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# wger Workout Manager is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+
+# Standard Library
+import os
+import re
+import subprocess
+import sys
+
+# Django
+from django.conf import settings
+from django.core.management.base import (
+    BaseCommand,
+    CommandError,
+)
+
+
+STARTUP_IMPORT_BUDGET = 2500
+"""
+Maximum time in milliseconds spent importing modules when starting a process
+"""
+
+LAZY_MODULES = ('reportlab', 'icalendar', 'openfoodfacts')
+"""
+Packages that are only imported where they are used and must not be loaded
+when the application starts
+"""
+
+IMPORTTIME_RE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$')
+
+
+def parse_importtime(output):
+    """
+    Parses the output of python -X importtime
+
+    :return: list of tuples with the module name, the nesting level and
+             the own and cumulative import times in microseconds
+    """
+    modules = []
+    for line in output.splitlines():
+        match = IMPORTTIME_RE.match(line)
+        if match:
+            modules.append(
+                (match[4], len(match[3]) // 2, int(match[1]), int(match[2])),
+            )
+    return modules
+
+
+class Command(BaseCommand):
+    """
+    Measures the time spent importing modules when the application starts
+    """
+
+    help = 'Runs "python -X importtime manage.py check" and fails if the time spent ' \
+           'importing modules exceeds the budget or if one of the lazily loaded ' \
+           'packages is imported'
+
+    # The checks are run in the measured process
+    requires_system_checks = []
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--tag',
+            action='append',
+            dest='tags',
+            default=[],
+            help='Only run the system checks with this tag, e.g. "urls" to run them '
+            'without a database. Can be used more than once',
+        )
+
+        parser.add_argument(
+            '--budget',
+            action='store',
+            dest='budget',
+            type=int,
+            default=STARTUP_IMPORT_BUDGET,
+            help=f'Import time budget in milliseconds, default is {STARTUP_IMPORT_BUDGET}',
+        )
+
+        parser.add_argument(
+            '--top',
+            action='store',
+            dest='top',
+            type=int,
+            default=10,
+            help='Number of the slowest top level imports to show, default is 10',
+        )
+
+    def handle(self, **options):
+        manage_py = os.path.join(os.path.dirname(settings.SITE_ROOT), 'manage.py')
+        if not os.path.exists(manage_py):
+            raise CommandError(f'Could not find {manage_py}')
+
+        args = [sys.executable, '-X', 'importtime', manage_py, 'check']
+        for tag in options['tags']:
+            args += ['--tag', tag]
+
+        result = subprocess.run(
+            args,
+            cwd=os.path.dirname(manage_py),
+            capture_output=True,
+            text=True,
+        )
+        if result.returncode:
+            raise CommandError(f'manage.py exited with {result.returncode}:\n{result.stderr}')
+
+        modules = parse_importtime(result.stderr)
+        total = sum(m[2] for m in modules) / 1000
+
+        self.stdout.write(
+            f'Imported {len(modules)} modules in {total:.1f} ms '
+            f'(budget {options["budget"]} ms)'
+        )
+        self.stdout.write('Slowest top level imports:')
+        top_level = sorted((m for m in modules if m[1] == 0), key=lambda m: m[3], reverse=True)
+        for name, level, own, cumulative in top_level[:options['top']]:
+            self.stdout.write(f'- {name}: {cumulative / 1000:.1f} ms')
+
+        loaded = sorted({m[0] for m in modules if m[0].split('.')[0] in LAZY_MODULES})
+        if loaded:
+            raise CommandError(f'Lazily loaded modules imported at startup: {", ".join(loaded)}')
+
+        if total > options['budget']:
+            raise CommandError(
+                f'Import time of {total:.1f} ms exceeds the budget of {options["budget"]} ms'
+            )
+
+        self.stdout.write(self.style.SUCCESS('Startup import time is within the budget'))
@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+
+# This file is part of wger Workout Manager.
+#
+# wger Workout Manager is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# wger Workout Manager is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+
+# Django
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.management.base import (
+    BaseCommand,
+    CommandError,
+)
+from django.core.validators import URLValidator
+
+# wger
+from wger.core.snapshots import sync_snapshot
+
+
+class Command(BaseCommand):
+    """
+    Synchronizes the exercises and ingredients from the snapshot of a wger instance
+    """
+
+    help = """Synchronizes the exercises and ingredients from the snapshot of a wger
+            instance. Only the files that changed since the last run are downloaded.
+
+            Exercises and ingredients are matched by their UUID, so objects that
+            were created locally are never overwritten. Other objects such as
+            categories, muscles or equipment are matched by their IDs, as in
+            sync-exercises. Aliases, comments and ingredient weight units are not
+            part of the snapshot.
+            """
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--remote-url',
+            action='store',
+            dest='remote_url',
+            default=settings.WGER_SETTINGS['WGER_INSTANCE'],
+            help=f'Remote URL to fetch the snapshot from (default: WGER_SETTINGS'
+            f'["WGER_INSTANCE"] - {settings.WGER_SETTINGS["WGER_INSTANCE"]})'
+        )
+
+        parser.add_argument(
+            '--directory',
+            action='store',
+            help='Directory for the downloads and the checksums of the applied files. '
+            'Default: a folder in the temp directory',
+        )
+
+        parser.add_argument(
+            '--restart',
+            action='store_true',
+            default=False,
+            help='Apply all files again, not only the changed ones',
+        )
+
+    def handle(self, **options):
+        try:
+            URLValidator()(options['remote_url'])
+        except ValidationError:
+            raise CommandError('Please enter a valid URL')
+
+        try:
+            sync_snapshot(
+                self.stdout.write,
+                options['remote_url'],
+                self.style.SUCCESS,
+                directory=options['directory'],
+                restart=options['restart'],
+            )
+        except ValueError as e:
+            raise CommandError(e)
@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+
+# This file is part of wger Workout Manager.
+#
+# wger Workout Manager is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# wger Workout Manager is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+
+# Django
+from django.core.management.base import BaseCommand
+
+# wger
+from wger.core.snapshots import (
+    CHUNK_SIZE,
+    write_snapshot,
+)
+
+
+class Command(BaseCommand):
+    """
+    Writes the snapshot of the exercises and ingredients
+    """
+
+    help = (
+        'Writes the exercises and ingredients as compressed NDJSON files into\n'
+        'the snapshots folder in MEDIA_ROOT. The manifest with the files and their\n'
+        'checksums is available at /api/v2/snapshot/, other instances can\n'
+        'synchronize the changed files with the sync-snapshot command.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--directory',
+            action='store',
+            help='Directory for the snapshot. Default: MEDIA_ROOT/snapshots',
+        )
+
+        parser.add_argument(
+            '--chunk-size',
+            action='store',
+            type=int,
+            default=CHUNK_SIZE,
+            help=f'Size of the primary key range of a file. Default: {CHUNK_SIZE}',
+        )
+
+    def handle(self, **options):
+        write_snapshot(
+            self.stdout.write,
+            self.style.SUCCESS,
+            directory=options['directory'],
+            chunk_size=options['chunk_size'],
+        )
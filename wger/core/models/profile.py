@@ -402,8 +402,11 @@ by the US Department of Agriculture. It is extremely complete, with around
             'street': '',
             'phone': '',
         }
-        if self.user.contract_member.exists():
-            last_contract = self.user.contract_member.last()
+        # Evaluate with all() so that prefetched contracts are used (e.g. when
+        # exporting all members of a gym)
+        contracts = self.user.contract_member.all()
+        if contracts:
+            last_contract = list(contracts)[-1]
             out['zip_code'] = last_contract.zip_code
             out['city'] = last_contract.city
             out['street'] = last_contract.street
@@ -19,18 +19,36 @@ import datetime
 
 # Django
 from django.contrib.auth.models import User
+from django.core.exceptions import ObjectDoesNotExist
 from django.db.models.signals import (
+    m2m_changed,
+    post_delete,
     post_save,
     pre_save,
 )
 from django.dispatch import receiver
 
 # wger
+from wger.core.dashboard import reset_dashboard_cache
 from wger.core.models import (
     UserCache,
     UserProfile,
 )
+from wger.manager.models import (
+    Day,
+    Schedule,
+    ScheduleStep,
+    Workout,
+)
+from wger.nutrition.models import (
+    Ingredient,
+    IngredientWeightUnit,
+    Meal,
+    MealItem,
+    NutritionPlan,
+)
 from wger.utils.helpers import disable_for_loaddata
+from wger.weight.models import WeightEntry
 
 
 @disable_for_loaddata
@@ -66,5 +84,51 @@ def set_user_age(sender, instance, **kwargs):
         )
 
 
+def reset_dashboard_summary(sender, instance, **kwargs):
+    """
+    Reset the cached dashboard summary of the owner of the object
+    """
+    try:
+        user_id = instance.get_owner_object().user_id
+    except ObjectDoesNotExist:
+        # The parent was deleted in the same cascade and resets the cache itself
+        return
+    reset_dashboard_cache(user_id)
+
+
+@receiver(post_save, sender=UserProfile)
+def reset_dashboard_summary_profile(sender, instance, **kwargs):
+    """
+    Reset the cached dashboard summary when the profile changes, the energy
+    of the meals depends on the user's units
+    """
+    reset_dashboard_cache(instance.user_id)
+
+
+@disable_for_loaddata
+def reset_dashboard_summary_ingredient(sender, instance, **kwargs):
+    """
+    Reset the cached dashboard summaries that show the ingredient
+
+    The names and nutritional values of the ingredients in the last plan are
+    part of the summary, so this affects every user with the ingredient in
+    one of their meals.
+    """
+    if sender is Ingredient:
+        items = MealItem.objects.filter(ingredient=instance)
+    else:
+        items = MealItem.objects.filter(weight_unit=instance)
+
+    for user_id in items.values_list('meal__plan__user_id', flat=True).distinct():
+        reset_dashboard_cache(user_id)
+
+
 post_save.connect(create_user_profile, sender=User)
 post_save.connect(create_user_cache, sender=User)
+
+for model in (Workout, Day, Schedule, ScheduleStep, NutritionPlan, Meal, MealItem, WeightEntry):
+    post_save.connect(reset_dashboard_summary, sender=model)
+    post_delete.connect(reset_dashboard_summary, sender=model)
+m2m_changed.connect(reset_dashboard_summary, sender=Day.day.through)
+for model in (Ingredient, IngredientWeightUnit):
+    post_save.connect(reset_dashboard_summary_ingredient, sender=model)
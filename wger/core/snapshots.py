@@ -0,0 +1,433 @@
+# This file is part of wger Workout Manager.
+#
+# wger Workout Manager is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# wger Workout Manager is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+"""
+Bulk snapshots of the exercises and ingredients, used to synchronize instances
+
+The snapshot is a set of gzip compressed NDJSON files, one per model and range
+of primary keys, with one object per line in Django's serialization format. The
+manifest lists the files with their checksums. Since the ranges are fixed and
+the files are written reproducibly, a file only changes if one of its objects
+changed, so clients only need to download and apply the changed files.
+
+The primary keys of the exercises and ingredients differ between instances,
+so these are identified by their UUID, also when other objects point to them.
+The other models are identified by their primary key, like in sync-exercises.
+"""
+
+# Standard Library
+import gzip
+import json
+import os
+import tempfile
+from itertools import groupby
+
+# Django
+from django.apps import apps
+from django.conf import settings
+from django.core import serializers
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import (
+    connection,
+    transaction,
+)
+from django.db.models import Max
+from django.utils import timezone
+
+# Third Party
+import requests
+
+# wger
+from wger.core.api.endpoints import SNAPSHOT_ENDPOINT
+from wger.exercises.cache import warmup_exercise_api_cache
+from wger.exercises.facets import reset_facet_index
+from wger.exercises.search import reset_search_index
+from wger.utils.bulk import (
+    chunked,
+    file_checksum,
+    reset_sequences,
+    save_deserialized,
+)
+from wger.utils.cache import cache_mapper
+from wger.utils.requests import (
+    download_file,
+    wger_headers,
+)
+from wger.utils.url import make_uri
+
+
+SNAPSHOT_VERSION = 2
+"""
+Version of the snapshot format, increased on incompatible changes
+"""
+
+SNAPSHOT_MODELS = (
+    'core.language',
+    'core.license',
+    'exercises.exercisecategory',
+    'exercises.equipment',
+    'exercises.muscle',
+    'exercises.variation',
+    'exercises.exercisebase',
+    'exercises.exercise',
+    'nutrition.ingredientcategory',
+    'nutrition.weightunit',
+    'nutrition.ingredient',
+)
+"""
+The models in the snapshot, in the order in which they are applied
+
+Aliases, comments and ingredient weight units are not part of it, since they
+have no UUID that identifies them across instances.
+"""
+
+SNAPSHOT_EXCLUDE = {
+    # Points to the exercise images, which are synchronized with their files
+    'exercises.exercisebase': ('main_image', ),
+}
+"""
+Fields that are not part of the snapshot
+"""
+
+CHUNK_SIZE = 5000
+"""
+Size of the primary key range of a snapshot file
+"""
+
+LOOKUP_BATCH_SIZE = 500
+"""
+Number of values per query when looking up the local objects
+"""
+
+MANIFEST_NAME = 'manifest.json'
+
+
+def has_uuid(model):
+    """
+    Returns whether the objects of a model are identified by their UUID
+    """
+    return any(f.name == 'uuid' for f in model._meta.concrete_fields)
+
+
+def get_uuid_relations(model):
+    """
+    Returns the foreign keys of a model to models that are identified by their
+    UUID. The snapshot contains the UUID of these objects instead of their
+    primary key.
+    """
+    return [
+        f for f in model._meta.concrete_fields
+        if f.many_to_one and has_uuid(f.related_model) and f.related_model is not model
+    ]
+
+
+def get_snapshot_directory():
+    """
+    Returns the directory the snapshot is written to, in the media folder
+    """
+    return os.path.join(settings.MEDIA_ROOT, 'snapshots')
+
+
+def read_manifest(directory=None):
+    """
+    Returns the manifest of the current snapshot, or None if none was written
+    """
+    path = os.path.join(directory or get_snapshot_directory(), MANIFEST_NAME)
+    if not os.path.exists(path):
+        return None
+
+    with open(path) as f:
+        return json.load(f)
+
+
+def write_chunk(directory, label, number, objects):
+    """
+    Writes the objects of a primary key range into a compressed NDJSON file
+
+    The gzip header contains no timestamp or file name, so the same objects
+    always result in the same file and checksum.
+
+    :return: the entry of the file in the manifest
+    """
+    exclude = SNAPSHOT_EXCLUDE.get(label, ())
+    relations = get_uuid_relations(apps.get_model(label))
+    objects = list(objects)
+    count = 0
+    with tempfile.NamedTemporaryFile(dir=directory, suffix='.tmp', delete=False) as raw:
+        with gzip.GzipFile(filename='', mode='wb', fileobj=raw, mtime=0) as f:
+            for obj, row in zip(objects, serializers.serialize('python', objects)):
+                for field in exclude:
+                    row['fields'].pop(field, None)
+                for field in relations:
+                    related = getattr(obj, field.name)
+                    row['fields'][field.name] = str(related.uuid) if related else None
+                f.write(json.dumps(row, cls=DjangoJSONEncoder, sort_keys=True).encode())
+                f.write(b'\n')
+                count += 1
+
+    checksum = file_checksum(raw.name)
+    name = f'{label}-{number:06}-{checksum[:12]}.ndjson.gz'
+    os.replace(raw.name, os.path.join(directory, name))
+    return {
+        'model': label,
+        'number': number,
+        'file': name,
+        'sha256': checksum,
+        'size': os.path.getsize(os.path.join(directory, name)),
+        'objects': count,
+    }
+
+
+def write_snapshot(
+    print_fn,
+    style_fn=lambda x: x,
+    directory=None,
+    chunk_size=CHUNK_SIZE,
+):
+    """
+    Writes the snapshot of the exercises and ingredients
+
+    The manifest is replaced once all files are written, files of earlier
+    snapshots that are not part of the new one are deleted afterwards.
+
+    :return: the manifest
+    """
+    directory = directory or get_snapshot_directory()
+    os.makedirs(directory, exist_ok=True)
+    print_fn('*** Writing the snapshot...')
+
+    chunks = []
+    for label in SNAPSHOT_MODELS:
+        model = apps.get_model(label)
+        queryset = model._default_manager \
+            .order_by('pk') \
+            .select_related(*[f.name for f in get_uuid_relations(model)]) \
+            .prefetch_related(*[f.name for f in model._meta.many_to_many])
+
+        count = 0
+        objects = queryset.iterator(chunk_size=1000)
+        for number, chunk_objects in groupby(objects, key=lambda o: o.pk // chunk_size):
+            chunk = write_chunk(directory, label, number, chunk_objects)
+            chunks.append(chunk)
+            count += chunk['objects']
+        print_fn(f'- {label}: {count} objects')
+
+    manifest = {
+        'version': SNAPSHOT_VERSION,
+        'created': timezone.now().isoformat(),
+        'chunk_size': chunk_size,
+        'chunks': chunks,
+    }
+    manifest_path = os.path.join(directory, MANIFEST_NAME)
+    with open(f'{manifest_path}.tmp', 'w') as f:
+        json.dump(manifest, f, indent=1)
+    os.replace(f'{manifest_path}.tmp', manifest_path)
+
+    current = {chunk['file'] for chunk in chunks}
+    for name in os.listdir(directory):
+        if name.endswith('.ndjson.gz') and name not in current:
+            os.unlink(os.path.join(directory, name))
+
+    size = sum(chunk['size'] for chunk in chunks)
+    print_fn(style_fn(f'done! {len(chunks)} files, {size / (1024 * 1024):.2f} MB\n'))
+    return manifest
+
+
+def read_chunk(path, label):
+    """
+    Reads the objects of a snapshot file
+
+    Only objects of the given model, which must be part of the snapshot, are
+    accepted. This prevents a remote server from writing into other tables.
+    """
+    if label not in SNAPSHOT_MODELS:
+        raise ValueError(f'{label} is not part of the snapshot')
+
+    with gzip.open(path, 'rt', encoding='utf-8') as f:
+        for line in f:
+            if not line.strip():
+                continue
+
+            row = json.loads(line)
+            if row.get('model') != label:
+                raise ValueError(f'Unexpected object of {row.get("model")} in a file of {label}')
+            yield row
+
+
+def get_local_ids(model, values, field='uuid'):
+    """
+    Returns the primary keys of the local objects with the given values of a
+    field, as dictionary with the values converted to strings as keys
+    """
+    result = {}
+    for batch in chunked(set(values), LOOKUP_BATCH_SIZE):
+        queryset = model._default_manager.filter(**{f'{field}__in': batch})
+        result.update((str(value), pk) for value, pk in queryset.values_list(field, 'pk'))
+    return result
+
+
+def map_relations(model, rows):
+    """
+    Replaces the UUIDs of the related objects with their local primary keys
+
+    Rows pointing to an object that does not exist locally are removed, e.g.
+    translations of an exercise that was deleted on this instance.
+
+    :return: tuple with the remaining rows and the number of removed ones
+    """
+    count = len(rows)
+    for field in get_uuid_relations(model):
+        ids = get_local_ids(
+            field.related_model,
+            [row['fields'][field.name] for row in rows if row['fields'][field.name]],
+        )
+
+        result = []
+        for row in rows:
+            value = row['fields'][field.name]
+            if value is None or value in ids:
+                row['fields'][field.name] = ids.get(value)
+                result.append(row)
+        rows = result
+    return rows, count - len(rows)
+
+
+def assign_local_ids(model, objects):
+    """
+    Sets the primary keys of the local objects with the same UUID
+
+    New objects keep the primary key of the remote instance if it is free,
+    otherwise they get a new one. Objects that were created on this instance
+    are therefore never overwritten.
+    """
+    instances = [o.object for o in objects]
+    ids = get_local_ids(model, [i.uuid for i in instances])
+    new = [i for i in instances if str(i.uuid) not in ids]
+    taken = get_local_ids(model, [i.pk for i in new], field='pk')
+
+    next_pk = max(
+        [model._default_manager.aggregate(max_pk=Max('pk'))['max_pk'] or 0] +
+        [i.pk for i in instances]
+    ) + 1
+    for instance in instances:
+        if str(instance.uuid) in ids:
+            instance.pk = ids[str(instance.uuid)]
+        elif str(instance.pk) in taken:
+            instance.pk = next_pk
+            next_pk += 1
+
+
+def apply_chunk(path, label):
+    """
+    Saves the objects of a snapshot file with a bulk upsert
+
+    :return: tuple with the saved instances and the number of skipped objects
+    """
+    model = apps.get_model(label)
+    rows, skipped = map_relations(model, list(read_chunk(path, label)))
+    objects = list(serializers.deserialize('python', rows))
+    if has_uuid(model):
+        assign_local_ids(model, objects)
+
+    with transaction.atomic():
+        instances = save_deserialized(
+            objects,
+            batch_size=len(objects) or 1,
+            exclude={model: SNAPSHOT_EXCLUDE.get(label, ())},
+        )
+    return instances.get(model, []), skipped
+
+
+def sync_snapshot(
+    print_fn,
+    remote_url=settings.WGER_SETTINGS['WGER_INSTANCE'],
+    style_fn=lambda x: x,
+    directory=None,
+    restart=False,
+):
+    """
+    Applies the changed files of the snapshot of a remote instance
+
+    The checksums of the applied files are kept in the directory, so the
+    next run only downloads the files that changed in the meantime.
+
+    :param directory: directory for the downloads, default: a folder in the temp directory
+    :param restart: apply all files again
+    """
+    directory = directory or os.path.join(tempfile.gettempdir(), 'wger-snapshots')
+    os.makedirs(directory, exist_ok=True)
+    state_path = os.path.join(directory, 'state.json')
+
+    state = {}
+    if os.path.exists(state_path) and not restart:
+        with open(state_path) as f:
+            state = json.load(f)
+
+    print_fn('*** Synchronizing the snapshot...')
+    headers = wger_headers()
+    response = requests.get(make_uri(SNAPSHOT_ENDPOINT, server_url=remote_url), headers=headers)
+    response.raise_for_status()
+    manifest = response.json()
+    if manifest['version'] != SNAPSHOT_VERSION:
+        raise ValueError(f'Unsupported snapshot version {manifest["version"]}')
+
+    changed = set()
+    applied = 0
+    unchanged = 0
+    for chunk in manifest['chunks']:
+        key = f'{chunk["model"]}-{chunk["number"]}'
+        if state.get(key) == chunk['sha256']:
+            unchanged += 1
+            continue
+
+        path = os.path.join(directory, os.path.basename(chunk['file']))
+        download_file(chunk['url'], path, headers=headers)
+        checksum = file_checksum(path)
+        if checksum != chunk['sha256']:
+            os.unlink(path)
+            raise ValueError(
+                f'Checksum of {chunk["file"]} is {checksum}, expected {chunk["sha256"]}'
+            )
+
+        instances, skipped = apply_chunk(path, chunk['model'])
+        out = f'- {chunk["model"]} {chunk["number"]}: {len(instances)} objects'
+        print_fn(out + (f', {skipped} without local related objects skipped' if skipped else ''))
+
+        # Ingredient.save() would do this for every object
+        if chunk['model'] == 'nutrition.ingredient':
+            cache.delete_many([cache_mapper.get_ingredient_key(i.pk) for i in instances])
+
+        for file_path in (path, f'{path}.etag'):
+            if os.path.exists(file_path):
+                os.unlink(file_path)
+
+        applied += 1
+        changed.add(chunk['model'])
+        state[key] = checksum
+        with open(f'{state_path}.tmp', 'w') as f:
+            json.dump(state, f)
+        os.replace(f'{state_path}.tmp', state_path)
+
+    models = [apps.get_model(label) for label in SNAPSHOT_MODELS if label in changed]
+    if models:
+        reset_sequences(models)
+        connection.check_constraints(table_names=[model._meta.db_table for model in models])
+
+    print_fn(style_fn(f'done! {applied} files applied, {unchanged} unchanged\n'))
+
+    if any(label.startswith('exercises.') for label in changed):
+        # The objects are bulk created, so the signals that do this are not sent
+        reset_search_index()
+        reset_facet_index()
+        warmup_exercise_api_cache(print_fn, style_fn=style_fn)
@@ -0,0 +1,79 @@
+# This file is part of wger Workout Manager.
+#
+# wger Workout Manager is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# wger Workout Manager is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+
+# Standard Library
+import logging
+import random
+
+# Django
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import cache
+
+# Third Party
+from celery.schedules import crontab
+
+# wger
+from wger.celery_configuration import app
+from wger.core.snapshots import write_snapshot
+from wger.exercises.search import reset_search_index
+from wger.utils.thumbnails import (
+    THUMBNAIL_SCHEDULED_KEY,
+    generate_thumbnails,
+)
+
+
+logger = logging.getLogger(__name__)
+
+
+@app.task
+def generate_thumbnails_task(model_label: str, pk: int):
+    """
+    Generates the thumbnails of the image of a model instance
+
+    The task can be routed to a dedicated worker pool with celery's task
+    routes, e.g. CELERY_TASK_ROUTES = {'wger.core.tasks.generate_thumbnails_task':
+    {'queue': 'thumbnails'}}
+    """
+    instance = apps.get_model(model_label).objects.filter(pk=pk).first()
+    if instance and instance.image:
+        count = generate_thumbnails(instance.image)
+        logger.info(f'Generated {count} thumbnails for {model_label} {pk}')
+
+        # The search index contains the original image until the thumbnail exists
+        if count and model_label == 'exercises.ExerciseImage':
+            reset_search_index()
+
+    cache.delete(THUMBNAIL_SCHEDULED_KEY.format(model_label, pk))
+
+
+@app.task
+def write_snapshot_task():
+    """
+    Writes the snapshot of the exercises and ingredients for other instances
+    """
+    write_snapshot(logger.info)
+
+
+@app.on_after_finalize.connect
+def setup_periodic_tasks(sender, **kwargs):
+    if settings.WGER_SETTINGS['WRITE_SNAPSHOT_CELERY']:
+        sender.add_periodic_task(
+            crontab(
+                hour=random.randint(0, 23),
+                minute=random.randint(0, 59),
+            ),
+            write_snapshot_task.s(),
+            name='Write snapshot',
+        )
@@ -33,6 +33,7 @@ from wger.utils.constants import (
     PAGINATION_PAGES_AROUND_CURRENT,
 )
 from wger.utils.language import get_language_data
+from wger.utils.thumbnails import get_thumbnail_url
 
 
 register = template.Library()
@@ -50,6 +51,17 @@ def get_current_settings(exercise, set_id):
     return exercise.exercise_base.setting_set.filter(set_id=set_id)
 
 
+@register.filter
+def thumbnail_or_original(image, alias):
+    """
+    Returns the URL of the thumbnail of an image, or of the original image
+    while the thumbnail is generated in the background
+    """
+    if not image:
+        return ''
+    return get_thumbnail_url(image, alias) or ''
+
+
 @register.inclusion_tag('tags/render_day.html')
 def render_day(day: Day, editable=True):
     """
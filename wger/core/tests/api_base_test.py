@@ -12,6 +12,9 @@
 #
 # You should have received a copy of the GNU Affero General Public License
 
+# Standard Library
+import contextlib
+
 # Django
 from django.contrib.auth.models import User
 from django.core.cache.backends import locmem
@@ -56,6 +59,18 @@ class ApiBaseTestCase(APITestCase):
     A different user
     """
 
+    query_budget_detail = None
+    """
+    Maximum number of queries of a successful request to the detail view,
+    None to not check it
+    """
+
+    query_budget_overview = None
+    """
+    Maximum number of queries of a successful request to the overview,
+    None to not check it
+    """
+
     data = {}
     """
     Dictionary with the data used for testing
@@ -98,6 +113,14 @@ class ApiBaseTestCase(APITestCase):
         """
         return f'{self.url}{self.pk}/'
 
+    def get_query_budget(self, budget):
+        """
+        Returns a context manager that checks the query budget, if one is set
+        """
+        if budget is None:
+            return contextlib.nullcontext()
+        return self.assertQueryBudget(budget)
+
     def authenticate(self, username=None):
         """
         Authenticates a user
@@ -134,7 +157,8 @@ class ApiGetTestCase:
 
             # Logged in owner user
             self.authenticate()
-            response = self.client.get(self.url_detail)
+            with self.get_query_budget(self.query_budget_detail):
+                response = self.client.get(self.url_detail)
             self.assertEqual(response.status_code, status.HTTP_200_OK)
 
             # Different logged in user
@@ -143,7 +167,8 @@ class ApiGetTestCase:
             self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
 
         else:
-            response = self.client.get(self.url_detail)
+            with self.get_query_budget(self.query_budget_detail):
+                response = self.client.get(self.url_detail)
             self.assertEqual(response.status_code, status.HTTP_200_OK)
 
     def test_get_overview(self):
@@ -156,11 +181,13 @@ class ApiGetTestCase:
 
             # Logged in owner user
             self.authenticate()
-            response = self.client.get(self.url)
+            with self.get_query_budget(self.query_budget_overview):
+                response = self.client.get(self.url)
             self.assertEqual(response.status_code, status.HTTP_200_OK)
 
         else:
-            response = self.client.get(self.url)
+            with self.get_query_budget(self.query_budget_overview):
+                response = self.client.get(self.url)
             self.assertEqual(response.status_code, status.HTTP_200_OK)
 
     def test_get_overview_is_cached(self):
@@ -19,6 +19,7 @@ import os
 import pathlib
 import shutil
 import tempfile
+from contextlib import contextmanager
 
 # Django
 from django.conf import settings
@@ -32,6 +33,7 @@ from django.utils.translation import activate
 
 # wger
 from wger.utils.constants import TWOPLACES
+from wger.utils.instrumentation import QueryRecorder
 
 
 STATUS_CODES_FAIL = (302, 403, 404)
@@ -171,6 +173,68 @@ class BaseTestCase:
         if self.media_root:
             shutil.rmtree(self.media_root)
 
+    @contextmanager
+    def assertQueryBudget(self, budget):
+        """
+        Context manager that fails if the code in it executes more than the
+        given number of queries
+
+        The most repeated queries are listed in the failure message, since
+        these are usually the cause.
+        """
+        with QueryRecorder() as recorder:
+            yield recorder
+
+        if recorder.count > budget:
+            duplicates = ''.join(
+                f'\n  {count}x {sql}' for sql, count, duration in recorder.get_top_duplicates()
+            )
+            self.fail(
+                f'{recorder.count} queries executed, the budget is {budget}. '
+                f'Most repeated queries:{duplicates or " none"}'
+            )
+
+    def assertNoQueryGrowth(self, request_fn, grow_fn, tolerance=0, clear_cache=True):
+        """
+        Fails if the number of queries of a request grows with the amount of data
+
+        The request is run once to fill the caches that don't depend on the
+        data (content types, sites, etc.), then counted before and after calling
+        grow_fn, which should add more of the objects the request returns. A
+        growing count is the sign of an N+1 problem.
+
+        :param request_fn: function that performs the request
+        :param grow_fn: function that adds data
+        :param tolerance: number of additional queries that are allowed
+        :param clear_cache: clear the cache before counting. If False, the request
+                            is run again after adding the data and the count of
+                            the cached request is compared instead
+        """
+        request_fn()
+
+        if clear_cache:
+            cache.clear()
+        with QueryRecorder() as small:
+            request_fn()
+
+        grow_fn()
+
+        if clear_cache:
+            cache.clear()
+        else:
+            request_fn()
+        with QueryRecorder() as large:
+            request_fn()
+
+        if large.count > small.count + tolerance:
+            duplicates = ''.join(
+                f'\n  {count}x {sql}' for sql, count, duration in large.get_top_duplicates()
+            )
+            self.fail(
+                f'The number of queries grew from {small.count} to {large.count} '
+                f'with more data. Most repeated queries:{duplicates}'
+            )
+
     def init_media_root(self):
         """
         Init the media root and copy the used images to it
@@ -0,0 +1,89 @@
+# This file is part of wger Workout Manager.
+#
+# wger Workout Manager is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# wger Workout Manager is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+
+# Standard Library
+import json
+import os
+import tempfile
+from io import StringIO
+
+# Django
+from django.contrib.auth.models import User
+from django.core.management import call_command
+
+# wger
+from wger.core.benchmark import (
+    BENCHMARK_USERNAME_PREFIX,
+    compare_results,
+)
+from wger.core.tests.base_testcase import WgerTestCase
+
+
+class BenchmarkTestCase(WgerTestCase):
+    """
+    Tests the benchmark command
+    """
+
+    def test_benchmark_command(self):
+        """
+        Test that the results are written as JSON and the data is deleted
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'results.json')
+            call_command(
+                'benchmark',
+                iterations=2,
+                scenarios=['dashboard', 'workout-ical', 'nutrition-values'],
+                output=path,
+                stderr=StringIO(),
+            )
+            with open(path) as results_file:
+                report = json.load(results_file)
+
+        self.assertEqual(
+            set(report['results']), {'dashboard', 'workout-ical', 'nutrition-values'}
+        )
+        self.assertEqual(report['meta']['scale'], 1)
+        self.assertGreater(report['meta']['objects']['workout_logs'], 0)
+        for result in report['results'].values():
+            self.assertEqual(result['status'], [200])
+            self.assertGreater(result['queries_first'], 0)
+            self.assertGreaterEqual(result['p95_ms'], result['min_ms'])
+
+        self.assertFalse(User.objects.filter(username__startswith=BENCHMARK_USERNAME_PREFIX))
+
+    def test_compare_results(self):
+        """
+        Test comparing two runs
+        """
+        baseline = {'results': {'a': {'median_ms': 10, 'queries': 5}}}
+        current = {
+            'results': {
+                'a': {
+                    'median_ms': 15,
+                    'queries': 3
+                },
+                'b': {
+                    'median_ms': 1,
+                    'queries': 1
+                },
+            }
+        }
+        self.assertEqual(
+            compare_results(baseline, current),
+            {'a': {
+                'median_change': 0.5,
+                'queries_change': -2
+            }},
+        )
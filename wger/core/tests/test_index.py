@@ -12,13 +12,41 @@
 #
 # You should have received a copy of the GNU Affero General Public License
 
+# Standard Library
+import datetime
+
 # Django
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
+from django.utils import translation
+
+# Third Party
+from rest_framework import status
 
 # wger
-from wger.core.tests.base_testcase import WgerTestCase
-from wger.manager.models import Workout
-from wger.nutrition.models import NutritionPlan
+from wger.core.dashboard import (
+    build_dashboard_summary,
+    get_dashboard_summary,
+)
+from wger.core.tests.api_base_test import ApiBaseTestCase
+from wger.core.tests.base_testcase import (
+    BaseTestCase,
+    WgerTestCase,
+)
+from wger.manager.models import (
+    Day,
+    Workout,
+)
+from wger.nutrition.models import (
+    Ingredient,
+    Meal,
+    MealItem,
+    NutritionPlan,
+)
+from wger.utils.cache import cache_mapper
 from wger.weight.models import WeightEntry
 
 
@@ -106,3 +134,155 @@ class DashboardTestCase(WgerTestCase):
         self.assertEqual(response.status_code, 200)
         self.assertContains(response, 'css/workout-manager.css', html=False)
         self.assertContains(response, 'yarn/bootstrap-compiled.css', html=False)
+
+
+class DashboardSummaryTestCase(WgerTestCase):
+    """
+    Tests the dashboard summary service
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.user = User.objects.get(username='admin')
+        self.key = cache_mapper.get_dashboard_key(self.user.pk, datetime.date.today())
+
+    def count_queries(self):
+        with CaptureQueriesContext(connection) as context:
+            build_dashboard_summary(self.user)
+        return len(context)
+
+    def test_summary(self):
+        """
+        Test the content of the summary
+        """
+        for day in range(1, 8):
+            WeightEntry.objects.create(
+                user=self.user,
+                weight=80 + day,
+                date=datetime.date(2020, 1, day),
+            )
+        summary = build_dashboard_summary(self.user)
+
+        self.assertTrue(summary['workout'])
+        self.assertTrue(summary['plan'])
+        self.assertEqual(len(summary['weekdays']), 7)
+        self.assertEqual(len(summary['weight_entries']), 5)
+        self.assertEqual(summary['weight_entries'][0]['date'], datetime.date(2020, 1, 7))
+        self.assertEqual(summary['weight_entries'][0]['weight_diff'], 1)
+        self.assertEqual(summary['weight_entries'][0]['day_diff'], 1)
+
+    def test_fixed_number_of_queries(self):
+        """
+        Test that the number of queries does not depend on the amount of data
+        """
+        cache.clear()
+        queries = self.count_queries()
+
+        plan = NutritionPlan.objects.filter(user=self.user).latest('creation_date')
+        meal = Meal.objects.create(plan=plan, order=10)
+        for i in range(5):
+            MealItem.objects.create(meal=meal, ingredient_id=1, amount=10 + i, order=i)
+        workout = Workout.objects.filter(user=self.user).latest('creation_date')
+        for i in range(3):
+            Day.objects.create(training=workout, description=f'Day {i}').day.add(i + 1)
+
+        cache.clear()
+        self.assertEqual(self.count_queries(), queries)
+
+    def test_cache(self):
+        """
+        Test that the summary is cached
+        """
+        self.assertFalse(cache.get(self.key))
+        summary = get_dashboard_summary(self.user)
+        self.assertEqual(cache.get(self.key), summary)
+
+        with self.assertNumQueries(0):
+            get_dashboard_summary(self.user)
+
+    def test_cache_reset(self):
+        """
+        Test that changes to the underlying objects reset the cache
+        """
+        get_dashboard_summary(self.user)
+        WeightEntry.objects.create(user=self.user, weight=80, date=datetime.date(2020, 1, 1))
+        self.assertFalse(cache.get(self.key))
+
+        get_dashboard_summary(self.user)
+        plan = NutritionPlan.objects.filter(user=self.user).first()
+        plan.description = 'New description'
+        plan.save()
+        self.assertFalse(cache.get(self.key))
+
+        get_dashboard_summary(self.user)
+        Day.objects.filter(training__user=self.user).first().day.add(7)
+        self.assertFalse(cache.get(self.key))
+
+        get_dashboard_summary(self.user)
+        MealItem.objects.filter(meal__plan__user=self.user).first().delete()
+        self.assertFalse(cache.get(self.key))
+
+    def test_cache_reset_profile_and_ingredients(self):
+        """
+        Test that changes to the units and to the ingredients reset the cache
+        """
+        get_dashboard_summary(self.user)
+        self.user.userprofile.weight_unit = 'lb'
+        self.user.userprofile.save()
+        self.assertFalse(cache.get(self.key))
+
+        get_dashboard_summary(self.user)
+        item = MealItem.objects.filter(meal__plan__user=self.user).first()
+        item.ingredient.name = 'New name'
+        item.ingredient.save()
+        self.assertFalse(cache.get(self.key))
+
+        # Ingredients that are not used by the user keep the cache
+        get_dashboard_summary(self.user)
+        Ingredient.objects.exclude(mealitem__meal__plan__user=self.user).first().save()
+        self.assertTrue(cache.get(self.key))
+
+    def test_unnamed_workout(self):
+        """
+        Test that the name of unnamed workouts is translated when rendering
+        """
+        workout = Workout.objects.create(user=self.user, name='')
+        summary = get_dashboard_summary(self.user)
+        self.assertEqual(summary['workout']['id'], workout.id)
+        self.assertEqual(summary['workout']['name'], '')
+
+        self.user_login('admin')
+        name = f'({workout.creation_date})'
+        with translation.override('de'):
+            response = self.client.get(reverse('core:dashboard'))
+        self.assertEqual(response.context['current_workout']['name'], f'Trainingsplan {name}')
+        response = self.client.get(reverse('core:dashboard'))
+        self.assertEqual(response.context['current_workout']['name'], f'Workout {name}')
+
+
+class DashboardApiTestCase(BaseTestCase, ApiBaseTestCase):
+    """
+    Tests the dashboard API endpoint
+    """
+    url = '/api/v2/dashboard/'
+
+    def test_anonymous(self):
+        """
+        Test that anonymous users can't access the endpoint
+        """
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_get(self):
+        """
+        Test that the summary of the current user is returned
+        """
+        self.authenticate('admin')
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            set(response.data.keys()),
+            {'workout', 'schedule', 'weekdays', 'plan', 'weight_entries'},
+        )
+        self.assertEqual(len(response.data['weekdays']), 7)
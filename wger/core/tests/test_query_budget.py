@@ -0,0 +1,59 @@
+# This file is part of wger Workout Manager.
+#
+# wger Workout Manager is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# wger Workout Manager is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+
+# Django
+from django.contrib.auth.models import User
+
+# wger
+from wger.core.models import Language
+from wger.core.tests.base_testcase import WgerTestCase
+
+
+class QueryBudgetTestCase(WgerTestCase):
+    """
+    Tests the query budget assertions
+    """
+
+    def test_budget(self):
+        """
+        Test that exceeding the budget fails and lists the repeated queries
+        """
+        with self.assertQueryBudget(1) as recorder:
+            list(Language.objects.all())
+        self.assertEqual(recorder.count, 1)
+
+        with self.assertRaisesRegex(AssertionError, r'3 queries executed, the budget is 2') as cm:
+            with self.assertQueryBudget(2):
+                for pk in (1, 2, 3):
+                    Language.objects.filter(pk=pk).first()
+        self.assertIn('3x SELECT', str(cm.exception))
+
+    def test_growth(self):
+        """
+        Test that a growing number of queries is detected
+        """
+
+        def add_user():
+            User.objects.create_user('budget-user')
+
+        def constant():
+            list(User.objects.all())
+
+        def per_user():
+            for user in User.objects.all():
+                user.userprofile
+
+        self.assertNoQueryGrowth(constant, add_user)
+        with self.assertRaisesRegex(AssertionError, 'The number of queries grew'):
+            self.assertNoQueryGrowth(per_user, lambda: User.objects.create_user('budget-user2'))
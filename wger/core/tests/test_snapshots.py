@@ -0,0 +1,248 @@
+# This file is part of wger Workout Manager.
+#
+# wger Workout Manager is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# wger Workout Manager is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+
+
+# Standard Library
+import json
+import os
+import shutil
+import tempfile
+import uuid
+from unittest.mock import patch
+
+# Django
+from django.core.cache import cache
+from django.urls import reverse
+
+# wger
+from wger.core.snapshots import (
+    read_manifest,
+    sync_snapshot,
+    write_snapshot,
+)
+from wger.core.tests.base_testcase import WgerTestCase
+from wger.exercises.models import (
+    Exercise,
+    ExerciseBase,
+    Muscle,
+)
+from wger.nutrition.models import Ingredient
+from wger.utils.cache import cache_mapper
+
+
+class SnapshotTestCase(WgerTestCase):
+    """
+    Tests writing the snapshot and synchronizing it to another instance
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.media_root = tempfile.mkdtemp()
+        media_root = self.settings(MEDIA_ROOT=self.media_root)
+        media_root.enable()
+        self.addCleanup(media_root.disable)
+
+        self.directory = os.path.join(self.media_root, 'snapshots')
+        self.sync_directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.sync_directory)
+        self.downloads = []
+
+    def write(self):
+        return write_snapshot(lambda x: None, directory=self.directory, chunk_size=10)
+
+    def download_file(self, url, path, headers=None):
+        name = url.rpartition('/')[2]
+        self.downloads.append(name)
+        shutil.copy(os.path.join(self.directory, name), path)
+
+    def sync(self, **kwargs):
+        """
+        Synchronizes the snapshot served by the test client
+        """
+        manifest = self.client.get(reverse('snapshot')).json()
+        with patch('wger.core.snapshots.requests.get') as mock_get, \
+                patch('wger.core.snapshots.download_file', self.download_file):
+            mock_get.return_value.json.return_value = manifest
+            sync_snapshot(lambda x: None, directory=self.sync_directory, **kwargs)
+
+    def test_write(self):
+        """
+        Test that the files only change if their objects changed
+        """
+        manifest = self.write()
+        files = {chunk['file'] for chunk in manifest['chunks']}
+        self.assertEqual(set(os.listdir(self.directory)), files | {'manifest.json'})
+        self.assertEqual(read_manifest(self.directory), manifest)
+
+        models = {chunk['model'] for chunk in manifest['chunks']}
+        self.assertIn('exercises.exercisebase', models)
+        self.assertIn('nutrition.ingredient', models)
+        self.assertEqual(
+            sum(c['objects'] for c in manifest['chunks'] if c['model'] == 'nutrition.ingredient'),
+            Ingredient.objects.count(),
+        )
+
+        Ingredient.objects.filter(pk=1).update(name='Changed name')
+        manifest2 = self.write()
+        files2 = {chunk['file'] for chunk in manifest2['chunks']}
+        self.assertEqual(len(files - files2), 1)
+        self.assertEqual(len(files2 - files), 1)
+        self.assertEqual(set(os.listdir(self.directory)), files2 | {'manifest.json'})
+
+    def test_api(self):
+        """
+        Test the manifest endpoint
+        """
+        response = self.client.get(reverse('snapshot'))
+        self.assertEqual(response.status_code, 404)
+
+        self.write()
+        response = self.client.get(reverse('snapshot'))
+        self.assertEqual(response.status_code, 200)
+        chunk = response.json()['chunks'][0]
+        self.assertEqual(chunk['url'], f'http://testserver/media/snapshots/{chunk["file"]}')
+
+        response2 = self.client.get(reverse('snapshot'), HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response2.status_code, 304)
+
+        Ingredient.objects.filter(pk=1).update(name='Changed name')
+        self.write()
+        response3 = self.client.get(reverse('snapshot'), HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response3.status_code, 200)
+
+    def test_sync(self):
+        """
+        Test that only the changed files are applied
+        """
+        manifest = self.write()
+        name = Ingredient.objects.get(pk=1).name
+        muscles = set(ExerciseBase.objects.get(pk=1).muscles.values_list('pk', flat=True))
+        self.assertTrue(muscles)
+
+        # Simulate a remote instance with different data
+        Ingredient.objects.filter(pk=1).update(name='Old name')
+        ExerciseBase.objects.get(pk=1).muscles.clear()
+        Muscle.objects.filter(pk=1).update(name='Old muscle')
+        cache.set(cache_mapper.EXERCISE_SEARCH_VERSION_KEY, 'old', None)
+        cache.set(cache_mapper.EXERCISE_FACETS_VERSION_KEY, 'old', None)
+
+        self.sync()
+        self.assertEqual(len(self.downloads), len(manifest['chunks']))
+        self.assertNotEqual(cache.get(cache_mapper.EXERCISE_SEARCH_VERSION_KEY), 'old')
+        self.assertNotEqual(cache.get(cache_mapper.EXERCISE_FACETS_VERSION_KEY), 'old')
+        self.assertEqual(Ingredient.objects.get(pk=1).name, name)
+        self.assertEqual(
+            set(ExerciseBase.objects.get(pk=1).muscles.values_list('pk', flat=True)),
+            muscles,
+        )
+        self.assertNotEqual(Muscle.objects.get(pk=1).name, 'Old muscle')
+
+        # A second run only downloads the changed files
+        self.downloads = []
+        self.sync()
+        self.assertEqual(self.downloads, [])
+
+        Ingredient.objects.filter(pk=1).update(name='Remote name')
+        self.write()
+        Ingredient.objects.filter(pk=1).update(name='Local name')
+        cache.set(cache_mapper.EXERCISE_SEARCH_VERSION_KEY, 'old', None)
+        self.sync()
+        self.assertEqual(len(self.downloads), 1)
+        self.assertEqual(Ingredient.objects.get(pk=1).name, 'Remote name')
+
+        # Only ingredients were applied, the exercise indexes are kept
+        self.assertEqual(cache.get(cache_mapper.EXERCISE_SEARCH_VERSION_KEY), 'old')
+
+        with open(os.path.join(self.sync_directory, 'state.json')) as f:
+            self.assertEqual(len(json.load(f)), len(manifest['chunks']))
+
+    def test_sync_local_objects(self):
+        """
+        Test that objects created on the local instance are not overwritten
+        """
+        self.write()
+        ExerciseBase.objects.filter(pk=1).update(uuid=uuid.uuid4())
+        ExerciseBase.objects.get(pk=1).muscles.clear()
+
+        self.sync()
+        self.assertFalse(ExerciseBase.objects.get(pk=1).muscles.exists())
+
+    def test_sync_different_keys(self):
+        """
+        Test that the objects are matched by UUID if the primary keys differ
+        """
+        self.write()
+        base = ExerciseBase.objects.get(pk=1)
+        muscles = set(base.muscles.values_list('pk', flat=True))
+        translations = dict(base.exercises.values_list('uuid', 'name'))
+        ingredient = Ingredient.objects.get(pk=1)
+
+        # On this instance, the primary keys belong to other objects
+        ExerciseBase.objects.filter(pk=1).update(uuid=uuid.uuid4())
+        for pk in base.exercises.values_list('pk', flat=True):
+            Exercise.objects.filter(pk=pk).update(uuid=uuid.uuid4(), name='Local name')
+        Ingredient.objects.filter(pk=1).update(uuid=uuid.uuid4(), name='Local name')
+        base_count = ExerciseBase.objects.count()
+        translation_count = Exercise.objects.count()
+
+        self.sync()
+        remote_base = ExerciseBase.objects.get(uuid=base.uuid)
+        self.assertNotEqual(remote_base.pk, 1)
+        self.assertEqual(set(remote_base.muscles.values_list('pk', flat=True)), muscles)
+        self.assertEqual(dict(remote_base.exercises.values_list('uuid', 'name')), translations)
+        self.assertEqual(Ingredient.objects.get(uuid=ingredient.uuid).name, ingredient.name)
+
+        # The local objects are unchanged
+        self.assertEqual(
+            set(ExerciseBase.objects.get(pk=1).exercises.values_list('name', flat=True)),
+            {'Local name'},
+        )
+        self.assertEqual(Ingredient.objects.get(pk=1).name, 'Local name')
+
+        # Applying the files again updates the same objects
+        self.sync(restart=True)
+        self.assertEqual(ExerciseBase.objects.count(), base_count + 1)
+        self.assertEqual(Exercise.objects.count(), translation_count + len(translations))
+
+    def test_sync_missing_related_objects(self):
+        """
+        Test that translations of a base that does not exist locally are skipped
+        """
+        self.write()
+        self.sync()
+
+        base = ExerciseBase.objects.get(pk=2)
+        translations = list(base.exercises.values_list('uuid', flat=True))
+        Exercise.objects.filter(uuid=translations[0]).update(name='Remote name')
+        self.write()
+        base.delete()
+
+        self.sync()
+        self.assertFalse(ExerciseBase.objects.filter(pk=2).exists())
+        self.assertFalse(Exercise.objects.filter(uuid__in=translations).exists())
+
+    def test_sync_checksum(self):
+        """
+        Test that files with a wrong checksum are not applied
+        """
+        self.write()
+        for name in os.listdir(self.directory):
+            if name.startswith('nutrition.ingredient-'):
+                with open(os.path.join(self.directory, name), 'ab') as f:
+                    f.write(b'x')
+        Ingredient.objects.filter(pk=1).update(name='Local name')
+
+        with self.assertRaisesRegex(ValueError, 'Checksum of nutrition.ingredient-'):
+            self.sync()
+        self.assertEqual(Ingredient.objects.get(pk=1).name, 'Local name')
@@ -0,0 +1,68 @@
+# This file is part of wger Workout Manager.
+#
+# wger Workout Manager is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# wger Workout Manager is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+
+# Standard Library
+import importlib
+from io import StringIO
+
+# Django
+from django.core.management import (
+    CommandError,
+    call_command,
+)
+
+# wger
+from wger.core.tests.base_testcase import WgerTestCase
+
+
+parse_importtime = importlib.import_module(
+    'wger.core.management.commands.startup-benchmark'
+).parse_importtime
+
+
+class StartupBenchmarkTestCase(WgerTestCase):
+    """
+    Tests the startup import time benchmark
+    """
+
+    def test_parse_importtime(self):
+        """
+        Test parsing the output of python -X importtime
+        """
+        output = (
+            'import time: self [us] | cumulative | imported package\n'
+            'import time:       120 |        120 |     _io\n'
+            'import time:      1500 |       1620 |   django.utils\n'
+            'import time:       300 |       1920 | django\n'
+            'some other output\n'
+        )
+        self.assertEqual(
+            parse_importtime(output),
+            [
+                ('_io', 2, 120, 120),
+                ('django.utils', 1, 1500, 1620),
+                ('django', 0, 300, 1920),
+            ],
+        )
+
+    def test_lazy_modules_and_budget(self):
+        """
+        Test that the lazily loaded packages are not imported on startup and
+        that exceeding the budget fails
+        """
+        out = StringIO()
+        with self.assertRaisesMessage(CommandError, 'exceeds the budget of 0 ms'):
+            call_command('startup-benchmark', tags=['urls'], budget=0, stdout=out)
+
+        self.assertIn('Slowest top level imports:', out.getvalue())
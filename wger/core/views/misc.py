@@ -23,7 +23,6 @@ from django.contrib import messages
 from django.contrib.auth import login as django_login
 from django.contrib.auth.decorators import login_required
 from django.core import mail
-from django.core.exceptions import ObjectDoesNotExist
 from django.http import HttpResponseRedirect
 from django.shortcuts import render
 from django.template.loader import render_to_string
@@ -41,6 +40,7 @@ from crispy_forms.helper import FormHelper
 from crispy_forms.layout import Submit
 
 # wger
+from wger.core.dashboard import get_dashboard_summary
 from wger.core.demo import (
     create_demo_entries,
     create_temporary_user,
@@ -49,11 +49,6 @@ from wger.core.forms import (
     FeedbackAnonymousForm,
     FeedbackRegisteredForm,
 )
-from wger.core.models import DaysOfWeek
-from wger.manager.models import Schedule
-from wger.nutrition.models import NutritionPlan
-from wger.weight.helpers import get_last_entries
-from wger.weight.models import WeightEntry
 
 
 logger = logging.getLogger(__name__)
@@ -112,53 +107,29 @@ def dashboard(request):
     Show the index page, in our case, the last workout and nutritional plan
     and the current weight
     """
-
-    context = {}
-
-    # Load the last workout, either from a schedule or a 'regular' one
-    (current_workout, schedule) = Schedule.objects.get_current_workout(request.user)
-
-    context['current_workout'] = current_workout
-    context['schedule'] = schedule
-
-    # Load the last nutritional plan, if one exists
-    try:
-        plan = NutritionPlan.objects.filter(user=request.user).latest('creation_date')
-    except ObjectDoesNotExist:
-        plan = False
-    context['plan'] = plan
-
-    # Load the last logged weight entry, if one exists
-    try:
-        weight = WeightEntry.objects.filter(user=request.user).latest('date')
-    except ObjectDoesNotExist:
-        weight = False
-    context['weight'] = weight
-    context['last_weight_entries'] = get_last_entries(request.user)
-
-    # Format a bit the days, so it doesn't have to be done in the template
-    used_days = {}
-    if current_workout:
-        for day in current_workout.day_set.select_related():
-            for day_of_week in day.day.select_related():
-                used_days[day_of_week.id] = day.description
-
-    week_day_result = []
-    for week in DaysOfWeek.objects.all():
-        day_has_workout = False
-
-        if week.id in used_days:
-            day_has_workout = True
-            week_day_result.append((_(week.day_of_week), used_days[week.id], True))
-
-        if not day_has_workout:
-            week_day_result.append((_(week.day_of_week), _('Rest day'), False))
-
-    context['weekdays'] = week_day_result
-
-    if plan:
-        # Load the nutritional info
-        context['nutritional_info'] = plan.get_nutritional_values()
+    summary = get_dashboard_summary(request.user)
+
+    # Like the names of the days below, the name of unnamed workouts is
+    # translated here, since the summary is cached for all languages
+    workout = summary['workout']
+    if workout and not workout['name']:
+        workout = {**workout, 'name': '{0} ({1})'.format(_('Workout'), workout['creation_date'])}
+
+    context = {
+        'current_workout': workout,
+        'schedule': summary['schedule'],
+        'plan': summary['plan'],
+        'weight': summary['weight_entries'][0] if summary['weight_entries'] else None,
+        'last_weight_entries': summary['weight_entries'],
+    }
+
+    # The names of the days are translated here as well
+    context['weekdays'] = []
+    for day in summary['weekdays']:
+        if day['description'] is not None:
+            context['weekdays'].append((_(day['day_of_week']), day['description'], True))
+        else:
+            context['weekdays'].append((_(day['day_of_week']), _('Rest day'), False))
 
     return render(request, 'index.html', context)
 
@@ -15,7 +15,10 @@
 # Django
 from django.conf import settings
 from django.core.cache import cache
-from django.db.models import Q
+from django.db.models import (
+    Prefetch,
+    Q,
+)
 
 # Third Party
 from rest_framework import serializers
@@ -383,6 +386,57 @@ class ExerciseInfoSerializer(serializers.ModelSerializer):
         ]
 
 
+def exercise_base_info_queryset(queryset=None):
+    """
+    Returns the queryset that loads everything needed by ExerciseBaseInfoSerializer
+    with a fixed number of queries
+    """
+    if queryset is None:
+        queryset = ExerciseBase.objects.all()
+
+    return queryset.select_related('category', 'license').prefetch_related(
+        'authors',
+        'muscles',
+        'muscles_secondary',
+        'equipment',
+        'exerciseimage_set',
+        'exercisevideo_set',
+        Prefetch(
+            'exercises',
+            queryset=Exercise.objects.prefetch_related('alias_set', 'exercisecomment_set'),
+        ),
+    )
+
+
+class ExerciseBaseInfoListSerializer(serializers.ListSerializer):
+    """
+    List serializer for the exercise base info
+
+    Reads all cached entries of the list at once and only loads and serializes
+    the missing ones, which are then cached as well.
+    """
+
+    def to_representation(self, data):
+        bases = list(data.all() if hasattr(data, 'all') else data)
+        keys = {base.pk: CacheKeyMapper.get_exercise_api_key(base.uuid) for base in bases}
+        cached = cache.get_many(keys.values())
+
+        missing = [pk for pk, key in keys.items() if key not in cached]
+        if missing:
+            instances = list(exercise_base_info_queryset().filter(pk__in=missing))
+            for base in instances:
+                base.prefetch_authors()
+
+            new = {
+                keys[base.pk]: self.child.to_uncached_representation(base)
+                for base in instances
+            }
+            cache.set_many(new, settings.WGER_SETTINGS['EXERCISE_CACHE_TTL'])
+            cached.update(new)
+
+        return [cached[keys[base.pk]] for base in bases]
+
+
 class ExerciseBaseInfoSerializer(serializers.ModelSerializer):
     """
     Exercise base info serializer
@@ -402,6 +456,7 @@ class ExerciseBaseInfoSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = ExerciseBase
+        list_serializer_class = ExerciseBaseInfoListSerializer
         depth = 1
         fields = [
             "id",
@@ -434,6 +489,12 @@ class ExerciseBaseInfoSerializer(serializers.ModelSerializer):
         if representation:
             return representation
 
-        representation = super().to_representation(instance)
+        representation = self.to_uncached_representation(instance)
         cache.set(key, representation, settings.WGER_SETTINGS['EXERCISE_CACHE_TTL'])
         return representation
+
+    def to_uncached_representation(self, instance):
+        """
+        Serializes the instance without going through the cache
+        """
+        return super().to_representation(instance)
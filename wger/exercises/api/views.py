@@ -20,7 +20,6 @@ import logging
 
 # Django
 from django.conf import settings
-from django.db.models import Q
 from django.utils.decorators import method_decorator
 from django.utils.translation import gettext as _
 from django.views.decorators.cache import cache_page
@@ -36,8 +35,6 @@ from drf_spectacular.utils import (
     inline_serializer,
 )
 from easy_thumbnails.alias import aliases
-from easy_thumbnails.exceptions import InvalidImageFormatError
-from easy_thumbnails.files import get_thumbnailer
 from rest_framework import viewsets
 from rest_framework.decorators import (
     action,
@@ -45,7 +42,9 @@ from rest_framework.decorators import (
 )
 from rest_framework.fields import (
     CharField,
+    DictField,
     IntegerField,
+    ListField,
 )
 from rest_framework.response import Response
 from rest_framework.viewsets import ModelViewSet
@@ -68,6 +67,11 @@ from wger.exercises.api.serializers import (
     ExerciseVideoSerializer,
     MuscleSerializer,
 )
+from wger.exercises.facets import (
+    FACETS,
+    filter_bases,
+    get_facet_index,
+)
 from wger.exercises.models import (
     Alias,
     DeletionLog,
@@ -81,6 +85,7 @@ from wger.exercises.models import (
     Muscle,
     Variation,
 )
+from wger.exercises.search import get_search_index
 from wger.exercises.views.helper import StreamVerbs
 from wger.utils.constants import (
     ENGLISH_SHORT_NAME,
@@ -89,6 +94,8 @@ from wger.utils.constants import (
     HTML_TAG_WHITELIST,
 )
 from wger.utils.language import load_language
+from wger.utils.thumbnails import get_thumbnail_url
+from wger.utils.viewsets import ConditionalGetMixin
 
 
 logger = logging.getLogger(__name__)
@@ -201,7 +208,26 @@ class ExerciseTranslationViewSet(ModelViewSet):
         )
 
 
-class ExerciseViewSet(viewsets.ReadOnlyModelViewSet):
+def parse_facet_filters(query_params):
+    """
+    Reads the comma separated facet IDs from the query parameters
+
+    Invalid values are logged and ignored.
+    """
+    filters = {}
+    for facet in FACETS:
+        value = query_params.get(facet)
+        if not value:
+            continue
+
+        try:
+            filters[facet] = [int(v) for v in value.split(',')]
+        except ValueError:
+            logger.info(f"Got '{value}' as {facet} IDs")
+    return filters
+
+
+class ExerciseViewSet(ConditionalGetMixin, viewsets.ReadOnlyModelViewSet):
     """
     API endpoint for exercise objects, use /api/v2/exercisebaseinfo/ instead.
 
@@ -220,10 +246,6 @@ class ExerciseViewSet(viewsets.ReadOnlyModelViewSet):
         'name',
     )
 
-    @method_decorator(cache_page(settings.WGER_SETTINGS['EXERCISE_CACHE_TTL']))
-    def dispatch(self, request, *args, **kwargs):
-        return super().dispatch(request, *args, **kwargs)
-
     @extend_schema(deprecated=True)
     def list(self, request, *args, **kwargs):
         return super().list(request, *args, **kwargs)
@@ -237,42 +259,9 @@ class ExerciseViewSet(viewsets.ReadOnlyModelViewSet):
 
         qs = Exercise.objects.all()
 
-        category = self.request.query_params.get('category')
-        muscles = self.request.query_params.get('muscles')
-        muscles_secondary = self.request.query_params.get('muscles_secondary')
-        equipment = self.request.query_params.get('equipment')
-        license = self.request.query_params.get('license')
-
-        if category:
-            try:
-                qs = qs.filter(exercise_base__category_id=int(category))
-            except ValueError:
-                logger.info(f"Got {category} as category ID")
-
-        if muscles:
-            try:
-                qs = qs.filter(exercise_base__muscles__in=[int(m) for m in muscles.split(',')])
-            except ValueError:
-                logger.info(f"Got {muscles} as muscle IDs")
-
-        if muscles_secondary:
-            try:
-                muscle_ids = [int(m) for m in muscles_secondary.split(',')]
-                qs = qs.filter(exercise_base__muscles_secondary__in=muscle_ids)
-            except ValueError:
-                logger.info(f"Got '{muscles_secondary}' as secondary muscle IDs")
-
-        if equipment:
-            try:
-                qs = qs.filter(exercise_base__equipment__in=[int(e) for e in equipment.split(',')])
-            except ValueError:
-                logger.info(f"Got {equipment} as equipment IDs")
-
-        if license:
-            try:
-                qs = qs.filter(exercise_base__license_id=int(license))
-            except ValueError:
-                logger.info(f"Got {license} as license ID")
+        filters = parse_facet_filters(self.request.query_params)
+        if filters:
+            qs = qs.filter(exercise_base_id__in=filter_bases(filters))
 
         return qs
 
@@ -324,7 +313,9 @@ def search(request):
     """
     Searches for exercises.
 
-    This format is currently used by the exercise search autocompleter
+    This format is currently used by the exercise search autocompleter. The
+    results come from the in-memory search index and are ranked by how well
+    the name or one of the aliases matches.
     """
     q = request.GET.get('term', None)
     language_codes = request.GET.get('language', ENGLISH_SHORT_NAME)
@@ -335,41 +326,68 @@ def search(request):
         return Response(response)
 
     languages = [load_language(l) for l in language_codes.split(',')]
-    translations = Exercise.objects \
-        .filter(Q(name__icontains=q) | Q(alias__alias__icontains=q)) \
-        .filter(language__in=languages) \
-        .order_by('exercise_base__category__name', 'name') \
-        .distinct()
-
-    for translation in translations:
-        image = None
-        thumbnail = None
-        if translation.main_image:
-            image_obj = translation.main_image
-            image = image_obj.image.url
-            t = get_thumbnailer(image_obj.image)
-            thumbnail = None
-            try:
-                thumbnail = t.get_thumbnail(aliases.get('micro_cropped')).url
-            except InvalidImageFormatError:
-                pass
-
-        result_json = {
-            'value': translation.name,
-            'data': {
-                'id': translation.id,
-                'base_id': translation.exercise_base_id,
-                'name': translation.name,
-                'category': _(translation.category.name),
-                'image': image,
-                'image_thumbnail': thumbnail
+    for entry in get_search_index().search(q, [language.id for language in languages]):
+        results.append(
+            {
+                'value': entry['name'],
+                'data': {
+                    'id': entry['id'],
+                    'base_id': entry['base_id'],
+                    'name': entry['name'],
+                    'category': _(entry['category']),
+                    'image': entry['image'],
+                    'image_thumbnail': entry['image_thumbnail']
+                }
             }
-        }
-        results.append(result_json)
+        )
     response['suggestions'] = results
     return Response(response)
 
 
+@extend_schema(
+    parameters=[
+        OpenApiParameter(
+            facet,
+            OpenApiTypes.STR,
+            OpenApiParameter.QUERY,
+            description=f'Comma separated list of {facet} IDs',
+        ) for facet in FACETS
+    ],
+    # yapf: disable
+    responses={
+        200:
+        inline_serializer(
+            name='ExerciseFacetsResponse',
+            fields={
+                'count': IntegerField(),
+                'base_ids': ListField(child=IntegerField()),
+                'facets': DictField(child=DictField(child=IntegerField())),
+            }
+        )
+    }
+    # yapf: enable
+)
+@api_view(['GET'])
+def facets(request):
+    """
+    Filters the exercise bases by category, muscles, equipment, language and
+    license and returns the number of matches for every facet value.
+
+    Several IDs of the same facet match any of them, different facets must
+    all match.
+    """
+    index = get_facet_index()
+    filters = parse_facet_filters(request.GET)
+
+    return Response(
+        {
+            'count': index.count(filters),
+            'base_ids': index.filter(filters),
+            'facets': index.facet_counts(filters),
+        }
+    )
+
+
 class ExerciseInfoViewset(viewsets.ReadOnlyModelViewSet):
     """
     API endpoint for exercise objects, use /api/v2/exercisebaseinfo/ instead.
@@ -400,7 +418,7 @@ class ExerciseInfoViewset(viewsets.ReadOnlyModelViewSet):
         return super().retrieve(request, *args, **kwargs)
 
 
-class ExerciseBaseInfoViewset(viewsets.ReadOnlyModelViewSet):
+class ExerciseBaseInfoViewset(ConditionalGetMixin, viewsets.ReadOnlyModelViewSet):
     """
     Read-only info API endpoint for exercise objects, grouped by the exercise
     base. Returns nested data structures for more easy and faster parsing and
@@ -421,8 +439,28 @@ class ExerciseBaseInfoViewset(viewsets.ReadOnlyModelViewSet):
         'license_author',
     )
 
+    def get_validators(self, queryset):
+        """
+        The data of a base includes its translations, images and videos, so
+        their count and last modification are taken into account as well
+        """
+        values, last_modified = super().get_validators(queryset)
+
+        base_ids = queryset.order_by().values('pk')
+        for model in (Exercise, ExerciseImage, ExerciseVideo):
+            related_values, related_last_modified = super().get_validators(
+                model.objects.filter(exercise_base__in=base_ids)
+            )
+            values.extend(related_values)
+            last_modified = max(
+                filter(None, (last_modified, related_last_modified)),
+                default=None,
+            )
+
+        return values, last_modified
+
 
-class EquipmentViewSet(viewsets.ReadOnlyModelViewSet):
+class EquipmentViewSet(ConditionalGetMixin, viewsets.ReadOnlyModelViewSet):
     """
     API endpoint for equipment objects
     """
@@ -430,10 +468,7 @@ class EquipmentViewSet(viewsets.ReadOnlyModelViewSet):
     serializer_class = EquipmentSerializer
     ordering_fields = '__all__'
     filterset_fields = ('name', )
-
-    @method_decorator(cache_page(settings.WGER_SETTINGS['EXERCISE_CACHE_TTL']))
-    def dispatch(self, request, *args, **kwargs):
-        return super().dispatch(request, *args, **kwargs)
+    last_modified_field = None
 
 
 class DeletionLogViewSet(viewsets.ReadOnlyModelViewSet):
@@ -464,7 +499,7 @@ class ExerciseCategoryViewSet(viewsets.ReadOnlyModelViewSet):
         return super().dispatch(request, *args, **kwargs)
 
 
-class ExerciseImageViewSet(ModelViewSet):
+class ExerciseImageViewSet(ConditionalGetMixin, ModelViewSet):
     """
     API endpoint for exercise image objects
     """
@@ -480,10 +515,6 @@ class ExerciseImageViewSet(ModelViewSet):
         'license_author',
     )
 
-    @method_decorator(cache_page(settings.WGER_SETTINGS['EXERCISE_CACHE_TTL']))
-    def dispatch(self, request, *args, **kwargs):
-        return super().dispatch(request, *args, **kwargs)
-
     @action(detail=True)
     def thumbnails(self, request, pk):
         """
@@ -496,9 +527,8 @@ class ExerciseImageViewSet(ModelViewSet):
 
         thumbnails = {}
         for alias in aliases.all():
-            t = get_thumbnailer(image.image)
             thumbnails[alias] = {
-                'url': t.get_thumbnail(aliases.get(alias)).url,
+                'url': get_thumbnail_url(image.image, alias),
                 'settings': aliases.get(alias)
             }
         thumbnails['original'] = image.image.url
@@ -648,7 +678,7 @@ class ExerciseVariationViewSet(ModelViewSet):
     permission_classes = (CanContributeExercises, )
 
 
-class MuscleViewSet(viewsets.ReadOnlyModelViewSet):
+class MuscleViewSet(ConditionalGetMixin, viewsets.ReadOnlyModelViewSet):
     """
     API endpoint for muscle objects
     """
@@ -656,7 +686,4 @@ class MuscleViewSet(viewsets.ReadOnlyModelViewSet):
     serializer_class = MuscleSerializer
     ordering_fields = '__all__'
     filterset_fields = ('name', 'is_front', 'name_en')
-
-    @method_decorator(cache_page(settings.WGER_SETTINGS['EXERCISE_CACHE_TTL']))
-    def dispatch(self, request, *args, **kwargs):
-        return super().dispatch(request, *args, **kwargs)
+    last_modified_field = None
@@ -0,0 +1,127 @@
+#  This file is part of wger Workout Manager <https://github.com/wger-project>.
+#
+#  wger Workout Manager is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Affero General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  wger Workout Manager is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Affero General Public License for more details.
+#
+#  You should have received a copy of the GNU Affero General Public License
+#  along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+# Standard Library
+import multiprocessing
+import time
+
+# Django
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections
+
+# wger
+from wger.exercises.api.serializers import (
+    ExerciseBaseInfoSerializer,
+    exercise_base_info_queryset,
+)
+from wger.exercises.models import ExerciseBase
+from wger.utils.cache import CacheKeyMapper
+
+
+WARMUP_BATCH_SIZE = 100
+"""
+Number of exercise bases loaded and serialized at once
+"""
+
+
+def warmup_batch(base_ids, force=False):
+    """
+    Caches the API representation of the given exercise bases
+
+    Entries whose cached last_update_global is still current are skipped,
+    unless force is set.
+
+    :return: tuple with the number of cached and skipped bases
+    """
+    serializer = ExerciseBaseInfoSerializer()
+    last_update_field = serializer.fields['last_update_global']
+
+    bases = list(exercise_base_info_queryset().filter(pk__in=base_ids))
+    keys = {base.pk: CacheKeyMapper.get_exercise_api_key(base.uuid) for base in bases}
+    cached = {} if force else cache.get_many(keys.values())
+
+    new = {}
+    for base in bases:
+        entry = cached.get(keys[base.pk])
+        last_update = last_update_field.to_representation(base.last_update_global)
+        if entry and entry.get('last_update_global') == last_update:
+            continue
+
+        base.prefetch_authors()
+        new[keys[base.pk]] = serializer.to_uncached_representation(base)
+
+    cache.set_many(new, settings.WGER_SETTINGS['EXERCISE_CACHE_TTL'])
+    return len(new), len(bases) - len(new)
+
+
+def _warmup_batch_process(args):
+    """
+    Entry point for the worker processes of warmup_exercise_api_cache
+    """
+    try:
+        return warmup_batch(*args)
+    finally:
+        connections.close_all()
+
+
+def warmup_exercise_api_cache(
+    print_fn,
+    force=False,
+    base_ids=None,
+    batch_size=WARMUP_BATCH_SIZE,
+    processes=1,
+    style_fn=lambda x: x,
+):
+    """
+    Warms the cache of the exercise base info API
+
+    The bases are processed in batches, each loaded with a fixed number of
+    queries. With more than one process, the batches are spread over a process
+    pool, which is only useful with a cache shared between processes, such
+    as redis.
+    """
+    print_fn('*** Warming the exercise API cache...')
+    start = time.monotonic()
+
+    if base_ids is None:
+        base_ids = ExerciseBase.objects.filter(exercises__isnull=False) \
+            .order_by('pk') \
+            .values_list('pk', flat=True) \
+            .distinct()
+    base_ids = list(base_ids)
+    batches = [(base_ids[i:i + batch_size], force) for i in range(0, len(base_ids), batch_size)]
+
+    if processes > 1 and len(batches) > 1:
+        # The forked processes must open their own database connections
+        connections.close_all()
+        with multiprocessing.Pool(processes) as pool:
+            results = pool.map(_warmup_batch_process, batches)
+    else:
+        results = [warmup_batch(*batch) for batch in batches]
+
+    cached = sum(r[0] for r in results)
+    skipped = sum(r[1] for r in results)
+    duration = time.monotonic() - start
+    rate = len(base_ids) / duration if duration else 0
+
+    print_fn(f'- cached: {cached}, up to date: {skipped}')
+    print_fn(
+        f'- {len(base_ids)} exercises in {len(batches)} batches, {duration:.2f}s '
+        f'({rate:.1f} exercises/s, {processes} process(es))'
+    )
+    print_fn(style_fn('done!\n'))
+
+    return cached, skipped
@@ -0,0 +1,230 @@
+# -*- coding: utf-8 -*-
+
+# This file is part of wger Workout Manager.
+#
+# wger Workout Manager is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# wger Workout Manager is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+
+# Standard Library
+import logging
+import threading
+import uuid
+from collections import defaultdict
+
+# Django
+from django.core.cache import cache
+
+# wger
+from wger.utils.cache import cache_mapper
+
+
+logger = logging.getLogger(__name__)
+
+FACETS = (
+    'category',
+    'muscles',
+    'muscles_secondary',
+    'equipment',
+    'language',
+    'license',
+)
+"""
+The facets the exercise bases can be filtered by
+"""
+
+
+def _count(bitset):
+    """
+    Returns the number of set bits of an integer
+    """
+    return bin(bitset).count('1')
+
+
+def _bits(bitset):
+    """
+    Returns the positions of the set bits of an integer
+    """
+    while bitset:
+        low = bitset & -bitset
+        yield low.bit_length() - 1
+        bitset ^= low
+
+
+class ExerciseFacetIndex:
+    """
+    In-memory index of the exercise bases by category, muscles, equipment,
+    language and license
+
+    Every base gets a position, in the order of the IDs, and the bases of each
+    facet value are kept as an integer bitset in which bit n is set when the
+    base at position n has that value. Filters are combined with bitwise
+    operations, so that no database query is needed. Several values of the
+    same facet are or-ed, different facets are and-ed.
+    """
+
+    def __init__(self, version=None):
+        self.version = version
+        self.all = 0
+        self.ids = []
+        self.values = {facet: defaultdict(int) for facet in FACETS}
+
+    @classmethod
+    def build(cls, version=None):
+        """
+        Builds the index from the database, with one query per facet
+        """
+        # wger
+        from wger.exercises.models import (
+            Exercise,
+            ExerciseBase,
+        )
+
+        index = cls(version)
+        bits = {}
+        for base_id, category_id, license_id in ExerciseBase.objects.order_by('id').values_list(
+            'id',
+            'category_id',
+            'license_id',
+        ):
+            bits[base_id] = 1 << len(index.ids)
+            index.ids.append(base_id)
+            index.all |= bits[base_id]
+            index.values['category'][category_id] |= bits[base_id]
+            index.values['license'][license_id] |= bits[base_id]
+
+        for facet in ('muscles', 'muscles_secondary', 'equipment'):
+            field = ExerciseBase._meta.get_field(facet)
+            for base_id, value in field.remote_field.through.objects.values_list(
+                field.m2m_field_name(),
+                field.m2m_reverse_field_name(),
+            ):
+                index.values[facet][value] |= bits.get(base_id, 0)
+
+        for base_id, language_id in Exercise.objects.values_list('exercise_base_id', 'language_id'):
+            index.values['language'][language_id] |= bits.get(base_id, 0)
+
+        return index
+
+    def match(self, filters, exclude=None):
+        """
+        Returns the bitset of the bases matching the filters
+
+        :param filters: dictionary with the facet as key and a list of value
+                        IDs as value
+        :param exclude: optional facet that is ignored
+        """
+        result = self.all
+        for facet, values in filters.items():
+            if facet == exclude or not values:
+                continue
+
+            bitset = 0
+            for value in values:
+                bitset |= self.values[facet].get(value, 0)
+            result &= bitset
+        return result
+
+    def filter(self, filters):
+        """
+        Returns the sorted list of IDs of the bases matching the filters
+        """
+        return [self.ids[position] for position in _bits(self.match(filters))]
+
+    def count(self, filters):
+        """
+        Returns the number of bases matching the filters
+        """
+        return _count(self.match(filters))
+
+    def facet_counts(self, filters):
+        """
+        Returns the number of matching bases for every value of every facet
+
+        The counts of a facet apply the filters of all the other facets, so that
+        they show how many results selecting an additional value would bring.
+        """
+        counts = {}
+        for facet in FACETS:
+            other = self.match(filters, exclude=facet)
+            counts[facet] = {
+                value: _count(bitset & other)
+                for value, bitset in sorted(self.values[facet].items(), key=lambda v: v[0] or 0)
+                if value is not None
+            }
+        return counts
+
+
+def filter_bases(filters):
+    """
+    Returns a queryset of the bases matching the filters, with the same rules
+    as the index
+
+    This is used to filter lists in the database. A subquery works for any
+    number of matches, while the IDs from the index would have to be passed
+    as query parameters.
+    """
+    # wger
+    from wger.exercises.models import ExerciseBase
+
+    lookups = {
+        'category': 'category_id__in',
+        'muscles': 'muscles__in',
+        'muscles_secondary': 'muscles_secondary__in',
+        'equipment': 'equipment__in',
+        'language': 'exercises__language_id__in',
+        'license': 'license_id__in',
+    }
+
+    queryset = ExerciseBase.objects.all()
+    for facet, values in filters.items():
+        if values:
+            queryset = queryset.filter(**{lookups[facet]: values})
+    return queryset.values('id')
+
+
+_index = None
+_lock = threading.Lock()
+
+
+def get_facet_index():
+    """
+    Returns the facet index of this process
+
+    The index is rebuilt when the version stamp in the cache changed, i.e.
+    after an exercise was edited or synced. Looking up the stamp is the only
+    work done per call while the index is current.
+    """
+    global _index
+
+    version = cache.get(cache_mapper.EXERCISE_FACETS_VERSION_KEY)
+    if version is None:
+        version = reset_facet_index()
+
+    index = _index
+    if index is None or index.version != version:
+        with _lock:
+            if _index is None or _index.version != version:
+                logger.debug('Building the exercise facet index')
+                _index = ExerciseFacetIndex.build(version)
+            index = _index
+    return index
+
+
+def reset_facet_index():
+    """
+    Sets a new version stamp, so that all processes rebuild their index
+
+    :return: the new version
+    """
+    version = uuid.uuid4().hex
+    cache.set(cache_mapper.EXERCISE_FACETS_VERSION_KEY, version, None)
+    return version
@@ -16,6 +16,7 @@
 
 # Django
 from django import forms
+from django.utils.translation import gettext_lazy
 
 # wger
 from wger.exercises.models import (
@@ -23,6 +24,7 @@ from wger.exercises.models import (
     ExerciseImage,
     ExerciseVideo,
 )
+from wger.exercises.views.helper import StreamVerbs
 
 
 class ExerciseImageForm(forms.ModelForm):
@@ -54,3 +56,29 @@ class CommentForm(forms.ModelForm):
     class Meta:
         model = ExerciseComment
         exclude = ('exercise', )
+
+
+class HistoryFilterForm(forms.Form):
+    """
+    Filters for the exercise history admin view
+    """
+
+    date = forms.DateField(
+        required=False,
+        label=gettext_lazy('Date'),
+        widget=forms.DateInput(attrs={
+            'type': 'date',
+            'class': 'form-control'
+        }),
+    )
+    verb = forms.ChoiceField(
+        required=False,
+        label=gettext_lazy('Action'),
+        choices=[('', '---------')] + [(verb.value, verb.value) for verb in StreamVerbs],
+        widget=forms.Select(attrs={'class': 'form-select'}),
+    )
+    user = forms.CharField(
+        required=False,
+        label=gettext_lazy('User'),
+        widget=forms.TextInput(attrs={'class': 'form-control'}),
+    )
@@ -14,9 +14,11 @@
 
 # Standard Library
 import csv
+import time
 
 # Django
 from django.core.management.base import BaseCommand
+from django.db.models import Prefetch
 
 # wger
 from wger.core.models import Language
@@ -26,6 +28,14 @@ from wger.exercises.models import (
 )
 
 
+CHUNK_SIZE = 500
+"""
+Number of exercise bases loaded at once
+"""
+
+FILENAME = 'exercise_cleanup.csv'
+
+
 class Command(BaseCommand):
     """
     ONE OFF SCRIPT!
@@ -33,46 +43,30 @@ class Command(BaseCommand):
     This script reads out the exercise database and writes it to a CSV file,
     so that mass corrections can be done. The file can be read in with
     read-exercises-cleanup.py
+
+    The bases are streamed in chunks together with their translations,
+    aliases and equipment, so that the number of queries only depends on
+    the number of chunks.
     """
 
     def handle(self, **options):
-        out = []
-
-        languages = Language.objects.all()
-        for base in ExerciseBase.objects.all():
-
-            data = {
-                'base': {
-                    'uuid': base.uuid,
-                    'category': base.category.name,
-                    'equipment': ','.join([e.name for e in base.equipment.all()]),
-                    'variations': base.variations.id if base.variations else ''
-                }
-            }
-
-            for language in languages:
-                exercise_data = {
-                    'uuid': '',
-                    'name': '',
-                    'description': '',
-                    'aliases': '',
-                    'license': '',
-                    'author': ''
-                }
-
-                exercise = Exercise.objects.filter(exercise_base=base, language=language).first()
-                if exercise:
-                    exercise_data['uuid'] = exercise.uuid
-                    exercise_data['name'] = exercise.name
-                    exercise_data['description'] = exercise.description
-                    exercise_data['license'] = exercise.license.short_name
-                    exercise_data['author'] = exercise.license_author
-                    exercise_data['aliases'] = ','.join([a.alias for a in exercise.alias_set.all()])
-
-                data[language.short_name] = exercise_data
-            out.append(data)
-
-        with open('exercise_cleanup.csv', 'w', newline='') as csvfile:
+        start = time.monotonic()
+        languages = list(Language.objects.all())
+
+        bases = ExerciseBase.objects \
+            .select_related('category', 'variations') \
+            .prefetch_related(
+                'equipment',
+                Prefetch(
+                    'exercises',
+                    queryset=Exercise.objects.select_related('license')
+                    .prefetch_related('alias_set'),
+                ),
+            ) \
+            .order_by('pk')
+
+        count = 0
+        with open(FILENAME, 'w', newline='') as csvfile:
             file_writer = csv.writer(csvfile, )
 
             header = ['base:uuid', 'base:category', 'base:equipment', 'base:variations']
@@ -88,21 +82,43 @@ class Command(BaseCommand):
 
             file_writer.writerow(header)
 
-            for entry in out:
-                data = [
-                    entry['base']['uuid'],
-                    entry['base']['category'],
-                    entry['base']['equipment'],
-                    entry['base']['variations'],
+            for base in bases.iterator(chunk_size=CHUNK_SIZE):
+                file_writer.writerow(self.get_row(base, languages))
+                count += 1
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'Wrote {count} exercises to {FILENAME} in {time.monotonic() - start:.2f}s'
+            )
+        )
+
+    @staticmethod
+    def get_row(base: ExerciseBase, languages):
+        """
+        Returns the CSV row of a base, with the first translation in each language
+        """
+        translations = {}
+        for exercise in base.exercises.all():
+            translations.setdefault(exercise.language_id, exercise)
+
+        data = [
+            base.uuid,
+            base.category.name,
+            ','.join([e.name for e in base.equipment.all()]),
+            base.variations.id if base.variations else '',
+        ]
+        for language in languages:
+            exercise = translations.get(language.id)
+            if exercise:
+                data += [
+                    exercise.uuid,
+                    exercise.name,
+                    ','.join([a.alias for a in exercise.alias_set.all()]),
+                    exercise.description,
+                    exercise.license.short_name,
+                    exercise.license_author,
                 ]
-                for language in languages:
-                    data += [
-                        entry[language.short_name]['uuid'],
-                        entry[language.short_name]['name'],
-                        entry[language.short_name]['aliases'],
-                        entry[language.short_name]['description'],
-                        entry[language.short_name]['license'],
-                        entry[language.short_name]['author'],
-                    ]
-
-                file_writer.writerow(data)
+            else:
+                data += ['', '', '', '', '', '']
+
+        return data
@@ -14,20 +14,32 @@
 
 # Standard Library
 import collections
+import time
 from argparse import RawTextHelpFormatter
 
 # Django
 from django.core.management.base import BaseCommand
+from django.db.models import (
+    Count,
+    Q,
+)
 
 # wger
 from wger.core.models import Language
-from wger.exercises.models import ExerciseBase
+from wger.exercises.models import (
+    Exercise,
+    ExerciseBase,
+)
 from wger.utils.constants import ENGLISH_SHORT_NAME
 
 
 class Command(BaseCommand):
     """
     Performs some sanity checks on the exercise database
+
+    All problems are found with a fixed number of queries, independently of
+    the number of exercises. Only the fixes are done per object, so that the
+    deletion signals are sent.
     """
     english: Language
 
@@ -85,18 +97,49 @@ class Command(BaseCommand):
         delete_duplicates = options['delete_duplicates'] or options['delete_all']
         delete_no_english = options['delete_no_english'] or options['delete_all']
 
+        start = time.monotonic()
         self.english = Language.objects.get(short_name=ENGLISH_SHORT_NAME)
 
-        for base in ExerciseBase.objects.all():
+        bases = ExerciseBase.objects.annotate(
+            translation_count=Count('exercises'),
+            english_count=Count('exercises', filter=Q(exercises__language=self.english)),
+        ).order_by('pk')
+        duplicates = self.find_duplicate_translations()
+
+        count = 0
+        for base in bases:
+            count += 1
             self.handle_untranslated(base, delete_untranslated)
             self.handle_no_english(base, delete_no_english)
-            self.handle_duplicate_translations(base, delete_duplicates)
+            self.handle_duplicate_translations(base, duplicates.get(base.pk), delete_duplicates)
+
+        if options['verbosity'] >= 2:
+            self.stdout.write(f'Checked {count} exercises in {time.monotonic() - start:.2f}s')
+
+    def find_duplicate_translations(self):
+        """
+        Returns the translations of the bases that have more than one
+        translation in the same language, grouped by base and language
+        """
+        duplicate_groups = Exercise.objects.values('exercise_base', 'language') \
+            .annotate(count=Count('id')) \
+            .filter(count__gt=1) \
+            .order_by()
+
+        query = Q(pk__in=[])
+        for group in duplicate_groups:
+            query |= Q(exercise_base=group['exercise_base'], language=group['language'])
+
+        duplicates = collections.defaultdict(lambda: collections.defaultdict(list))
+        for translation in Exercise.objects.filter(query).select_related('language'):
+            duplicates[translation.exercise_base_id][translation.language].append(translation)
+        return duplicates
 
     def handle_untranslated(self, base: ExerciseBase, delete: bool):
         """
         Delete exercises without translations
         """
-        if not base.pk or base.exercises.count():
+        if not base.pk or base.translation_count:
             return
 
         self.stdout.write(self.style.WARNING(f'Exercise {base.uuid} has no translations!'))
@@ -105,7 +148,7 @@ class Command(BaseCommand):
             self.stdout.write('  -> deleted')
 
     def handle_no_english(self, base: ExerciseBase, delete: bool):
-        if not base.pk or base.exercises.filter(language=self.english).exists():
+        if not base.pk or base.english_count:
             return
 
         self.stdout.write(self.style.WARNING(f'Exercise {base.uuid} has no English translation!'))
@@ -113,25 +156,15 @@ class Command(BaseCommand):
             base.delete()
             self.stdout.write('  -> deleted')
 
-    def handle_duplicate_translations(self, base: ExerciseBase, delete: bool):
-        if not base.pk:
-            return
-
-        exercise_languages = base.exercises.values_list('language', flat=True)
-        duplicates = [
-            Language.objects.get(pk=item)
-            for item, count in collections.Counter(exercise_languages).items() if count > 1
-        ]
-
-        if not duplicates:
+    def handle_duplicate_translations(self, base: ExerciseBase, duplicates, delete: bool):
+        if not base.pk or not duplicates:
             return
 
         warning = f'Exercise {base.uuid} has duplicate translations!'
         self.stdout.write(self.style.WARNING(warning))
 
         # Output the duplicates
-        for language in duplicates:
-            translations = base.exercises.filter(language=language)
+        for language, translations in duplicates.items():
             self.stdout.write(f'language {language.short_name}:')
             for translation in translations:
                 self.stdout.write(f'  * {translation.name} {translation.uuid}')
@@ -0,0 +1,37 @@
+#  This file is part of wger Workout Manager <https://github.com/wger-project>.
+#
+#  wger Workout Manager is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Affero General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  wger Workout Manager is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Affero General Public License for more details.
+#
+#  You should have received a copy of the GNU Affero General Public License
+#  along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+# Django
+from django.core.management.base import BaseCommand
+
+# wger
+from wger.exercises.models.author import rebuild_exercise_authors
+
+
+class Command(BaseCommand):
+    """
+    Rebuilds the exercise authors from the historical records
+    """
+
+    help = 'Rebuilds the denormalized exercise authors from the edit history. This is ' \
+           'done by the migrations when upgrading, afterwards the authors are kept up to ' \
+           'date automatically.'
+
+    def handle(self, **options):
+        result = rebuild_exercise_authors()
+        for name, count in result.items():
+            self.stdout.write(f'{name}: {count} authors')
+
+        self.stdout.write(self.style.SUCCESS(f'Added {sum(result.values())} exercise authors'))
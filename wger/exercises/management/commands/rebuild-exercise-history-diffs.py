@@ -0,0 +1,72 @@
+#  This file is part of wger Workout Manager <https://github.com/wger-project>.
+#
+#  wger Workout Manager is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Affero General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  wger Workout Manager is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Affero General Public License for more details.
+#
+#  You should have received a copy of the GNU Affero General Public License
+#  along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+# Django
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+# wger
+from wger.exercises.models import (
+    Alias,
+    Exercise,
+    ExerciseBase,
+    ExerciseComment,
+    ExerciseHistoryDiff,
+    ExerciseImage,
+    ExerciseVideo,
+)
+
+
+BATCH_SIZE = 1000
+
+
+class Command(BaseCommand):
+    """
+    Rebuilds the exercise history diffs from the historical records
+    """
+
+    help = 'Rebuilds the precomputed diffs used by the exercise history admin view. The ' \
+           'diffs of existing records are added by a migration and new ones automatically, ' \
+           'so this is only needed if they got out of sync.'
+
+    def handle(self, **options):
+        with transaction.atomic():
+            ExerciseHistoryDiff.objects.all().delete()
+
+            count = 0
+            for model in (ExerciseBase, Exercise, ExerciseImage, ExerciseVideo, Alias,
+                          ExerciseComment):
+                count += self.rebuild_model(model)
+
+        self.stdout.write(self.style.SUCCESS(f'Added {count} history diffs'))
+
+    def rebuild_model(self, model):
+        """
+        Compares the historical records of each object to the previous one in one pass
+        """
+        history = model.history.order_by('id', 'history_date', 'history_id') \
+            .iterator(chunk_size=BATCH_SIZE)
+
+        diffs = []
+        previous = None
+        for record in history:
+            if previous and previous.id == record.id and record.history_type == '~':
+                diffs.append(ExerciseHistoryDiff.from_historical_record(record, previous))
+            previous = record
+
+        ExerciseHistoryDiff.objects.bulk_create(diffs, batch_size=BATCH_SIZE)
+
+        self.stdout.write(f'{model.__name__}: {len(diffs)} diffs')
+        return len(diffs)
@@ -13,13 +13,13 @@
 # You should have received a copy of the GNU Affero General Public License
 
 # Django
-from django.core.cache import cache
 from django.core.management.base import BaseCommand
 
 # wger
-from wger.exercises.api.serializers import ExerciseBaseInfoSerializer
-from wger.exercises.models import ExerciseBase
-from wger.utils.cache import CacheKeyMapper
+from wger.exercises.cache import (
+    WARMUP_BATCH_SIZE,
+    warmup_exercise_api_cache,
+)
 
 
 class Command(BaseCommand):
@@ -40,29 +40,36 @@ class Command(BaseCommand):
             action='store_true',
             dest='force',
             default=False,
-            help='Force the update of the cache'
+            help='Force the update of the cache, also for entries that are still current'
         )
 
-    def handle(self, **options):
-        exercise_base_id = options['exercise_base_id']
-        force = options['force']
-
-        if exercise_base_id:
-            exercise = ExerciseBase.objects.get(pk=exercise_base_id)
-            self.handle_cache(exercise, force)
-            return
-
-        for exercise in ExerciseBase.translations.all():
-            self.handle_cache(exercise, force)
+        parser.add_argument(
+            '--batch-size',
+            action='store',
+            dest='batch_size',
+            type=int,
+            default=WARMUP_BATCH_SIZE,
+            help=f'Number of exercises processed at once, default {WARMUP_BATCH_SIZE}'
+        )
 
-    def handle_cache(self, exercise: ExerciseBase, force: bool):
-        if force:
-            self.stdout.write(f"Force updating cache for exercise base {exercise.uuid}")
-        else:
-            self.stdout.write(f"Warming cache for exercise base {exercise.uuid}")
+        parser.add_argument(
+            '--processes',
+            action='store',
+            dest='processes',
+            type=int,
+            default=1,
+            help='Number of worker processes. Only useful with a cache shared between '
+            'processes, such as redis'
+        )
 
-        if force:
-            cache.delete(CacheKeyMapper.get_exercise_api_key(exercise.uuid))
+    def handle(self, **options):
+        exercise_base_id = options['exercise_base_id']
 
-        serializer = ExerciseBaseInfoSerializer(exercise)
-        serializer.data
+        warmup_exercise_api_cache(
+            self.stdout.write,
+            force=options['force'],
+            base_ids=[exercise_base_id] if exercise_base_id else None,
+            batch_size=options['batch_size'],
+            processes=options['processes'],
+            style_fn=self.style.SUCCESS,
+        )
@@ -0,0 +1,27 @@
+# Generated by Django 4.1.9 on 2026-10-19 08:14
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('exercises', '0025_rename_update_date_exercise_last_update_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ExerciseAuthor',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('model_type', models.CharField(choices=[('base', 'base'), ('translation', 'translation'), ('image', 'image'), ('video', 'video')], max_length=11)),
+                ('object_id', models.PositiveIntegerField()),
+                ('author', models.CharField(max_length=200)),
+                ('exercise_base', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='authors', to='exercises.exercisebase')),
+            ],
+            options={
+                'unique_together': {('model_type', 'object_id', 'author')},
+            },
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 4.1.9 on 2026-10-19 08:37
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contenttypes', '0002_remove_content_type_name'),
+        ('exercises', '0026_exerciseauthor'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ExerciseHistoryDiff',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('object_id', models.PositiveIntegerField()),
+                ('history_id', models.PositiveIntegerField()),
+                ('history_date', models.DateTimeField()),
+                ('previous_history_id', models.PositiveIntegerField()),
+                ('changes', models.JSONField(default=list)),
+                ('content_type', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='contenttypes.contenttype')),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='exercisehistorydiff',
+            index=models.Index(fields=['content_type', 'object_id', 'history_date'], name='exercises_e_content_ba679a_idx'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='exercisehistorydiff',
+            unique_together={('content_type', 'history_id')},
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 4.1.9 on 2026-10-19 08:52
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def set_main_images(apps, schema_editor):
+    """
+    Point every exercise base to its current main image
+    """
+    ExerciseBase = apps.get_model('exercises', 'ExerciseBase')
+    ExerciseImage = apps.get_model('exercises', 'ExerciseImage')
+
+    main_images = {}
+    for image_id, base_id in ExerciseImage.objects.filter(is_main=True) \
+            .order_by('-id').values_list('id', 'exercise_base_id'):
+        main_images[base_id] = image_id
+
+    for base_id, image_id in main_images.items():
+        ExerciseBase.objects.filter(pk=base_id).update(main_image_id=image_id)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('exercises', '0027_exercisehistorydiff'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='exercisebase',
+            name='main_image',
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='exercises.exerciseimage'),
+        ),
+        migrations.RunPython(set_main_images, reverse_code=migrations.RunPython.noop),
+    ]
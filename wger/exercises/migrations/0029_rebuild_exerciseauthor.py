@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+
+from django.db import migrations
+
+
+# Frozen copy of rebuild_exercise_authors in wger.exercises.models.author, so
+# that later changes to that module don't change what this migration does
+BATCH_SIZE = 1000
+MODEL_TYPES = (
+    ('ExerciseBase', 'base'),
+    ('Exercise', 'translation'),
+    ('ExerciseImage', 'image'),
+    ('ExerciseVideo', 'video'),
+)
+
+
+def rebuild_authors(apps, schema_editor):
+    """
+    Builds the exercise authors from the existing historical records
+    """
+    ExerciseAuthor = apps.get_model('exercises', 'ExerciseAuthor')
+    ExerciseAuthor.objects.all().delete()
+
+    for name, model_type in MODEL_TYPES:
+        model = apps.get_model('exercises', name)
+        history_model = apps.get_model('exercises', f'Historical{name}')
+        if name == 'ExerciseBase':
+            base_ids = dict(model.objects.values_list('id', 'id'))
+        else:
+            base_ids = dict(model.objects.values_list('id', 'exercise_base_id'))
+
+        history = history_model.objects.exclude(license_author__isnull=True) \
+            .exclude(license_author='') \
+            .values_list('id', 'license_author') \
+            .distinct() \
+            .iterator(chunk_size=BATCH_SIZE)
+
+        ExerciseAuthor.objects.bulk_create(
+            [
+                ExerciseAuthor(
+                    exercise_base_id=base_ids[pk],
+                    model_type=model_type,
+                    object_id=pk,
+                    author=author,
+                ) for pk, author in history if pk in base_ids
+            ],
+            batch_size=BATCH_SIZE,
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('exercises', '0028_exercisebase_main_image'),
+    ]
+
+    operations = [
+        migrations.RunPython(rebuild_authors, reverse_code=migrations.RunPython.noop),
+    ]
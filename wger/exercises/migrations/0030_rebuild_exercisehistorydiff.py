@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+
+from django.db import migrations
+
+
+# Frozen copy of the rebuild-exercise-history-diffs command and of
+# ExerciseHistoryDiff.from_historical_record, so that later changes to them
+# don't change what this migration does
+BATCH_SIZE = 1000
+MODELS = ('ExerciseBase', 'Exercise', 'ExerciseImage', 'ExerciseVideo', 'Alias', 'ExerciseComment')
+
+
+def get_changes(fields, record, previous):
+    """
+    Returns the changed fields of a historical record, like diff_against
+    """
+    changes = []
+    for field in fields:
+        old = field.value_from_object(previous)
+        new = field.value_from_object(record)
+        if old != new:
+            changes.append(
+                {
+                    'field': field.name,
+                    'old': None if old is None else str(old),
+                    'new': None if new is None else str(new),
+                }
+            )
+    return changes
+
+
+def rebuild_diffs(apps, schema_editor):
+    """
+    Builds the diffs of the existing historical records
+    """
+    ContentType = apps.get_model('contenttypes', 'ContentType')
+    ExerciseHistoryDiff = apps.get_model('exercises', 'ExerciseHistoryDiff')
+    ExerciseHistoryDiff.objects.all().delete()
+
+    for name in MODELS:
+        history_model = apps.get_model('exercises', f'Historical{name}')
+        if not history_model.objects.filter(history_type='~').exists():
+            continue
+
+        content_type, created = ContentType.objects.get_or_create(
+            app_label='exercises',
+            model=name.lower(),
+        )
+        fields = sorted(
+            (
+                f for f in history_model._meta.fields
+                if f.editable and not f.name.startswith('history_')
+            ),
+            key=lambda f: f.name,
+        )
+
+        history = history_model.objects.order_by('id', 'history_date', 'history_id') \
+            .iterator(chunk_size=BATCH_SIZE)
+
+        diffs = []
+        previous = None
+        for record in history:
+            if previous and previous.id == record.id and record.history_type == '~':
+                diffs.append(
+                    ExerciseHistoryDiff(
+                        content_type=content_type,
+                        object_id=record.id,
+                        history_id=record.history_id,
+                        history_date=record.history_date,
+                        previous_history_id=previous.history_id,
+                        changes=get_changes(fields, record, previous),
+                    )
+                )
+            previous = record
+
+        ExerciseHistoryDiff.objects.bulk_create(diffs, batch_size=BATCH_SIZE)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contenttypes', '0002_remove_content_type_name'),
+        ('exercises', '0029_rebuild_exerciseauthor'),
+    ]
+
+    operations = [
+        migrations.RunPython(rebuild_diffs, reverse_code=migrations.RunPython.noop),
+    ]
@@ -15,6 +15,7 @@
 #  along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
 # Local
+from .author import ExerciseAuthor
 from .base import ExerciseBase
 from .category import ExerciseCategory
 from .comment import ExerciseComment
@@ -22,6 +23,7 @@ from .deletion_log import DeletionLog
 from .equipment import Equipment
 from .exercise import Exercise
 from .exercise_alias import Alias
+from .history_diff import ExerciseHistoryDiff
 from .image import ExerciseImage
 from .muscle import Muscle
 from .variation import Variation
@@ -0,0 +1,163 @@
+#  This file is part of wger Workout Manager <https://github.com/wger-project>.
+#
+#  wger Workout Manager is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Affero General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  wger Workout Manager is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Affero General Public License for more details.
+#
+#  You should have received a copy of the GNU Affero General Public License
+#  along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+# Django
+from django.db import (
+    models,
+    transaction,
+)
+
+# wger
+from wger.utils.models import AbstractHistoryMixin
+
+
+class ExerciseAuthor(models.Model):
+    """
+    A license author from the edit history of an exercise base or of one of
+    its translations, images or videos
+
+    These rows are a denormalized copy of the history tables. They are added
+    when a historical record is created (see wger.exercises.signals) and can be
+    rebuilt with the rebuild-exercise-authors command.
+    """
+
+    MODEL_BASE = 'base'
+    MODEL_TRANSLATION = 'translation'
+    MODEL_IMAGE = 'image'
+    MODEL_VIDEO = 'video'
+
+    MODELS = [
+        (MODEL_BASE, 'base'),
+        (MODEL_TRANSLATION, 'translation'),
+        (MODEL_IMAGE, 'image'),
+        (MODEL_VIDEO, 'video'),
+    ]
+
+    exercise_base = models.ForeignKey(
+        'exercises.ExerciseBase',
+        on_delete=models.CASCADE,
+        related_name='authors',
+    )
+
+    model_type = models.CharField(
+        max_length=11,
+        choices=MODELS,
+    )
+
+    object_id = models.PositiveIntegerField()
+    """
+    The ID of the base, translation, image or video
+    """
+
+    author = models.CharField(max_length=200)
+
+    class Meta:
+        unique_together = ('model_type', 'object_id', 'author')
+
+    def __str__(self):
+        """
+        Return a more human-readable representation
+        """
+        return f"{self.author} ({self.model_type} {self.object_id})"
+
+
+class ExerciseAuthorHistoryMixin(AbstractHistoryMixin):
+    """
+    Reads the author history from the ExerciseAuthor table instead of going
+    through all the historical records
+    """
+
+    author_model_type = None
+    """
+    The model type used in ExerciseAuthor
+    """
+
+    @property
+    def author_base_id(self):
+        """
+        The ID of the exercise base the authors are attributed to
+        """
+        return self.exercise_base_id
+
+    @property
+    def author_history(self):
+        """
+        The unique set of license authors from the historical records
+
+        Uses the authors loaded by ExerciseBase.prefetch_authors, if available.
+        """
+        if hasattr(self, '_prefetched_author_history'):
+            return set(self._prefetched_author_history)
+
+        return set(
+            ExerciseAuthor.objects.filter(
+                model_type=self.author_model_type,
+                object_id=self.pk,
+            ).values_list('author', flat=True)
+        )
+
+
+REBUILD_BATCH_SIZE = 1000
+
+
+def rebuild_exercise_authors(batch_size=REBUILD_BATCH_SIZE):
+    """
+    Rebuilds the exercise authors from the historical records
+
+    The distinct authors of each model's history are read in one pass and
+    written in batches.
+
+    :return: dict with the number of added authors per model name
+    """
+    # Django
+    from django.apps import apps
+
+    model_types = (
+        ('ExerciseBase', ExerciseAuthor.MODEL_BASE),
+        ('Exercise', ExerciseAuthor.MODEL_TRANSLATION),
+        ('ExerciseImage', ExerciseAuthor.MODEL_IMAGE),
+        ('ExerciseVideo', ExerciseAuthor.MODEL_VIDEO),
+    )
+
+    result = {}
+    with transaction.atomic():
+        ExerciseAuthor.objects.all().delete()
+
+        for name, model_type in model_types:
+            model = apps.get_model('exercises', name)
+            history_model = apps.get_model('exercises', f'Historical{name}')
+            if name == 'ExerciseBase':
+                base_ids = dict(model.objects.values_list('id', 'id'))
+            else:
+                base_ids = dict(model.objects.values_list('id', 'exercise_base_id'))
+
+            history = history_model.objects.exclude(license_author__isnull=True) \
+                .exclude(license_author='') \
+                .values_list('id', 'license_author') \
+                .distinct() \
+                .iterator(chunk_size=batch_size)
+
+            authors = [
+                ExerciseAuthor(
+                    exercise_base_id=base_ids[pk],
+                    model_type=model_type,
+                    object_id=pk,
+                    author=author,
+                ) for pk, author in history if pk in base_ids
+            ]
+            ExerciseAuthor.objects.bulk_create(authors, batch_size=batch_size)
+            result[name] = len(authors)
+
+    return result
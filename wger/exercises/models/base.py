@@ -42,20 +42,20 @@ from wger.exercises.managers import (
     ExerciseBaseManagerTranslations,
 )
 from wger.utils.constants import ENGLISH_SHORT_NAME
-from wger.utils.models import (
-    AbstractHistoryMixin,
-    AbstractLicenseModel,
-    collect_models_author_history,
-)
+from wger.utils.models import AbstractLicenseModel
 
 # Local
+from .author import (
+    ExerciseAuthor,
+    ExerciseAuthorHistoryMixin,
+)
 from .category import ExerciseCategory
 from .equipment import Equipment
 from .muscle import Muscle
 from .variation import Variation
 
 
-class ExerciseBase(AbstractLicenseModel, AbstractHistoryMixin, models.Model):
+class ExerciseBase(AbstractLicenseModel, ExerciseAuthorHistoryMixin, models.Model):
     """
     Model for an exercise base
     """
@@ -112,6 +112,22 @@ class ExerciseBase(AbstractLicenseModel, AbstractHistoryMixin, models.Model):
     )
     """Variations of this exercise"""
 
+    main_image = models.ForeignKey(
+        'exercises.ExerciseImage',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        editable=False,
+        related_name='+',
+    )
+    """
+    The main image of the exercise
+
+    This is a denormalized pointer kept up to date by the image signals (see
+    wger.exercises.signals) so that the images of many bases can be loaded
+    with select_related.
+    """
+
     created = models.DateTimeField(
         _('Date'),
         auto_now_add=True,
@@ -124,7 +140,7 @@ class ExerciseBase(AbstractLicenseModel, AbstractHistoryMixin, models.Model):
     )
     """Datetime of last modification"""
 
-    history = HistoricalRecords()
+    history = HistoricalRecords(excluded_fields=['main_image'])
     """Edit history"""
 
     def __str__(self):
@@ -161,17 +177,39 @@ class ExerciseBase(AbstractLicenseModel, AbstractHistoryMixin, models.Model):
     # Own methods
     #
 
+    author_model_type = ExerciseAuthor.MODEL_BASE
+
+    @property
+    def author_base_id(self):
+        """
+        The ID of the exercise base the authors are attributed to
+        """
+        return self.id
+
     @property
     def total_authors_history(self):
         """
         All authors history related to the BaseExercise.
         """
-        collect_for_models = [
+        return {author.author for author in self.authors.all()}
+
+    def prefetch_authors(self):
+        """
+        Distributes the authors of the base to itself and to its translations,
+        images and videos, so that reading their author history needs no
+        further queries. Use together with prefetch_related('authors').
+        """
+        authors = {}
+        for author in self.authors.all():
+            authors.setdefault((author.model_type, author.object_id), set()).add(author.author)
+
+        for obj in (
+            self,
             *self.exercises.all(),
-            *self.exercisevideo_set.all(),
             *self.exerciseimage_set.all(),
-        ]
-        return self.author_history.union(collect_models_author_history(collect_for_models))
+            *self.exercisevideo_set.all(),
+        ):
+            obj._prefetched_author_history = authors.get((obj.author_model_type, obj.pk), set())
 
     @property
     def last_update_global(self):
@@ -185,13 +223,6 @@ class ExerciseBase(AbstractLicenseModel, AbstractHistoryMixin, models.Model):
             *[translation.last_update for translation in self.exercises.all()],
         )
 
-    @property
-    def main_image(self):
-        """
-        Return the main image for the exercise or None if nothing is found
-        """
-        return self.exerciseimage_set.all().filter(is_main=True).first()
-
     @property
     def languages(self) -> List[Language]:
         """
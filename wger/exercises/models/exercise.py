@@ -31,14 +31,15 @@ from simple_history.models import HistoricalRecords
 # wger
 from wger.core.models import Language
 from wger.exercises.models import ExerciseBase
-from wger.utils.cache import reset_workout_canonical_form
-from wger.utils.models import (
-    AbstractHistoryMixin,
-    AbstractLicenseModel,
+from wger.exercises.models.author import (
+    ExerciseAuthor,
+    ExerciseAuthorHistoryMixin,
 )
+from wger.utils.cache import reset_workout_canonical_form
+from wger.utils.models import AbstractLicenseModel
 
 
-class Exercise(AbstractLicenseModel, AbstractHistoryMixin, models.Model):
+class Exercise(AbstractLicenseModel, ExerciseAuthorHistoryMixin, models.Model):
     """
     Model for an exercise
     """
@@ -95,6 +96,8 @@ class Exercise(AbstractLicenseModel, AbstractHistoryMixin, models.Model):
     history = HistoricalRecords()
     """Edit history"""
 
+    author_model_type = ExerciseAuthor.MODEL_TRANSLATION
+
     #
     # Django methods
     #
@@ -188,7 +191,7 @@ class Exercise(AbstractLicenseModel, AbstractHistoryMixin, models.Model):
         """
         Return the main image for the exercise or None if nothing is found
         """
-        return self.images.all().filter(is_main=True).first()
+        return self.exercise_base.main_image
 
     @property
     def description_clean(self):
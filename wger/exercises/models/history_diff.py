@@ -0,0 +1,89 @@
+#  This file is part of wger Workout Manager <https://github.com/wger-project>.
+#
+#  wger Workout Manager is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Affero General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  wger Workout Manager is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Affero General Public License for more details.
+#
+#  You should have received a copy of the GNU Affero General Public License
+#  along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+# Django
+from django.contrib.contenttypes.models import ContentType
+from django.db import models
+
+
+class ExerciseHistoryDiff(models.Model):
+    """
+    The changes of a historical record of an exercise object compared to the
+    previous record of the same object
+
+    The diff is computed once, when the historical record is created (see
+    wger.exercises.signals), so that the history admin view does not need to
+    load and compare the historical records of every entry. The diffs of
+    existing records are computed by a data migration and can be rebuilt with
+    the rebuild-exercise-history-diffs command.
+    """
+
+    content_type = models.ForeignKey(ContentType, on_delete=models.CASCADE)
+
+    object_id = models.PositiveIntegerField()
+    """
+    The ID of the changed object
+    """
+
+    history_id = models.PositiveIntegerField()
+    """
+    The ID of the historical record
+    """
+
+    history_date = models.DateTimeField()
+    """
+    The date of the historical record
+    """
+
+    previous_history_id = models.PositiveIntegerField()
+    """
+    The ID of the previous historical record, used to revert the changes
+    """
+
+    changes = models.JSONField(default=list)
+    """
+    List of the changed fields, as dictionaries with the field, old and new value
+    """
+
+    class Meta:
+        unique_together = ('content_type', 'history_id')
+        indexes = [models.Index(fields=['content_type', 'object_id', 'history_date'])]
+
+    def __str__(self):
+        """
+        Return a more human-readable representation
+        """
+        return f"{self.content_type} {self.object_id}, history {self.history_id}"
+
+    @classmethod
+    def from_historical_record(cls, record, previous):
+        """
+        Returns an unsaved diff between a historical record and its previous one
+        """
+        delta = record.diff_against(previous)
+        return cls(
+            content_type=ContentType.objects.get_for_model(record.instance_type),
+            object_id=record.id,
+            history_id=record.history_id,
+            history_date=record.history_date,
+            previous_history_id=previous.history_id,
+            changes=[
+                {
+                    'field': change.field,
+                    'old': None if change.old is None else str(change.old),
+                    'new': None if change.new is None else str(change.new),
+                } for change in delta.changes
+            ],
+        )
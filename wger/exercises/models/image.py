@@ -27,11 +27,12 @@ from simple_history.models import HistoricalRecords
 
 # wger
 from wger.exercises.models import ExerciseBase
-from wger.utils.helpers import BaseImage
-from wger.utils.models import (
-    AbstractHistoryMixin,
-    AbstractLicenseModel,
+from wger.exercises.models.author import (
+    ExerciseAuthor,
+    ExerciseAuthorHistoryMixin,
 )
+from wger.utils.helpers import BaseImage
+from wger.utils.models import AbstractLicenseModel
 
 
 def exercise_image_upload_dir(instance, filename):
@@ -42,7 +43,7 @@ def exercise_image_upload_dir(instance, filename):
     return f"exercise-images/{instance.exercise_base.id}/{instance.uuid}{ext}"
 
 
-class ExerciseImage(AbstractLicenseModel, AbstractHistoryMixin, models.Model, BaseImage):
+class ExerciseImage(AbstractLicenseModel, ExerciseAuthorHistoryMixin, models.Model, BaseImage):
     """
     Model for an exercise image
     """
@@ -117,6 +118,8 @@ class ExerciseImage(AbstractLicenseModel, AbstractHistoryMixin, models.Model, Ba
     history = HistoricalRecords()
     """Edit history"""
 
+    author_model_type = ExerciseAuthor.MODEL_IMAGE
+
     def get_absolute_url(self):
         """
         Return the image URL
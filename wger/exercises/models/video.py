@@ -35,10 +35,11 @@ except ImportError:
 
 # wger
 from wger.exercises.models import ExerciseBase
-from wger.utils.models import (
-    AbstractHistoryMixin,
-    AbstractLicenseModel,
+from wger.exercises.models.author import (
+    ExerciseAuthor,
+    ExerciseAuthorHistoryMixin,
 )
+from wger.utils.models import AbstractLicenseModel
 
 
 MAX_FILE_SIZE_MB = 100
@@ -77,7 +78,7 @@ def exercise_video_upload_dir(instance, filename):
     return f"exercise-video/{instance.exercise_base.id}/{instance.uuid}{ext}"
 
 
-class ExerciseVideo(AbstractLicenseModel, AbstractHistoryMixin, models.Model):
+class ExerciseVideo(AbstractLicenseModel, ExerciseAuthorHistoryMixin, models.Model):
     """
     Model for an exercise image
     """
@@ -171,6 +172,8 @@ class ExerciseVideo(AbstractLicenseModel, AbstractHistoryMixin, models.Model):
     history = HistoricalRecords()
     """Edit history"""
 
+    author_model_type = ExerciseAuthor.MODEL_VIDEO
+
     def get_absolute_url(self):
         """
         Returns the video URL
@@ -0,0 +1,233 @@
+# -*- coding: utf-8 -*-
+
+# This file is part of wger Workout Manager.
+#
+# wger Workout Manager is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# wger Workout Manager is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+
+# Standard Library
+import difflib
+import logging
+import re
+import threading
+import uuid
+from collections import defaultdict
+
+# Django
+from django.core.cache import cache
+
+# wger
+from wger.utils.cache import cache_mapper
+from wger.utils.thumbnails import get_thumbnail_url
+
+
+logger = logging.getLogger(__name__)
+
+FUZZY_MIN_LENGTH = 4
+"""
+Search terms shorter than this are not matched fuzzily
+"""
+
+FUZZY_CUTOFF = 0.8
+"""
+Minimum similarity of a word to a search term for fuzzy matches
+"""
+
+RANK_EXACT = 0
+RANK_PREFIX = 1
+RANK_WORD_PREFIX = 2
+RANK_CONTAINS = 3
+RANK_FUZZY = 4
+
+WORD_SPLIT = re.compile(r'\W+')
+
+
+def normalize(text):
+    """
+    Normalizes a text for case-insensitive matching
+    """
+    return text.casefold().strip()
+
+
+def words(text):
+    """
+    Returns the words of a normalized text
+    """
+    return [w for w in WORD_SPLIT.split(text) if w]
+
+
+class ExerciseSearchIndex:
+    """
+    In-memory search index over the names and aliases of the exercises
+
+    The entries are kept per language, together with the image and thumbnail
+    URLs and the category name, so that a search does not need the database.
+    Each entry has its position in the order of all translations by category
+    and name, which orders the results within a rank across languages.
+
+    Matches on the name or an alias are ranked, from best to worst: exact
+    match, prefix, prefix of a word and substring. Only when nothing matches,
+    terms are compared fuzzily to the words of the names and aliases to
+    tolerate typos.
+    """
+
+    def __init__(self, version=None):
+        self.version = version
+        self.entries = defaultdict(list)
+        self.vocabulary = defaultdict(set)
+
+    @classmethod
+    def build(cls, version=None):
+        """
+        Builds the index from the database
+        """
+        # wger
+        from wger.exercises.models import Exercise
+
+        index = cls(version)
+
+        translations = Exercise.objects \
+            .select_related('exercise_base__category', 'exercise_base__main_image') \
+            .prefetch_related('alias_set') \
+            .order_by('exercise_base__category__name', 'name')
+
+        for position, translation in enumerate(translations):
+            image = None
+            thumbnail = None
+            image_obj = translation.exercise_base.main_image
+            if image_obj:
+                image = image_obj.image.url
+                thumbnail = get_thumbnail_url(image_obj.image, 'micro_cropped')
+
+            texts = [normalize(translation.name)]
+            texts += [normalize(alias.alias) for alias in translation.alias_set.all()]
+            entry_words = {word for text in texts for word in words(text)}
+
+            index.entries[translation.language_id].append(
+                {
+                    'id': translation.id,
+                    'position': position,
+                    'base_id': translation.exercise_base_id,
+                    'name': translation.name,
+                    'category': translation.exercise_base.category.name,
+                    'image': image,
+                    'image_thumbnail': thumbnail,
+                    'texts': texts,
+                    'words': entry_words,
+                }
+            )
+            index.vocabulary[translation.language_id].update(entry_words)
+
+        return index
+
+    @staticmethod
+    def rank(term, texts):
+        """
+        Returns the best rank of the term in the texts, or None if it does not match
+        """
+        best = None
+        for text in texts:
+            if text == term:
+                return RANK_EXACT
+            elif text.startswith(term):
+                rank = RANK_PREFIX
+            elif any(word.startswith(term) for word in words(text)):
+                rank = RANK_WORD_PREFIX
+            elif term in text:
+                rank = RANK_CONTAINS
+            else:
+                continue
+
+            best = rank if best is None else min(best, rank)
+        return best
+
+    def search(self, term, language_ids):
+        """
+        Returns the ranked entries matching the term in the given languages
+        """
+        term = normalize(term)
+        if not term:
+            return []
+
+        results = []
+        for language_id in language_ids:
+            for entry in self.entries.get(language_id, []):
+                rank = self.rank(term, entry['texts'])
+                if rank is not None:
+                    results.append((rank, entry))
+
+        if not results:
+            results = self.search_fuzzy(term, language_ids)
+
+        results.sort(key=lambda r: (r[0], r[1]['position']))
+        return [r[1] for r in results]
+
+    def search_fuzzy(self, term, language_ids):
+        """
+        Returns the entries where every word of the term is close to one of their words
+        """
+        terms = words(term)
+        if not terms or any(len(t) < FUZZY_MIN_LENGTH for t in terms):
+            return []
+
+        results = []
+        for language_id in language_ids:
+            vocabulary = self.vocabulary.get(language_id, set())
+            candidates = [
+                set(difflib.get_close_matches(t, vocabulary, n=10, cutoff=FUZZY_CUTOFF))
+                for t in terms
+            ]
+            if not all(candidates):
+                continue
+
+            for entry in self.entries[language_id]:
+                if all(entry['words'] & c for c in candidates):
+                    results.append((RANK_FUZZY, entry))
+        return results
+
+
+_index = None
+_lock = threading.Lock()
+
+
+def get_search_index():
+    """
+    Returns the search index of this process
+
+    The index is rebuilt when the version stamp in the cache changed, i.e.
+    after an exercise, alias, image or category was edited.
+    """
+    global _index
+
+    version = cache.get(cache_mapper.EXERCISE_SEARCH_VERSION_KEY)
+    if version is None:
+        version = reset_search_index()
+
+    index = _index
+    if index is None or index.version != version:
+        with _lock:
+            if _index is None or _index.version != version:
+                logger.debug('Building the exercise search index')
+                _index = ExerciseSearchIndex.build(version)
+            index = _index
+    return index
+
+
+def reset_search_index():
+    """
+    Sets a new version stamp, so that all processes rebuild their index
+
+    :return: the new version
+    """
+    version = uuid.uuid4().hex
+    cache.set(cache_mapper.EXERCISE_SEARCH_VERSION_KEY, version, None)
+    return version
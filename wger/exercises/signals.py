@@ -18,8 +18,12 @@
 import pathlib
 
 # Django
+from django.conf import settings
+from django.db import transaction
 from django.db.models.signals import (
+    m2m_changed,
     post_delete,
+    post_save,
     pre_delete,
     pre_save,
 )
@@ -27,17 +31,27 @@ from django.dispatch import receiver
 
 # Third Party
 from easy_thumbnails.files import get_thumbnailer
-from easy_thumbnails.signal_handlers import generate_aliases
-from easy_thumbnails.signals import saved_file
+from simple_history.signals import post_create_historical_record
 
 # wger
+from wger.exercises.facets import reset_facet_index
 from wger.exercises.models import (
+    Alias,
     DeletionLog,
     Exercise,
+    ExerciseAuthor,
     ExerciseBase,
+    ExerciseCategory,
+    ExerciseHistoryDiff,
     ExerciseImage,
     ExerciseVideo,
 )
+from wger.exercises.models.author import ExerciseAuthorHistoryMixin
+from wger.exercises.search import reset_search_index
+from wger.utils.thumbnails import (
+    delete_thumbnail_urls,
+    schedule_thumbnails,
+)
 
 
 @receiver(post_delete, sender=ExerciseImage)
@@ -48,6 +62,7 @@ def delete_exercise_image_on_delete(sender, instance, **kwargs):
 
     thumbnailer = get_thumbnailer(instance.image)
     thumbnailer.delete_thumbnails()
+    delete_thumbnail_urls(instance.image)
     instance.image.delete(save=False)
 
 
@@ -69,11 +84,32 @@ def delete_exercise_image_on_update(sender, instance, **kwargs):
     if not old_file == new_file:
         thumbnailer = get_thumbnailer(instance.image)
         thumbnailer.delete_thumbnails()
+        delete_thumbnail_urls(old_file)
         instance.image.delete(save=False)
 
 
-# Generate thumbnails when uploading a new image
-saved_file.connect(generate_aliases)
+@receiver(post_save, sender=ExerciseImage)
+@receiver(post_delete, sender=ExerciseImage)
+def update_main_image(sender, instance: ExerciseImage, **kwargs):
+    """
+    Point the exercise base to the image currently marked as main
+    """
+    main_image = ExerciseImage.objects.filter(
+        exercise_base_id=instance.exercise_base_id,
+        is_main=True,
+    ).order_by('id').first()
+    ExerciseBase.objects.filter(pk=instance.exercise_base_id).update(main_image=main_image)
+
+
+@receiver(post_save, sender=ExerciseImage)
+def generate_exercise_image_thumbnails(sender, instance: ExerciseImage, raw=False, **kwargs):
+    """
+    Generate the thumbnails of a new or changed image in the background
+    """
+    if raw or not settings.WGER_SETTINGS['USE_CELERY']:
+        return
+
+    transaction.on_commit(lambda: schedule_thumbnails(instance))
 
 
 @receiver(post_delete, sender=ExerciseVideo)
@@ -141,3 +177,100 @@ def add_deletion_log_video(sender, instance: ExerciseVideo, **kwargs):
         uuid=instance.uuid,
     )
     log.save()
+
+
+@receiver(post_create_historical_record)
+def add_exercise_author(sender, instance, history_instance, **kwargs):
+    """
+    Add the license author of a new historical record to the exercise authors
+    """
+    if not isinstance(instance, ExerciseAuthorHistoryMixin):
+        return
+
+    if history_instance.history_type == '-' or not history_instance.license_author:
+        return
+
+    ExerciseAuthor.objects.get_or_create(
+        model_type=instance.author_model_type,
+        object_id=instance.pk,
+        author=history_instance.license_author,
+        defaults={'exercise_base_id': instance.author_base_id},
+    )
+
+
+@receiver(post_create_historical_record)
+def add_exercise_history_diff(sender, instance, history_instance, **kwargs):
+    """
+    Store the changes of an updated exercise object for the history admin view
+    """
+    if instance._meta.app_label != 'exercises' or history_instance.history_type != '~':
+        return
+
+    previous = history_instance.prev_record
+    if previous:
+        ExerciseHistoryDiff.from_historical_record(history_instance, previous).save()
+
+
+@receiver(post_delete, sender=Exercise)
+@receiver(post_delete, sender=ExerciseImage)
+@receiver(post_delete, sender=ExerciseVideo)
+def delete_exercise_authors(sender, instance, **kwargs):
+    """
+    Remove the authors of deleted translations, images and videos
+
+    The authors of a deleted base are removed by the database cascade.
+    """
+    ExerciseAuthor.objects.filter(
+        model_type=instance.author_model_type,
+        object_id=instance.pk,
+    ).delete()
+
+
+@receiver(post_save, sender=Exercise)
+@receiver(post_save, sender=ExerciseImage)
+@receiver(post_save, sender=ExerciseVideo)
+def move_exercise_authors(sender, instance, raw=False, **kwargs):
+    """
+    Attribute the authors of translations, images and videos that were moved
+    to another base to the new one
+    """
+    if raw:
+        return
+
+    ExerciseAuthor.objects.filter(
+        model_type=instance.author_model_type,
+        object_id=instance.pk,
+    ).exclude(exercise_base_id=instance.exercise_base_id) \
+        .update(exercise_base_id=instance.exercise_base_id)
+
+
+@receiver(post_save, sender=ExerciseBase)
+@receiver(post_delete, sender=ExerciseBase)
+@receiver(post_save, sender=Exercise)
+@receiver(post_delete, sender=Exercise)
+@receiver(m2m_changed, sender=ExerciseBase.muscles.through)
+@receiver(m2m_changed, sender=ExerciseBase.muscles_secondary.through)
+@receiver(m2m_changed, sender=ExerciseBase.equipment.through)
+def reset_exercise_facets(sender, **kwargs):
+    """
+    Rebuild the exercise facet index when a base or its translations change
+    """
+    reset_facet_index()
+
+
+@receiver(post_save, sender=Exercise)
+@receiver(post_delete, sender=Exercise)
+@receiver(post_save, sender=Alias)
+@receiver(post_delete, sender=Alias)
+@receiver(post_save, sender=ExerciseBase)
+@receiver(post_delete, sender=ExerciseBase)
+@receiver(post_save, sender=ExerciseImage)
+@receiver(post_delete, sender=ExerciseImage)
+@receiver(post_save, sender=ExerciseCategory)
+@receiver(post_delete, sender=ExerciseCategory)
+def reset_exercise_search(sender, **kwargs):
+    """
+    Rebuild the exercise search index when the names, aliases, categories or
+    main images change
+    """
+    reset_search_index()
@@ -24,6 +24,7 @@ from celery.schedules import crontab
 
 # wger
 from wger.celery_configuration import app
+from wger.exercises.cache import warmup_exercise_api_cache
 from wger.exercises.sync import (
     delete_entries,
     download_exercise_images,
@@ -52,6 +53,7 @@ def sync_exercises_task():
     sync_equipment(logger.info)
     sync_exercises(logger.info)
     delete_entries(logger.info)
+    warmup_exercise_api_cache(logger.info)
 
 
 @app.task
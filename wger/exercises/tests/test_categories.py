@@ -97,5 +97,7 @@ class ExerciseCategoryApiTestCase(api_base_test.ApiBaseResourceTestCase):
     """
     pk = 2
     resource = ExerciseCategory
+    query_budget_detail = 5
+    query_budget_overview = 6
     private_resource = False
     overview_cached = True
@@ -115,5 +115,7 @@ class EquipmentApiTestCase(api_base_test.ApiBaseResourceTestCase):
     """
     pk = 1
     resource = Equipment
+    query_budget_detail = 6
+    query_budget_overview = 7
     private_resource = False
     overview_cached = True
@@ -0,0 +1,131 @@
+#  This file is part of wger Workout Manager <https://github.com/wger-project>.
+#
+#  wger Workout Manager is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Affero General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  wger Workout Manager is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Affero General Public License for more details.
+#
+#  You should have received a copy of the GNU Affero General Public License
+#  along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+# Standard Library
+import importlib
+from io import StringIO
+
+# Django
+from django.apps import apps
+from django.core.management import call_command
+
+# wger
+from wger.core.tests.base_testcase import WgerTestCase
+from wger.exercises.models import (
+    ExerciseAuthor,
+    ExerciseBase,
+)
+
+
+class ExerciseAuthorTestCase(WgerTestCase):
+    """
+    Tests the denormalized exercise authors
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.base = ExerciseBase.objects.get(pk=1)
+        self.translation = self.base.exercises.first()
+
+        self.base.license_author = 'Author 1'
+        self.base.save()
+        self.base.license_author = 'Author 2'
+        self.base.save()
+        self.translation.license_author = 'Author 3'
+        self.translation.save()
+
+    def test_authors_added_on_save(self):
+        """
+        Test that the authors of new historical records are added
+        """
+        self.assertEqual(self.base.author_history, {'Author 1', 'Author 2'})
+        self.assertEqual(self.translation.author_history, {'Author 3'})
+        self.assertEqual(self.base.total_authors_history, {'Author 1', 'Author 2', 'Author 3'})
+
+        # Authors are not added twice
+        self.base.save()
+        self.assertEqual(ExerciseAuthor.objects.filter(exercise_base=self.base).count(), 3)
+
+    def test_authors_deleted(self):
+        """
+        Test that the authors of deleted translations are removed
+        """
+        self.translation.delete()
+        self.assertEqual(self.base.total_authors_history, {'Author 1', 'Author 2'})
+
+    def test_same_as_history(self):
+        """
+        Test that the author history is the same as read from the history tables
+        """
+        for model in (self.base, self.translation):
+            authors = {h.license_author for h in model.history.all() if h.license_author}
+            self.assertEqual(model.author_history, authors)
+
+    def test_prefetch_authors(self):
+        """
+        Test that prefetched authors are read without further queries
+        """
+        base = ExerciseBase.objects.prefetch_related('authors', 'exercises').get(pk=1)
+        base.prefetch_authors()
+
+        with self.assertNumQueries(0):
+            self.assertEqual(base.total_authors_history, {'Author 1', 'Author 2', 'Author 3'})
+            self.assertEqual(base.author_history, {'Author 1', 'Author 2'})
+            for translation in base.exercises.all():
+                self.assertEqual(
+                    translation.author_history,
+                    {'Author 3'} if translation.pk == self.translation.pk else set(),
+                )
+
+    def test_rebuild_command(self):
+        """
+        Test that the command rebuilds the authors from the history
+        """
+        ExerciseAuthor.objects.all().delete()
+
+        out = StringIO()
+        call_command('rebuild-exercise-authors', stdout=out, no_color=True)
+
+        self.assertIn('Added 3 exercise authors', out.getvalue())
+        self.assertEqual(self.base.author_history, {'Author 1', 'Author 2'})
+        self.assertEqual(self.base.total_authors_history, {'Author 1', 'Author 2', 'Author 3'})
+
+    def test_authors_moved(self):
+        """
+        Test that the authors follow a translation that is moved to another base
+        """
+        other_base = ExerciseBase.objects.get(pk=2)
+        self.translation.exercise_base = other_base
+        self.translation.save()
+
+        authors = ExerciseAuthor.objects.filter(exercise_base=other_base)
+        self.assertEqual(set(authors.values_list('author', flat=True)), {'Author 3'})
+        self.assertFalse(
+            ExerciseAuthor.objects.filter(exercise_base=self.base, author='Author 3').exists()
+        )
+
+    def test_migration(self):
+        """
+        Test that the frozen rebuild in the migration gives the same result
+        """
+        migration = importlib.import_module('wger.exercises.migrations.0029_rebuild_exerciseauthor')
+        expected = set(ExerciseAuthor.objects.values_list('model_type', 'object_id', 'author'))
+
+        ExerciseAuthor.objects.all().delete()
+        migration.rebuild_authors(apps, None)
+        self.assertEqual(
+            set(ExerciseAuthor.objects.values_list('model_type', 'object_id', 'author')),
+            expected,
+        )
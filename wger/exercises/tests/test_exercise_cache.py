@@ -0,0 +1,98 @@
+#  This file is part of wger Workout Manager <https://github.com/wger-project>.
+#
+#  wger Workout Manager is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Affero General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  wger Workout Manager is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Affero General Public License for more details.
+#
+#  You should have received a copy of the GNU Affero General Public License
+#  along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+# Standard Library
+from io import StringIO
+
+# Django
+from django.core.cache import cache
+from django.core.management import call_command
+
+# wger
+from wger.core.tests.base_testcase import WgerTestCase
+from wger.exercises.api.serializers import ExerciseBaseInfoSerializer
+from wger.exercises.cache import warmup_exercise_api_cache
+from wger.exercises.models import ExerciseBase
+from wger.utils.cache import CacheKeyMapper
+
+
+class WarmupExerciseCacheTestCase(WgerTestCase):
+    """
+    Tests warming the cache of the exercise base info API
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.bases = list(ExerciseBase.objects.filter(exercises__isnull=False).distinct())
+        self.keys = [CacheKeyMapper.get_exercise_api_key(base.uuid) for base in self.bases]
+
+    def test_warmup(self):
+        """
+        Test that all exercises are cached with the same data as the serializer
+        """
+        cached, skipped = warmup_exercise_api_cache(lambda x: None)
+
+        self.assertEqual(cached, len(self.bases))
+        self.assertEqual(skipped, 0)
+        for base, key in zip(self.bases, self.keys):
+            self.assertEqual(
+                cache.get(key),
+                ExerciseBaseInfoSerializer().to_uncached_representation(base),
+            )
+
+    def test_warmup_skips_current_entries(self):
+        """
+        Test that entries that are still up to date are not built again
+        """
+        warmup_exercise_api_cache(lambda x: None)
+        self.assertEqual(warmup_exercise_api_cache(lambda x: None), (0, len(self.bases)))
+        self.assertEqual(
+            warmup_exercise_api_cache(lambda x: None, force=True),
+            (len(self.bases), 0),
+        )
+
+        # Outdated entries are built again
+        cache.set(self.keys[0], {'last_update_global': '2000-01-01T00:00:00Z'})
+        self.assertEqual(
+            warmup_exercise_api_cache(lambda x: None),
+            (1, len(self.bases) - 1),
+        )
+
+    def test_warmup_queries(self):
+        """
+        Test that the number of queries does not depend on the number of exercises
+        """
+        with self.assertNumQueries(11):
+            warmup_exercise_api_cache(lambda x: None)
+
+        # One batch per exercise
+        with self.assertNumQueries(1 + 10 * len(self.bases)):
+            warmup_exercise_api_cache(lambda x: None, force=True, batch_size=1)
+
+    def test_command(self):
+        """
+        Test the management command
+        """
+        out = StringIO()
+        call_command(
+            'warmup-exercise-api-cache',
+            exercise_base_id=self.bases[0].pk,
+            stdout=out,
+            no_color=True,
+        )
+
+        self.assertIn('cached: 1, up to date: 0', out.getvalue())
+        self.assertTrue(cache.get(self.keys[0]))
+        self.assertIsNone(cache.get(self.keys[1]))
@@ -26,6 +26,7 @@ from wger.core.tests.base_testcase import (
 )
 from wger.exercises.models import (
     Exercise,
+    ExerciseBase,
     ExerciseImage,
 )
 
@@ -103,6 +104,44 @@ class MainImageTestCase(WgerTestCase):
         self.assertFalse(ExerciseImage.objects.get(pk=pk4).is_main)
         self.assertFalse(ExerciseImage.objects.get(pk=pk5).is_main)
 
+    def test_main_image_pointer(self):
+        """
+        Tests that the base points to the current main image
+        """
+        exercise = Exercise.objects.get(pk=2)
+        base = exercise.exercise_base
+        ExerciseImage.objects.filter(exercise_base=base).delete()
+        self.assertIsNone(ExerciseBase.objects.get(pk=base.pk).main_image)
+
+        pk1 = self.save_image(exercise, 'protestschwein.jpg')
+        pk2 = self.save_image(exercise, 'wildschwein.jpg')
+        self.assertEqual(ExerciseBase.objects.get(pk=base.pk).main_image_id, pk1)
+
+        image = ExerciseImage.objects.get(pk=pk2)
+        image.is_main = True
+        image.save()
+        self.assertEqual(ExerciseBase.objects.get(pk=base.pk).main_image_id, pk2)
+        self.assertEqual(Exercise.objects.get(pk=2).main_image.pk, pk2)
+
+        image.delete()
+        self.assertEqual(
+            ExerciseBase.objects.get(pk=base.pk).main_image,
+            ExerciseImage.objects.filter(exercise_base=base, is_main=True).first(),
+        )
+
+    def test_main_image_select_related(self):
+        """
+        Tests that the main images of many bases are loaded in one query
+        """
+        bases = list(ExerciseBase.objects.select_related('main_image'))
+        with self.assertNumQueries(0):
+            images = [base.main_image for base in bases]
+
+        self.assertEqual(
+            images,
+            [base.exerciseimage_set.filter(is_main=True).order_by('id').first() for base in bases],
+        )
+
 
 # TODO: add POST and DELETE tests
 class ExerciseImagesApiTestCase(
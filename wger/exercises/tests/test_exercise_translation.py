@@ -17,10 +17,12 @@ import json
 
 # Django
 from django.core.cache import cache
+from django.db import connection
 from django.template import (
     Context,
     Template,
 )
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 
 # Third Party
@@ -33,8 +35,10 @@ from wger.core.tests.base_testcase import (
     WgerDeleteTestCase,
     WgerTestCase,
 )
+from wger.exercises.api.serializers import ExerciseBaseInfoSerializer
 from wger.exercises.models import (
     Exercise,
+    ExerciseBase,
     Muscle,
 )
 from wger.utils.cache import cache_mapper
@@ -305,6 +309,73 @@ class ExerciseBaseInfoApiTestCase(
     def get_resource_name(self):
         return 'exercisebaseinfo'
 
+    def get_overview(self):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(self.url + '?limit=100')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response, len(context)
+
+    def test_overview_number_of_queries(self):
+        """
+        Test that a cold overview page needs a fixed number of queries
+        """
+        cache.clear()
+        response, queries = self.get_overview()
+        self.assertEqual(len(response.data['results']), ExerciseBase.objects.count())
+        self.assertLessEqual(queries, 24)
+
+        # Warm cache, only the validators are calculated
+        response_cached, queries = self.get_overview()
+        self.assertEqual(response.data, response_cached.data)
+        self.assertLessEqual(queries, 8)
+
+    def test_overview_partially_cached(self):
+        """
+        Test that only the missing entries of a list are built
+        """
+        cache.clear()
+        data = ExerciseBaseInfoSerializer(ExerciseBase.objects.all(), many=True).data
+
+        base = ExerciseBase.objects.get(pk=1)
+        cache.delete(cache_mapper.get_exercise_api_key(base.uuid))
+        with CaptureQueriesContext(connection) as context:
+            data_partial = ExerciseBaseInfoSerializer(ExerciseBase.objects.all(), many=True).data
+
+        self.assertEqual(data, data_partial)
+        self.assertTrue(cache.get(cache_mapper.get_exercise_api_key(base.uuid)))
+        self.assertLessEqual(len(context), 15)
+
+    def test_conditional_get(self):
+        """
+        Test that clients with a current copy get a 304 response
+        """
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response['ETag'])
+        self.assertNotIn('Last-Modified', response)
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertFalse(response.content)
+
+        # A change in a translation changes the ETag
+        etag = response['ETag']
+        exercise = Exercise.objects.get(pk=1)
+        exercise.name = 'Changed name'
+        exercise.save()
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_conditional_get_different_filters(self):
+        """
+        Test that the ETag depends on the filters
+        """
+        response = self.client.get(self.url)
+        response_filtered = self.client.get(self.url + '?category=2')
+        self.assertNotEqual(response['ETag'], response_filtered['ETag'])
+
 
 class ExerciseCustomApiTestCase(ExerciseCrudApiTestCase):
     pk = 1
@@ -0,0 +1,170 @@
+#  This file is part of wger Workout Manager <https://github.com/wger-project>.
+#
+#  wger Workout Manager is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Affero General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  wger Workout Manager is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Affero General Public License for more details.
+#
+#  You should have received a copy of the GNU Affero General Public License
+#  along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+# Standard Library
+import uuid
+
+# Django
+from django.urls import reverse
+
+# wger
+from wger.core.tests.base_testcase import WgerTestCase
+from wger.exercises.facets import (
+    filter_bases,
+    get_facet_index,
+)
+from wger.exercises.models import (
+    Exercise,
+    ExerciseBase,
+    Muscle,
+)
+
+
+class ExerciseFacetIndexTestCase(WgerTestCase):
+    """
+    Tests the in-memory exercise facet index
+    """
+
+    def assert_same_as_database(self, filters, queryset):
+        expected = sorted(set(queryset.values_list('id', flat=True)))
+        self.assertEqual(get_facet_index().filter(filters), expected)
+        self.assertEqual(
+            sorted(set(ExerciseBase.objects.filter(id__in=filter_bases(filters))
+                       .values_list('id', flat=True))),
+            expected,
+        )
+
+    def test_filter(self):
+        """
+        Test that the index returns the same bases as the database
+        """
+        bases = ExerciseBase.objects.all()
+
+        self.assert_same_as_database({}, bases)
+        self.assert_same_as_database({'category': [2]}, bases.filter(category=2))
+        self.assert_same_as_database({'muscles': [1, 2]}, bases.filter(muscles__in=[1, 2]))
+        self.assert_same_as_database(
+            {'muscles_secondary': [2]},
+            bases.filter(muscles_secondary=2),
+        )
+        self.assert_same_as_database({'equipment': [1]}, bases.filter(equipment=1))
+        self.assert_same_as_database({'language': [1]}, bases.filter(exercises__language=1))
+        self.assert_same_as_database(
+            {
+                'category': [2],
+                'equipment': [1, 2]
+            },
+            bases.filter(category=2, equipment__in=[1, 2]),
+        )
+        self.assert_same_as_database({'muscles': [999]}, bases.none())
+
+    def test_facet_counts(self):
+        """
+        Test that the counts of a facet ignore the filter on that facet
+        """
+        counts = get_facet_index().facet_counts({'category': [2], 'equipment': [1]})
+
+        for category, count in counts['category'].items():
+            self.assertEqual(
+                count,
+                ExerciseBase.objects.filter(category=category, equipment=1).count(),
+            )
+        for muscle, count in counts['muscles'].items():
+            self.assertEqual(
+                count,
+                ExerciseBase.objects.filter(muscles=muscle, category=2, equipment=1).count(),
+            )
+
+    def test_rebuilt_on_change(self):
+        """
+        Test that the index is rebuilt when a base changes
+        """
+        index = get_facet_index()
+        self.assertIs(get_facet_index(), index)
+
+        base = ExerciseBase.objects.exclude(muscles=3).first()
+        base.muscles.add(Muscle.objects.get(pk=3))
+        self.assertIsNot(get_facet_index(), index)
+        self.assertIn(base.id, get_facet_index().filter({'muscles': [3]}))
+
+        base.category_id = 3
+        base.save()
+        self.assertIn(base.id, get_facet_index().filter({'category': [3]}))
+
+    def test_dense_positions(self):
+        """
+        Test that the size of the bitsets depends on the number of bases, not their IDs
+        """
+        base = ExerciseBase.objects.get(pk=1)
+        muscles = list(base.muscles.all())
+        base.pk = 1000000
+        base.uuid = uuid.uuid4()
+        base.save()
+        base.muscles.set(muscles)
+
+        index = get_facet_index()
+        self.assertEqual(index.all.bit_length(), ExerciseBase.objects.count())
+        self.assertIn(1000000, index.filter({'muscles': [m.id for m in muscles]}))
+        self.assertEqual(index.filter({})[-1], 1000000)
+
+    def test_no_queries_when_current(self):
+        """
+        Test that a current index does not query the database
+        """
+        get_facet_index()
+        with self.assertNumQueries(0):
+            get_facet_index().facet_counts({'muscles': [1]})
+
+
+class ExerciseFacetsApiTestCase(WgerTestCase):
+    """
+    Tests the exercise facets endpoint
+    """
+
+    def test_facets(self):
+        response = self.client.get(reverse('exercise-facets'), {'category': '2', 'language': '1'})
+        self.assertEqual(response.status_code, 200)
+
+        result = response.json()
+        base_ids = list(
+            ExerciseBase.objects.filter(category=2, exercises__language=1).order_by('id')
+            .values_list('id', flat=True).distinct()
+        )
+        self.assertEqual(result['base_ids'], base_ids)
+        self.assertEqual(result['count'], len(base_ids))
+        self.assertEqual(
+            set(result['facets']),
+            {'category', 'muscles', 'muscles_secondary', 'equipment', 'language', 'license'},
+        )
+
+    def test_invalid_values_ignored(self):
+        response = self.client.get(reverse('exercise-facets'), {'muscles': 'abc'})
+        self.assertEqual(response.json()['count'], ExerciseBase.objects.count())
+
+    def test_exercise_endpoint_filter(self):
+        """
+        Test that the exercise endpoint filters in the database without duplicates
+        """
+        response = self.client.get(reverse('exercise-list'), {'muscles': '1,2', 'limit': 100})
+        ids = [e['id'] for e in response.json()['results']]
+
+        self.assertEqual(len(ids), len(set(ids)))
+        self.assertEqual(
+            set(ids),
+            set(
+                Exercise.objects.filter(exercise_base__muscles__in=[1, 2])
+                .values_list('id', flat=True)
+            ),
+        )
@@ -12,11 +12,15 @@
 #
 # You should have received a copy of the GNU Affero General Public License
 # Standard Library
+import importlib
+from io import StringIO
 from time import sleep
 
 # Django
+from django.apps import apps
 from django.contrib.auth.models import User
 from django.contrib.contenttypes.models import ContentType
+from django.core.management import call_command
 from django.urls import reverse
 
 # Third Party
@@ -24,8 +28,12 @@ from actstream import action as actstream_action
 
 # wger
 from wger.core.tests.base_testcase import WgerTestCase
-from wger.exercises.models import Exercise
+from wger.exercises.models import (
+    Exercise,
+    ExerciseHistoryDiff,
+)
 from wger.exercises.views.helper import StreamVerbs
+from wger.exercises.views.history import HISTORY_PAGE_SIZE
 
 
 class ExerciseHistoryControl(WgerTestCase):
@@ -83,3 +91,157 @@ class ExerciseHistoryControl(WgerTestCase):
 
         exercise = Exercise.objects.get(pk=2)
         self.assertEqual(exercise.description, 'Boring exercise')
+
+
+class ExerciseHistoryDiffTestCase(WgerTestCase):
+    """
+    Test the precomputed history diffs and the paginated history view
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.user_login()
+        self.user = User.objects.get(username='admin')
+
+    def update_exercise(self, name):
+        exercise = Exercise.objects.get(pk=2)
+        exercise.name = name
+        exercise.save()
+        actstream_action.send(self.user, verb=StreamVerbs.UPDATED.value, action_object=exercise)
+        return exercise
+
+    def test_diff_stored(self):
+        """
+        Test that the diff is stored when a historical record is created
+        """
+        exercise = Exercise.objects.get(pk=2)
+        exercise.save()
+        self.update_exercise('Very cool exercise!')
+
+        record = exercise.history.order_by('history_date').last()
+        diff = ExerciseHistoryDiff.objects.get(history_id=record.history_id)
+        self.assertEqual(diff.previous_history_id, record.prev_record.history_id)
+        self.assertEqual(
+            diff.changes,
+            [{
+                'field': 'name',
+                'old': 'Very cool exercise',
+                'new': 'Very cool exercise!'
+            }],
+        )
+
+    def test_view_changes(self):
+        """
+        Test that the view shows the changes and the record to revert to
+        """
+        Exercise.objects.get(pk=2).save()
+        exercise = self.update_exercise('Very cool exercise!')
+
+        response = self.client.get(reverse('exercise:history:overview'))
+        entry = response.context['context'][0]
+        record = exercise.history.as_of(entry['stream'].timestamp)._history
+
+        self.assertEqual(entry['history_id'], record.prev_record.history_id)
+        self.assertEqual(entry['delta']['changes'][0]['new'], 'Very cool exercise!')
+        self.assertContains(response, 'Very cool exercise!')
+
+    def test_pagination(self):
+        """
+        Test the cursor pagination
+        """
+        Exercise.objects.get(pk=2).save()
+        for i in range(HISTORY_PAGE_SIZE + 5):
+            self.update_exercise(f'Exercise {i}')
+
+        response = self.client.get(reverse('exercise:history:overview'))
+        self.assertEqual(len(response.context['context']), HISTORY_PAGE_SIZE)
+        self.assertEqual(
+            response.context['context'][0]['delta']['changes'][0]['new'],
+            f'Exercise {HISTORY_PAGE_SIZE + 4}',
+        )
+
+        response = self.client.get(
+            reverse('exercise:history:overview') + '?' + response.context['next_query']
+        )
+        self.assertEqual(len(response.context['context']), 5)
+        self.assertIsNone(response.context['next_query'])
+        self.assertEqual(
+            response.context['context'][-1]['delta']['changes'][0]['new'],
+            'Exercise 0',
+        )
+
+    def test_filters(self):
+        """
+        Test filtering by verb and user
+        """
+        exercise = Exercise.objects.get(pk=1)
+        actstream_action.send(self.user, verb=StreamVerbs.CREATED.value, action_object=exercise)
+        Exercise.objects.get(pk=2).save()
+        self.update_exercise('Very cool exercise!')
+
+        url = reverse('exercise:history:overview')
+        response = self.client.get(url, {'verb': StreamVerbs.CREATED.value})
+        self.assertEqual([e['verb'] for e in response.context['context']], ['created'])
+
+        response = self.client.get(url, {'user': 'admin'})
+        self.assertEqual(len(response.context['context']), 2)
+
+        response = self.client.get(url, {'user': 'test'})
+        self.assertEqual(len(response.context['context']), 0)
+
+    def test_queries_bounded(self):
+        """
+        Test that the number of queries does not depend on the number of entries
+        """
+        Exercise.objects.get(pk=2).save()
+        self.update_exercise('Exercise')
+
+        with self.assertNumQueries(14):
+            self.client.get(reverse('exercise:history:overview'))
+
+        for i in range(10):
+            self.update_exercise(f'Exercise {i}')
+
+        with self.assertNumQueries(14):
+            self.client.get(reverse('exercise:history:overview'))
+
+    def test_rebuild_command(self):
+        """
+        Test that the command rebuilds the diffs from the historical records
+        """
+        Exercise.objects.get(pk=2).save()
+        self.update_exercise('Very cool exercise!')
+        diffs = list(ExerciseHistoryDiff.objects.values('history_id', 'changes'))
+        ExerciseHistoryDiff.objects.all().delete()
+
+        out = StringIO()
+        call_command('rebuild-exercise-history-diffs', stdout=out, no_color=True)
+
+        self.assertIn('Added 1 history diffs', out.getvalue())
+        self.assertEqual(list(ExerciseHistoryDiff.objects.values('history_id', 'changes')), diffs)
+
+    def test_migration(self):
+        """
+        Test that the frozen rebuild in the migration gives the same diffs as the command
+        """
+        Exercise.objects.get(pk=2).save()
+        self.update_exercise('Very cool exercise!')
+        call_command('rebuild-exercise-history-diffs', stdout=StringIO())
+        diffs = list(
+            ExerciseHistoryDiff.objects.order_by('id')
+            .values('content_type', 'object_id', 'history_id', 'previous_history_id', 'changes')
+        )
+        self.assertTrue(diffs)
+
+        migration = importlib.import_module(
+            'wger.exercises.migrations.0030_rebuild_exercisehistorydiff'
+        )
+        migration.rebuild_diffs(apps, None)
+        self.assertEqual(
+            list(
+                ExerciseHistoryDiff.objects.order_by('id').values(
+                    'content_type', 'object_id', 'history_id', 'previous_history_id', 'changes'
+                )
+            ),
+            diffs,
+        )
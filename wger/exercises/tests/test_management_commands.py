@@ -12,6 +12,9 @@
 #
 # You should have received a copy of the GNU Affero General Public License
 # Standard Library
+import csv
+import os
+import tempfile
 from io import StringIO
 from unittest.mock import patch
 
@@ -134,3 +137,50 @@ class TestHealthCheckManagementCommands(WgerTestCase):
         call_command('exercises-health-check', '--delete-duplicate-translations', stdout=self.out)
         self.assertIn("Deleting all but first fr translation", self.out.getvalue())
         self.assertRaises(Exercise.DoesNotExist, Exercise.objects.get, pk=5)
+
+    def test_queries_independent_of_exercises(self):
+        """
+        Test that finding the problems needs a fixed number of queries
+        """
+        exercise = Exercise.objects.get(pk=1)
+        exercise.language_id = 3
+        exercise.save()
+        Exercise.objects.get(pk=2).delete()
+
+        with self.assertNumQueries(4):
+            call_command('exercises-health-check', stdout=self.out)
+
+    def test_timing_output(self):
+        call_command('exercises-health-check', verbosity=2, stdout=self.out)
+        self.assertIn(f'Checked {ExerciseBase.objects.count()} exercises', self.out.getvalue())
+
+
+class TestExerciseCleanupManagementCommand(WgerTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.cwd = os.getcwd()
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        os.chdir(self.tmp_dir.name)
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        self.tmp_dir.cleanup()
+        super().tearDown()
+
+    def test_export(self):
+        out = StringIO()
+        call_command('exercise-cleanup', stdout=out, no_color=True)
+        self.assertIn(f'Wrote {ExerciseBase.objects.count()} exercises', out.getvalue())
+
+        with open('exercise_cleanup.csv', newline='') as csvfile:
+            rows = list(csv.DictReader(csvfile))
+
+        self.assertEqual(len(rows), ExerciseBase.objects.count())
+        base = ExerciseBase.objects.get(pk=1)
+        row = next(r for r in rows if r['base:uuid'] == str(base.uuid))
+        self.assertEqual(row['base:category'], base.category.name)
+        self.assertEqual(row['en:name'], 'An exercise')
+        self.assertEqual(row['en:alias'], 'a different name')
+        self.assertEqual(row['fr:name'], 'Test exercise 123')
+        self.assertEqual(row['de:uuid'], '')
@@ -102,6 +102,8 @@ class MuscleApiTestCase(api_base_test.ApiBaseResourceTestCase):
     """
     pk = 1
     resource = Muscle
+    query_budget_detail = 6
+    query_budget_overview = 7
     private_resource = False
     overview_cached = True
     data = {'name': 'The name', 'is_front': True, 'name_en': 'name en'}
@@ -116,3 +118,22 @@ class MuscleApiTestCase(api_base_test.ApiBaseResourceTestCase):
         self.assertIn(
             "images/muscles/secondary/muscle-1.svg", response_object["image_url_secondary"]
         )
+
+    def test_conditional_get(self):
+        """
+        Test that muscles, which have no modification date, still get an ETag
+        that changes with the data
+        """
+        response = self.client.get(self.url)
+        etag = response['ETag']
+        self.assertNotIn('Last-Modified', response)
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+        muscle = Muscle.objects.get(pk=1)
+        muscle.name_en = 'New name'
+        muscle.save()
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
@@ -0,0 +1,96 @@
+# This file is part of wger Workout Manager.
+#
+# wger Workout Manager is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# wger Workout Manager is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+
+# Django
+from django.core.cache import cache
+from django.urls import reverse
+
+# wger
+from wger.core.tests.base_testcase import WgerTestCase
+from wger.exercises.models import (
+    Exercise,
+    ExerciseBase,
+)
+
+
+class ExerciseQueryBudgetTestCase(WgerTestCase):
+    """
+    Tests the number of queries of the exercise endpoints
+    """
+
+    def add_exercises(self, count=5):
+        """
+        Adds exercises with muscles, equipment and an english translation
+        """
+        for i in range(count):
+            base = ExerciseBase.objects.create(category_id=2)
+            base.muscles.add(1)
+            base.muscles_secondary.add(2)
+            base.equipment.add(1)
+            Exercise.objects.create(
+                exercise_base=base,
+                name=f'Budget exercise {i}',
+                description='A description',
+                language_id=2,
+            )
+
+    def test_exercise_base_info(self):
+        """
+        Test the exercise base info overview endpoint
+        """
+        url = reverse('exercisebaseinfo-list')
+        self.client.get(url)
+        with self.assertQueryBudget(8):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertNoQueryGrowth(lambda: self.client.get(url), self.add_exercises)
+
+    def test_exercise_info(self):
+        """
+        Test the exercise info overview endpoint
+
+        The translation based endpoints still read the fields of the base for
+        every translation, so only the budget of the uncached request is checked.
+        """
+        url = reverse('exerciseinfo-list')
+        self.client.get(url)
+        cache.clear()
+        with self.assertQueryBudget(171):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+
+    def test_exercise_api(self):
+        """
+        Test the exercise translation overview endpoint
+        """
+        url = reverse('exercise-list')
+        self.client.get(url)
+        cache.clear()
+        with self.assertQueryBudget(108):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+
+    def test_search(self):
+        """
+        Test the exercise search endpoint
+        """
+        url = reverse('exercise-search')
+        self.client.get(url, {'term': 'exercise'})
+        with self.assertQueryBudget(4):
+            response = self.client.get(url, {'term': 'exercise'})
+        self.assertEqual(response.status_code, 200)
+        self.assertNoQueryGrowth(
+            lambda: self.client.get(url, {'term': 'exercise'}),
+            self.add_exercises,
+        )
@@ -0,0 +1,112 @@
+#  This file is part of wger Workout Manager <https://github.com/wger-project>.
+#
+#  wger Workout Manager is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Affero General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  wger Workout Manager is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Affero General Public License for more details.
+#
+#  You should have received a copy of the GNU Affero General Public License
+#  along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+# wger
+from wger.core.tests.base_testcase import WgerTestCase
+from wger.exercises.models import (
+    Alias,
+    Exercise,
+)
+from wger.exercises.search import get_search_index
+
+
+class ExerciseSearchIndexTestCase(WgerTestCase):
+    """
+    Tests the in-memory exercise search index
+    """
+
+    def search(self, term, language_ids=(2, )):
+        return [entry['id'] for entry in get_search_index().search(term, language_ids)]
+
+    def test_ranking(self):
+        """
+        Test that better matches are ranked first
+        """
+        exercise = Exercise.objects.get(pk=3)
+        exercise.name = 'Exercise'
+        exercise.save()
+
+        # Exact, prefix of a word, then substring
+        self.assertEqual(self.search('exercise')[0], 3)
+        self.assertEqual(self.search('ool'), [2])
+        self.assertEqual(self.search('cool'), [2])
+
+    def test_same_as_database(self):
+        """
+        Test that the index finds the same exercises as a database search
+        """
+        for term in ('exercise', 'ing', 'demo', 'e'):
+            self.assertEqual(
+                set(self.search(term)),
+                set(
+                    Exercise.objects.filter(name__icontains=term,
+                                            language=2).values_list('id', flat=True)
+                ),
+            )
+
+    def test_alias(self):
+        """
+        Test that exercises are found by their aliases
+        """
+        self.assertIn(1, self.search('a different'))
+
+        Alias.objects.create(exercise_id=3, alias='Skull crusher')
+        self.assertEqual(self.search('skull'), [3])
+
+        Alias.objects.filter(exercise_id=3).delete()
+        self.assertEqual(self.search('skull'), [])
+
+    def test_fuzzy(self):
+        """
+        Test that terms with typos are matched if nothing else does
+        """
+        self.assertEqual(self.search('borring'), [3])
+        self.assertEqual(self.search('Foobar'), [])
+
+        # Short terms are not matched fuzzily
+        self.assertEqual(self.search('xyz'), [])
+
+    def test_languages(self):
+        """
+        Test that only the given languages are searched
+        """
+        self.assertEqual(self.search('Testübung', [2]), [])
+        self.assertEqual(self.search('Testübung', [1]), [7])
+        self.assertEqual(self.search('testübung', [1, 2]), [7])
+
+    def test_ranking_across_languages(self):
+        """
+        Test that equally ranked results of several languages keep the order by
+        category and name
+        """
+        for pk, name in ((7, 'Curl B'), (3, 'Curl A')):
+            exercise = Exercise.objects.get(pk=pk)
+            exercise.name = name
+            exercise.save()
+
+        expected = list(
+            Exercise.objects.filter(pk__in=(3, 7))
+            .order_by('exercise_base__category__name', 'name').values_list('id', flat=True)
+        )
+        self.assertEqual(self.search('curl', [1, 2]), expected)
+        self.assertEqual(self.search('curl', [2, 1]), expected)
+
+    def test_no_queries(self):
+        """
+        Test that a current index answers without the database
+        """
+        get_search_index()
+        with self.assertNumQueries(0):
+            self.search('exercise')
@@ -15,10 +15,13 @@
 
 # Standard Library
 import logging
+from collections import defaultdict
 
 # Django
 from django.contrib.auth.decorators import permission_required
+from django.contrib.auth.models import User
 from django.contrib.contenttypes.models import ContentType
+from django.db.models import Q
 from django.http import HttpResponseRedirect
 from django.shortcuts import (
     get_object_or_404,
@@ -31,41 +34,143 @@ from actstream import action as actstream_action
 from actstream.models import Action
 
 # wger
+from wger.exercises.forms import HistoryFilterForm
+from wger.exercises.models import ExerciseHistoryDiff
 from wger.exercises.views.helper import StreamVerbs
 
 
 logger = logging.getLogger(__name__)
 
+HISTORY_PAGE_SIZE = 50
+"""
+Number of actions shown per page in the history admin view
+"""
+
+
+def filter_actions(actions, form):
+    """
+    Applies the filters of the history filter form to the actions
+    """
+    if not form.is_valid():
+        return actions
+
+    if form.cleaned_data['date']:
+        actions = actions.filter(timestamp__date=form.cleaned_data['date'])
+
+    if form.cleaned_data['verb']:
+        actions = actions.filter(verb=form.cleaned_data['verb'])
+
+    if form.cleaned_data['user']:
+        user = User.objects.filter(username=form.cleaned_data['user']).first()
+        if not user:
+            return actions.none()
+
+        actions = actions.filter(
+            actor_content_type=ContentType.objects.get_for_model(User),
+            actor_object_id=str(user.pk),
+        )
+
+    return actions
+
+
+def get_history_diffs(actions):
+    """
+    Returns the diff of the historical record each updated action refers to
+
+    The diffs of all actions are loaded with a single query. The one for an
+    action is the most recent one of its object that is not newer than the
+    action, i.e. the same record history.as_of(action.timestamp) would find.
+
+    :return: dictionary with the action ID as key
+    """
+    updated = [a for a in actions if a.verb == StreamVerbs.UPDATED.value and a.action_object]
+    if not updated:
+        return {}
+
+    object_ids = defaultdict(set)
+    for action in updated:
+        object_ids[action.action_object_content_type_id].add(action.action_object.pk)
+
+    query = Q()
+    for content_type_id, ids in object_ids.items():
+        query |= Q(content_type_id=content_type_id, object_id__in=ids)
+
+    diffs = defaultdict(list)
+    for diff in ExerciseHistoryDiff.objects.filter(query) \
+            .filter(history_date__lte=max(a.timestamp for a in updated)) \
+            .order_by('history_date', 'history_id'):
+        diffs[(diff.content_type_id, diff.object_id)].append(diff)
+
+    out = {}
+    for action in updated:
+        key = (action.action_object_content_type_id, action.action_object.pk)
+        candidates = [d for d in diffs[key] if d.history_date <= action.timestamp]
+        if candidates:
+            out[action.id] = candidates[-1]
+    return out
+
 
 @permission_required('exercises.change_exercise')
 def control(request):
     """
     Admin view of the history of the exercises
+
+    The actions are paginated with a cursor, the ID of the last action of the
+    previous page. Actors and objects are loaded in batches per content type
+    and the changes come from the precomputed diffs, so each page needs a
+    fixed number of queries.
     """
-    all_streams = Action.objects.all()
+    form = HistoryFilterForm(request.GET)
+    actions = filter_actions(Action.objects.all(), form) \
+        .prefetch_related('actor', 'action_object') \
+        .order_by('-id')
+
+    cursor = request.GET.get('cursor')
+    if cursor:
+        try:
+            actions = actions.filter(id__lt=int(cursor))
+        except ValueError:
+            logger.info(f"Got {cursor} as history cursor")
+
+    entries = list(actions[:HISTORY_PAGE_SIZE + 1])
+    next_cursor = None
+    if len(entries) > HISTORY_PAGE_SIZE:
+        entries = entries[:HISTORY_PAGE_SIZE]
+        next_cursor = entries[-1].id
+
+    diffs = get_history_diffs(entries)
+
     out = []
-    for entry in all_streams:
+    for entry in entries:
         data = {'verb': entry.verb, 'stream': entry}
 
-        if entry.verb == StreamVerbs.UPDATED.value:
-            entry_obj = entry.action_object.history.as_of(entry.timestamp)
-            historical_entry = entry_obj._history
-            previous_entry = historical_entry.prev_record
-
-            data['id'] = historical_entry.id
-            data['content_type_id'] = ContentType.objects.get_for_model(entry_obj).id
+        if entry.verb == StreamVerbs.UPDATED.value and entry.action_object:
+            data['id'] = entry.action_object.pk
+            data['content_type_id'] = entry.action_object_content_type_id
 
-            if previous_entry:
-                data['delta'] = historical_entry.diff_against(previous_entry)
-                data['history_id'] = previous_entry.history_id
+            diff = diffs.get(entry.id)
+            if diff:
+                data['delta'] = {'changes': diff.changes}
+                data['history_id'] = diff.previous_history_id
 
         out.append(data)
 
+    params = request.GET.copy()
+    params.pop('cursor', None)
+    next_query = None
+    if next_cursor:
+        params['cursor'] = next_cursor
+        next_query = params.urlencode()
+        params.pop('cursor')
+
     return render(
         request,
         'history/overview.html',
         {
             'context': out,
+            'form': form,
+            'next_query': next_query,
+            'first_query': params.urlencode() if cursor else None,
 
             # We can't pass the enum to the template, so we have to do this
             # https://stackoverflow.com/questions/35953132/
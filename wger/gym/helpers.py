@@ -83,3 +83,58 @@ def get_permission_list(user):
         form_group_permission.append('manager')
 
     return form_group_permission
+
+
+def get_member_export_rows(gym):
+    """
+    Lazily generates the rows (including the header) for the CSV export of
+    all members of a gym
+
+    The members are read in chunks with their profiles and contracts, so that
+    the memory usage and the number of queries do not grow with the gym.
+
+    :param gym: the gym object
+    :return: a generator of lists
+    """
+    # Django
+    from django.utils.translation import gettext as _
+
+    # wger
+    from wger.gym.models import Gym
+    from wger.utils.export import EXPORT_CHUNK_SIZE
+
+    yield [
+        _('Nr.'),
+        _('Gym'),
+        _('Username'),
+        _('Email'),
+        _('First name'),
+        _('Last name'),
+        _('Gender'),
+        _('Age'),
+        _('ZIP code'),
+        _('City'),
+        _('Street'),
+        _('Phone'),
+    ]
+
+    members = Gym.objects.get_members(gym.pk) \
+        .select_related('userprofile') \
+        .prefetch_related('contract_member') \
+        .order_by('pk')
+    for user in members.iterator(chunk_size=EXPORT_CHUNK_SIZE):
+        address = user.userprofile.address
+        yield [
+            user.id,
+            gym.name,
+            user.username,
+            user.email,
+            user.first_name,
+            user.last_name,
+            user.userprofile.get_gender_display(),
+            user.userprofile.age,
+            address['zip_code'],
+            address['city'],
+            address['street'],
+            address['phone'],
+        ]
@@ -0,0 +1,95 @@
+# This file is part of wger Workout Manager.
+#
+# wger Workout Manager is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# wger Workout Manager is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+# Standard Library
+import csv
+import logging
+import tempfile
+
+# Django
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.contrib.sites.models import Site
+from django.core import mail
+from django.core.files import File
+from django.core.files.storage import default_storage
+from django.template.loader import render_to_string
+from django.utils import translation
+from django.utils.crypto import get_random_string
+from django.utils.translation import gettext as _
+
+# wger
+from wger.celery_configuration import app
+from wger.gym.helpers import get_member_export_rows
+from wger.gym.models import Gym
+from wger.utils.export import (
+    iter_csv,
+    iter_gzip,
+)
+
+
+logger = logging.getLogger(__name__)
+
+EXPORT_PATH = 'gym/export/{gym_pk}/{filename}'
+
+
+def export_members(gym_pk, user_pk, compress=True):
+    """
+    Writes the CSV export of all members of a gym to the storage and notifies
+    the user that requested it per email
+
+    :return: the name of the file in the storage
+    """
+    gym = Gym.objects.get(pk=gym_pk)
+    user = User.objects.select_related('userprofile__notification_language').get(pk=user_pk)
+
+    translation.activate(user.userprofile.notification_language.short_name)
+    filename = '{0}.csv{1}'.format(get_random_string(32), '.gz' if compress else '')
+
+    content = iter_csv(get_member_export_rows(gym), delimiter='\t', quoting=csv.QUOTE_ALL)
+    with tempfile.TemporaryFile() as tmp:
+        for chunk in iter_gzip(content) if compress else content:
+            tmp.write(chunk if compress else chunk.encode('utf-8'))
+        tmp.seek(0)
+        name = default_storage.save(
+            EXPORT_PATH.format(gym_pk=gym.pk, filename=filename),
+            File(tmp),
+        )
+
+    logger.info(f'Exported members of gym {gym.pk} to {name}')
+
+    if user.email:
+        context = {
+            'site': Site.objects.get_current(),
+            'gym': gym,
+            'filename': filename,
+        }
+        mail.send_mail(
+            _('Your export is ready'),
+            render_to_string('gym/email_export_ready.tpl', context),
+            settings.WGER_SETTINGS['EMAIL_FROM'],
+            [user.email],
+            fail_silently=True,
+        )
+
+    return name
+
+
+@app.task
+def export_members_task(gym_pk: int, user_pk: int, compress: bool = True):
+    """
+    Exports the members of a gym in the background
+    """
+    export_members(gym_pk, user_pk, compress)
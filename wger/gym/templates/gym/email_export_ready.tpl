@@ -0,0 +1,5 @@
+{% load i18n %}{% blocktranslate with gym_name=gym.name %}The export of the members of {{ gym_name }} you requested is ready.{% endblocktranslate %}
+
+* https://{{ site }}{% url 'gym:export:download' gym.pk filename %}
+
+— {% blocktranslate %}The {{ site }} team{% endblocktranslate %}
@@ -14,13 +14,22 @@
 
 # Standard Library
 import datetime
+import gzip
+import tempfile
+from unittest import mock
 
 # Django
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core import mail
+from django.core.files.storage import default_storage
+from django.test import override_settings
 from django.urls import reverse
 
 # wger
 from wger.core.tests.base_testcase import WgerTestCase
 from wger.gym.models import Gym
+from wger.gym.tasks import export_members
 
 
 class GymMembersCsvExportTestCase(WgerTestCase):
@@ -47,8 +56,9 @@ class GymMembersCsvExportTestCase(WgerTestCase):
             self.assertEqual(
                 response['Content-Disposition'], 'attachment; filename={0}'.format(filename)
             )
-            self.assertGreaterEqual(len(response.content), 1000)
-            self.assertLessEqual(len(response.content), 1300)
+            content = b''.join(response.streaming_content)
+            self.assertGreaterEqual(len(content), 1000)
+            self.assertLessEqual(len(content), 1300)
 
     def test_export_csv_authorized(self):
         """
@@ -83,3 +93,87 @@ class GymMembersCsvExportTestCase(WgerTestCase):
         """
         self.user_logout()
         self.export_csv(fail=True)
+
+    def test_export_csv_gzip(self):
+        """
+        Test the compressed CSV export
+        """
+        self.user_login('manager1')
+        response = self.client.get(
+            reverse('gym:export:users', kwargs={'gym_pk': 1}),
+            {'gzip': 1},
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'application/gzip')
+        self.assertTrue(response['Content-Disposition'].endswith('.csv.gz'))
+
+        content = gzip.decompress(b''.join(response.streaming_content))
+        self.assertGreaterEqual(len(content), 1000)
+        self.assertLessEqual(len(content), 1300)
+
+    def test_export_csv_queries(self):
+        """
+        Test that the number of queries does not depend on the number of members
+        """
+        self.user_login('manager1')
+
+        with self.assertNumQueries(15):
+            response = self.client.get(reverse('gym:export:users', kwargs={'gym_pk': 1}))
+            b''.join(response.streaming_content)
+
+    def test_export_csv_background(self):
+        """
+        Test that the export is started in the background if requested
+        """
+        settings.WGER_SETTINGS['USE_CELERY'] = True
+        self.user_login('manager1')
+        with mock.patch('wger.gym.views.export.export_members_task') as task:
+            response = self.client.get(
+                reverse('gym:export:users', kwargs={'gym_pk': 1}),
+                {'background': 1},
+            )
+            self.assertEqual(response.status_code, 302)
+            task.delay.assert_called_once_with(1, 9, compress=False)
+
+
+class GymMembersBackgroundExportTestCase(WgerTestCase):
+    """
+    Test case for the background export of gym members
+    """
+
+    def test_export_members(self):
+        """
+        Test that the export is saved and the user notified
+        """
+        user = User.objects.get(username='manager1')
+        user.email = 'manager1@example.com'
+        user.save()
+
+        with tempfile.TemporaryDirectory() as media_root, override_settings(MEDIA_ROOT=media_root):
+            self.check_export_members(user)
+
+    def check_export_members(self, user):
+        name = export_members(1, user.pk, compress=True)
+        self.assertTrue(default_storage.exists(name))
+        with default_storage.open(name) as f:
+            content = gzip.decompress(f.read())
+        self.assertGreaterEqual(len(content), 1000)
+        self.assertEqual(len(mail.outbox), 1)
+
+        # Can be downloaded by authorized users only
+        filename = name.split('/')[-1]
+        url = reverse('gym:export:download', kwargs={'gym_pk': 1, 'filename': filename})
+        self.assertIn(url, mail.outbox[0].body)
+
+        self.user_login('manager1')
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(gzip.decompress(b''.join(response.streaming_content)), content)
+
+        self.user_login('member1')
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 403)
+
+        self.user_login('manager1')
+        url = reverse('gym:export:download', kwargs={'gym_pk': 1, 'filename': '..'})
+        self.assertEqual(self.client.get(url).status_code, 404)
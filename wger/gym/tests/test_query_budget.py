@@ -0,0 +1,67 @@
+# This file is part of wger Workout Manager.
+#
+# wger Workout Manager is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# wger Workout Manager is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+
+# Django
+from django.contrib.auth.models import User
+from django.urls import reverse
+
+# wger
+from wger.core.tests.base_testcase import WgerTestCase
+
+
+class GymQueryBudgetTestCase(WgerTestCase):
+    """
+    Tests the number of queries of the gym member pages
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.user_login('admin')
+
+    def add_members(self, count=5):
+        """
+        Adds members to the first gym
+        """
+        for i in range(count):
+            user = User.objects.create_user(f'budget-member{i}', f'member{i}@example.com')
+            user.userprofile.gym_id = 1
+            user.userprofile.save()
+
+    def test_member_list(self):
+        """
+        Test the gym member overview
+        """
+        url = reverse('gym:gym:user-list', kwargs={'pk': 1})
+        self.client.get(url)
+        with self.assertQueryBudget(35):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertNoQueryGrowth(lambda: self.client.get(url), self.add_members)
+
+    def test_member_export(self):
+        """
+        Test the CSV export of the gym members
+        """
+        url = reverse('gym:export:users', kwargs={'gym_pk': 1})
+
+        def export():
+            response = self.client.get(url)
+            b''.join(response.streaming_content)
+            return response
+
+        export()
+        with self.assertQueryBudget(15):
+            response = export()
+        self.assertEqual(response.status_code, 200)
+        self.assertNoQueryGrowth(export, self.add_members)
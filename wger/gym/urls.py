@@ -241,6 +241,11 @@ patterns_export = [
         export.users,
         name='users',
     ),
+    path(
+        'users/<int:gym_pk>/download/<str:filename>',
+        export.download,
+        name='download',
+    ),
 ]
 
 #
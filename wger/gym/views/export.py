@@ -18,82 +18,103 @@
 import csv
 import datetime
 import logging
+import re
 
 # Django
+from django.conf import settings
+from django.contrib import messages
 from django.contrib.auth.decorators import login_required
+from django.core.files.storage import default_storage
 from django.http.response import (
-    HttpResponse,
+    FileResponse,
+    Http404,
     HttpResponseForbidden,
+    HttpResponseRedirect,
 )
 from django.shortcuts import get_object_or_404
+from django.urls import reverse
 from django.utils.translation import gettext as _
 
 # wger
+from wger.gym.helpers import get_member_export_rows
 from wger.gym.models import Gym
+from wger.gym.tasks import (
+    EXPORT_PATH,
+    export_members_task,
+)
+from wger.utils.export import (
+    csv_streaming_response,
+    wants_gzip,
+)
 
 
 logger = logging.getLogger(__name__)
 
+EXPORT_FILENAME_RE = re.compile(r'^[A-Za-z0-9]+\.csv(\.gz)?$')
+
+
+def can_export(user, gym):
+    """
+    Checks whether the user is allowed to export the members of the gym
+    """
+    if not user.has_perm('gym.manage_gyms') \
+            and not user.has_perm('gym.manage_gym'):
+        return False
+
+    if user.has_perm('gym.manage_gym') \
+            and user.userprofile.gym != gym:
+        return False
+
+    return True
+
 
 @login_required
 def users(request, gym_pk):
     """
     Exports all members in selected gym
+
+    The CSV file is streamed to the browser, optionally compressed (?gzip=1).
+    For very large gyms the export can be done in the background (?background=1),
+    the user is then notified per email when the file is ready.
     """
     gym = get_object_or_404(Gym, pk=gym_pk)
 
-    if not request.user.has_perm('gym.manage_gyms') \
-            and not request.user.has_perm('gym.manage_gym'):
-        return HttpResponseForbidden()
-
-    if request.user.has_perm('gym.manage_gym') \
-            and request.user.userprofile.gym != gym:
+    if not can_export(request.user, gym):
         return HttpResponseForbidden()
 
-    # Create CSV 'file'
-    response = HttpResponse(content_type='text/csv')
-    writer = csv.writer(response, delimiter='\t', quoting=csv.QUOTE_ALL)
-
-    writer.writerow(
-        [
-            _('Nr.'),
-            _('Gym'),
-            _('Username'),
-            _('Email'),
-            _('First name'),
-            _('Last name'),
-            _('Gender'),
-            _('Age'),
-            _('ZIP code'),
-            _('City'),
-            _('Street'),
-            _('Phone')
-        ]
-    )
-    for user in Gym.objects.get_members(gym_pk):
-        address = user.userprofile.address
-        writer.writerow(
-            [
-                user.id,
-                gym.name,
-                user.username,
-                user.email,
-                user.first_name,
-                user.last_name,
-                user.userprofile.get_gender_display(),
-                user.userprofile.age,
-                address['zip_code'],
-                address['city'],
-                address['street'],
-                address['phone'],
-            ]
+    if request.GET.get('background') and settings.WGER_SETTINGS['USE_CELERY']:
+        export_members_task.delay(gym.pk, request.user.pk, compress=wants_gzip(request))
+        messages.success(
+            request,
+            _('The export was started, you will receive an email when it is ready.'),
         )
+        return HttpResponseRedirect(reverse('gym:gym:user-list', kwargs={'pk': gym.pk}))
 
-    # Send the data to the browser
     today = datetime.date.today()
     filename = 'User-data-gym-{gym}-{t.year}-{t.month:02d}-{t.day:02d}.csv'.format(
         t=today, gym=gym.id
     )
-    response['Content-Disposition'] = 'attachment; filename={0}'.format(filename)
-    response['Content-Length'] = len(response.content)
-    return response
+    return csv_streaming_response(
+        get_member_export_rows(gym),
+        filename,
+        compress=wants_gzip(request),
+        delimiter='\t',
+        quoting=csv.QUOTE_ALL,
+    )
+
+
+@login_required
+def download(request, gym_pk, filename):
+    """
+    Downloads a members export that was generated in the background
+    """
+    gym = get_object_or_404(Gym, pk=gym_pk)
+
+    if not can_export(request.user, gym):
+        return HttpResponseForbidden()
+
+    name = EXPORT_PATH.format(gym_pk=gym.pk, filename=filename)
+    if not EXPORT_FILENAME_RE.match(filename) or not default_storage.exists(name):
+        raise Http404
+
+    return FileResponse(default_storage.open(name), as_attachment=True, filename=filename)
@@ -20,6 +20,7 @@ import datetime
 import logging
 
 # Django
+from django.conf import settings
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.mixins import (
     LoginRequiredMixin,
@@ -157,6 +158,7 @@ class GymUserListView(LoginRequiredMixin, WgerMultiplePermissionRequiredMixin, L
                      _('Last activity')],
             'users': context['object_list']['members']
         }
+        context['background_export'] = settings.WGER_SETTINGS['USE_CELERY']
         return context
 
 
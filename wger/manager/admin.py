@@ -24,6 +24,7 @@ admin.site.register(manager_models.Workout)
 admin.site.register(manager_models.Set)
 admin.site.register(manager_models.Day)
 admin.site.register(manager_models.WorkoutLog)
+admin.site.register(manager_models.WorkoutLogStats)
 admin.site.register(UserProfile)
 
 admin.site.register(manager_models.Setting)
@@ -34,6 +34,7 @@ from wger.manager.models import (
     Setting,
     Workout,
     WorkoutLog,
+    WorkoutLogStats,
     WorkoutSession,
 )
 
@@ -81,6 +82,16 @@ class WorkoutLogSerializer(serializers.ModelSerializer):
         exclude = ('user', )
 
 
+class WorkoutLogStatsSerializer(serializers.ModelSerializer):
+    """
+    Workout log statistics serializer
+    """
+
+    class Meta:
+        model = WorkoutLogStats
+        exclude = ('user', )
+
+
 class ScheduleStepSerializer(serializers.ModelSerializer):
     """
     ScheduleStep serializer
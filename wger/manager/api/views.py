@@ -40,6 +40,7 @@ from wger.manager.api.serializers import (
     SettingSerializer,
     WorkoutCanonicalFormSerializer,
     WorkoutLogSerializer,
+    WorkoutLogStatsSerializer,
     WorkoutSerializer,
     WorkoutSessionSerializer,
     WorkoutTemplateSerializer,
@@ -52,6 +53,7 @@ from wger.manager.models import (
     Setting,
     Workout,
     WorkoutLog,
+    WorkoutLogStats,
     WorkoutSession,
 )
 from wger.utils.viewsets import WgerOwnerObjectModelViewSet
@@ -411,3 +413,31 @@ class WorkoutLogViewSet(WgerOwnerObjectModelViewSet):
         Return objects to check for ownership permission
         """
         return [(Workout, 'workout')]
+
+
+class WorkoutLogStatsViewSet(viewsets.ReadOnlyModelViewSet):
+    """
+    API endpoint for the precomputed workout log statistics (volume, estimated
+    1RM, personal records) per exercise and day
+    """
+    serializer_class = WorkoutLogStatsSerializer
+    is_private = True
+    ordering_fields = '__all__'
+    filterset_fields = {
+        'date': ['exact', 'gte', 'lte'],
+        'exercise_base': ['exact'],
+        'weight_unit': ['exact'],
+        'is_weight_pr': ['exact'],
+        'is_e1rm_pr': ['exact'],
+        'is_volume_pr': ['exact'],
+    }
+
+    def get_queryset(self):
+        """
+        Only allow access to appropriate objects
+        """
+        # REST API generation
+        if getattr(self, "swagger_fake_view", False):
+            return WorkoutLogStats.objects.none()
+
+        return WorkoutLogStats.objects.filter(user=self.request.user)
@@ -0,0 +1,43 @@
+# This file is part of wger Workout Manager.
+#
+# wger Workout Manager is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# wger Workout Manager is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+
+# Django
+from django.core.management.base import BaseCommand
+
+# wger
+from wger.manager.stats import rebuild_log_stats
+
+
+class Command(BaseCommand):
+    """
+    Rebuilds the precomputed workout log statistics
+    """
+
+    help = 'Rebuilds the precomputed statistics (volume, estimated 1RM, personal ' \
+           'records) of the workout logs. This is needed once after upgrading and ' \
+           'after logs were changed without going through WorkoutLog.save(), e.g. ' \
+           'with bulk operations.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--user-id',
+            action='append',
+            dest='user_ids',
+            type=int,
+            help='Only rebuild the statistics for this user. Can be used multiple times'
+        )
+
+    def handle(self, **options):
+        count = rebuild_log_stats(options['user_ids'])
+        self.stdout.write(f'Created {count} log statistic entries')
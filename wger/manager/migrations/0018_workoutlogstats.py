@@ -0,0 +1,40 @@
+# Generated by Django 4.1.9 on 2026-10-19 07:53
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('exercises', '0025_rename_update_date_exercise_last_update_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('core', '0016_alter_language_short_name'),
+        ('manager', '0017_alter_workoutlog_exercise_base'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='WorkoutLogStats',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(verbose_name='Date')),
+                ('set_count', models.IntegerField(verbose_name='Sets')),
+                ('volume', models.DecimalField(decimal_places=2, max_digits=12, verbose_name='Volume')),
+                ('max_weight', models.DecimalField(decimal_places=2, max_digits=5, verbose_name='Max weight')),
+                ('e1rm_epley', models.DecimalField(decimal_places=2, max_digits=7, verbose_name='Estimated 1RM (Epley)')),
+                ('e1rm_brzycki', models.DecimalField(decimal_places=2, max_digits=7, null=True, verbose_name='Estimated 1RM (Brzycki)')),
+                ('is_weight_pr', models.BooleanField(default=False)),
+                ('is_e1rm_pr', models.BooleanField(default=False)),
+                ('is_volume_pr', models.BooleanField(default=False)),
+                ('exercise_base', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='exercises.exercisebase', verbose_name='Exercise')),
+                ('user', models.ForeignKey(editable=False, on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL, verbose_name='User')),
+                ('weight_unit', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='core.weightunit', verbose_name='Unit')),
+            ],
+            options={
+                'ordering': ['date'],
+                'unique_together': {('user', 'exercise_base', 'date', 'weight_unit')},
+            },
+        ),
+    ]
@@ -0,0 +1,115 @@
+# -*- coding: utf-8 -*-
+
+# Standard Library
+import itertools
+from decimal import Decimal
+
+from django.db import migrations
+
+
+# Frozen copy of the rebuild in wger.manager.stats, so that later changes to
+# that module don't change what this migration does
+REPETITION_UNIT = 1
+WEIGHT_UNITS = (1, 2)
+BATCH_SIZE = 1000
+MAX_E1RM = Decimal('99999.99')
+MAX_VOLUME = Decimal('9999999999.99')
+TWOPLACES = Decimal('0.01')
+
+
+def estimate_1rm_epley(weight, reps):
+    if reps <= 1:
+        return Decimal(weight)
+    return min((Decimal(weight) * (1 + Decimal(reps) / 30)).quantize(TWOPLACES), MAX_E1RM)
+
+
+def estimate_1rm_brzycki(weight, reps):
+    if reps <= 1:
+        return Decimal(weight)
+    if reps >= 37:
+        return None
+    return (Decimal(weight) * 36 / (37 - Decimal(reps))).quantize(TWOPLACES)
+
+
+def compute_day(WorkoutLogStats, user_id, exercise_base_id, date, weight_unit_id, logs):
+    stats = WorkoutLogStats(
+        user_id=user_id,
+        exercise_base_id=exercise_base_id,
+        date=date,
+        weight_unit_id=weight_unit_id,
+        set_count=0,
+        volume=Decimal(0),
+        max_weight=Decimal(0),
+        e1rm_epley=Decimal(0),
+        e1rm_brzycki=None,
+    )
+    for reps, weight in logs:
+        stats.set_count += 1
+        stats.volume = min(stats.volume + reps * weight, MAX_VOLUME)
+        stats.max_weight = max(stats.max_weight, weight)
+        stats.e1rm_epley = max(stats.e1rm_epley, estimate_1rm_epley(weight, reps))
+
+        brzycki = estimate_1rm_brzycki(weight, reps)
+        if brzycki is not None:
+            stats.e1rm_brzycki = max(stats.e1rm_brzycki or 0, brzycki)
+    return stats
+
+
+def set_pr_flags(stats_list):
+    best = {}
+    for stats in stats_list:
+        stats.is_weight_pr = stats.max_weight > (best.get('max_weight') or 0)
+        stats.is_e1rm_pr = stats.e1rm_epley > (best.get('e1rm_epley') or 0)
+        stats.is_volume_pr = stats.volume > (best.get('volume') or 0)
+
+        for field in ('max_weight', 'e1rm_epley', 'volume'):
+            best[field] = max(best.get(field) or 0, getattr(stats, field))
+
+
+def rebuild_stats(apps, schema_editor):
+    """
+    Builds the statistics of the existing logs
+    """
+    WorkoutLog = apps.get_model('manager', 'WorkoutLog')
+    WorkoutLogStats = apps.get_model('manager', 'WorkoutLogStats')
+
+    rows = WorkoutLog.objects.filter(
+        repetition_unit_id=REPETITION_UNIT,
+        weight_unit_id__in=WEIGHT_UNITS,
+        reps__gt=0,
+    ).order_by('user_id', 'exercise_base_id', 'weight_unit_id', 'date').values_list(
+        'user_id', 'exercise_base_id', 'weight_unit_id', 'date', 'reps', 'weight'
+    ).iterator(chunk_size=BATCH_SIZE)
+
+    WorkoutLogStats.objects.all().delete()
+    batch = []
+    for (user_id, base_id, unit_id), group_rows in itertools.groupby(rows, key=lambda r: r[:3]):
+        group = [
+            compute_day(
+                WorkoutLogStats,
+                user_id,
+                base_id,
+                date,
+                unit_id,
+                [(r[4], r[5]) for r in day_rows],
+            ) for date, day_rows in itertools.groupby(group_rows, key=lambda r: r[3])
+        ]
+        set_pr_flags(group)
+        batch.extend(group)
+
+        if len(batch) >= BATCH_SIZE:
+            WorkoutLogStats.objects.bulk_create(batch)
+            batch = []
+
+    WorkoutLogStats.objects.bulk_create(batch)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('manager', '0018_workoutlogstats'),
+    ]
+
+    operations = [
+        migrations.RunPython(rebuild_stats, reverse_code=migrations.RunPython.noop),
+    ]
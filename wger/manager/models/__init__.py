@@ -17,6 +17,7 @@
 # Local
 from .day import Day
 from .log import WorkoutLog
+from .log_stats import WorkoutLogStats
 from .schedule import Schedule
 from .schedule_step import ScheduleStep
 from .session import WorkoutSession
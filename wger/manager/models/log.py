@@ -26,6 +26,7 @@ from wger.core.models import (
     WeightUnit,
 )
 from wger.exercises.models import ExerciseBase
+from wger.manager.stats import counts_for_stats
 from wger.utils.cache import reset_workout_log
 from wger.utils.fields import Html5DateField
 
@@ -141,6 +142,16 @@ class WorkoutLog(models.Model):
         except WorkoutSession.DoesNotExist:
             return None
 
+    @property
+    def stats_key(self):
+        """
+        The values that identify the WorkoutLogStats row of this entry, or None
+        if the entry is not used for the statistics
+        """
+        if not counts_for_stats(self.repetition_unit_id, self.weight_unit_id, self.reps):
+            return None
+        return self.user_id, self.exercise_base_id, self.date, self.weight_unit_id
+
     def save(self, *args, **kwargs):
         """
         Reset cache
@@ -152,10 +163,3 @@ class WorkoutLog(models.Model):
         if self.repetition_unit == 2:
             self.reps = 1
         super(WorkoutLog, self).save(*args, **kwargs)
-
-    def delete(self, *args, **kwargs):
-        """
-        Reset cache
-        """
-        reset_workout_log(self.user_id, self.date.year, self.date.month, self.date.day)
-        super(WorkoutLog, self).delete(*args, **kwargs)
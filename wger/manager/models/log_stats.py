@@ -0,0 +1,119 @@
+#  This file is part of wger Workout Manager <https://github.com/wger-project>.
+#  Copyright (C) 2013 - 2021 wger Team
+#
+#  wger Workout Manager is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Affero General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  wger Workout Manager is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Affero General Public License for more details.
+#
+#  You should have received a copy of the GNU Affero General Public License
+#  along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+# Django
+from django.contrib.auth.models import User
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+
+# wger
+from wger.core.models import WeightUnit
+from wger.exercises.models import ExerciseBase
+
+
+class WorkoutLogStats(models.Model):
+    """
+    Precomputed statistics of the logs of a user for an exercise on a day
+
+    These rows are maintained by WorkoutLog.save() and WorkoutLog.delete() (see
+    wger.manager.stats) and can be rebuilt with the rebuild-log-stats command.
+    Only logs with repetitions and a weight in kg or lb are taken into account.
+    """
+
+    user = models.ForeignKey(
+        User,
+        verbose_name=_('User'),
+        editable=False,
+        on_delete=models.CASCADE,
+    )
+
+    exercise_base = models.ForeignKey(
+        ExerciseBase,
+        verbose_name=_('Exercise'),
+        on_delete=models.CASCADE,
+    )
+
+    date = models.DateField(verbose_name=_('Date'))
+
+    weight_unit = models.ForeignKey(
+        WeightUnit,
+        verbose_name=_('Unit'),
+        on_delete=models.CASCADE,
+    )
+
+    set_count = models.IntegerField(verbose_name=_('Sets'))
+    """
+    Number of logged sets
+    """
+
+    volume = models.DecimalField(
+        decimal_places=2,
+        max_digits=12,
+        verbose_name=_('Volume'),
+    )
+    """
+    Total volume, i.e. the sum of repetitions times weight
+    """
+
+    max_weight = models.DecimalField(
+        decimal_places=2,
+        max_digits=5,
+        verbose_name=_('Max weight'),
+    )
+
+    e1rm_epley = models.DecimalField(
+        decimal_places=2,
+        max_digits=7,
+        verbose_name=_('Estimated 1RM (Epley)'),
+    )
+    """
+    Best estimated one repetition maximum with the Epley formula
+    """
+
+    e1rm_brzycki = models.DecimalField(
+        decimal_places=2,
+        max_digits=7,
+        verbose_name=_('Estimated 1RM (Brzycki)'),
+        null=True,
+    )
+    """
+    Best estimated one repetition maximum with the Brzycki formula. This is not
+    defined for sets with 37 or more repetitions
+    """
+
+    is_weight_pr = models.BooleanField(default=False)
+    is_e1rm_pr = models.BooleanField(default=False)
+    is_volume_pr = models.BooleanField(default=False)
+    """
+    Personal record flags, i.e. whether the value is higher than on all previous
+    days for this exercise
+    """
+
+    class Meta:
+        ordering = ["date"]
+        unique_together = ("user", "exercise_base", "date", "weight_unit")
+
+    def __str__(self):
+        """
+        Return a more human-readable representation
+        """
+        return "Log stats: {0} on {1}".format(self.exercise_base_id, self.date)
+
+    def get_owner_object(self):
+        """
+        Returns the object that has owner information
+        """
+        return self
@@ -23,6 +23,7 @@ from django.core.validators import (
     MinValueValidator,
 )
 from django.db import models
+from django.db.models import prefetch_related_objects
 from django.utils.translation import gettext_lazy as _
 
 # wger
@@ -99,6 +100,7 @@ class Set(models.Model):
         out = list(
             dict.fromkeys([s.exercise_base for s in self.setting_set.select_related().all()])
         )
+        prefetch_related_objects(out, 'main_image')
         for exercise in out:
             exercise.settings = self.reps_smart_text(exercise)
 
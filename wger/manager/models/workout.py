@@ -152,7 +152,7 @@ class Workout(models.Model):
             muscles_back_secondary = []
 
             # Sort list by weekday
-            day_list = [i for i in self.day_set.select_related()]
+            day_list = [i for i in self.day_set.select_related().prefetch_related('day')]
             day_list.sort(key=lambda day: day.get_first_day_id)
 
             for day in day_list:
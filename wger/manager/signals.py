@@ -15,14 +15,26 @@
 # You should have received a copy of the GNU Affero General Public License
 
 # Django
-from django.db.models.signals import post_save
+from django.db.models.signals import (
+    m2m_changed,
+    post_delete,
+    post_save,
+    pre_save,
+)
 
 # wger
 from wger.gym.helpers import get_user_last_activity
 from wger.manager.models import (
+    Day,
     WorkoutLog,
     WorkoutSession,
 )
+from wger.manager.stats import update_log_stats
+from wger.utils.cache import (
+    reset_workout_canonical_form,
+    reset_workout_log,
+)
+from wger.utils.helpers import disable_for_loaddata
 
 
 def update_activity_cache(sender, instance, **kwargs):
@@ -35,5 +47,51 @@ def update_activity_cache(sender, instance, **kwargs):
     user.usercache.save()
 
 
+def reset_day_workout(sender, instance, **kwargs):
+    """
+    Reset the cached representations of the workout when the weekdays of a
+    day change, these are saved after the day itself
+    """
+    if isinstance(instance, Day):
+        reset_workout_canonical_form(instance.training_id)
+
+
+@disable_for_loaddata
+def remember_log_stats_key(sender, instance, **kwargs):
+    """
+    Remember the statistics row of a log before it is changed, the entry might
+    have been moved to a different day, exercise, etc.
+    """
+    previous = WorkoutLog.objects.filter(pk=instance.pk).first() if instance.pk else None
+    instance._previous_stats_key = previous.stats_key if previous else None
+
+
+@disable_for_loaddata
+def update_log_stats_on_save(sender, instance, **kwargs):
+    """
+    Update the statistics of the old and the new day of a saved log
+    """
+    keys = {instance.stats_key, getattr(instance, '_previous_stats_key', None)}
+    for key in keys - {None}:
+        update_log_stats(*key)
+
+
+def update_log_stats_on_delete(sender, instance, **kwargs):
+    """
+    Reset the cache and update the statistics of a deleted log
+
+    This is also sent for queryset deletes and cascades, e.g. when deleting a
+    workout session together with its logs or a whole workout.
+    """
+    reset_workout_log(instance.user_id, instance.date.year, instance.date.month, instance.date.day)
+    key = instance.stats_key
+    if key:
+        update_log_stats(*key)
+
+
 post_save.connect(update_activity_cache, sender=WorkoutSession)
 post_save.connect(update_activity_cache, sender=WorkoutLog)
+m2m_changed.connect(reset_day_workout, sender=Day.day.through)
+pre_save.connect(remember_log_stats_key, sender=WorkoutLog)
+post_save.connect(update_log_stats_on_save, sender=WorkoutLog)
+post_delete.connect(update_log_stats_on_delete, sender=WorkoutLog)
@@ -0,0 +1,244 @@
+#  This file is part of wger Workout Manager <https://github.com/wger-project>.
+#  Copyright (C) 2013 - 2021 wger Team
+#
+#  wger Workout Manager is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Affero General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  wger Workout Manager is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Affero General Public License for more details.
+#
+#  You should have received a copy of the GNU Affero General Public License
+#  along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+# Standard Library
+import itertools
+import logging
+from decimal import Decimal
+
+# Django
+from django.db import transaction
+from django.db.models import Max
+
+# wger
+from wger.utils.constants import TWOPLACES
+
+
+logger = logging.getLogger(__name__)
+
+STATS_REPETITION_UNIT = 1
+"""
+Only logs with repetitions are used for the statistics
+"""
+
+STATS_WEIGHT_UNITS = (1, 2)
+"""
+Only logs in kg and lb are used for the statistics
+"""
+
+REBUILD_BATCH_SIZE = 1000
+
+MAX_E1RM = Decimal('99999.99')
+MAX_VOLUME = Decimal('9999999999.99')
+"""
+Largest values that fit into the statistics, since the repetitions have no
+upper limit, estimates from absurd logs are clamped to these
+"""
+
+
+def estimate_1rm_epley(weight, reps):
+    """
+    Estimated one repetition maximum with the Epley formula
+    """
+    if reps <= 1:
+        return Decimal(weight)
+    return min((Decimal(weight) * (1 + Decimal(reps) / 30)).quantize(TWOPLACES), MAX_E1RM)
+
+
+def estimate_1rm_brzycki(weight, reps):
+    """
+    Estimated one repetition maximum with the Brzycki formula
+
+    Returns None for 37 repetitions or more, where the formula is not defined
+    """
+    if reps <= 1:
+        return Decimal(weight)
+    if reps >= 37:
+        return None
+    return (Decimal(weight) * 36 / (37 - Decimal(reps))).quantize(TWOPLACES)
+
+
+def counts_for_stats(repetition_unit_id, weight_unit_id, reps):
+    """
+    Whether a log with these values is used for the statistics
+    """
+    return repetition_unit_id == STATS_REPETITION_UNIT \
+        and weight_unit_id in STATS_WEIGHT_UNITS \
+        and reps > 0
+
+
+def compute_day(user_id, exercise_base_id, date, weight_unit_id, logs):
+    """
+    Computes the (unsaved) statistics object for the logs of a day
+
+    :param logs: iterable of (reps, weight) tuples
+    """
+    # wger
+    from wger.manager.models import WorkoutLogStats
+
+    stats = WorkoutLogStats(
+        user_id=user_id,
+        exercise_base_id=exercise_base_id,
+        date=date,
+        weight_unit_id=weight_unit_id,
+        set_count=0,
+        volume=Decimal(0),
+        max_weight=Decimal(0),
+        e1rm_epley=Decimal(0),
+        e1rm_brzycki=None,
+    )
+    for reps, weight in logs:
+        stats.set_count += 1
+        stats.volume = min(stats.volume + reps * weight, MAX_VOLUME)
+        stats.max_weight = max(stats.max_weight, weight)
+        stats.e1rm_epley = max(stats.e1rm_epley, estimate_1rm_epley(weight, reps))
+
+        brzycki = estimate_1rm_brzycki(weight, reps)
+        if brzycki is not None:
+            stats.e1rm_brzycki = max(stats.e1rm_brzycki or 0, brzycki)
+
+    return stats
+
+
+def set_pr_flags(stats_list, best=None):
+    """
+    Sets the personal record flags of the given statistics, which must belong to
+    the same user, exercise and unit and be ordered by date
+
+    :param best: dict with the best values before the first entry in the list
+    :return: the list of the changed objects
+    """
+    best = best or {}
+    changed = []
+    for stats in stats_list:
+        flags = (
+            stats.max_weight > (best.get('max_weight') or 0),
+            stats.e1rm_epley > (best.get('e1rm_epley') or 0),
+            stats.volume > (best.get('volume') or 0),
+        )
+        if flags != (stats.is_weight_pr, stats.is_e1rm_pr, stats.is_volume_pr):
+            stats.is_weight_pr, stats.is_e1rm_pr, stats.is_volume_pr = flags
+            changed.append(stats)
+
+        for field in ('max_weight', 'e1rm_epley', 'volume'):
+            best[field] = max(best.get(field) or 0, getattr(stats, field))
+
+    return changed
+
+
+def update_log_stats(user_id, exercise_base_id, date, weight_unit_id):
+    """
+    Incrementally updates the statistics for a user, exercise and day
+
+    The row for the day is recomputed from its logs. The personal record flags
+    of this and all later days are then updated, which for the usual case of
+    logging today's workout is only this row.
+    """
+    # wger
+    from wger.manager.models import (
+        WorkoutLog,
+        WorkoutLogStats,
+    )
+
+    if weight_unit_id not in STATS_WEIGHT_UNITS:
+        return
+
+    group = WorkoutLogStats.objects.filter(
+        user_id=user_id,
+        exercise_base_id=exercise_base_id,
+        weight_unit_id=weight_unit_id,
+    )
+
+    logs = WorkoutLog.objects.filter(
+        user_id=user_id,
+        exercise_base_id=exercise_base_id,
+        date=date,
+        weight_unit_id=weight_unit_id,
+        repetition_unit_id=STATS_REPETITION_UNIT,
+        reps__gt=0,
+    ).values_list('reps', 'weight')
+
+    with transaction.atomic():
+        group.filter(date=date).delete()
+        if logs:
+            compute_day(user_id, exercise_base_id, date, weight_unit_id, logs).save()
+
+        best = group.filter(date__lt=date).aggregate(
+            max_weight=Max('max_weight'),
+            e1rm_epley=Max('e1rm_epley'),
+            volume=Max('volume'),
+        )
+        changed = set_pr_flags(group.filter(date__gte=date).order_by('date'), best)
+        WorkoutLogStats.objects.bulk_update(
+            changed,
+            ['is_weight_pr', 'is_e1rm_pr', 'is_volume_pr'],
+        )
+
+
+def rebuild_log_stats(user_ids=None, batch_size=REBUILD_BATCH_SIZE):
+    """
+    Rebuilds the statistics from scratch
+
+    The logs are read once, ordered so that they can be grouped while streaming,
+    and the results are written in batches.
+
+    :param user_ids: optional list of user IDs to limit the rebuild to
+    :return: the number of created rows
+    """
+    # wger
+    from wger.manager.models import (
+        WorkoutLog,
+        WorkoutLogStats,
+    )
+
+    logs = WorkoutLog.objects.filter(
+        repetition_unit_id=STATS_REPETITION_UNIT,
+        weight_unit_id__in=STATS_WEIGHT_UNITS,
+        reps__gt=0,
+    )
+    stats = WorkoutLogStats.objects.all()
+    if user_ids is not None:
+        logs = logs.filter(user_id__in=user_ids)
+        stats = stats.filter(user_id__in=user_ids)
+
+    rows = logs.order_by('user_id', 'exercise_base_id', 'weight_unit_id', 'date').values_list(
+        'user_id', 'exercise_base_id', 'weight_unit_id', 'date', 'reps', 'weight'
+    ).iterator(chunk_size=batch_size)
+
+    count = 0
+    batch = []
+    with transaction.atomic():
+        stats.delete()
+
+        for (user_id, base_id, unit_id), group_rows in itertools.groupby(
+            rows, key=lambda r: r[:3]
+        ):
+            group = [
+                compute_day(user_id, base_id, date, unit_id, [(r[4], r[5]) for r in day_rows])
+                for date, day_rows in itertools.groupby(group_rows, key=lambda r: r[3])
+            ]
+            set_pr_flags(group)
+            batch.extend(group)
+
+            if len(batch) >= batch_size:
+                WorkoutLogStats.objects.bulk_create(batch)
+                count += len(batch)
+                batch = []
+
+        WorkoutLogStats.objects.bulk_create(batch)
+        count += len(batch)
+
+    return count
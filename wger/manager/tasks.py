@@ -0,0 +1,51 @@
+# This file is part of wger Workout Manager.
+#
+# wger Workout Manager is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# wger Workout Manager is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+# Standard Library
+import logging
+
+# Django
+from django.utils import translation
+
+# wger
+from wger.celery_configuration import app
+from wger.manager.models import Workout
+
+
+logger = logging.getLogger(__name__)
+
+
+@app.task
+def render_workout_pdf_task(
+    key: str,
+    workout_pk: int,
+    url: str,
+    language: str,
+    images: bool = False,
+    comments: bool = False,
+    only_table: bool = False,
+):
+    """
+    Renders a workout PDF in the background and saves it to the cache
+    """
+    # wger
+    from wger.manager.pdf import render_workout_pdf
+    from wger.utils.pdf import store_pdf
+
+    workout = Workout.objects.select_related('user').get(pk=workout_pk)
+    with translation.override(language):
+        content = render_workout_pdf(workout, url, images, comments, only_table)
+    store_pdf(key, content)
+    logger.info(f'Rendered PDF of workout {workout_pk} ({len(content)} bytes)')
@@ -17,10 +17,18 @@ import datetime
 
 # Django
 from django.contrib.auth.models import User
+from django.contrib.sites.models import Site
 from django.urls import reverse
 
+# Third Party
+from icalendar import Calendar
+
 # wger
 from wger.core.tests.base_testcase import WgerTestCase
+from wger.manager.models import (
+    Day,
+    Setting,
+)
 from wger.utils.helpers import (
     make_token,
     next_weekday,
@@ -78,7 +86,7 @@ class WorkoutICalExportTestCase(WgerTestCase):
         )
 
         # Approximate size
-        self.assertGreater(len(response.content), 540)
+        self.assertGreater(len(response.content), 520)
         self.assertLess(len(response.content), 620)
 
     def export_ical_token_wrong(self):
@@ -115,7 +123,7 @@ class WorkoutICalExportTestCase(WgerTestCase):
             )
 
             # Approximate size
-            self.assertGreater(len(response.content), 540)
+            self.assertGreater(len(response.content), 520)
             self.assertLess(len(response.content), 620)
 
     def test_export_ical_anonymous(self):
@@ -243,3 +251,106 @@ class ScheduleICalExportTestCase(WgerTestCase):
         self.export_ical(fail=True)
         self.export_ical_token()
         self.export_ical_token_wrong()
+
+
+class ICalCacheTestCase(WgerTestCase):
+    """
+    Tests the cached iCal feeds
+    """
+
+    def setUp(self):
+        super().setUp()
+        uid, token = make_token(User.objects.get(username='test'))
+        self.url = reverse('manager:workout:ical', kwargs={'pk': 3, 'uidb64': uid, 'token': token})
+
+        # The current site is cached per process
+        Site.objects.get_current()
+
+    def get_uids(self, response):
+        return sorted(str(e['uid']) for e in Calendar.from_ical(response.content).walk('vevent'))
+
+    def test_deterministic_uids(self):
+        """
+        Test that the events keep their UIDs when the content changes
+        """
+        response = self.client.get(self.url)
+        uids = self.get_uids(response)
+        self.assertTrue(uids)
+        self.assertTrue(all(uid.startswith('workout-3-day-') for uid in uids))
+
+        day = Day.objects.filter(training_id=3).first()
+        day.description = 'New description'
+        day.save()
+
+        response2 = self.client.get(self.url)
+        self.assertNotEqual(response['ETag'], response2['ETag'])
+        self.assertEqual(uids, self.get_uids(response2))
+
+    def test_not_modified(self):
+        """
+        Test that clients with the current ETag get a 304 response
+        """
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response['ETag'])
+
+        response2 = self.client.get(self.url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response2.status_code, 304)
+        self.assertEqual(response2.content, b'')
+        self.assertEqual(response2['ETag'], response['ETag'])
+
+        response3 = self.client.get(self.url, HTTP_IF_NONE_MATCH='"abc"')
+        self.assertEqual(response3.status_code, 200)
+
+    def test_cache_invalidated(self):
+        """
+        Test that changing the workout renders the feed again
+        """
+        response = self.client.get(self.url)
+
+        setting = Setting.objects.filter(set__exerciseday__training_id=3).first()
+        setting.exercise_base_id = 1
+        setting.save()
+        response2 = self.client.get(self.url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response2.status_code, 200)
+        self.assertNotEqual(response.content, response2.content)
+
+        # Changing only the weekdays of a day
+        day = Day.objects.filter(training_id=3).first()
+        day.day.add(7)
+        response3 = self.client.get(self.url, HTTP_IF_NONE_MATCH=response2['ETag'])
+        self.assertEqual(response3.status_code, 200)
+        self.assertEqual(len(self.get_uids(response3)), len(self.get_uids(response2)) + 1)
+
+    def test_number_of_queries(self):
+        """
+        Test that polling an unchanged feed only checks the token and loads the workout
+        """
+        response = self.client.get(self.url)
+
+        with self.assertNumQueries(2):
+            self.assertEqual(self.client.get(self.url).content, response.content)
+
+        with self.assertNumQueries(2):
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=response['ETag'])
+            self.assertEqual(response.status_code, 304)
+
+    def test_schedule_not_modified(self):
+        """
+        Test the ETag of the schedule feed
+        """
+        uid, token = make_token(User.objects.get(username='test'))
+        url = reverse('manager:schedule:ical', kwargs={'pk': 2, 'uidb64': uid, 'token': token})
+        response = self.client.get(url)
+        uids = self.get_uids(response)
+        self.assertTrue(all(uid.startswith('schedule-2-step-') for uid in uids))
+
+        with self.assertNumQueries(3):
+            response2 = self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response2.status_code, 304)
+
+        # Changing one of the workouts
+        Day.objects.filter(training__schedulestep__schedule_id=2).first().save()
+        response3 = self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response3.status_code, 200)
+        self.assertEqual(uids, self.get_uids(response3))
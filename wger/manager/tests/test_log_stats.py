@@ -0,0 +1,218 @@
+# This file is part of wger Workout Manager.
+#
+# wger Workout Manager is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# wger Workout Manager is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+
+# Standard Library
+import datetime
+import importlib
+from decimal import Decimal
+
+# Django
+from django.apps import apps
+from django.core.management import call_command
+from django.urls import reverse
+
+# Third Party
+from rest_framework import status
+
+# wger
+from wger.core.tests import api_base_test
+from wger.core.tests.base_testcase import WgerTestCase
+from wger.manager.models import (
+    WorkoutLog,
+    WorkoutLogStats,
+    WorkoutSession,
+)
+from wger.manager.stats import (
+    MAX_E1RM,
+    MAX_VOLUME,
+    estimate_1rm_brzycki,
+    estimate_1rm_epley,
+    rebuild_log_stats,
+)
+
+
+def stats_values(user_id=1):
+    return list(
+        WorkoutLogStats.objects.filter(user_id=user_id).order_by('exercise_base', 'date').values(
+            'exercise_base',
+            'date',
+            'weight_unit',
+            'set_count',
+            'volume',
+            'max_weight',
+            'e1rm_epley',
+            'e1rm_brzycki',
+            'is_weight_pr',
+            'is_e1rm_pr',
+            'is_volume_pr',
+        )
+    )
+
+
+class WorkoutLogStatsTestCase(WgerTestCase):
+    """
+    Tests the precomputed workout log statistics
+    """
+
+    def test_formulas(self):
+        self.assertEqual(estimate_1rm_epley(Decimal(100), 1), Decimal(100))
+        self.assertEqual(estimate_1rm_epley(Decimal(100), 10), Decimal('133.33'))
+        self.assertEqual(estimate_1rm_brzycki(Decimal(100), 10), Decimal('133.33'))
+        self.assertEqual(estimate_1rm_brzycki(Decimal(100), 5), Decimal('112.50'))
+        self.assertIsNone(estimate_1rm_brzycki(Decimal(100), 40))
+
+    def test_large_values(self):
+        """
+        Test that the estimates of absurd logs are clamped so they can be saved
+        """
+        self.assertEqual(estimate_1rm_epley(Decimal('999.99'), 3000), MAX_E1RM)
+
+        log = WorkoutLog(
+            user_id=1,
+            exercise_base_id=1,
+            workout_id=1,
+            reps=2**31 - 1,
+            weight=Decimal('999.99'),
+            date=datetime.date(2012, 10, 20),
+        )
+        log.save()
+        stats = WorkoutLogStats.objects.get(user_id=1, date=datetime.date(2012, 10, 20))
+        self.assertEqual(stats.e1rm_epley, MAX_E1RM)
+        self.assertEqual(stats.volume, MAX_VOLUME)
+
+    def test_rebuild(self):
+        """
+        Test rebuilding the statistics from the logs in the fixtures
+        """
+        count = rebuild_log_stats()
+        self.assertEqual(count, 5)
+
+        stats = stats_values()
+        self.assertEqual([s['date'].isoformat() for s in stats],
+                         ['2012-10-01', '2012-10-10', '2012-11-01', '2013-10-30'])
+        self.assertEqual(stats[0]['volume'], Decimal(240))
+        self.assertEqual([s['is_weight_pr'] for s in stats], [True, True, False, True])
+
+    def test_incremental(self):
+        """
+        Test that saving and deleting logs yields the same result as a rebuild
+        """
+        rebuild_log_stats()
+
+        # Add a new record between existing entries
+        log = WorkoutLog(
+            user_id=1,
+            exercise_base_id=1,
+            workout_id=1,
+            reps=5,
+            weight=35,
+            date=datetime.date(2012, 10, 20),
+        )
+        log.save()
+        incremental = stats_values()
+        rebuild_log_stats()
+        self.assertEqual(incremental, stats_values())
+        self.assertFalse(
+            WorkoutLogStats.objects.get(user_id=1, date=datetime.date(2012, 11, 1)).is_weight_pr
+        )
+
+        # Move it to another day
+        log.date = datetime.date(2012, 10, 5)
+        log.save()
+        incremental = stats_values()
+        rebuild_log_stats()
+        self.assertEqual(incremental, stats_values())
+
+        # Change the unit to one not used for the stats
+        log.repetition_unit_id = 3
+        log.save()
+        self.assertFalse(
+            WorkoutLogStats.objects.filter(user_id=1, date=datetime.date(2012, 10, 5)).exists()
+        )
+        log.repetition_unit_id = 1
+        log.save()
+
+        # Delete it
+        log.delete()
+        incremental = stats_values()
+        rebuild_log_stats()
+        self.assertEqual(incremental, stats_values())
+
+    def test_delete_session_and_workout(self):
+        """
+        Test that deleting logs together with their session or workout updates the statistics
+        """
+        rebuild_log_stats()
+        before = stats_values()
+
+        session = WorkoutSession.objects.get(pk=1)
+        self.user_login(session.user.username)
+        self.client.post(reverse('manager:session:delete', kwargs={'pk': 1, 'logs': 'logs'}))
+        incremental = stats_values(session.user_id)
+        rebuild_log_stats()
+        self.assertEqual(incremental, stats_values(session.user_id))
+
+        workout = WorkoutLog.objects.filter(user_id=1).first().workout
+        workout.delete()
+        incremental = stats_values()
+        rebuild_log_stats()
+        self.assertEqual(incremental, stats_values())
+        self.assertNotEqual(before, incremental)
+
+    def test_migration(self):
+        """
+        Test that the frozen rebuild in the migration gives the same result
+        """
+        migration = importlib.import_module('wger.manager.migrations.0019_rebuild_workoutlogstats')
+        WorkoutLog.objects.create(
+            user_id=1,
+            exercise_base_id=1,
+            workout_id=1,
+            reps=5,
+            weight=35,
+            date=datetime.date(2012, 10, 20),
+        )
+
+        rebuild_log_stats()
+        expected = stats_values()
+        WorkoutLogStats.objects.all().delete()
+        migration.rebuild_stats(apps, None)
+        self.assertEqual(stats_values(), expected)
+
+    def test_command(self):
+        call_command('rebuild-log-stats', user_ids=[2], stdout=None)
+        self.assertEqual(WorkoutLogStats.objects.filter(user_id=2).count(), 1)
+        self.assertEqual(WorkoutLogStats.objects.filter(user_id=1).count(), 0)
+
+
+class WorkoutLogStatsApiTestCase(
+    api_base_test.BaseTestCase, api_base_test.ApiBaseTestCase, api_base_test.ApiGetTestCase
+):
+    """
+    Tests the (read only) workout log statistics resource
+    """
+    pk = None
+    resource = WorkoutLogStats
+    private_resource = True
+
+    def setUp(self):
+        super().setUp()
+        rebuild_log_stats()
+        self.pk = WorkoutLogStats.objects.get(user_id=2).pk
+
+    def test_get_overview(self):
+        self.authenticate('test')
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['count'], 1)
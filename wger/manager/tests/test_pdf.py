@@ -12,12 +12,25 @@
 #
 # You should have received a copy of the GNU Affero General Public License
 
+# Standard Library
+from io import StringIO
+from unittest import mock
+
 # Django
+from django.conf import settings
 from django.contrib.auth.models import User
+from django.core.management import call_command
 from django.urls import reverse
+from django.utils import translation
 
 # wger
 from wger.core.tests.base_testcase import WgerTestCase
+from wger.manager.models import (
+    Setting,
+    Workout,
+)
+from wger.manager.pdf import render_workout_pdf
+from wger.manager.tasks import render_workout_pdf_task
 from wger.utils.helpers import make_token
 
 
@@ -293,3 +306,122 @@ class WorkoutPdfTableExportTestCase(WgerTestCase):
         self.export_pdf(fail=True)
         self.export_pdf_token()
         self.export_pdf_token_wrong()
+
+
+class WorkoutPdfCacheTestCase(WgerTestCase):
+    """
+    Tests the cache of the rendered workout PDFs
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.user_login('test')
+        self.url = reverse('manager:workout:pdf-log', kwargs={'id': 3})
+
+    def test_cached(self):
+        """
+        Test that the PDF is only rendered once
+        """
+        with mock.patch(
+            'wger.manager.pdf.render_workout_pdf',
+            wraps=render_workout_pdf,
+        ) as render:
+            response1 = self.client.get(self.url)
+            response2 = self.client.get(self.url)
+
+            self.assertEqual(render.call_count, 1)
+            self.assertEqual(response1.content, response2.content)
+            self.assertEqual(response2['Content-Type'], 'application/pdf')
+            self.assertEqual(
+                response2['Content-Disposition'],
+                'attachment; filename=Workout-3-log.pdf',
+            )
+
+    def test_render_options(self):
+        """
+        Test that the PDFs with other render options are cached separately
+        """
+        with mock.patch(
+            'wger.manager.pdf.render_workout_pdf',
+            wraps=render_workout_pdf,
+        ) as render:
+            self.client.get(self.url)
+            self.client.get(reverse('manager:workout:pdf-table', kwargs={'id': 3}))
+            self.client.get(
+                reverse('manager:workout:pdf-log', kwargs={
+                    'id': 3,
+                    'images': 1,
+                    'comments': 0
+                })
+            )
+            with translation.override('de'):
+                self.client.get(reverse('manager:workout:pdf-log', kwargs={'id': 3}))
+            self.assertEqual(render.call_count, 4)
+
+    def test_invalidated(self):
+        """
+        Test that changes to the workout invalidate the cached PDF
+        """
+        with mock.patch(
+            'wger.manager.pdf.render_workout_pdf',
+            wraps=render_workout_pdf,
+        ) as render:
+            self.client.get(self.url)
+
+            setting = Setting.objects.filter(set__exerciseday__training_id=3).first()
+            setting.reps = 99
+            setting.save()
+            self.client.get(self.url)
+            self.assertEqual(render.call_count, 2)
+
+            workout = Workout.objects.get(pk=3)
+            workout.name = 'A new name'
+            workout.save()
+            self.client.get(self.url)
+            self.assertEqual(render.call_count, 3)
+
+    @mock.patch.dict(settings.WGER_SETTINGS, {'PDF_BACKGROUND_THRESHOLD': 0})
+    def test_background(self):
+        """
+        Test that large workouts are rendered in the background
+        """
+        settings.WGER_SETTINGS['USE_CELERY'] = True
+        with mock.patch('wger.manager.views.pdf.render_workout_pdf_task') as task:
+            response = self.client.get(self.url)
+            self.assertEqual(response.status_code, 202)
+            self.assertTemplateUsed(response, 'misc/pdf_pending.html')
+
+            # The task is only started once while it is running
+            response = self.client.get(self.url)
+            self.assertEqual(response.status_code, 202)
+            self.assertEqual(task.delay.call_count, 1)
+
+        args, kwargs = task.delay.call_args
+        render_workout_pdf_task(*args, **kwargs)
+
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'application/pdf')
+        self.assertGreater(int(response['Content-Length']), 38000)
+
+    @mock.patch.dict(settings.WGER_SETTINGS, {'PDF_BACKGROUND_THRESHOLD': 0})
+    def test_background_no_celery(self):
+        """
+        Test that large workouts are rendered directly without celery
+        """
+        with mock.patch('wger.manager.views.pdf.render_workout_pdf_task') as task:
+            response = self.client.get(self.url)
+            self.assertEqual(response.status_code, 200)
+            task.delay.assert_not_called()
+
+    def test_benchmark_command(self):
+        """
+        Test the PDF benchmark command
+        """
+        out = StringIO()
+        call_command('benchmark-pdf', workouts=[3], plans=[4], iterations=1, stdout=out)
+
+        self.assertIn('Workout 3 (log): ', out.getvalue())
+        self.assertIn('Workout 3 (table): ', out.getvalue())
+        self.assertIn('Nutritional plan 4: ', out.getvalue())
+        self.assertIn('peak memory', out.getvalue())
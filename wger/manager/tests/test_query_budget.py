@@ -0,0 +1,125 @@
+# This file is part of wger Workout Manager.
+#
+# wger Workout Manager is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# wger Workout Manager is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+
+# Standard Library
+import datetime
+
+# Django
+from django.core.cache import cache
+from django.urls import reverse
+
+# wger
+from wger.core.tests.base_testcase import WgerTestCase
+from wger.manager.models import (
+    Day,
+    Set,
+    Setting,
+    Workout,
+    WorkoutLog,
+)
+
+
+class WorkoutQueryBudgetTestCase(WgerTestCase):
+    """
+    Tests the number of queries of the workout pages and endpoints
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.user_login('admin')
+        self.workout = Workout.objects.get(pk=1)
+
+    def add_days(self, count=3):
+        """
+        Adds training days with two exercises each to the workout
+        """
+        for i in range(count):
+            day = Day.objects.create(training=self.workout, description=f'Extra day {i}')
+            day.day.add(i % 7 + 1)
+            for order, base_id in enumerate((1, 2), 1):
+                exercise_set = Set.objects.create(exerciseday=day, sets=3, order=order)
+                Setting.objects.bulk_create(
+                    [
+                        Setting(set=exercise_set, exercise_base_id=base_id, reps=reps, order=j)
+                        for j, reps in enumerate((8, 10, 12), 1)
+                    ]
+                )
+
+    def add_logs(self, count=20):
+        """
+        Adds workout logs for the admin user
+        """
+        WorkoutLog.objects.bulk_create(
+            [
+                WorkoutLog(
+                    user_id=1,
+                    workout=self.workout,
+                    exercise_base_id=i % 2 + 1,
+                    reps=10,
+                    weight=50 + i,
+                    date=datetime.date(2023, 1, 1) + datetime.timedelta(days=i),
+                ) for i in range(count)
+            ]
+        )
+
+    def test_workout_view(self):
+        """
+        Test the workout detail page
+        """
+        url = reverse('manager:workout:view', kwargs={'pk': 1})
+        self.client.get(url)
+        with self.assertQueryBudget(13):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertNoQueryGrowth(lambda: self.client.get(url), self.add_days, clear_cache=False)
+
+    def test_canonical_representation(self):
+        """
+        Test the canonical representation endpoint
+
+        Building the canonical form still needs queries for every set, so only
+        the cached form must not grow.
+        """
+        url = reverse('workout-canonical-representation', kwargs={'pk': 1})
+        self.client.get(url)
+        cache.clear()
+        with self.assertQueryBudget(75):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        with self.assertQueryBudget(7):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertNoQueryGrowth(lambda: self.client.get(url), self.add_days, clear_cache=False)
+
+    def test_workout_log_api(self):
+        """
+        Test the workout log overview endpoint
+        """
+        url = reverse('workoutlog-list')
+        self.client.get(url)
+        with self.assertQueryBudget(7):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertNoQueryGrowth(lambda: self.client.get(url), self.add_logs)
+
+    def test_log_data(self):
+        """
+        Test the log data endpoint used for the charts
+        """
+        url = reverse('workout-log-data', kwargs={'pk': 1})
+        self.client.get(url, {'id': 1})
+        with self.assertQueryBudget(9):
+            response = self.client.get(url, {'id': 1})
+        self.assertEqual(response.status_code, 200)
+        self.assertNoQueryGrowth(lambda: self.client.get(url, {'id': 1}), self.add_logs)
@@ -751,6 +751,8 @@ class ScheduleApiTestCase(api_base_test.ApiBaseResourceTestCase):
     """
     pk = 1
     resource = Schedule
+    query_budget_detail = 2
+    query_budget_overview = 2
     private_resource = True
     data = {
         'name': 'An updated name',
@@ -98,6 +98,8 @@ class ScheduleStepApiTestCase(api_base_test.ApiBaseResourceTestCase):
     """
     pk = 4
     resource = ScheduleStep
+    query_budget_detail = 3
+    query_budget_overview = 2
     private_resource = True
     data = {
         'workout': '3',
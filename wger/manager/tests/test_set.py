@@ -533,11 +533,34 @@ class SetSmartReprTestCase(WgerTestCase):
                 self.assertEqual(settings[i].rir, '2.5')
 
 
+class SetExerciseBasesTestCase(WgerTestCase):
+    """
+    Tests the exercise bases of a set
+    """
+
+    def test_main_images_loaded(self):
+        """
+        Test that the main images of all exercises are loaded at once
+        """
+        set_obj = Set.objects.create(exerciseday_id=5, sets=4)
+        for base_id in (1, 2, 3):
+            Setting.objects.create(set=set_obj, exercise_base_id=base_id, reps=10, order=base_id)
+
+        bases = set_obj.exercise_bases
+        with self.assertNumQueries(0):
+            images = [base.main_image for base in bases]
+
+        self.assertEqual(images, [ExerciseBase.objects.get(pk=pk).main_image for pk in (1, 2, 3)])
+        self.assertTrue(any(images))
+
+
 class SetApiTestCase(api_base_test.ApiBaseResourceTestCase):
     """
     Tests the set overview resource
     """
     pk = 3
     resource = Set
+    query_budget_detail = 4
+    query_budget_overview = 2
     private_resource = True
     data = {'exerciseday': 5, 'sets': 4}
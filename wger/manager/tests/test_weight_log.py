@@ -539,6 +539,8 @@ class WorkoutLogApiTestCase(api_base_test.ApiBaseResourceTestCase):
     """
     pk = 5
     resource = WorkoutLog
+    query_budget_detail = 2
+    query_budget_overview = 2
     private_resource = True
     data = {
         "exercise_base": 1,
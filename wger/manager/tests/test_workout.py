@@ -131,6 +131,8 @@ class WorkoutApiTestCase(api_base_test.ApiBaseResourceTestCase):
     """
     pk = 3
     resource = Workout
+    query_budget_detail = 2
+    query_budget_overview = 2
     private_resource = True
     special_endpoints = ('canonical_representation', )
     data = {'name': 'A new comment'}
@@ -261,6 +261,8 @@ class WorkoutSessionApiTestCase(api_base_test.ApiBaseResourceTestCase):
     """
     pk = 4
     resource = WorkoutSession
+    query_budget_detail = 2
+    query_budget_overview = 2
     private_resource = True
     data = {
         'workout': 3,
@@ -16,29 +16,36 @@
 
 # Standard Library
 import datetime
+import hashlib
 import logging
 
 # Django
+from django.conf import settings
 from django.contrib.sites.models import Site
+from django.core.cache import cache
 from django.http import (
     HttpResponse,
     HttpResponseForbidden,
 )
 from django.shortcuts import get_object_or_404
-
-# Third Party
-from icalendar import (
-    Calendar,
-    Event,
-)
-from icalendar.tools import UIDGenerator
+from django.utils.cache import get_conditional_response
+from django.utils.http import quote_etag
+from django.utils.translation import get_language
 
 # wger
 from wger import get_version
+from wger.exercises.models import Exercise
 from wger.manager.models import (
+    Day,
     Schedule,
+    Setting,
     Workout,
 )
+from wger.utils.cache import (
+    cache_mapper,
+    get_content_version,
+)
+from wger.utils.constants import ENGLISH_SHORT_NAME
 from wger.utils.helpers import (
     check_token,
     next_weekday,
@@ -66,50 +73,121 @@ def get_calendar():
 
     :return: Calendar
     """
+    # Third Party
+    from icalendar import Calendar
+
     calendar = Calendar()
     calendar.add('prodid', '-//wger Workout Manager//wger.de//')
     calendar.add('version', get_version())
     return calendar
 
 
-def get_events_workout(calendar, workout, duration, start_date=None):
+def get_events_workouts(calendar, entries, domain, language=None):
     """
-    Creates all necessary events from the given workout and adds them to
-    the calendar. Each event's occurrence ist set to weekly (one event for
-    each training day).
+    Creates the events of several workouts and adds them to the calendar.
+    Each event's occurrence is set to weekly (one event for each training day).
+
+    The days, exercises and translations of all workouts are loaded at once,
+    so the number of queries does not depend on the size of the workouts.
+    The UIDs only depend on the workout, day and weekday, so that calendar
+    applications recognize the events when the feed is fetched again.
 
     :param calendar: calendar to add events to
-    :param workout: Workout
-    :param duration: duration in weeks
-    :param start_date: start date, default: profile default
+    :param entries: list of (workout id, duration in weeks, start date, UID prefix)
+    :param domain: domain used in the UIDs
+    :param language: language of the exercise names, default: current language
     :return: None
     """
+    # Third Party
+    from icalendar import Event
+
+    language = language or get_language()
+    workout_ids = {entry[0] for entry in entries}
+
+    days = {}
+    for day in Day.objects.filter(training_id__in=workout_ids).prefetch_related('day').order_by('pk'):
+        days.setdefault(day.training_id, []).append(day)
+
+    # The exercise bases of each set, without duplicates
+    day_sets = {}
+    rows = Setting.objects.filter(set__exerciseday__training_id__in=workout_ids) \
+        .order_by('set__order', 'set_id', 'order', 'id') \
+        .values_list('set__exerciseday_id', 'set_id', 'exercise_base_id')
+    for day_id, set_id, base_id in rows:
+        day_sets.setdefault(day_id, {}).setdefault(set_id, {})[base_id] = None
+
+    base_ids = {base_id for sets in day_sets.values() for bases in sets.values() for base_id in bases}
+    translations = {}
+    for base_id, short_name, name in Exercise.objects.filter(exercise_base_id__in=base_ids) \
+            .values_list('exercise_base_id', 'language__short_name', 'name'):
+        translations.setdefault(base_id, {}).setdefault(short_name, name)
+
+    def get_name(base_id):
+        names = translations[base_id]
+        return names.get(language) or names.get(ENGLISH_SHORT_NAME) or next(iter(names.values()))
+
+    for workout_id, duration, start_date, uid_prefix in entries:
+        end_date = start_date + datetime.timedelta(weeks=duration)
+
+        for day in days.get(workout_id, []):
+
+            # Make the description of the event with the day's exercises
+            description_list = [
+                get_name(base_id)
+                for bases in day_sets.get(day.pk, {}).values()
+                for base_id in bases
+                if base_id in translations
+            ]
+            description = ', '.join(description_list) if description_list else day.description
+
+            # Make an event for each weekday
+            for weekday in day.day.all():
+                event = Event()
+                event.add('summary', day.description)
+                event.add('description', description)
+                event.add('dtstart', next_weekday(start_date, weekday.id - 1))
+                event.add('dtend', next_weekday(start_date, weekday.id - 1))
+                event.add('rrule', {'freq': 'weekly', 'until': end_date})
+                event['uid'] = f'{uid_prefix}workout-{workout_id}-day-{day.pk}-' \
+                               f'weekday-{weekday.id}@{domain}'
+                event.add('priority', 5)
+                calendar.add_component(event)
+
+
+def get_etag(*values):
+    """
+    Returns an ETag for the given values
+    """
+    return hashlib.md5('-'.join(str(value) for value in values).encode()).hexdigest()
+
+
+def ical_response(request, kind, pk, etag, build_fn):
+    """
+    Returns the iCal file of an object
 
-    start_date = start_date if start_date else workout.creation_date
-    end_date = start_date + datetime.timedelta(weeks=duration)
-    generator = UIDGenerator()
-    site = Site.objects.get_current()
-
-    for day in workout.day_set.all():
-
-        # Make the description of the event with the day's exercises
-        description_list = []
-        for set_obj in day.set_set.all():
-            for base in set_obj.exercise_bases:
-                description_list.append(str(base.get_exercise()))
-        description = ', '.join(description_list) if description_list else day.description
-
-        # Make an event for each weekday
-        for weekday in day.day.all():
-            event = Event()
-            event.add('summary', day.description)
-            event.add('description', description)
-            event.add('dtstart', next_weekday(start_date, weekday.id - 1))
-            event.add('dtend', next_weekday(start_date, weekday.id - 1))
-            event.add('rrule', {'freq': 'weekly', 'until': end_date})
-            event['uid'] = generator.uid(host_name=site.domain)
-            event.add('priority', 5)
-            calendar.add_component(event)
+    Clients that send the current ETag in If-None-Match get an empty 304
+    response, otherwise the file is read from the cache and only rendered
+    with build_fn if the content changed.
+
+    :param kind: kind of object, 'workout' or 'schedule'
+    :param pk: primary key of the object
+    :param etag: ETag of the current content
+    :param build_fn: function that renders the calendar, returns bytes
+    """
+    quoted_etag = quote_etag(etag)
+    response = get_conditional_response(request, etag=quoted_etag)
+    if response is None:
+        key = cache_mapper.get_ical_key(kind, pk, etag)
+        content = cache.get(key)
+        if content is None:
+            content = build_fn()
+            cache.set(key, content, settings.WGER_SETTINGS['ICAL_CACHE_TTL'])
+
+        response = HttpResponse(content, content_type='text/calendar')
+        response['Content-Disposition'] = f'attachment; filename=Calendar-{kind}-{pk}.ics'
+        response['Content-Length'] = len(content)
+    response['ETag'] = quoted_etag
+    return response
 
 
 # Views
@@ -117,31 +195,41 @@ def export(request, pk, uidb64=None, token=None):
     """
     Export the current workout as an iCal file
     """
+    workouts = Workout.objects.select_related('user__userprofile')
 
     # Load the workout
     if uidb64 is not None and token is not None:
         if check_token(uidb64, token):
-            workout = get_object_or_404(Workout, pk=pk)
+            workout = get_object_or_404(workouts, pk=pk)
         else:
             return HttpResponseForbidden()
     else:
         if request.user.is_anonymous:
             return HttpResponseForbidden()
-        workout = get_object_or_404(Workout, pk=pk, user=request.user)
+        workout = get_object_or_404(workouts, pk=pk, user=request.user)
 
-    # Create the calendar
-    calendar = get_calendar()
+    domain = Site.objects.get_current().domain
+    language = get_language()
+    duration = workout.user.userprofile.workout_duration
+    etag = get_etag(
+        get_content_version('workout', workout.pk),
+        workout.creation_date,
+        duration,
+        domain,
+        language,
+    )
 
-    # Create the events and add them to the calendar
-    get_events_workout(calendar, workout, workout.user.userprofile.workout_duration)
+    def build():
+        calendar = get_calendar()
+        get_events_workouts(
+            calendar,
+            [(workout.pk, duration, workout.creation_date, '')],
+            domain,
+            language,
+        )
+        return calendar.to_ical()
 
-    # Send the file to the user
-    response = HttpResponse(content_type='text/calendar')
-    response['Content-Disposition'] = \
-        'attachment; filename=Calendar-workout-{0}.ics'.format(workout.pk)
-    response.write(calendar.to_ical())
-    response['Content-Length'] = len(response.content)
-    return response
+    return ical_response(request, 'workout', workout.pk, etag, build)
 
 
 def export_schedule(request, pk, uidb64=None, token=None):
@@ -160,19 +248,30 @@ def export_schedule(request, pk, uidb64=None, token=None):
             return HttpResponseForbidden()
         schedule = get_object_or_404(Schedule, pk=pk, user=request.user)
 
-    # Create the calendar
-    calendar = get_calendar()
+    domain = Site.objects.get_current().domain
+    language = get_language()
 
-    # Create the events and add them to the calendar
+    # The steps follow each other, starting today
+    entries = []
     start_date = datetime.date.today()
-    for step in schedule.schedulestep_set.all():
-        get_events_workout(calendar, step.workout, step.duration, start_date)
-        start_date = start_date + datetime.timedelta(weeks=step.duration)
-
-    # Send the file to the user
-    response = HttpResponse(content_type='text/calendar')
-    response['Content-Disposition'] = \
-        'attachment; filename=Calendar-schedule-{0}.ics'.format(schedule.pk)
-    response.write(calendar.to_ical())
-    response['Content-Length'] = len(response.content)
-    return response
+    steps = schedule.schedulestep_set.values_list('pk', 'workout_id', 'duration')
+    for step_pk, workout_id, duration in steps:
+        entries.append((workout_id, duration, start_date, f'schedule-{schedule.pk}-step-{step_pk}-'))
+        start_date = start_date + datetime.timedelta(weeks=duration)
+
+    etag = get_etag(
+        datetime.date.today(),
+        domain,
+        language,
+        *[
+            f'{entry[3]}{entry[1]}-{get_content_version("workout", entry[0])}'
+            for entry in entries
+        ],
+    )
+
+    def build():
+        calendar = get_calendar()
+        get_events_workouts(calendar, entries, domain, language)
+        return calendar.to_ical()
+
+    return ical_response(request, 'schedule', schedule.pk, etag, build)
@@ -16,33 +16,21 @@
 
 # Standard Library
 import logging
+from functools import partial
 
 # Django
-from django.http import (
-    HttpResponse,
-    HttpResponseForbidden,
-)
+from django.conf import settings
+from django.http import HttpResponseForbidden
 from django.shortcuts import get_object_or_404
-from django.utils.translation import gettext as _
-
-# Third Party
-from reportlab.lib.pagesizes import A4
-from reportlab.lib.units import cm
-from reportlab.platypus import (
-    Paragraph,
-    SimpleDocTemplate,
-    Spacer,
-)
+from django.utils import translation
 
 # wger
-from wger.manager.helpers import render_workout_day
-from wger.manager.models import Workout
-from wger.utils.helpers import check_token
-from wger.utils.pdf import (
-    get_logo,
-    render_footer,
-    styleSheet,
+from wger.manager.models import (
+    Setting,
+    Workout,
 )
+from wger.manager.tasks import render_workout_pdf_task
+from wger.utils.helpers import check_token
 
 
 logger = logging.getLogger(__name__)
@@ -56,141 +44,77 @@ def workout_log(request, id, images=False, comments=False, uidb64=None, token=No
     * http://www.blog.pythonlibrary.org/2010/09/21/reportlab
     * http://www.reportlab.com/apis/reportlab/dev/platypus.html
     """
-    comments = bool(int(comments))
-    images = bool(int(images))
-
-    # Load the workout
-    if uidb64 is not None and token is not None:
-        if check_token(uidb64, token):
-            workout = get_object_or_404(Workout, pk=id)
-        else:
-            return HttpResponseForbidden()
-    else:
-        if request.user.is_anonymous:
-            return HttpResponseForbidden()
-        workout = get_object_or_404(Workout, pk=id, user=request.user)
-
-    # Create the HttpResponse object with the appropriate PDF headers.
-    response = HttpResponse(content_type='application/pdf')
-
-    # Create the PDF object, using the response object as its "file."
-    doc = SimpleDocTemplate(
-        response,
-        pagesize=A4,
-        # pagesize = landscape(A4),
-        leftMargin=cm,
-        rightMargin=cm,
-        topMargin=0.5 * cm,
-        bottomMargin=0.5 * cm,
-        title=_('Workout'),
-        author='wger Workout Manager',
-        subject=_('Workout for %s') % request.user.username
-    )
-
-    # container for the 'Flowable' objects
-    elements = []
-
-    # Add site logo
-    elements.append(get_logo())
-    elements.append(Spacer(10 * cm, 0.5 * cm))
-
-    # Set the title
-    p = Paragraph(
-        f'<para align="center"><strong>{workout.name}</strong></para>', styleSheet["HeaderBold"]
-    )
-    elements.append(p)
-    elements.append(Spacer(10 * cm, 0.5 * cm))
-    if workout.description:
-        p = Paragraph(f'<para align="center">{workout.description}</para>')
-        elements.append(p)
-        elements.append(Spacer(10 * cm, 1.5 * cm))
-
-    # Iterate through the Workout and render the training days
-    for day in workout.day_set.all():
-        elements.append(render_workout_day(day, images=images, comments=comments))
-        elements.append(Spacer(10 * cm, 0.5 * cm))
-
-    # Footer, date and info
-    elements.append(Spacer(10 * cm, 0.5 * cm))
-    elements.append(render_footer(request.build_absolute_uri(workout.get_absolute_url())))
-
-    # write the document and send the response to the browser
-    doc.build(elements)
-
-    # Create the HttpResponse object with the appropriate PDF headers.
-    response['Content-Disposition'] = 'attachment; filename=Workout-{0}-log.pdf'.format(id)
-    response['Content-Length'] = len(response.content)
-    return response
+    return export_workout_pdf(request, id, images, comments, uidb64, token, only_table=False)
 
 
 def workout_view(request, id, images=False, comments=False, uidb64=None, token=None):
     """
     Generates a PDF with the contents of the workout, without table for logs
     """
+    return export_workout_pdf(request, id, images, comments, uidb64, token, only_table=True)
+
+
+def export_workout_pdf(request, id, images, comments, uidb64, token, only_table):
     """
-    Generates a PDF with the contents of the given workout
-    See also
-    * http://www.blog.pythonlibrary.org/2010/09/21/reportlab
-    * http://www.reportlab.com/apis/reportlab/dev/platypus.html
+    Returns the PDF of a workout
+
+    Rendered PDFs are cached per workout content version and render options,
+    so shared links do not build the document on every request. Large
+    workouts that are not in the cache are rendered in the background if
+    celery is used.
     """
+    # wger
+    from wger.manager.pdf import render_workout_pdf
+    from wger.utils.pdf import (
+        cached_pdf_response,
+        get_pdf_render_key,
+    )
+
     comments = bool(int(comments))
     images = bool(int(images))
 
     # Load the workout
     if uidb64 is not None and token is not None:
         if check_token(uidb64, token):
-            workout = get_object_or_404(Workout, pk=id)
+            workout = get_object_or_404(Workout.objects.select_related('user'), pk=id)
         else:
             return HttpResponseForbidden()
     else:
         if request.user.is_anonymous:
             return HttpResponseForbidden()
-        workout = get_object_or_404(Workout, pk=id, user=request.user)
-
-    # Create the HttpResponse object with the appropriate PDF headers.
-    response = HttpResponse(content_type='application/pdf')
-
-    # Create the PDF object, using the response object as its "file."
-    doc = SimpleDocTemplate(
-        response,
-        pagesize=A4,
-        leftMargin=cm,
-        rightMargin=cm,
-        topMargin=0.5 * cm,
-        bottomMargin=0.5 * cm,
-        title=_('Workout'),
-        author='wger Workout Manager',
-        subject=_('Workout for %s') % request.user.username
+        workout = get_object_or_404(
+            Workout.objects.select_related('user'), pk=id, user=request.user
+        )
+
+    url = request.build_absolute_uri(workout.get_absolute_url())
+    key = get_pdf_render_key(
+        'workout',
+        workout.pk,
+        url=url,
+        images=images,
+        comments=comments,
+        only_table=only_table,
     )
-
-    # container for the 'Flowable' objects
-    elements = []
-
-    # Add site logo
-    elements.append(get_logo())
-    elements.append(Spacer(10 * cm, 0.5 * cm))
-
-    # Set the title
-    p = Paragraph(
-        '<para align="center"><strong>%(description)s</strong></para>' % {'description': workout},
-        styleSheet["HeaderBold"]
+    filename = 'Workout-{0}-{1}.pdf'.format(id, 'table' if only_table else 'log')
+
+    background_fn = None
+    nr_of_settings = Setting.objects.filter(set__exerciseday__training=workout).count()
+    if nr_of_settings > settings.WGER_SETTINGS['PDF_BACKGROUND_THRESHOLD']:
+        background_fn = partial(
+            render_workout_pdf_task.delay,
+            key,
+            workout.pk,
+            url,
+            translation.get_language(),
+            images=images,
+            comments=comments,
+            only_table=only_table,
+        )
+
+    return cached_pdf_response(
+        request,
+        key,
+        filename,
+        partial(render_workout_pdf, workout, url, images, comments, only_table),
+        background_fn,
     )
-    elements.append(p)
-    elements.append(Spacer(10 * cm, 1.5 * cm))
-
-    # Iterate through the Workout and render the training days
-    for day in workout.day_set.all():
-        elements.append(render_workout_day(day, images=images, comments=comments, only_table=True))
-        elements.append(Spacer(10 * cm, 0.5 * cm))
-
-    # Footer, date and info
-    elements.append(Spacer(10 * cm, 0.5 * cm))
-    elements.append(render_footer(request.build_absolute_uri(workout.get_absolute_url())))
-
-    # write the document and send the response to the browser
-    doc.build(elements)
-
-    # Create the HttpResponse object with the appropriate PDF headers.
-    response['Content-Disposition'] = 'attachment; filename=Workout-{0}-table.pdf'.format(id)
-    response['Content-Length'] = len(response.content)
-    return response
@@ -44,18 +44,8 @@ from django.views.generic import (
     UpdateView,
 )
 
-# Third Party
-from reportlab.lib.pagesizes import A4
-from reportlab.lib.units import cm
-from reportlab.platypus import (
-    Paragraph,
-    SimpleDocTemplate,
-    Spacer,
-)
-
 # wger
 from wger.manager.forms import WorkoutScheduleDownloadForm
-from wger.manager.helpers import render_workout_day
 from wger.manager.models import Schedule
 from wger.utils.generic_views import (
     WgerDeleteMixin,
@@ -65,10 +55,6 @@ from wger.utils.helpers import (
     check_token,
     make_token,
 )
-from wger.utils.pdf import (
-    render_footer,
-    styleSheet,
-)
 
 
 logger = logging.getLogger(__name__)
@@ -123,77 +109,22 @@ def export_pdf_log(request, pk, images=False, comments=False, uidb64=None, token
     """
     Show the workout schedule
     """
-    user = request.user
-
-    comments = bool(int(comments))
-    images = bool(int(images))
-
-    # Load the workout
-    if uidb64 is not None and token is not None:
-        if check_token(uidb64, token):
-            schedule = get_object_or_404(Schedule, pk=pk)
-        else:
-            return HttpResponseForbidden()
-    else:
-        if request.user.is_anonymous:
-            return HttpResponseForbidden()
-        schedule = get_object_or_404(Schedule, pk=pk, user=user)
-
-    # Create the HttpResponse object with the appropriate PDF headers.
-    # and use it to the create the PDF using it as a file like object
-    response = HttpResponse(content_type='application/pdf')
-    doc = SimpleDocTemplate(
-        response,
-        pagesize=A4,
-        leftMargin=cm,
-        rightMargin=cm,
-        topMargin=0.5 * cm,
-        bottomMargin=0.5 * cm,
-        title=_('Workout'),
-        author='wger Workout Manager',
-        subject='Schedule for {0}'.format(request.user.username)
-    )
-
-    # container for the 'Flowable' objects
-    elements = []
-
-    # Set the title
-    p = Paragraph('<para align="center">{0}</para>'.format(schedule), styleSheet["HeaderBold"])
-    elements.append(p)
-    elements.append(Spacer(10 * cm, 0.5 * cm))
-
-    # Iterate through the Workout and render the training days
-    for step in schedule.schedulestep_set.all():
-        p = Paragraph(
-            '<para>{0} {1}</para>'.format(step.duration, _('Weeks')),
-            styleSheet["HeaderBold"],
-        )
-        elements.append(p)
-        elements.append(Spacer(10 * cm, 0.5 * cm))
-
-        for day in step.workout.day_set.all():
-            elements.append(
-                render_workout_day(day, images=images, comments=comments, nr_of_weeks=7)
-            )
-            elements.append(Spacer(10 * cm, 0.5 * cm))
-
-    # Footer, date and info
-    elements.append(Spacer(10 * cm, 0.5 * cm))
-    url = reverse('manager:schedule:view', kwargs={'pk': schedule.id})
-    elements.append(render_footer(request.build_absolute_uri(url)))
-
-    # write the document and send the response to the browser
-    doc.build(elements)
-    response['Content-Disposition'] = 'attachment; filename=Schedule-{0}-log.pdf'.format(pk)
-    response['Content-Length'] = len(response.content)
-    return response
+    return export_pdf(request, pk, images, comments, uidb64, token, only_table=False)
 
 
 def export_pdf_table(request, pk, images=False, comments=False, uidb64=None, token=None):
     """
     Show the workout schedule
     """
-    user = request.user
+    return export_pdf(request, pk, images, comments, uidb64, token, only_table=True)
+
+
+def export_pdf(request, pk, images, comments, uidb64, token, only_table):
+    """
+    Returns the PDF of a schedule
+    """
+    # wger
+    from wger.manager.pdf import render_schedule_pdf
 
     comments = bool(int(comments))
     images = bool(int(images))
@@ -201,66 +132,29 @@ def export_pdf_table(request, pk, images=False, comments=False, uidb64=None, tok
     # Load the workout
     if uidb64 is not None and token is not None:
         if check_token(uidb64, token):
-            schedule = get_object_or_404(Schedule, pk=pk)
+            schedule = get_object_or_404(Schedule.objects.select_related('user'), pk=pk)
         else:
             return HttpResponseForbidden()
     else:
         if request.user.is_anonymous:
             return HttpResponseForbidden()
-        schedule = get_object_or_404(Schedule, pk=pk, user=user)
-
-    # Create the HttpResponse object with the appropriate PDF headers.
-    # and use it to the create the PDF using it as a file like object
-    response = HttpResponse(content_type='application/pdf')
-    doc = SimpleDocTemplate(
-        response,
-        pagesize=A4,
-        leftMargin=cm,
-        rightMargin=cm,
-        topMargin=0.5 * cm,
-        bottomMargin=0.5 * cm,
-        title=_('Workout'),
-        author='wger Workout Manager',
-        subject='Schedule for {0}'.format(request.user.username)
-    )
-
-    # container for the 'Flowable' objects
-    elements = []
-
-    # Set the title
-    p = Paragraph('<para align="center">{0}</para>'.format(schedule), styleSheet["HeaderBold"])
-    elements.append(p)
-    elements.append(Spacer(10 * cm, 0.5 * cm))
-
-    # Iterate through the Workout and render the training days
-    for step in schedule.schedulestep_set.all():
-        p = Paragraph(
-            '<para>{0} {1}</para>'.format(step.duration, _('Weeks')),
-            styleSheet["HeaderBold"],
+        schedule = get_object_or_404(
+            Schedule.objects.select_related('user'), pk=pk, user=request.user
         )
-        elements.append(p)
-        elements.append(Spacer(10 * cm, 0.5 * cm))
-
-        for day in step.workout.day_set.all():
-            elements.append(
-                render_workout_day(
-                    day,
-                    images=images,
-                    comments=comments,
-                    nr_of_weeks=7,
-                    only_table=True,
-                )
-            )
-            elements.append(Spacer(10 * cm, 0.5 * cm))
-
-    # Footer, date and info
-    elements.append(Spacer(10 * cm, 0.5 * cm))
+
     url = reverse('manager:schedule:view', kwargs={'pk': schedule.id})
-    elements.append(render_footer(request.build_absolute_uri(url)))
+    content = render_schedule_pdf(
+        schedule,
+        request.build_absolute_uri(url),
+        images=images,
+        comments=comments,
+        only_table=only_table,
+    )
 
-    # write the document and send the response to the browser
-    doc.build(elements)
-    response['Content-Disposition'] = 'attachment; filename=Schedule-{0}-table.pdf'.format(pk)
+    response = HttpResponse(content, content_type='application/pdf')
+    response['Content-Disposition'] = 'attachment; filename=Schedule-{0}-{1}.pdf'.format(
+        pk, 'table' if only_table else 'log'
+    )
     response['Content-Length'] = len(response.content)
     return response
 
@@ -20,6 +20,8 @@ import logging
 
 # Third Party
 from rest_framework import viewsets
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 from rest_framework.permissions import IsAuthenticated
 
 # wger
@@ -31,6 +33,7 @@ from wger.measurements.models import (
     Category,
     Measurement,
 )
+from wger.utils.timeseries import timeseries_response
 
 
 logger = logging.getLogger(__name__)
@@ -89,3 +92,20 @@ class MeasurementViewSet(viewsets.ModelViewSet):
             return Measurement.objects.none()
 
         return Measurement.objects.filter(category__user=self.request.user)
+
+    @action(detail=False)
+    def timeseries(self, request):
+        """
+        Return the measurements of a category aggregated by day, week or month
+
+        Parameters: category (required), period (day, week, month), start and
+        end (ISO dates), points (downsample to this number of points) and
+        moving_average (window size in periods).
+        """
+        try:
+            category = int(request.query_params['category'])
+        except (KeyError, ValueError):
+            raise ValidationError({'category': 'A category ID is required'})
+
+        queryset = self.get_queryset().filter(category_id=category)
+        return timeseries_response(request, queryset, 'value')
@@ -14,8 +14,12 @@
 # along with Workout Manager.  If not, see <http://www.gnu.org/licenses/>.
 # Standard Library
 
+# Third Party
+from rest_framework import status
+
 # wger
 from wger.core.tests import api_base_test
+from wger.core.tests.base_testcase import BaseTestCase
 from wger.measurements.models import Measurement
 
 
@@ -32,3 +36,30 @@ class MeasurementsApiTestCase(api_base_test.ApiBaseResourceTestCase):
         'date': '2021-08-12',
         'value': 99.99,
     }
+
+
+class MeasurementsTimeSeriesApiTestCase(BaseTestCase, api_base_test.ApiBaseTestCase):
+    """
+    Tests the time series endpoint for measurements
+    """
+    url = '/api/v2/measurement/timeseries/'
+
+    def test_timeseries(self):
+        self.authenticate('test')
+        response = self.client.get(self.url, {'category': 1, 'period': 'month'})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['results']), 1)
+        self.assertEqual(response.data['results'][0]['count'], 2)
+        self.assertEqual(response.data['results'][0]['min'], 20)
+        self.assertEqual(response.data['results'][0]['last'], 21)
+
+    def test_timeseries_category_required(self):
+        self.authenticate('test')
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_timeseries_other_user(self):
+        self.authenticate('admin')
+        response = self.client.get(self.url, {'category': 1})
+        self.assertEqual(response.data['results'], [])
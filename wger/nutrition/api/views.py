@@ -20,10 +20,8 @@ import datetime
 import logging
 
 # Django
-from django.conf import settings
+from django.db.models import Prefetch
 from django.shortcuts import get_object_or_404
-from django.utils.decorators import method_decorator
-from django.views.decorators.cache import cache_page
 
 # Third Party
 from drf_spectacular.types import OpenApiTypes
@@ -32,8 +30,6 @@ from drf_spectacular.utils import (
     extend_schema,
     inline_serializer,
 )
-from easy_thumbnails.alias import aliases
-from easy_thumbnails.files import get_thumbnailer
 from rest_framework import viewsets
 from rest_framework.decorators import (
     action,
@@ -71,13 +67,17 @@ from wger.nutrition.models import (
 )
 from wger.utils.constants import ENGLISH_SHORT_NAME
 from wger.utils.language import load_language
-from wger.utils.viewsets import WgerOwnerObjectModelViewSet
+from wger.utils.thumbnails import get_thumbnail_url
+from wger.utils.viewsets import (
+    ConditionalGetMixin,
+    WgerOwnerObjectModelViewSet,
+)
 
 
 logger = logging.getLogger(__name__)
 
 
-class IngredientViewSet(viewsets.ReadOnlyModelViewSet):
+class IngredientViewSet(ConditionalGetMixin, viewsets.ReadOnlyModelViewSet):
     """
     API endpoint for ingredient objects. For a read-only endpoint with all
     the information of an ingredient, see /api/v2/ingredientinfo/
@@ -104,10 +104,6 @@ class IngredientViewSet(viewsets.ReadOnlyModelViewSet):
         'license_author',
     )
 
-    @method_decorator(cache_page(settings.WGER_SETTINGS['EXERCISE_CACHE_TTL']))
-    def list(self, request, *args, **kwargs):
-        return super().list(request, *args, **kwargs)
-
     def get_queryset(self):
         """H"""
         qs = Ingredient.objects.accepted()
@@ -245,8 +241,7 @@ def search(request):
         if hasattr(ingredient, 'image'):
             image_obj = ingredient.image
             image = image_obj.image.url
-            t = get_thumbnailer(image_obj.image)
-            thumbnail = t.get_thumbnail(aliases.get('micro_cropped')).url
+            thumbnail = get_thumbnail_url(image_obj.image, 'micro_cropped')
         else:
             ingredient.get_image(request)
             image = None
@@ -267,7 +262,7 @@ def search(request):
     return Response(json_response)
 
 
-class ImageViewSet(viewsets.ReadOnlyModelViewSet):
+class ImageViewSet(ConditionalGetMixin, viewsets.ReadOnlyModelViewSet):
     """
     API endpoint for ingredient images
     """
@@ -276,10 +271,6 @@ class ImageViewSet(viewsets.ReadOnlyModelViewSet):
     ordering_fields = '__all__'
     filterset_fields = ('uuid', 'ingredient_id', 'ingredient__uuid')
 
-    @method_decorator(cache_page(settings.WGER_SETTINGS['EXERCISE_CACHE_TTL']))
-    def dispatch(self, request, *args, **kwargs):
-        return super().dispatch(request, *args, **kwargs)
-
 
 class WeightUnitViewSet(viewsets.ReadOnlyModelViewSet):
     """
@@ -377,6 +368,28 @@ class NutritionPlanInfoViewSet(NutritionPlanViewSet):
     """
     serializer_class = NutritionPlanInfoSerializer
 
+    def get_queryset(self):
+        """
+        Load the meals, items and ingredients of the plans with a fixed number of queries
+        """
+        return super().get_queryset().select_related('language', 'user__userprofile') \
+            .prefetch_related(
+                Prefetch(
+                    'meal_set',
+                    queryset=Meal.objects.prefetch_related(
+                        Prefetch(
+                            'mealitem_set',
+                            queryset=MealItem.objects.select_related(
+                                'ingredient__license',
+                                'ingredient__language',
+                                'ingredient__image',
+                                'weight_unit__unit',
+                            ).prefetch_related('ingredient__ingredientweightunit_set__unit'),
+                        )
+                    ),
+                )
+            )
+
 
 class MealViewSet(WgerOwnerObjectModelViewSet):
     """
@@ -0,0 +1,109 @@
+# -*- coding: utf-8 -*-
+
+# This file is part of wger Workout Manager.
+#
+# wger Workout Manager is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# wger Workout Manager is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+
+# Django
+from django.core.exceptions import ValidationError
+from django.core.management.base import (
+    BaseCommand,
+    CommandError,
+)
+from django.core.validators import URLValidator
+
+# wger
+from wger.nutrition.sync import (
+    FIXTURE_URL,
+    ONLINE_FIXTURES,
+    load_online_fixtures,
+)
+
+
+class Command(BaseCommand):
+    """
+    Downloads the ingredient fixtures and loads them into the local database
+    """
+
+    help = (
+        'Downloads the ingredients, weight units and ingredient weight units and\n'
+        'loads them into the local database. The fixtures are read and saved in\n'
+        'chunks, so the memory usage stays constant. If the command is interrupted,\n'
+        'running it again continues where it stopped.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--fixture-url',
+            action='store',
+            default=FIXTURE_URL,
+            help=f'URL of the folder with the fixtures (default: {FIXTURE_URL})',
+        )
+
+        parser.add_argument(
+            '--directory',
+            action='store',
+            help='Directory for the downloads and the progress of the loading, needed '
+            'to continue an interrupted run. Default: a folder in the temp directory',
+        )
+
+        parser.add_argument(
+            '--checksum',
+            action='append',
+            dest='checksums',
+            default=[],
+            metavar='NAME=SHA256',
+            help=f'Expected SHA-256 checksum of a fixture ({", ".join(ONLINE_FIXTURES)}), '
+            'can be used more than once',
+        )
+
+        parser.add_argument(
+            '--chunk-size',
+            action='store',
+            type=int,
+            default=1000,
+            help='Number of objects saved in one transaction. Default: 1000',
+        )
+
+        parser.add_argument(
+            '--restart',
+            action='store_true',
+            default=False,
+            help='Ignore the progress of an earlier, interrupted run',
+        )
+
+    def handle(self, **options):
+        try:
+            URLValidator()(options['fixture_url'])
+        except ValidationError:
+            raise CommandError('Please enter a valid URL')
+
+        checksums = {}
+        for value in options['checksums']:
+            name, _, checksum = value.partition('=')
+            if name not in ONLINE_FIXTURES or not checksum:
+                raise CommandError(f'Invalid checksum "{value}", use NAME=SHA256')
+            checksums[name] = checksum
+
+        try:
+            load_online_fixtures(
+                self.stdout.write,
+                options['fixture_url'],
+                self.style.SUCCESS,
+                directory=options['directory'],
+                checksums=checksums,
+                chunk_size=options['chunk_size'],
+                restart=options['restart'],
+            )
+        except ValueError as e:
+            raise CommandError(e)
@@ -39,9 +39,6 @@ from django.utils import translation
 from django.utils.text import slugify
 from django.utils.translation import gettext_lazy as _
 
-# Third Party
-import openfoodfacts
-
 # wger
 from wger.core.models import Language
 from wger.nutrition.consts import ENERGY_FACTOR
@@ -458,6 +455,9 @@ class Ingredient(AbstractSubmissionModel, AbstractLicenseModel, models.Model):
         """
         Searches OFF by barcode and creates a local ingredient from the result
         """
+        # Third Party
+        import openfoodfacts
+
         # wger
         from wger.nutrition.off import extract_info_from_off
 
@@ -99,7 +99,12 @@ class Meal(models.Model):
         }
 
         # Get the calculated values from the meal item and add them
-        for item in self.mealitem_set.select_related():
+        if 'mealitem_set' in getattr(self, '_prefetched_objects_cache', {}):
+            items = self.mealitem_set.all()
+        else:
+            items = self.mealitem_set.select_related()
+
+        for item in items:
 
             values = item.get_nutritional_values(use_metric=use_metric)
             for key in nutritional_info.keys():
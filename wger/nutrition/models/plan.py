@@ -23,7 +23,9 @@ from decimal import Decimal
 from django.contrib.auth.models import User
 from django.core.cache import cache
 from django.db import models
+from django.db.models import Prefetch
 from django.urls import reverse
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
 # wger
@@ -131,7 +133,20 @@ class NutritionPlan(models.Model):
             }
 
             # Energy
-            for meal in self.meal_set.select_related():
+            if 'meal_set' in getattr(self, '_prefetched_objects_cache', {}):
+                meals = self.meal_set.all()
+            else:
+                # Local
+                from .meal_item import MealItem
+
+                meals = self.meal_set.prefetch_related(
+                    Prefetch(
+                        'mealitem_set',
+                        queryset=MealItem.objects.select_related('ingredient', 'weight_unit'),
+                    )
+                )
+
+            for meal in meals:
                 values = meal.get_nutritional_values(use_metric=use_metric)
                 for key in result['total'].keys():
                     result['total'][key] += values[key]
@@ -208,11 +223,17 @@ class NutritionPlan(models.Model):
         """
         Returns an overview for all logs available for this plan
         """
+        use_metric = self.user.userprofile.use_metric
+
+        # Load all entries at once and group them by day in the current timezone
+        entries = {}
+        for item in self.logitem_set.select_related('ingredient', 'weight_unit'):
+            entries.setdefault(timezone.localtime(item.datetime).date(), []).append(item)
+
         result = []
-        for date in self.logitem_set.datetimes('datetime', 'day', order='DESC'):
-            # TODO: in python 3.5 this can be simplified as z = {**x, **y}
-            tmp = self.get_log_summary(date=date).copy()
-            tmp.update({'date': date.date()})
+        for date in sorted(entries, reverse=True):
+            tmp = self.sum_log_entries(entries[date], use_metric)
+            tmp['date'] = date
             result.append(tmp)
 
         return result
@@ -230,7 +251,13 @@ class NutritionPlan(models.Model):
         """
         Sums the nutritional info of the items logged for the given date
         """
-        use_metric = self.user.userprofile.use_metric
+        return self.sum_log_entries(self.get_log_entries(date), self.user.userprofile.use_metric)
+
+    @staticmethod
+    def sum_log_entries(entries, use_metric=True):
+        """
+        Sums the nutritional info of the given diary entries
+        """
         result = {
             'energy': 0,
             'protein': 0,
@@ -243,7 +270,7 @@ class NutritionPlan(models.Model):
         }
 
         # Perform the sums
-        for item in self.get_log_entries(date):
+        for item in entries:
             values = item.get_nutritional_values(use_metric=use_metric)
             for key in result.keys():
                 result[key] += values[key]
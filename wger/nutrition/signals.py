@@ -15,7 +15,9 @@
 # You should have received a copy of the GNU Affero General Public License
 
 # Django
+from django.conf import settings
 from django.core.cache import cache
+from django.db import transaction
 from django.db.models.signals import (
     post_delete,
     post_save,
@@ -23,18 +25,25 @@ from django.db.models.signals import (
 
 # wger
 from wger.nutrition.models import (
+    Image,
     Meal,
     MealItem,
     NutritionPlan,
 )
-from wger.utils.cache import cache_mapper
+from wger.utils.cache import (
+    cache_mapper,
+    reset_content_version,
+)
+from wger.utils.thumbnails import schedule_thumbnails
 
 
 def reset_nutritional_values_canonical_form(sender, instance, **kwargs):
     """
-    Reset the nutrition values canonical form in cache
+    Reset the nutrition values canonical form and the rendered PDFs in cache
     """
-    cache.delete(cache_mapper.get_nutrition_cache_by_key(instance.get_owner_object().id))
+    plan_id = instance.get_owner_object().id
+    cache.delete(cache_mapper.get_nutrition_cache_by_key(plan_id))
+    reset_content_version('nutrition-plan', plan_id)
 
 
 post_save.connect(reset_nutritional_values_canonical_form, sender=NutritionPlan)
@@ -43,3 +52,16 @@ post_save.connect(reset_nutritional_values_canonical_form, sender=Meal)
 post_delete.connect(reset_nutritional_values_canonical_form, sender=Meal)
 post_save.connect(reset_nutritional_values_canonical_form, sender=MealItem)
 post_delete.connect(reset_nutritional_values_canonical_form, sender=MealItem)
+
+
+def generate_image_thumbnails(sender, instance, raw=False, **kwargs):
+    """
+    Generate the thumbnails of a new or changed ingredient image in the background
+    """
+    if raw or not settings.WGER_SETTINGS['USE_CELERY']:
+        return
+
+    transaction.on_commit(lambda: schedule_thumbnails(instance))
+
+
+post_save.connect(generate_image_thumbnails, sender=Image)
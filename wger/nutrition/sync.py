@@ -13,12 +13,15 @@
 # You should have received a copy of the GNU Affero General Public License
 
 # Standard Library
+import json
 import logging
 import os
+import tempfile
 from typing import Optional
 
 # Django
 from django.conf import settings
+from django.core.cache import cache
 from django.db import IntegrityError
 
 # Third Party
@@ -31,12 +34,18 @@ from wger.nutrition.models import (
     Ingredient,
     Source,
 )
+from wger.utils.bulk import (
+    file_checksum,
+    load_fixture,
+)
+from wger.utils.cache import cache_mapper
 from wger.utils.constants import (
     CC_BY_SA_3_LICENSE_ID,
     DOWNLOAD_INGREDIENT_OFF,
     DOWNLOAD_INGREDIENT_WGER,
 )
 from wger.utils.requests import (
+    download_file,
     get_paginated_generator,
     wger_headers,
 )
@@ -45,6 +54,13 @@ from wger.utils.url import make_uri
 
 logger = logging.getLogger(__name__)
 
+FIXTURE_URL = 'https://github.com/wger-project/data/raw/master/fixtures/'
+
+ONLINE_FIXTURES = ('ingredients', 'weight_units', 'ingredient_units')
+"""
+Fixtures with the ingredient data, in the order they are loaded
+"""
+
 
 def fetch_ingredient_image(pk: int):
     # wger
@@ -189,3 +205,89 @@ def download_ingredient_images(
                 Image.from_json(ingredient, retrieved_image, image_data)
 
             print_fn(style_fn('    successfully saved'))
+
+
+def load_online_fixtures(
+    print_fn,
+    fixture_url=FIXTURE_URL,
+    style_fn=lambda x: x,
+    directory=None,
+    checksums=None,
+    chunk_size=1000,
+    restart=False,
+):
+    """
+    Downloads the ingredient fixtures and loads them in chunks
+
+    The downloads and the number of loaded objects are kept in the directory,
+    so that an interrupted run continues where it stopped. They are deleted
+    once all fixtures are loaded.
+
+    :param directory: directory for the downloads, default: a folder in the temp directory
+    :param checksums: dictionary with the expected SHA-256 checksums of the fixtures
+    :param restart: ignore earlier, interrupted runs
+    """
+    directory = directory or os.path.join(tempfile.gettempdir(), 'wger-fixtures')
+    os.makedirs(directory, exist_ok=True)
+    state_path = os.path.join(directory, 'state.json')
+    checksums = checksums or {}
+
+    state = {}
+    if os.path.exists(state_path) and not restart:
+        with open(state_path) as f:
+            state = json.load(f)
+
+    def save_state():
+        with open(f'{state_path}.tmp', 'w') as f:
+            json.dump(state, f)
+        os.replace(f'{state_path}.tmp', state_path)
+
+    paths = []
+    for name in ONLINE_FIXTURES:
+        url = f'{fixture_url}{name}.json.zip'
+        path = os.path.join(directory, f'{name}.json.zip')
+        paths.extend([path, f'{path}.etag'])
+        progress = state.get(name, {})
+
+        if progress.get('complete'):
+            print_fn(f'Fixture {name} was already loaded, skipping...')
+            continue
+
+        if restart:
+            for file_path in (path, f'{path}.etag'):
+                if os.path.exists(file_path):
+                    os.unlink(file_path)
+
+        print_fn(f'Downloading fixture data from {url}...')
+        download_file(url, path, headers=wger_headers())
+        print_fn(f'-> fixture size: {os.path.getsize(path) / (1024 * 1024):.3} MB')
+
+        checksum = file_checksum(path)
+        expected = checksums.get(name)
+        if expected and expected.lower() != checksum:
+            os.unlink(path)
+            raise ValueError(f'Checksum of {name} is {checksum}, expected {expected}')
+
+        # A changed file has to be loaded from the start
+        if progress.get('sha256') != checksum:
+            progress = {'sha256': checksum, 'loaded': 0}
+        elif progress['loaded']:
+            print_fn(f'-> resuming after {progress["loaded"]} objects')
+        state[name] = progress
+
+        def progress_fn(count, instances):
+            progress['loaded'] = count
+            save_state()
+
+            # Ingredient.save() would do this for every object
+            ingredients = instances.get(Ingredient, [])
+            cache.delete_many([cache_mapper.get_ingredient_key(i.pk) for i in ingredients])
+
+        total = load_fixture(path, chunk_size, progress['loaded'], progress_fn)
+        progress['complete'] = True
+        save_state()
+        print_fn(style_fn(f'-> {total} objects loaded'))
+
+    for path in paths + [state_path]:
+        if os.path.exists(path):
+            os.unlink(path)
@@ -15,8 +15,12 @@
 # Standard Library
 import logging
 
+# Django
+from django.utils import translation
+
 # wger
 from wger.celery_configuration import app
+from wger.nutrition.models import NutritionPlan
 from wger.nutrition.sync import (
     download_ingredient_images,
     fetch_ingredient_image,
@@ -44,3 +48,19 @@ def fetch_all_ingredient_images_task():
     Returns the image if it is already present in the DB
     """
     download_ingredient_images(logger.info)
+
+
+@app.task
+def render_plan_pdf_task(key: str, plan_pk: int, url: str, language: str):
+    """
+    Renders a nutritional plan PDF in the background and saves it to the cache
+    """
+    # wger
+    from wger.nutrition.pdf import render_plan_pdf
+    from wger.utils.pdf import store_pdf
+
+    plan = NutritionPlan.objects.select_related('user').get(pk=plan_pk)
+    with translation.override(language):
+        content = render_plan_pdf(plan, url)
+    store_pdf(key, content)
+    logger.info(f'Rendered PDF of nutritional plan {plan_pk} ({len(content)} bytes)')
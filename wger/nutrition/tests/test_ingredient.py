@@ -16,12 +16,14 @@
 # Standard Library
 import datetime
 import json
+import time
 from decimal import Decimal
 from unittest.mock import patch
 
 # Django
 from django.core.exceptions import ValidationError
 from django.urls import reverse
+from django.utils.http import http_date
 
 # Third Party
 from rest_framework import status
@@ -452,10 +454,60 @@ class IngredientApiTestCase(api_base_test.ApiBaseResourceTestCase):
     """
     pk = 4
     resource = Ingredient
+    query_budget_detail = 6
+    query_budget_overview = 7
     private_resource = False
     overview_cached = True
     data = {'language': 1, 'license': 2}
 
+    def test_conditional_get(self):
+        """
+        Test that the detail view supports conditional requests
+        """
+        response = self.client.get(self.url_detail)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        response = self.client.get(self.url_detail, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        response = self.client.get(
+            self.url_detail,
+            HTTP_IF_MODIFIED_SINCE=response['Last-Modified'],
+        )
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_conditional_get_changed(self):
+        """
+        Test that changing an ingredient changes the ETag
+        """
+        response = self.client.get(self.url)
+        etag = response['ETag']
+
+        ingredient = Ingredient.objects.get(pk=self.pk)
+        ingredient.name = 'A new name'
+        ingredient.save()
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_conditional_get_deleted(self):
+        """
+        Test that deleting an ingredient is not hidden by the modification date
+        """
+        response = self.client.get(self.url)
+        self.assertNotIn('Last-Modified', response)
+        etag = response['ETag']
+
+        Ingredient.objects.order_by('last_update').first().delete()
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response['ETag'], etag)
+
+        response = self.client.get(self.url, HTTP_IF_MODIFIED_SINCE=http_date(time.time()))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
 
 class IngredientModelTestCase(WgerTestCase):
     """
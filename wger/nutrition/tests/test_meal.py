@@ -132,6 +132,8 @@ class MealApiTestCase(api_base_test.ApiBaseResourceTestCase):
     """
     pk = 2
     resource = Meal
+    query_budget_detail = 3
+    query_budget_overview = 2
     private_resource = True
     special_endpoints = ('nutritional_values', )
     data = {
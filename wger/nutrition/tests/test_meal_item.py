@@ -81,6 +81,8 @@ class MealItemApiTestCase(api_base_test.ApiBaseResourceTestCase):
     """
     pk = 10
     resource = MealItem
+    query_budget_detail = 4
+    query_budget_overview = 2
     private_resource = True
     special_endpoints = ('nutritional_values', )
     data = {
@@ -0,0 +1,179 @@
+# This file is part of wger Workout Manager.
+#
+# wger Workout Manager is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# wger Workout Manager is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+
+# Standard Library
+import datetime
+import json
+import os
+import tempfile
+import uuid
+import zipfile
+from unittest.mock import patch
+
+# Django
+from django.utils import timezone
+
+# wger
+from wger.core.tests.base_testcase import WgerTestCase
+from wger.nutrition.models import (
+    Ingredient,
+    IngredientWeightUnit,
+    WeightUnit,
+)
+from wger.nutrition.sync import load_online_fixtures
+from wger.utils.bulk import file_checksum
+
+
+def get_fixtures():
+    """
+    Returns the content of the fixtures, five new ingredients and a changed one
+    """
+    ingredient = {
+        'uuid': '',
+        'name': '',
+        'language': 2,
+        'license': 1,
+        'license_author': 'wger test',
+        'status': '2',
+        'created': '2020-01-01T10:00:00Z',
+        'last_update': '2020-02-01T10:00:00Z',
+        'last_imported': '2020-02-01T10:00:00Z',
+        'energy': 100,
+        'protein': '10.0',
+        'carbohydrates': '10.0',
+        'fat': '1.0',
+    }
+
+    ingredients = [
+        {
+            'model': 'nutrition.ingredient',
+            'pk': pk,
+            'fields': {
+                **ingredient, 'uuid': str(uuid.uuid4()),
+                'name': f'Fixture ingredient {pk}'
+            },
+        } for pk in (1, 100, 101, 102, 103, 104)
+    ]
+    return {
+        'ingredients': ingredients,
+        'weight_units': [{
+            'model': 'nutrition.weightunit',
+            'pk': 100,
+            'fields': {
+                'language': 2,
+                'name': 'Fixture unit'
+            },
+        }],
+        'ingredient_units': [
+            {
+                'model': 'nutrition.ingredientweightunit',
+                'pk': 100,
+                'fields': {
+                    'ingredient': 1,
+                    'unit': 100,
+                    'gram': 30,
+                    'amount': '1.00'
+                },
+            }
+        ],
+    }
+
+
+class LoadOnlineFixturesTestCase(WgerTestCase):
+    """
+    Tests loading the ingredient fixtures
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.directory = tempfile.mkdtemp()
+        self.fixtures = get_fixtures()
+        self.downloads = []
+
+    def download_file(self, url, path, headers=None):
+        name = url.rpartition('/')[2].replace('.json.zip', '')
+        self.downloads.append(name)
+        with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as archive:
+            archive.writestr(f'{name}.json', json.dumps(self.fixtures[name]))
+
+    def load(self, **kwargs):
+        with patch('wger.nutrition.sync.download_file', self.download_file):
+            load_online_fixtures(
+                lambda x: None,
+                'https://example.com/',
+                directory=self.directory,
+                chunk_size=2,
+                **kwargs,
+            )
+
+    def test_load(self):
+        """
+        Test loading the fixtures in chunks
+        """
+        self.load()
+
+        self.assertEqual(self.downloads, ['ingredients', 'weight_units', 'ingredient_units'])
+        self.assertEqual(Ingredient.objects.get(pk=1).name, 'Fixture ingredient 1')
+        ingredient = Ingredient.objects.get(pk=104)
+        self.assertEqual(
+            ingredient.last_update,
+            datetime.datetime(2020, 2, 1, 10, tzinfo=datetime.timezone.utc),
+        )
+        self.assertEqual(WeightUnit.objects.get(pk=100).name, 'Fixture unit')
+        self.assertEqual(IngredientWeightUnit.objects.get(pk=100).ingredient_id, 1)
+
+        # The downloads and the progress were deleted
+        self.assertEqual(os.listdir(self.directory), [])
+
+        # The auto_now fields work as before
+        ingredient.save()
+        self.assertGreater(ingredient.last_update, timezone.now() - datetime.timedelta(minutes=1))
+
+    def test_resume(self):
+        """
+        Test that an interrupted run continues where it stopped
+        """
+        path = os.path.join(self.directory, 'ingredients.json.zip')
+        self.download_file('https://example.com/ingredients.json.zip', path)
+        with open(os.path.join(self.directory, 'state.json'), 'w') as f:
+            json.dump({'ingredients': {'sha256': file_checksum(path), 'loaded': 4}}, f)
+
+        self.load()
+
+        self.assertNotEqual(Ingredient.objects.get(pk=1).name, 'Fixture ingredient 1')
+        self.assertFalse(Ingredient.objects.filter(pk__in=(100, 101, 102)).exists())
+        self.assertEqual(Ingredient.objects.filter(pk__in=(103, 104)).count(), 2)
+
+    def test_resume_completed_fixture(self):
+        """
+        Test that completed fixtures are not downloaded again
+        """
+        with open(os.path.join(self.directory, 'state.json'), 'w') as f:
+            json.dump({'ingredients': {'sha256': 'abc', 'loaded': 6, 'complete': True}}, f)
+
+        self.load()
+        self.assertEqual(self.downloads, ['weight_units', 'ingredient_units'])
+        self.assertFalse(Ingredient.objects.filter(pk=100).exists())
+
+        # Restarting ignores the progress
+        self.load(restart=True)
+        self.assertTrue(Ingredient.objects.filter(pk=100).exists())
+
+    def test_checksum(self):
+        """
+        Test that a wrong checksum aborts the loading
+        """
+        with self.assertRaisesRegex(ValueError, 'Checksum of ingredients'):
+            self.load(checksums={'ingredients': '0' * 64})
+        self.assertFalse(Ingredient.objects.filter(pk=100).exists())
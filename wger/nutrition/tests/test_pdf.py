@@ -12,14 +12,23 @@
 #
 # You should have received a copy of the GNU Affero General Public License
 
+# Standard Library
+from unittest import mock
+
 # Django
+from django.conf import settings
 from django.contrib.auth.models import User
 from django.urls import reverse
 
 # wger
 from wger.core.models import Language
 from wger.core.tests.base_testcase import WgerTestCase
-from wger.nutrition.models import NutritionPlan
+from wger.nutrition.models import (
+    MealItem,
+    NutritionPlan,
+)
+from wger.nutrition.pdf import render_plan_pdf
+from wger.nutrition.tasks import render_plan_pdf_task
 from wger.utils.helpers import make_token
 
 
@@ -122,3 +131,53 @@ class NutritionalPlanPdfExportTestCase(WgerTestCase):
         self.user_login('admin')
         self.export_pdf(fail=True)
         self.export_pdf_token()
+
+
+class NutritionalPlanPdfCacheTestCase(WgerTestCase):
+    """
+    Tests the cache of the rendered nutritional plan PDFs
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.user_login('test')
+        self.url = reverse('nutrition:plan:export-pdf', kwargs={'id': 4})
+
+    def test_cached_and_invalidated(self):
+        """
+        Test that the PDF is cached until the plan changes
+        """
+        with mock.patch(
+            'wger.nutrition.pdf.render_plan_pdf',
+            wraps=render_plan_pdf,
+        ) as render:
+            response1 = self.client.get(self.url)
+            response2 = self.client.get(self.url)
+            self.assertEqual(render.call_count, 1)
+            self.assertEqual(response1.content, response2.content)
+
+            item = MealItem.objects.filter(meal__plan_id=4).first()
+            item.amount = 123
+            item.save()
+            self.client.get(self.url)
+            self.assertEqual(render.call_count, 2)
+
+    @mock.patch.dict(settings.WGER_SETTINGS, {'PDF_BACKGROUND_THRESHOLD': 0})
+    def test_background(self):
+        """
+        Test that large plans are rendered in the background
+        """
+        settings.WGER_SETTINGS['USE_CELERY'] = True
+        with mock.patch('wger.nutrition.views.plan.render_plan_pdf_task') as task:
+            response = self.client.get(self.url)
+            self.assertEqual(response.status_code, 202)
+            task.delay.assert_called_once()
+
+        render_plan_pdf_task(*task.delay.call_args[0])
+
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response['Content-Disposition'],
+            'attachment; filename=nutritional-plan.pdf',
+        )
@@ -186,6 +186,8 @@ class PlanApiTestCase(api_base_test.ApiBaseResourceTestCase):
     """
     pk = 4
     resource = NutritionPlan
+    query_budget_detail = 2
+    query_budget_overview = 2
     private_resource = True
     special_endpoints = ('nutritional_values', )
     data = {'description': 'The description', 'language': 1}
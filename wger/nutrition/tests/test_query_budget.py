@@ -0,0 +1,124 @@
+# This file is part of wger Workout Manager.
+#
+# wger Workout Manager is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# wger Workout Manager is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+
+# Standard Library
+import datetime
+
+# Django
+from django.urls import reverse
+from django.utils import timezone
+
+# wger
+from wger.core.tests.base_testcase import WgerTestCase
+from wger.nutrition.models import (
+    LogItem,
+    Meal,
+    MealItem,
+    NutritionPlan,
+)
+
+
+class NutritionQueryBudgetTestCase(WgerTestCase):
+    """
+    Tests the number of queries of the nutritional plan pages and endpoints
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.user_login('test')
+        self.plan = NutritionPlan.objects.get(pk=1)
+
+    def add_meals(self, count=3):
+        """
+        Adds meals with three ingredients each to the plan
+        """
+        for order in range(2, count + 2):
+            meal = Meal.objects.create(plan=self.plan, order=order)
+            MealItem.objects.bulk_create(
+                [
+                    MealItem(meal=meal, ingredient_id=ingredient_id, order=i, amount=100)
+                    for i, ingredient_id in enumerate((1, 2, 3), 1)
+                ]
+            )
+
+    def add_diary_entries(self, count=20):
+        """
+        Adds diary entries on different days to the plan
+        """
+        now = timezone.now()
+        LogItem.objects.bulk_create(
+            [
+                LogItem(
+                    plan=self.plan,
+                    ingredient_id=i % 3 + 1,
+                    datetime=now - datetime.timedelta(days=i),
+                    amount=150,
+                ) for i in range(count)
+            ]
+        )
+
+    def test_plan_view(self):
+        """
+        Test the nutritional plan detail page
+        """
+        url = reverse('nutrition:plan:view', kwargs={'id': 1})
+        self.client.get(url)
+        with self.assertQueryBudget(16):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertNoQueryGrowth(lambda: self.client.get(url), self.add_meals)
+
+    def test_nutritional_values(self):
+        """
+        Test the nutritional values endpoint
+        """
+        url = reverse('nutritionplan-nutritional-values', kwargs={'pk': 1})
+        self.client.get(url)
+        with self.assertQueryBudget(6):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertNoQueryGrowth(lambda: self.client.get(url), self.add_meals)
+
+    def test_plan_info(self):
+        """
+        Test the nutritional plan info endpoint
+        """
+        url = reverse('nutritionplaninfo-detail', kwargs={'pk': 1})
+        self.client.get(url)
+        with self.assertQueryBudget(10):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertNoQueryGrowth(lambda: self.client.get(url), self.add_meals)
+
+    def test_diary_overview(self):
+        """
+        Test the nutrition diary overview page
+        """
+        url = reverse('nutrition:log:overview', kwargs={'pk': 1})
+        self.client.get(url)
+        with self.assertQueryBudget(14):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertNoQueryGrowth(lambda: self.client.get(url), self.add_diary_entries)
+
+    def test_diary_api(self):
+        """
+        Test the nutrition diary overview endpoint
+        """
+        url = reverse('nutritiondiary-list')
+        self.client.get(url)
+        with self.assertQueryBudget(7):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertNoQueryGrowth(lambda: self.client.get(url), self.add_diary_entries)
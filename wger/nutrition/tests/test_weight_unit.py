@@ -116,5 +116,7 @@ class WeightUnitApiTestCase(api_base_test.ApiBaseResourceTestCase):
     """
     pk = 1
     resource = WeightUnit
+    query_budget_detail = 5
+    query_budget_overview = 6
     private_resource = False
     data = {'name': 'The weight unit name'}
@@ -126,6 +126,8 @@ class WeightUnitToIngredientApiTestCase(api_base_test.ApiBaseResourceTestCase):
     """
     pk = 1
     resource = IngredientWeightUnit
+    query_budget_detail = 5
+    query_budget_overview = 6
     private_resource = False
     data = {
         'amount': '1',
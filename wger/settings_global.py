@@ -115,6 +115,8 @@ INSTALLED_APPS = (
 )
 
 MIDDLEWARE = (
+    # Query and cache instrumentation, only active with WGER_SETTINGS['INSTRUMENTATION']
+    'wger.utils.middleware.InstrumentationMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -375,6 +377,11 @@ THUMBNAIL_ALIASES = {
             'crop': 'smart',
             'quality': 90
         },
+
+        # Exercise previews in the PDFs, up to 2cm wide at 300 dpi
+        'print': {
+            'size': (240, 240)
+        },
     },
 }
 
@@ -532,7 +539,13 @@ WGER_SETTINGS = {
     'DOWNLOAD_INGREDIENTS_FROM': DOWNLOAD_INGREDIENT_WGER,
     'EMAIL_FROM': 'wger Workout Manager <wger@example.com>',
     'EXERCISE_CACHE_TTL': 3600,
+    'ICAL_CACHE_TTL': 60 * 60 * 24,
+    'INSTRUMENTATION': False,
+    'INSTRUMENTATION_SAMPLE_RATE': 1.0,
+    'INSTRUMENTATION_SLOW_REQUEST_MS': 1000,
     'MIN_ACCOUNT_AGE_TO_TRUST': 21,
+    'PDF_BACKGROUND_THRESHOLD': 150,
+    'PDF_CACHE_TTL': 60 * 60 * 24,
     'SYNC_EXERCISES_CELERY': False,
     'SYNC_EXERCISE_IMAGES_CELERY': False,
     'SYNC_EXERCISE_VIDEOS_CELERY': False,
@@ -540,6 +553,7 @@ WGER_SETTINGS = {
     'USE_CELERY': False,
     'USE_RECAPTCHA': False,
     'WGER_INSTANCE': 'https://wger.de',
+    'WRITE_SNAPSHOT_CELERY': False,
 }
 
 
@@ -19,7 +19,6 @@ import logging
 import os
 import pathlib
 import sys
-import tempfile
 
 # Django
 import django
@@ -30,12 +29,10 @@ from django.core.management import (
 from django.utils.crypto import get_random_string
 
 # Third Party
-import requests
 from invoke import task
 
 
 logger = logging.getLogger(__name__)
-FIXTURE_URL = 'https://github.com/wger-project/data/raw/master/fixtures/'
 
 
 @task(
@@ -264,29 +261,15 @@ def load_fixtures(context, settings_path=None):
 def load_online_fixtures(context, settings_path=None):
     """
     Downloads fixtures from server and installs them (at the moment only ingredients)
+
+    The fixtures are loaded in chunks by the load-online-fixtures command, if the
+    task is interrupted, running it again continues where it stopped.
     """
 
     # Find the path to the settings and setup the django environment
     setup_django_environment(settings_path)
 
-    # Prepare the download
-    for name in ('ingredients', 'weight_units', 'ingredient_units'):
-        url = f'{FIXTURE_URL}{name}.json.zip'
-
-        print(f'Downloading fixture data from {url}...')
-        response = requests.get(url, stream=True)
-        size = int(response.headers["content-length"]) / (1024 * 1024)
-        print(f'-> fixture size: {size:.3} MB')
-
-        # Save to temporary file and load the data
-        f = tempfile.NamedTemporaryFile(delete=False, suffix='.json.zip')
-        print(f'-> saving to temp file {f.name}')
-        f.write(response.content)
-        f.close()
-        call_command("loaddata", f.name)
-        print('-> removing temp file')
-        print('')
-        os.unlink(f.name)
+    call_command('load-online-fixtures')
 
 
 @task
@@ -79,6 +79,9 @@ router.register(
     r'workoutsession', manager_api_views.WorkoutSessionViewSet, basename='workoutsession'
 )
 router.register(r'workoutlog', manager_api_views.WorkoutLogViewSet, basename='workoutlog')
+router.register(
+    r'workoutlogstats', manager_api_views.WorkoutLogStatsViewSet, basename='workoutlogstats'
+)
 router.register(r'schedulestep', manager_api_views.ScheduleStepViewSet, basename='schedulestep')
 router.register(r'schedule', manager_api_views.ScheduleViewSet, basename='schedule')
 
@@ -250,6 +253,7 @@ urlpatterns += [
 
     # API
     path('api/v2/exercise/search/', exercises_api_views.search, name='exercise-search'),
+    path('api/v2/exercise/facets/', exercises_api_views.facets, name='exercise-facets'),
     path('api/v2/ingredient/search/', nutrition_api_views.search, name='ingredient-search'),
     path('api/v2/', include(router.urls)),
 
@@ -277,11 +281,21 @@ urlpatterns += [
         core_api_views.PermissionView.as_view({'get': 'get'}),
         name='permission'
     ),
+    path(
+        'api/v2/dashboard/',
+        core_api_views.DashboardView.as_view({'get': 'get'}),
+        name='dashboard'
+    ),
     path(
         'api/v2/min-app-version/',
         core_api_views.RequiredApplicationVersionView.as_view({'get': 'get'}),
         name='min_app_version'
     ),
+    path(
+        'api/v2/snapshot/',
+        core_api_views.SnapshotView.as_view({'get': 'get'}),
+        name='snapshot'
+    ),
 
     # Api documentation
     path(
@@ -0,0 +1,282 @@
+# This file is part of wger Workout Manager.
+#
+# wger Workout Manager is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# wger Workout Manager is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+"""
+Helpers to read and save large amounts of data in chunks
+"""
+
+# Standard Library
+import hashlib
+import io
+import json
+import zipfile
+from contextlib import contextmanager
+from itertools import islice
+
+# Django
+from django.core import serializers
+from django.core.management.color import no_style
+from django.db import (
+    connection,
+    transaction,
+)
+
+
+READ_SIZE = 64 * 1024
+"""
+Number of bytes or characters read at once from files
+"""
+
+
+def file_checksum(path, algorithm='sha256'):
+    """
+    Returns the hex digest of a file, which is read in blocks
+    """
+    digest = hashlib.new(algorithm)
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(READ_SIZE), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def iter_json_array(stream, read_size=READ_SIZE):
+    """
+    Iterates over the elements of a JSON array without loading the whole document
+
+    Only the current element and the unparsed rest of the last read block are
+    kept in memory, so this works for fixtures of any size.
+
+    :param stream: text stream with a JSON array, e.g. a Django fixture
+    """
+    decoder = json.JSONDecoder()
+    buffer = ''
+    position = 0
+    started = False
+    eof = False
+
+    while True:
+        # Skip the whitespace and the separators between the elements
+        while position < len(buffer) and buffer[position] in ' \t\r\n,':
+            position += 1
+
+        if position < len(buffer) and not started:
+            if buffer[position] != '[':
+                raise ValueError('The data is not a JSON array')
+            started = True
+            position += 1
+            continue
+
+        if position < len(buffer) and buffer[position] == ']':
+            return
+
+        if position < len(buffer):
+            try:
+                element, end = decoder.raw_decode(buffer, position)
+            except json.JSONDecodeError:
+                # The element is not complete yet, read more
+                if eof:
+                    raise
+            else:
+                # Numbers at the end of the buffer might continue in the next block,
+                # so an element is only complete if a separator follows it
+                if (end < len(buffer) and buffer[end] in ' \t\r\n,]') or eof:
+                    yield element
+                    position = end
+                    continue
+
+        if eof:
+            raise ValueError('Unexpected end of the JSON array')
+
+        block = stream.read(read_size)
+        eof = not block
+        buffer = buffer[position:] + block
+        position = 0
+
+
+def chunked(iterable, size):
+    """
+    Splits an iterable into lists with at most size elements
+    """
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+@contextmanager
+def keep_timestamps(*models):
+    """
+    Context manager that keeps the values of the auto_now and auto_now_add fields
+
+    bulk_create would otherwise overwrite e.g. the modification dates of the
+    loaded data with the current time.
+    """
+    changed = []
+    for model in models:
+        for field in model._meta.concrete_fields:
+            if getattr(field, 'auto_now', False) or getattr(field, 'auto_now_add', False):
+                changed.append((field, field.auto_now, field.auto_now_add))
+                field.auto_now = False
+                field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, auto_now, auto_now_add in changed:
+            field.auto_now = auto_now
+            field.auto_now_add = auto_now_add
+
+
+def bulk_upsert(model, objects, batch_size=1000, exclude=()):
+    """
+    Inserts the objects, or updates all their fields if the primary key already exists
+
+    The objects are saved with bulk_create, so save() is not called and no
+    signals are sent.
+
+    :param exclude: names of the fields that are not updated for existing rows
+    """
+    update_fields = [
+        f.name for f in model._meta.concrete_fields if not f.primary_key and f.name not in exclude
+    ]
+
+    # Models with only a primary key have nothing to update
+    if not update_fields:
+        return model.objects.bulk_create(objects, batch_size=batch_size, ignore_conflicts=True)
+
+    kwargs = {}
+    if connection.features.supports_update_conflicts_with_target:
+        kwargs['unique_fields'] = [model._meta.pk.name]
+
+    return model.objects.bulk_create(
+        objects,
+        batch_size=batch_size,
+        update_conflicts=True,
+        update_fields=update_fields,
+        **kwargs,
+    )
+
+
+def bulk_set_m2m(model, m2m_data, batch_size=1000):
+    """
+    Replaces the many-to-many relationships of the objects with the given ones
+
+    :param m2m_data: list of tuples with the primary key of an object and a
+                     dictionary with the related primary keys per field
+    """
+    for field in model._meta.many_to_many:
+        rows = [(pk, data[field.name]) for pk, data in m2m_data if field.name in data]
+        if not rows:
+            continue
+
+        through = field.remote_field.through
+        source = through._meta.get_field(field.m2m_field_name()).attname
+        target = through._meta.get_field(field.m2m_reverse_field_name()).attname
+        through.objects.filter(**{f'{source}__in': [pk for pk, related in rows]}).delete()
+        through.objects.bulk_create(
+            [through(**{source: pk, target: value}) for pk, related in rows for value in related],
+            batch_size=batch_size,
+        )
+
+
+def save_deserialized(objects, batch_size=1000, exclude=None):
+    """
+    Saves deserialized objects with one bulk upsert per model
+
+    The many-to-many relationships of the objects are replaced as well. This
+    should be called inside a transaction.
+
+    :param objects: the objects as returned by django.core.serializers.deserialize
+    :param exclude: dictionary with the fields per model that are not updated
+                    for existing rows
+    :return: dictionary with the saved instances per model
+    """
+    exclude = exclude or {}
+    instances = {}
+    m2m_data = {}
+    for deserialized in objects:
+        model = type(deserialized.object)
+        instances.setdefault(model, []).append(deserialized.object)
+        if deserialized.m2m_data:
+            m2m_data.setdefault(model, []).append((deserialized.object.pk, deserialized.m2m_data))
+
+    with keep_timestamps(*instances):
+        for model, model_instances in instances.items():
+            bulk_upsert(model, model_instances, batch_size, exclude.get(model, ()))
+
+    for model, data in m2m_data.items():
+        bulk_set_m2m(model, data, batch_size)
+    return instances
+
+
+def reset_sequences(models):
+    """
+    Resets the primary key sequences of the models, this is needed after saving
+    objects with explicit primary keys on e.g. PostgreSQL
+    """
+    statements = connection.ops.sequence_reset_sql(no_style(), list(models))
+    if statements:
+        with connection.cursor() as cursor:
+            for sql in statements:
+                cursor.execute(sql)
+
+
+@contextmanager
+def open_fixture(path):
+    """
+    Opens a JSON fixture, optionally compressed as zip file, as a text stream
+
+    The CRC of the compressed file is validated by zipfile once it is read completely.
+    """
+    if zipfile.is_zipfile(path):
+        with zipfile.ZipFile(path) as archive:
+            with archive.open(archive.namelist()[0]) as member:
+                yield io.TextIOWrapper(member, encoding='utf-8')
+    else:
+        with open(path, encoding='utf-8') as f:
+            yield f
+
+
+def load_fixture(path, chunk_size=1000, skip=0, progress_fn=None):
+    """
+    Loads a Django JSON fixture in chunks, like loaddata but with a constant memory usage
+
+    The objects are parsed one by one and saved with one bulk upsert per chunk
+    and model, each chunk in its own transaction. As with loaddata, save() is
+    not called and no signals are sent.
+
+    :param skip: number of objects at the start of the fixture that were already
+                 loaded in an earlier run
+    :param progress_fn: function called after each chunk is committed, with the
+                        number of loaded objects and a dictionary with the saved
+                        instances per model
+    :return: the number of objects in the fixture
+    """
+    count = skip
+    models = set()
+    with open_fixture(path) as stream:
+        objects = islice(iter_json_array(stream), skip, None)
+        for chunk in chunked(objects, chunk_size):
+            with transaction.atomic():
+                instances = save_deserialized(serializers.deserialize('python', chunk), chunk_size)
+
+            models.update(instances)
+            count += len(chunk)
+            if progress_fn:
+                progress_fn(count, instances)
+
+    if models:
+        reset_sequences(models)
+        connection.check_constraints(table_names=[model._meta.db_table for model in models])
+    return count
@@ -14,6 +14,7 @@
 
 # Standard Library
 import logging
+import uuid
 
 # Django
 from django.core.cache import cache
@@ -33,6 +34,24 @@ def delete_template_fragment_cache(fragment_name='', vary_on=None):
 
 def reset_workout_canonical_form(workout_id):
     cache.delete(cache_mapper.get_workout_canonical(workout_id))
+    reset_content_version('workout', workout_id)
+
+
+def get_content_version(kind, pk):
+    """
+    Returns the content version of an object exported as PDF or calendar
+
+    The version is a random stamp that is replaced whenever the content
+    changes, so that the exports of older versions are not used anymore.
+    """
+    return cache.get_or_set(cache_mapper.get_content_version_key(kind, pk), uuid.uuid4().hex, None)
+
+
+def reset_content_version(kind, pk):
+    """
+    Invalidates the cached exports of an object
+    """
+    cache.delete(cache_mapper.get_content_version_key(kind, pk))
 
 
 def reset_workout_log(user_pk, year, month, day=None):
@@ -59,6 +78,12 @@ class CacheKeyMapper:
     WORKOUT_LOG_LIST = 'workout-log-hash-{0}'
     NUTRITION_CACHE_KEY = 'nutrition-cache-log-{0}'
     EXERCISE_API_KEY = 'base-uuid-{0}'
+    DASHBOARD_CACHE_KEY = 'dashboard-{0}-{1}'
+    EXERCISE_FACETS_VERSION_KEY = 'exercise-facets-version'
+    EXERCISE_SEARCH_VERSION_KEY = 'exercise-search-version'
+    CONTENT_VERSION_KEY = 'content-version-{0}-{1}'
+    PDF_RENDER_KEY = 'pdf-render-{0}-{1}-{2}'
+    ICAL_CACHE_KEY = 'ical-{0}-{1}-{2}'
 
     def get_pk(self, param):
         """
@@ -103,5 +128,31 @@ class CacheKeyMapper:
         """
         return cls.EXERCISE_API_KEY.format(base_uuid)
 
+    def get_dashboard_key(self, user_id, date):
+        """
+        Return the dashboard summary cache key of a user for the given day
+        """
+        return self.DASHBOARD_CACHE_KEY.format(self.get_pk(user_id), date.isoformat())
+
+    def get_content_version_key(self, kind, param):
+        """
+        Return the key of the content version of an exported object
+        """
+        return self.CONTENT_VERSION_KEY.format(kind, self.get_pk(param))
+
+    def get_pdf_render_key(self, kind, param, options_hash):
+        """
+        Return the key of a rendered PDF, the hash covers the content version
+        and the render options
+        """
+        return self.PDF_RENDER_KEY.format(kind, self.get_pk(param), options_hash)
+
+    def get_ical_key(self, kind, param, etag):
+        """
+        Return the key of a rendered iCal feed, the ETag covers the content
+        versions and everything else the feed depends on
+        """
+        return self.ICAL_CACHE_KEY.format(kind, self.get_pk(param), etag)
+
 
 cache_mapper = CacheKeyMapper()
@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+
+# This file is part of wger Workout Manager.
+#
+# wger Workout Manager is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# wger Workout Manager is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+
+# Standard Library
+import csv
+import logging
+import zlib
+
+# Django
+from django.http import StreamingHttpResponse
+
+
+logger = logging.getLogger(__name__)
+
+EXPORT_CHUNK_SIZE = 2000
+"""
+Number of rows fetched from the database at a time when exporting
+"""
+
+
+class Echo:
+    """
+    Pseudo buffer that simply returns what is written to it, so that the
+    csv writer can be used to produce individual lines
+    """
+
+    def write(self, value):
+        return value
+
+
+def wants_gzip(request):
+    """
+    Whether the client asked for a gzip compressed export (?gzip=1)
+    """
+    return request.GET.get('gzip', '').lower() in ('1', 'true', 'yes')
+
+
+def iter_csv(rows, **kwargs):
+    """
+    Lazily converts an iterable of rows to CSV encoded lines
+
+    :param rows: any iterable of lists, including the header
+    :param kwargs: passed as is to the csv writer
+    """
+    writer = csv.writer(Echo(), **kwargs)
+    for row in rows:
+        yield writer.writerow(row)
+
+
+def iter_gzip(chunks, encoding='utf-8'):
+    """
+    Lazily compresses the given string chunks as a gzip stream
+    """
+    compressor = zlib.compressobj(wbits=zlib.MAX_WBITS | 16)
+    for chunk in chunks:
+        data = compressor.compress(chunk.encode(encoding))
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def csv_streaming_response(rows, filename, compress=False, **kwargs):
+    """
+    Returns a streaming response for the given rows. Nothing is buffered, so
+    the memory usage stays constant regardless of the number of rows.
+
+    :param rows: any iterable of lists, including the header
+    :param filename: the filename, without the .gz extension
+    :param compress: whether to gzip the output
+    :param kwargs: passed as is to the csv writer
+    """
+    content = iter_csv(rows, **kwargs)
+    if compress:
+        response = StreamingHttpResponse(iter_gzip(content), content_type='application/gzip')
+        filename = f'{filename}.gz'
+    else:
+        response = StreamingHttpResponse(content, content_type='text/csv')
+
+    response['Content-Disposition'] = f'attachment; filename={filename}'
+    return response
@@ -0,0 +1,198 @@
+# This file is part of wger Workout Manager.
+#
+# wger Workout Manager is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# wger Workout Manager is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+"""
+Recorders for the queries and cache accesses of a block of code
+"""
+
+# Standard Library
+import re
+import time
+from contextlib import ExitStack
+
+# Django
+from django.core.cache import caches
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
+from django.db import connections
+
+
+_MISSING = object()
+
+IN_LIST_RE = re.compile(r'\((?:%s, )+%s\)')
+
+
+def get_fingerprint(sql):
+    """
+    Returns the fingerprint of a query, which is the same for queries that only
+    differ in their parameters, including the length of IN lists
+    """
+    return IN_LIST_RE.sub('(...)', sql)
+
+
+class QueryRecorder:
+    """
+    Records the number, duration and SQL of the queries executed on all
+    database connections while active
+
+    The SQL is recorded with placeholders instead of the parameters, so that
+    repeated queries (e.g. from an N+1 problem) can be told apart.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.queries = {}
+        self._stack = None
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration = time.perf_counter() - start
+            self.count += 1
+            self.duration += duration
+            entry = self.queries.get(sql)
+            if entry is None:
+                self.queries[sql] = [1, duration]
+            else:
+                entry[0] += 1
+                entry[1] += duration
+
+    def __enter__(self):
+        self._stack = ExitStack()
+        for alias in connections:
+            self._stack.enter_context(connections[alias].execute_wrapper(self))
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stack.close()
+
+    def get_fingerprints(self):
+        """
+        Returns the number and duration of the queries per fingerprint
+        """
+        fingerprints = {}
+        for sql, (count, duration) in self.queries.items():
+            entry = fingerprints.setdefault(get_fingerprint(sql), [0, 0.0])
+            entry[0] += count
+            entry[1] += duration
+        return fingerprints
+
+    @property
+    def duplicates(self):
+        """
+        Number of queries that repeat an earlier query with the same fingerprint
+        """
+        return sum(count - 1 for count, duration in self.get_fingerprints().values())
+
+    def get_top_duplicates(self, limit=5):
+        """
+        Returns the fingerprints executed more than once as a list of
+        (fingerprint, count, duration), most frequent first
+        """
+        duplicates = [
+            (sql, count, duration)
+            for sql, (count, duration) in self.get_fingerprints().items()
+            if count > 1
+        ]
+        duplicates.sort(key=lambda entry: (-entry[1], -entry[2]))
+        return duplicates[:limit]
+
+
+class CacheRecorder:
+    """
+    Counts the hits and misses of the configured caches while active
+
+    The get, get_many and get_or_set methods of the cache instances of the
+    current thread are wrapped and restored afterwards.
+    """
+
+    METHODS = ('get', 'get_many', 'get_or_set')
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self._patched = []
+        self._depth = 0
+
+    def __enter__(self):
+        for alias in caches:
+            backend = caches[alias]
+            self._patched.append(
+                (backend, {name: backend.__dict__.get(name) for name in self.METHODS})
+            )
+            backend.get = self._wrap_get(backend.get)
+            backend.get_many = self._wrap_get_many(backend.get_many)
+            backend.get_or_set = self._wrap_get_or_set(backend.get, backend.get_or_set)
+        return self
+
+    def __exit__(self, *exc_info):
+        # Restore the previous attributes, which may come from an outer recorder
+        for backend, attributes in self._patched:
+            for name in self.METHODS:
+                if attributes[name]:
+                    setattr(backend, name, attributes[name])
+                else:
+                    delattr(backend, name)
+        self._patched = []
+
+    def _wrap_get(self, get):
+
+        def wrapper(key, default=None, version=None):
+            value = get(key, _MISSING, version=version)
+            if value is _MISSING:
+                if not self._depth:
+                    self.misses += 1
+                return default
+
+            if not self._depth:
+                self.hits += 1
+            return value
+
+        return wrapper
+
+    def _wrap_get_many(self, get_many):
+
+        def wrapper(keys, version=None):
+            keys = list(keys)
+
+            # Some backends implement get_many with get, count the keys only once
+            self._depth += 1
+            try:
+                values = get_many(keys, version=version)
+            finally:
+                self._depth -= 1
+
+            if not self._depth:
+                self.hits += len(values)
+                self.misses += len(keys) - len(values)
+            return values
+
+        return wrapper
+
+    def _wrap_get_or_set(self, get, get_or_set):
+
+        def wrapper(key, default, timeout=DEFAULT_TIMEOUT, version=None):
+            # Count the first lookup only, get_or_set reads the key again after setting it
+            value = get(key, _MISSING, version=version)
+            if value is not _MISSING:
+                return value
+
+            self._depth += 1
+            try:
+                return get_or_set(key, default, timeout, version=version)
+            finally:
+                self._depth -= 1
+
+        return wrapper
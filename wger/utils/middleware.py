@@ -16,17 +16,25 @@ Custom middleware
 """
 
 # Standard Library
+import json
 import logging
+import random
+import time
 
 # Django
 from django.conf import settings
 from django.contrib import auth
 from django.contrib.auth import login as django_login
+from django.core.exceptions import MiddlewareNotUsed
 from django.utils.deprecation import MiddlewareMixin
 from django.utils.functional import SimpleLazyObject
 
 # wger
 from wger.core.demo import create_temporary_user
+from wger.utils.instrumentation import (
+    CacheRecorder,
+    QueryRecorder,
+)
 
 
 logger = logging.getLogger(__name__)
@@ -120,3 +128,66 @@ class JavascriptAJAXRedirectionMiddleware(MiddlewareMixin):
             response['X-wger-redirect'] = request.path
             response.content = request.path
         return response
+
+
+class InstrumentationMiddleware:
+    """
+    Records the queries, database time and cache hits and misses of each request
+
+    The numbers are sent in a Server-Timing header and logged as a JSON line.
+    Requests slower than INSTRUMENTATION_SLOW_REQUEST_MS are sampled with
+    INSTRUMENTATION_SAMPLE_RATE and logged with their most repeated queries,
+    which usually point to an N+1 problem.
+
+    This is only active when INSTRUMENTATION is set, otherwise django removes
+    the middleware from the chain when loading it.
+    """
+
+    def __init__(self, get_response):
+        if not settings.WGER_SETTINGS.get('INSTRUMENTATION'):
+            raise MiddlewareNotUsed()
+
+        self.get_response = get_response
+        self.slow_request_ms = settings.WGER_SETTINGS['INSTRUMENTATION_SLOW_REQUEST_MS']
+        self.sample_rate = settings.WGER_SETTINGS['INSTRUMENTATION_SAMPLE_RATE']
+
+    def __call__(self, request):
+        start = time.perf_counter()
+        with QueryRecorder() as queries, CacheRecorder() as cache_stats:
+            response = self.get_response(request)
+        duration = (time.perf_counter() - start) * 1000
+        db_duration = queries.duration * 1000
+        duplicates = queries.duplicates
+
+        response['Server-Timing'] = ', '.join(
+            [
+                f'db;dur={db_duration:.1f};desc="{queries.count} queries, {duplicates} duplicates"',
+                f'cache;desc="{cache_stats.hits} hits, {cache_stats.misses} misses"',
+                f'total;dur={duration:.1f}',
+            ]
+        )
+
+        data = {
+            'method': request.method,
+            'path': request.path,
+            'status': response.status_code,
+            'duration_ms': round(duration, 1),
+            'queries': queries.count,
+            'db_ms': round(db_duration, 1),
+            'duplicate_queries': duplicates,
+            'cache_hits': cache_stats.hits,
+            'cache_misses': cache_stats.misses,
+        }
+        logger.info(json.dumps(data))
+
+        if duration > self.slow_request_ms and random.random() < self.sample_rate:
+            data['top_duplicates'] = [
+                {
+                    'sql': sql,
+                    'count': count,
+                    'db_ms': round(db_time * 1000, 1),
+                } for sql, count, db_time in queries.get_top_duplicates()
+            ]
+            logger.warning('Slow request: %s', json.dumps(data))
+
+        return response
@@ -14,14 +14,25 @@
 
 # Standard Library
 import datetime
+import functools
+import hashlib
+import json
+import logging
+from io import BytesIO
 from os.path import join as path_join
 
 # Django
 from django.conf import settings
+from django.core.cache import cache
 from django.core.exceptions import ObjectDoesNotExist
+from django.http import HttpResponse
+from django.shortcuts import render
 from django.utils import translation
 
 # Third Party
+from easy_thumbnails.alias import aliases
+from easy_thumbnails.exceptions import InvalidImageFormatError
+from easy_thumbnails.files import get_thumbnailer
 from reportlab.lib import colors
 from reportlab.lib.colors import HexColor
 from reportlab.lib.styles import (
@@ -29,6 +40,7 @@ from reportlab.lib.styles import (
     StyleSheet1,
 )
 from reportlab.lib.units import cm
+from reportlab.lib.utils import ImageReader
 from reportlab.pdfbase import pdfmetrics
 from reportlab.pdfbase.ttfonts import TTFont
 from reportlab.platypus import (
@@ -39,6 +51,35 @@ from reportlab.platypus import (
 # wger
 from wger import get_version
 from wger.core.models import Language
+from wger.utils.cache import (
+    cache_mapper,
+    get_content_version,
+)
+
+
+logger = logging.getLogger(__name__)
+
+PDF_IMAGE_ALIAS = 'print'
+"""
+Thumbnail alias of the images drawn in the PDFs, large enough to print the
+previews at 300 dpi
+"""
+
+PDF_IMAGE_CACHE_SIZE = 128
+"""
+Number of images kept in memory by each process
+"""
+
+PDF_PENDING_KEY = 'pdf-pending-{0}'
+"""
+Marks a PDF that is being rendered in the background
+"""
+
+PDF_PENDING_TIMEOUT = 300
+"""
+Seconds after which a background render is assumed to have failed and is
+started again
+"""
 
 
 # ************************
@@ -95,24 +136,133 @@ def get_logo(width=1.5):
     return image
 
 
-# register new truetype fonts for reportlab
-pdfmetrics.registerFont(
-    TTFont('OpenSans', path_join(settings.SITE_ROOT, 'core/static/fonts/OpenSans-Light.ttf'))
-)
-pdfmetrics.registerFont(
-    TTFont('OpenSans-Bold', path_join(settings.SITE_ROOT, 'core/static/fonts/OpenSans-Bold.ttf'))
-)
-pdfmetrics.registerFont(
-    TTFont(
-        'OpenSans-Regular', path_join(settings.SITE_ROOT, 'core/static/fonts/OpenSans-Regular.ttf')
+@functools.lru_cache(maxsize=PDF_IMAGE_CACHE_SIZE)
+def get_image_data(name):
+    """
+    Returns the content and size of the print variant of an image
+
+    The variant is a thumbnail that is generated once and saved to the
+    storage (see THUMBNAIL_ALIASES), its content is shared across the renders
+    of a process. Only the bytes are cached, since reportlab's image readers
+    must not be shared between threads. Uploads never change under the same
+    name, so the entries do not need to be invalidated.
+
+    :param name: the name of the image file in the storage
+    :return: tuple with the content, the width and the height, or None if the
+             image can't be read
+    """
+    try:
+        thumbnail = get_thumbnailer(name).get_thumbnail(aliases.get(PDF_IMAGE_ALIAS))
+    except InvalidImageFormatError:
+        logger.info(f'Could not generate the print variant of {name}')
+        return None
+
+    with thumbnail.storage.open(thumbnail.name) as f:
+        content = f.read()
+    width, height = ImageReader(BytesIO(content)).getSize()
+    return content, width, height
+
+
+def get_pdf_image(image, width):
+    """
+    Returns a flowable with the print variant of an image
+
+    :param image: the image field file
+    :param width: the width of the image in the document
+    :return: an Image or None if the image can't be read
+    """
+    data = get_image_data(image.name)
+    if data is None:
+        return None
+
+    content, image_width, image_height = data
+    return Image(BytesIO(content), width=width, height=width * image_height / image_width)
+
+
+# ************************
+# Rendered PDF cache
+# ************************
+
+
+def get_pdf_render_key(kind, pk, **options):
+    """
+    Returns the cache key of a rendered PDF
+
+    The key covers the content version of the object, the render options,
+    the active language and the current date, which is printed in the footer.
+    """
+    options.update(
+        version=get_content_version(kind, pk),
+        language=translation.get_language(),
+        date=datetime.date.today().isoformat(),
     )
-)
-pdfmetrics.registerFont(
-    TTFont(
-        'OpenSans-Italic',
-        path_join(settings.SITE_ROOT, 'core/static/fonts/OpenSans-LightItalic.ttf')
+    options_hash = hashlib.md5(json.dumps(options, sort_keys=True).encode()).hexdigest()
+    return cache_mapper.get_pdf_render_key(kind, pk, options_hash)
+
+
+def store_pdf(key, content):
+    """
+    Saves a rendered PDF to the cache and clears its pending marker
+    """
+    cache.set(key, content, settings.WGER_SETTINGS['PDF_CACHE_TTL'])
+    cache.delete(PDF_PENDING_KEY.format(key))
+
+
+def pdf_response(content, filename):
+    """
+    Returns the response for downloading a rendered PDF
+    """
+    response = HttpResponse(content, content_type='application/pdf')
+    response['Content-Disposition'] = f'attachment; filename={filename}'
+    response['Content-Length'] = len(content)
+    return response
+
+
+def cached_pdf_response(request, key, filename, render_fn, background_fn=None):
+    """
+    Returns a cached PDF, rendering it first if necessary
+
+    If the PDF is not in the cache and a background_fn is passed, e.g. because
+    the document is large, and celery is used, it is called once to start the
+    render task. Until the PDF is ready a page is shown that reloads itself.
+
+    :param render_fn: callable returning the content of the PDF
+    :param background_fn: callable starting the task that renders and stores it
+    """
+    content = cache.get(key)
+    if content is not None:
+        return pdf_response(content, filename)
+
+    if background_fn is not None and settings.WGER_SETTINGS['USE_CELERY']:
+        if cache.add(PDF_PENDING_KEY.format(key), True, PDF_PENDING_TIMEOUT):
+            background_fn()
+        return render(request, 'misc/pdf_pending.html', status=202)
+
+    content = render_fn()
+    store_pdf(key, content)
+    return pdf_response(content, filename)
+
+
+@functools.lru_cache(maxsize=None)
+def register_fonts():
+    """
+    Registers the truetype fonts used by the style sheet with reportlab
+
+    This reads the font files, so it is done once per process when the first
+    document is rendered and not when the module is imported. Call it before
+    building a document.
+    """
+    fonts = (
+        ('OpenSans', 'OpenSans-Light.ttf'),
+        ('OpenSans-Bold', 'OpenSans-Bold.ttf'),
+        ('OpenSans-Regular', 'OpenSans-Regular.ttf'),
+        ('OpenSans-Italic', 'OpenSans-LightItalic.ttf'),
     )
-)
+    for name, filename in fonts:
+        pdfmetrics.registerFont(
+            TTFont(name, path_join(settings.SITE_ROOT, 'core/static/fonts', filename))
+        )
+
 
 styleSheet = StyleSheet1()
 styleSheet.add(ParagraphStyle(
@@ -12,6 +12,9 @@
 #
 # You should have received a copy of the GNU Affero General Public License
 
+# Standard Library
+import os
+
 # Third Party
 import requests
 
@@ -67,3 +70,42 @@ def get_paginated_generator(url: str, headers=None):
         url = response['next']
         if not url:
             break
+
+
+def download_file(url: str, path: str, headers=None, chunk_size=1024 * 1024):
+    """
+    Streams a file to disk, continuing an earlier partial download if possible
+
+    The ETag of the file is saved next to it. If the download is interrupted,
+    the next call only requests the missing bytes, unless the file changed on
+    the server in the meantime or the server does not support ranges. In that
+    case it is downloaded again from the start.
+
+    :param url: The URL to fetch from.
+    :param path: The path of the file to write.
+    :param headers: Optional headers to send with the request.
+    """
+    headers = dict(headers or {})
+    etag_path = f'{path}.etag'
+
+    if os.path.exists(path) and os.path.exists(etag_path):
+        with open(etag_path) as f:
+            headers['Range'] = f'bytes={os.path.getsize(path)}-'
+            headers['If-Range'] = f.read()
+
+    with requests.get(url, headers=headers, stream=True) as response:
+        # The file is already complete
+        if response.status_code == 416:
+            return
+
+        response.raise_for_status()
+        etag = response.headers.get('ETag')
+        if etag:
+            with open(etag_path, 'w') as f:
+                f.write(etag)
+        elif os.path.exists(etag_path):
+            os.unlink(etag_path)
+
+        with open(path, 'ab' if response.status_code == 206 else 'wb') as f:
+            for chunk in response.iter_content(chunk_size=chunk_size):
+                f.write(chunk)
@@ -0,0 +1,70 @@
+# This file is part of wger Workout Manager.
+#
+# wger Workout Manager is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# wger Workout Manager is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+
+# Standard Library
+import io
+import json
+
+# Django
+from django.test import SimpleTestCase
+
+# wger
+from wger.utils.bulk import (
+    chunked,
+    iter_json_array,
+)
+
+
+class IterJsonArrayTestCase(SimpleTestCase):
+    """
+    Tests the incremental JSON parser
+    """
+
+    def test_parse(self):
+        """
+        Test that the elements are parsed correctly, whatever the block size
+        """
+        data = [
+            {
+                'model': 'nutrition.ingredient',
+                'pk': 1,
+                'fields': {
+                    'name': 'a "quoted" [name], {}'
+                }
+            },
+            12.5,
+            -1.25e-7,
+            'text',
+            [1, [2, 3]],
+            None,
+            123456789,
+        ]
+        for indent in (None, 2):
+            for read_size in (1, 2, 7, 1000):
+                stream = io.StringIO(json.dumps(data, indent=indent))
+                self.assertEqual(list(iter_json_array(stream, read_size)), data)
+
+    def test_empty(self):
+        self.assertEqual(list(iter_json_array(io.StringIO(' [ ] '))), [])
+
+    def test_invalid(self):
+        """
+        Test that invalid or incomplete data raises an error
+        """
+        for data in ('{"a": 1}', '[1, 2', '[{"a": ', ''):
+            with self.assertRaises(ValueError):
+                list(iter_json_array(io.StringIO(data), 2))
+
+    def test_chunked(self):
+        self.assertEqual(list(chunked(range(5), 2)), [[0, 1], [2, 3], [4]])
@@ -12,11 +12,24 @@
 #
 # You should have received a copy of the GNU Affero General Public License
 
+# Standard Library
+import json
+import logging
+from unittest import mock
+
 # Django
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import Client
 from django.urls import reverse
 
 # wger
 from wger.core.tests.base_testcase import WgerTestCase
+from wger.utils.instrumentation import (
+    CacheRecorder,
+    QueryRecorder,
+)
 
 
 class RobotsExclusionMiddlewareTestCase(WgerTestCase):
@@ -77,3 +90,98 @@ class RobotsExclusionMiddlewareTestCase(WgerTestCase):
 
         response = self.client.get(reverse('exercise:exercise:view-base', kwargs={'pk': 1}))
         self.assertFalse(response.get('X-Robots-Tag'))
+
+
+class InstrumentationMiddlewareTestCase(WgerTestCase):
+    """
+    Tests the query and cache instrumentation middleware
+    """
+
+    def test_disabled(self):
+        """
+        Test that nothing is recorded by default
+        """
+        response = self.client.get(reverse('core:dashboard'))
+        self.assertNotIn('Server-Timing', response)
+
+    def test_server_timing(self):
+        """
+        Test the Server-Timing header and the log line
+        """
+        with mock.patch.dict(settings.WGER_SETTINGS, {'INSTRUMENTATION': True}):
+            client = Client()
+            client.login(username='test', password='testtest')
+            logging.disable(logging.NOTSET)
+            try:
+                with self.assertLogs('wger.utils.middleware', level='INFO') as logs:
+                    response = client.get(reverse('core:dashboard'))
+            finally:
+                logging.disable(logging.INFO)
+
+        self.assertIn('db;dur=', response['Server-Timing'])
+        self.assertIn('cache;desc="', response['Server-Timing'])
+        self.assertIn('total;dur=', response['Server-Timing'])
+
+        data = json.loads(logs.records[-1].getMessage())
+        self.assertEqual(data['path'], reverse('core:dashboard'))
+        self.assertEqual(data['status'], 200)
+        self.assertGreater(data['queries'], 0)
+        self.assertGreater(data['cache_hits'] + data['cache_misses'], 0)
+
+    def test_slow_requests(self):
+        """
+        Test that slow requests are logged with their repeated queries
+        """
+        with mock.patch.dict(
+            settings.WGER_SETTINGS,
+            {
+                'INSTRUMENTATION': True,
+                'INSTRUMENTATION_SLOW_REQUEST_MS': 0,
+            },
+        ):
+            client = Client()
+            client.login(username='test', password='testtest')
+            with self.assertLogs('wger.utils.middleware', level='WARNING') as logs:
+                client.get(reverse('manager:workout:view', kwargs={'pk': 1}))
+
+        self.assertIn('Slow request', logs.output[0])
+        data = json.loads(logs.records[0].getMessage().split(': ', 1)[1])
+        self.assertIn('top_duplicates', data)
+
+    def test_query_recorder(self):
+        """
+        Test that repeated queries are grouped by their fingerprint
+        """
+        with QueryRecorder() as queries:
+            for pk in (1, 2, 3):
+                User.objects.get(pk=pk)
+            list(User.objects.filter(pk__in=[1, 2]))
+            list(User.objects.filter(pk__in=[1, 2, 3]))
+
+        self.assertEqual(queries.count, 5)
+        self.assertEqual(queries.duplicates, 3)
+        top = queries.get_top_duplicates()
+        self.assertEqual([count for sql, count, duration in top], [3, 2])
+        self.assertIn('IN (...)', top[1][0])
+
+    def test_cache_recorder(self):
+        """
+        Test counting the cache hits and misses
+        """
+        cache.set('instrumentation-test', None)
+        with CacheRecorder() as outer:
+            with CacheRecorder() as stats:
+                self.assertIsNone(cache.get('instrumentation-test'))
+                self.assertEqual(cache.get('instrumentation-missing', 'default'), 'default')
+                cache.get_many(['instrumentation-test', 'instrumentation-missing'])
+                self.assertEqual(cache.get_or_set('instrumentation-new', 1), 1)
+                self.assertEqual(cache.get_or_set('instrumentation-new', 2), 1)
+
+            # The methods of the outer recorder are restored
+            hits = outer.hits
+            cache.get('instrumentation-new')
+            self.assertEqual(outer.hits, hits + 1)
+
+        self.assertEqual((stats.hits, stats.misses), (3, 3))
+        self.assertNotIn('get', cache.__dict__)
+        self.assertNotIn('get_or_set', cache.__dict__)
@@ -0,0 +1,94 @@
+# This file is part of wger Workout Manager.
+#
+# wger Workout Manager is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# wger Workout Manager is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+
+# Standard Library
+from unittest import mock
+
+# Third Party
+from easy_thumbnails.files import get_thumbnailer
+from reportlab.lib.units import cm
+
+# wger
+from wger.core.tests.base_testcase import WgerTestCase
+from wger.exercises.models import ExerciseImage
+from wger.manager.models import (
+    Set,
+    Setting,
+    Workout,
+)
+from wger.manager.pdf import render_workout_pdf
+from wger.utils.pdf import (
+    get_image_data,
+    get_pdf_image,
+)
+
+
+class PdfImageTestCase(WgerTestCase):
+    """
+    Tests the images drawn in the PDFs
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.init_media_root()
+
+        # Reset the location cached by the file storages
+        media_root = self.settings(MEDIA_ROOT=self.media_root)
+        media_root.enable()
+        self.addCleanup(media_root.disable)
+
+        get_image_data.cache_clear()
+        self.addCleanup(get_image_data.cache_clear)
+
+        self.image = ExerciseImage.objects.get(pk=1)
+
+    def test_print_variant(self):
+        """
+        Test that the scaled down print variant is used
+        """
+        content, width, height = get_image_data(self.image.image.name)
+
+        self.assertLessEqual(max(width, height), 240)
+
+    def test_read_once(self):
+        """
+        Test that the images are only read once per process, but every flowable
+        has its own reader
+        """
+        with mock.patch('wger.utils.pdf.get_thumbnailer', wraps=get_thumbnailer) as thumbnailer:
+            image1 = get_pdf_image(self.image.image, 2 * cm)
+            image2 = get_pdf_image(self.image.image, 1.5 * cm)
+            self.assertEqual(thumbnailer.call_count, 1)
+
+        self.assertIsNot(image1, image2)
+        self.assertEqual(image1.drawWidth, 2 * cm)
+        self.assertEqual(image2.drawWidth, 1.5 * cm)
+        content, width, height = get_image_data(self.image.image.name)
+        self.assertAlmostEqual(image1.drawHeight, 2 * cm * height / width)
+
+    def test_workout_pdf(self):
+        """
+        Test that the images are drawn in the workout PDF
+        """
+        workout = Workout.objects.get(pk=3)
+        exercise_set = Set.objects.filter(exerciseday__training=workout).first()
+        Setting.objects.create(set=exercise_set, exercise_base_id=1, reps=10, order=99)
+
+        with mock.patch('wger.utils.pdf.get_thumbnailer', wraps=get_thumbnailer) as thumbnailer:
+            content = render_workout_pdf(workout, 'https://example.com', images=True)
+            render_workout_pdf(workout, 'https://example.com', images=True, only_table=True)
+
+        self.assertIn(b'/Subtype /Image', content)
+        self.assertGreater(get_image_data.cache_info().currsize, 0)
+        self.assertEqual(thumbnailer.call_count, get_image_data.cache_info().currsize)
@@ -0,0 +1,158 @@
+# This file is part of wger Workout Manager.
+#
+# wger Workout Manager is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# wger Workout Manager is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+
+# Standard Library
+import os
+from io import StringIO
+from unittest import mock
+
+# Django
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management import call_command
+
+# Third Party
+from easy_thumbnails.alias import aliases
+from easy_thumbnails.files import get_thumbnailer
+
+# wger
+from wger.core.tasks import generate_thumbnails_task
+from wger.core.tests.base_testcase import WgerTestCase
+from wger.exercises.models import ExerciseImage
+from wger.utils.cache import cache_mapper
+from wger.utils.thumbnails import (
+    delete_thumbnail_urls,
+    generate_thumbnails,
+    get_thumbnail_url,
+)
+
+
+class ThumbnailTestCase(WgerTestCase):
+    """
+    Tests the thumbnail helpers
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.init_media_root()
+
+        # Reset the location cached by the file storages
+        media_root = self.settings(MEDIA_ROOT=self.media_root)
+        media_root.enable()
+        self.addCleanup(media_root.disable)
+
+        self.image = ExerciseImage.objects.get(pk=1)
+
+    def test_thumbnail_generated_without_celery(self):
+        """
+        Test that the thumbnail is generated on the spot if celery is not used
+        """
+        url = get_thumbnail_url(self.image.image, 'small')
+
+        self.assertIn('200x200', url)
+        self.assertTrue(
+            get_thumbnailer(self.image.image).get_existing_thumbnail(aliases.get('small'))
+        )
+
+    def test_original_served_with_celery(self):
+        """
+        Test that the original is returned and the thumbnails are queued once
+        """
+        settings.WGER_SETTINGS['USE_CELERY'] = True
+        with mock.patch('wger.core.tasks.generate_thumbnails_task') as task:
+            self.assertEqual(get_thumbnail_url(self.image.image, 'small'), self.image.image.url)
+            self.assertEqual(get_thumbnail_url(self.image.image, 'medium'), self.image.image.url)
+
+            task.delay.assert_called_once_with('exercises.ExerciseImage', 1)
+
+        # Once generated, the thumbnail is used
+        generate_thumbnails(self.image.image)
+        self.assertIn('200x200', get_thumbnail_url(self.image.image, 'small'))
+
+    def test_queued_on_save(self):
+        """
+        Test that saving an image queues its thumbnails
+        """
+        settings.WGER_SETTINGS['USE_CELERY'] = True
+        with mock.patch('wger.core.tasks.generate_thumbnails_task') as task:
+            with self.captureOnCommitCallbacks(execute=True):
+                self.image.save()
+
+            task.delay.assert_called_once_with('exercises.ExerciseImage', 1)
+
+    def test_url_cached(self):
+        """
+        Test that the URLs of existing thumbnails are cached
+        """
+        url = get_thumbnail_url(self.image.image, 'small')
+        with self.assertNumQueries(0):
+            self.assertEqual(get_thumbnail_url(self.image.image, 'small'), url)
+
+        delete_thumbnail_urls(self.image.image)
+        with mock.patch(
+            'wger.utils.thumbnails.get_thumbnailer',
+            wraps=get_thumbnailer,
+        ) as thumbnailer:
+            get_thumbnail_url(self.image.image, 'small')
+            thumbnailer.assert_called_once()
+
+    def test_generate_thumbnails(self):
+        """
+        Test that only missing thumbnails are generated
+        """
+        self.assertEqual(generate_thumbnails(self.image.image), len(aliases.all()))
+        self.assertEqual(generate_thumbnails(self.image.image), 0)
+        self.assertEqual(generate_thumbnails(self.image.image, force=True), len(aliases.all()))
+
+    def test_generate_thumbnails_force(self):
+        """
+        Test that forcing the generation rewrites the existing thumbnail files
+        """
+        generate_thumbnails(self.image.image)
+        thumbnail = get_thumbnailer(self.image.image).get_existing_thumbnail(aliases.get('small'))
+        with open(thumbnail.path, 'wb') as f:
+            f.write(b'outdated')
+
+        generate_thumbnails(self.image.image, force=True)
+        self.assertGreater(os.path.getsize(thumbnail.path), len(b'outdated'))
+        with open(thumbnail.path, 'rb') as f:
+            self.assertNotEqual(f.read(), b'outdated')
+
+    def test_task_resets_search(self):
+        """
+        Test that the search index is rebuilt once the thumbnails of an
+        exercise image were generated
+        """
+        cache.set(cache_mapper.EXERCISE_SEARCH_VERSION_KEY, 'old', None)
+        generate_thumbnails_task('exercises.ExerciseImage', 1)
+        self.assertNotEqual(cache.get(cache_mapper.EXERCISE_SEARCH_VERSION_KEY), 'old')
+
+        # Nothing new was generated
+        cache.set(cache_mapper.EXERCISE_SEARCH_VERSION_KEY, 'old', None)
+        generate_thumbnails_task('exercises.ExerciseImage', 1)
+        self.assertEqual(cache.get(cache_mapper.EXERCISE_SEARCH_VERSION_KEY), 'old')
+
+    def test_command(self):
+        """
+        Test the generate-thumbnails command
+        """
+        cache.set(cache_mapper.EXERCISE_SEARCH_VERSION_KEY, 'old', None)
+        out = StringIO()
+        call_command('generate-thumbnails', processes=1, stdout=out, no_color=True)
+
+        self.assertIn(f'for {ExerciseImage.objects.count()} images', out.getvalue())
+        self.assertTrue(
+            get_thumbnailer(self.image.image).get_existing_thumbnail(aliases.get('small'))
+        )
+        self.assertNotEqual(cache.get(cache_mapper.EXERCISE_SEARCH_VERSION_KEY), 'old')
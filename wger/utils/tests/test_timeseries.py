@@ -0,0 +1,57 @@
+# This file is part of wger Workout Manager.
+#
+# wger Workout Manager is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# wger Workout Manager is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+
+# Standard Library
+import datetime
+import unittest
+
+# wger
+from wger.utils.timeseries import (
+    lttb,
+    moving_average,
+)
+
+
+def make_buckets(values):
+    start = datetime.date(2020, 1, 1)
+    return [
+        {
+            'date': start + datetime.timedelta(days=i),
+            'avg': value
+        } for i, value in enumerate(values)
+    ]
+
+
+class TimeSeriesTestCase(unittest.TestCase):
+
+    def test_moving_average(self):
+        buckets = moving_average(make_buckets([1, 2, 3, 4, 5]), 2)
+        self.assertEqual([b['moving_average'] for b in buckets], [1, 1.5, 2.5, 3.5, 4.5])
+
+    def test_lttb_keeps_short_series(self):
+        buckets = make_buckets([1, 2, 3])
+        self.assertEqual(lttb(buckets, 10), buckets)
+
+    def test_lttb(self):
+        values = [0] * 100
+        values[42] = 50
+        buckets = make_buckets(values)
+
+        sampled = lttb(buckets, 10)
+        self.assertEqual(len(sampled), 10)
+
+        # First, last and the peak are kept
+        self.assertEqual(sampled[0], buckets[0])
+        self.assertEqual(sampled[-1], buckets[-1])
+        self.assertIn(buckets[42], sampled)
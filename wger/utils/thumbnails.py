@@ -0,0 +1,127 @@
+# This file is part of wger Workout Manager.
+#
+# wger Workout Manager is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# wger Workout Manager is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+
+# Standard Library
+import hashlib
+import logging
+
+# Django
+from django.conf import settings
+from django.core.cache import cache
+
+# Third Party
+from easy_thumbnails.alias import aliases
+from easy_thumbnails.exceptions import InvalidImageFormatError
+from easy_thumbnails.files import get_thumbnailer
+
+
+logger = logging.getLogger(__name__)
+
+THUMBNAIL_MODELS = ('exercises.ExerciseImage', 'nutrition.Image')
+"""
+Models with an image field whose thumbnails are used in the application
+"""
+
+THUMBNAIL_URL_KEY = 'thumbnail-url-{0}-{1}'
+THUMBNAIL_SCHEDULED_KEY = 'thumbnails-scheduled-{0}-{1}'
+THUMBNAIL_SCHEDULED_TTL = 600
+"""
+Time in seconds during which a pending thumbnail generation is not queued again
+"""
+
+
+def get_thumbnail_url_key(image, alias):
+    """
+    Returns the cache key of the URL of a thumbnail
+    """
+    return THUMBNAIL_URL_KEY.format(alias, hashlib.md5(image.name.encode()).hexdigest())
+
+
+def delete_thumbnail_urls(image):
+    """
+    Deletes the cached thumbnail URLs of an image, e.g. when it is changed
+    """
+    cache.delete_many([get_thumbnail_url_key(image, alias) for alias in aliases.all()])
+
+
+def get_thumbnail_url(image, alias):
+    """
+    Returns the URL of a thumbnail of the image
+
+    If celery is used and the thumbnail does not exist yet, the URL of the
+    original image is returned and the thumbnails are generated in the
+    background, so that requests are never blocked by the image processing.
+    Otherwise the thumbnail is generated on the spot. The URLs of existing
+    thumbnails are cached, so that the thumbnail storage is only checked once.
+
+    :param image: the image field file
+    :param alias: name of the alias in THUMBNAIL_ALIASES
+    """
+    key = get_thumbnail_url_key(image, alias)
+    url = cache.get(key)
+    if url:
+        return url
+
+    thumbnailer = get_thumbnailer(image)
+    options = aliases.get(alias)
+
+    try:
+        if settings.WGER_SETTINGS['USE_CELERY']:
+            thumbnail = thumbnailer.get_existing_thumbnail(options)
+            if not thumbnail:
+                schedule_thumbnails(image.instance)
+                return image.url
+        else:
+            thumbnail = thumbnailer.get_thumbnail(options)
+    except InvalidImageFormatError:
+        return None
+
+    cache.set(key, thumbnail.url)
+    return thumbnail.url
+
+
+def schedule_thumbnails(instance):
+    """
+    Queues the generation of the thumbnails of a model instance's image
+
+    Instances that were queued recently are skipped.
+    """
+    # wger
+    from wger.core.tasks import generate_thumbnails_task
+
+    label = instance._meta.label
+    if cache.add(THUMBNAIL_SCHEDULED_KEY.format(label, instance.pk), True, THUMBNAIL_SCHEDULED_TTL):
+        generate_thumbnails_task.delay(label, instance.pk)
+
+
+def generate_thumbnails(image, force=False):
+    """
+    Generates the missing thumbnails of all aliases for the image
+
+    :param force: generate and save the thumbnails also if they already exist
+    :return: the number of generated thumbnails
+    """
+    thumbnailer = get_thumbnailer(image)
+    count = 0
+    for alias, options in aliases.all().items():
+        if not force and thumbnailer.get_existing_thumbnail(options):
+            continue
+
+        try:
+            thumbnailer.save_thumbnail(thumbnailer.generate_thumbnail(options))
+            count += 1
+        except InvalidImageFormatError:
+            logger.info(f'Could not generate thumbnail {alias} for {image.name}')
+            break
+    return count
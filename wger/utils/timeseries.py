@@ -0,0 +1,225 @@
+# -*- coding: utf-8 -*-
+
+# This file is part of wger Workout Manager.
+#
+# wger Workout Manager is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# wger Workout Manager is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+
+# Standard Library
+import datetime
+import hashlib
+import logging
+
+# Django
+from django.core.cache import cache
+from django.db.models import (
+    Avg,
+    Count,
+    Max,
+    Min,
+    Sum,
+)
+from django.db.models.functions import (
+    TruncDay,
+    TruncMonth,
+    TruncWeek,
+)
+from django.utils.cache import (
+    get_conditional_response,
+    patch_cache_control,
+)
+
+# Third Party
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+
+
+logger = logging.getLogger(__name__)
+
+PERIODS = {
+    'day': TruncDay,
+    'week': TruncWeek,
+    'month': TruncMonth,
+}
+
+TIMESERIES_CACHE_KEY = 'timeseries-{0}'
+
+
+def as_date(value):
+    """
+    Depending on the database, truncating a date field can return a datetime
+    """
+    return value.date() if isinstance(value, datetime.datetime) else value
+
+
+def aggregate(queryset, value_field, period='day'):
+    """
+    Aggregates the entries of a queryset by day, week or month in the database
+
+    The entries must be unique by date within the queryset (e.g. the weight
+    entries of a user or the measurements of a category).
+
+    :param queryset: the queryset to aggregate, with a 'date' field
+    :param value_field: the name of the field with the values
+    :param period: one of 'day', 'week', 'month'
+    :return: a list of dicts with the date of the bucket, the min, max, average
+             and last value and the number of entries
+    """
+    trunc = PERIODS[period]
+    buckets = list(
+        queryset.order_by().annotate(bucket=trunc('date')).values('bucket').annotate(
+            min=Min(value_field),
+            max=Max(value_field),
+            avg=Avg(value_field),
+            count=Count('pk'),
+            last_date=Max('date'),
+        ).order_by('bucket')
+    )
+
+    # The last value of each bucket, read in one query
+    last_dates = [b['last_date'] for b in buckets]
+    last_values = dict(
+        queryset.order_by().filter(date__in=last_dates).values_list('date', value_field)
+    )
+
+    return [
+        {
+            'date': as_date(b['bucket']),
+            'min': round(float(b['min']), 2),
+            'max': round(float(b['max']), 2),
+            'avg': round(float(b['avg']), 2),
+            'last': round(float(last_values[b['last_date']]), 2),
+            'count': b['count'],
+        } for b in buckets
+    ]
+
+
+def moving_average(buckets, window, key='avg'):
+    """
+    Adds a simple moving average over the last `window` buckets to each bucket
+    """
+    values = []
+    total = 0
+    for bucket in buckets:
+        values.append(bucket[key])
+        total += bucket[key]
+        if len(values) > window:
+            total -= values[-window - 1]
+        bucket['moving_average'] = round(total / min(len(values), window), 2)
+    return buckets
+
+
+def lttb(buckets, threshold, key='avg'):
+    """
+    Downsamples a list of buckets to `threshold` points with the
+    largest-triangle-three-buckets algorithm, which keeps the visual shape
+    of the series.
+
+    See https://skemman.is/bitstream/1946/15343/3/SS_MSthesis.pdf
+    """
+    length = len(buckets)
+    if threshold >= length or threshold < 3:
+        return buckets
+
+    xs = [b['date'].toordinal() for b in buckets]
+    ys = [b[key] for b in buckets]
+
+    sampled = [buckets[0]]
+    every = (length - 2) / (threshold - 2)
+    a = 0
+
+    for i in range(threshold - 2):
+        # Average point of the next bucket
+        avg_start = int((i + 1) * every) + 1
+        avg_end = min(int((i + 2) * every) + 1, length)
+        avg_length = avg_end - avg_start
+        avg_x = sum(xs[avg_start:avg_end]) / avg_length
+        avg_y = sum(ys[avg_start:avg_end]) / avg_length
+
+        # Point in the current bucket that forms the largest triangle
+        range_start = int(i * every) + 1
+        range_end = int((i + 1) * every) + 1
+        max_area = -1
+        next_a = range_start
+        for j in range(range_start, range_end):
+            area = abs((xs[a] - avg_x) * (ys[j] - ys[a]) - (xs[a] - xs[j]) * (avg_y - ys[a]))
+            if area > max_area:
+                max_area = area
+                next_a = j
+
+        sampled.append(buckets[next_a])
+        a = next_a
+
+    sampled.append(buckets[-1])
+    return sampled
+
+
+def get_etag(queryset, value_field, *params):
+    """
+    Calculates an ETag for a time series with a single cheap aggregate query
+
+    The tag changes when entries are added, deleted or their values changed,
+    as well as with the filters of the queryset and the passed parameters.
+    """
+    stats = queryset.order_by().aggregate(
+        count=Count('pk'),
+        last_pk=Max('pk'),
+        last_date=Max('date'),
+        total=Sum(value_field),
+    )
+    key = '-'.join(str(p) for p in (queryset.query, *stats.values(), *params))
+    return hashlib.md5(key.encode()).hexdigest()
+
+
+def timeseries_response(request, queryset, value_field):
+    """
+    Returns the API response for a time series
+
+    Reads the period, date range, number of points and moving average window
+    from the query parameters. Clients sending a matching If-None-Match
+    header get a 304 response.
+    """
+    period = request.query_params.get('period', 'day')
+    if period not in PERIODS:
+        raise ValidationError({'period': f'Must be one of {", ".join(PERIODS)}'})
+
+    try:
+        points = int(request.query_params.get('points', 0))
+        window = int(request.query_params.get('moving_average', 0))
+        start = request.query_params.get('start')
+        end = request.query_params.get('end')
+        if start:
+            queryset = queryset.filter(date__gte=datetime.date.fromisoformat(start))
+        if end:
+            queryset = queryset.filter(date__lte=datetime.date.fromisoformat(end))
+    except ValueError as e:
+        raise ValidationError(str(e))
+
+    etag = get_etag(queryset, value_field, period, points, window)
+    not_modified = get_conditional_response(request, etag=f'"{etag}"')
+    if not_modified:
+        return not_modified
+
+    cache_key = TIMESERIES_CACHE_KEY.format(etag)
+    results = cache.get(cache_key)
+    if results is None:
+        results = aggregate(queryset, value_field, period)
+        if window > 0:
+            results = moving_average(results, window)
+        if points:
+            results = lttb(results, points)
+        cache.set(cache_key, results)
+
+    response = Response({'period': period, 'results': results})
+    response['ETag'] = f'"{etag}"'
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
@@ -15,11 +15,28 @@
 # You should have received a copy of the GNU Affero General Public License
 # along with Workout Manager.  If not, see <http://www.gnu.org/licenses/>.
 
+# Standard Library
+import hashlib
+
+# Django
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import (
+    Count,
+    Max,
+)
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+
 # Third Party
 from rest_framework import (
     exceptions,
     viewsets,
 )
+from rest_framework.response import Response
+
+
+API_RESPONSE_CACHE_KEY = 'api-response-{0}'
 
 
 class WgerOwnerObjectModelViewSet(viewsets.ModelViewSet):
@@ -52,3 +69,100 @@ class WgerOwnerObjectModelViewSet(viewsets.ModelViewSet):
                     raise exceptions.PermissionDenied('You are not allowed to do this')
         else:
             return super().update(request, *args, **kwargs)
+
+
+class ConditionalGetMixin:
+    """
+    Adds ETag headers to the list and detail responses of a viewset, and
+    Last-Modified headers to the detail responses, and answers matching
+    conditional requests with a 304
+
+    The validators are calculated with a cheap aggregate query over the
+    filtered queryset (the count and the latest modification date). The
+    response data is cached under the ETag, so a changed object simply leads
+    to a new cache entry and unchanged data is never serialized twice.
+
+    Lists have no Last-Modified header, since deleting an object does not
+    change the latest modification date of the remaining ones. Their ETag
+    changes, because the count is part of it.
+    """
+
+    last_modified_field = 'last_update'
+    """
+    Field with the modification date of the objects. If None, the validators
+    are calculated from all the values of the queryset instead, which is only
+    sensible for small tables.
+    """
+
+    def get_validators(self, queryset):
+        """
+        Returns a list of values that change whenever the data of the queryset
+        changes, and the last modification date, if known
+        """
+        queryset = queryset.order_by()
+        if self.last_modified_field is None:
+            return list(queryset.values_list()), None
+
+        stats = queryset.aggregate(count=Count('pk'), last_modified=Max(self.last_modified_field))
+        return list(stats.values()), stats['last_modified']
+
+    def conditional_response(self, queryset, build_data, use_last_modified=True):
+        """
+        Returns a 304 response if the client's copy is still current. Otherwise,
+        returns the cached data or builds and caches it.
+
+        :param use_last_modified: whether the Last-Modified header is sent and
+                                  If-Modified-Since requests are answered
+        """
+        values, last_modified = self.get_validators(queryset)
+        key = '-'.join(
+            str(v) for v in (
+                self.request.build_absolute_uri(),
+                self.request.accepted_media_type,
+                *values,
+            )
+        )
+        etag = f'"{hashlib.md5(key.encode()).hexdigest()}"'
+        timestamp = None
+        if use_last_modified and last_modified:
+            timestamp = int(last_modified.timestamp())
+
+        response = get_conditional_response(
+            self.request,
+            etag=etag,
+            last_modified=timestamp,
+        )
+        if response is None:
+            cache_key = API_RESPONSE_CACHE_KEY.format(etag.strip('"'))
+            data = cache.get(cache_key)
+            if data is None:
+                data = build_data()
+                cache.set(cache_key, data, settings.WGER_SETTINGS['EXERCISE_CACHE_TTL'])
+            response = Response(data)
+
+        response['ETag'] = etag
+        if timestamp:
+            response['Last-Modified'] = http_date(timestamp)
+        return response
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+
+        def build_data():
+            page = self.paginate_queryset(queryset)
+            if page is not None:
+                serializer = self.get_serializer(page, many=True)
+                return self.get_paginated_response(serializer.data).data
+            return self.get_serializer(queryset, many=True).data
+
+        return self.conditional_response(queryset, build_data, use_last_modified=False)
+
+    def retrieve(self, request, *args, **kwargs):
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        queryset = self.filter_queryset(self.get_queryset()).filter(
+            **{self.lookup_field: self.kwargs[lookup_url_kwarg]}
+        )
+        return self.conditional_response(
+            queryset,
+            lambda: self.get_serializer(self.get_object()).data,
+        )
@@ -17,8 +17,10 @@
 
 # Third Party
 from rest_framework import viewsets
+from rest_framework.decorators import action
 
 # wger
+from wger.utils.timeseries import timeseries_response
 from wger.weight.api.serializers import WeightEntrySerializer
 from wger.weight.models import WeightEntry
 
@@ -48,3 +50,14 @@ class WeightEntryViewSet(viewsets.ModelViewSet):
         Set the owner
         """
         serializer.save(user=self.request.user)
+
+    @action(detail=False)
+    def timeseries(self, request):
+        """
+        Return the weight entries aggregated by day, week or month
+
+        Parameters: period (day, week, month), start and end (ISO dates),
+        points (downsample to this number of points) and moving_average
+        (window size in periods).
+        """
+        return timeseries_response(request, self.get_queryset(), 'weight')
@@ -19,6 +19,7 @@ from django import forms
 from django.forms import (
     CharField,
     DateField,
+    FileField,
     Form,
     ModelForm,
     Textarea,
@@ -64,6 +65,24 @@ class WeightCsvImportForm(Form):
         self.helper.form_tag = False
 
 
+class WeightCsvFileImportForm(Form):
+    """
+    A helper form to upload a (possibly large) CSV file
+    """
+    csv_file = FileField(label=_('File'))
+    date_format = forms.ChoiceField(choices=CSV_DATE_FORMAT, label=_('Date format'))
+
+    def __init__(self, *args, **kwargs):
+        super(WeightCsvFileImportForm, self).__init__(*args, **kwargs)
+
+        self.helper = FormHelper()
+        self.helper.layout = Layout(
+            "csv_file",
+            "date_format",
+        )
+        self.helper.form_tag = False
+
+
 class WeightForm(ModelForm):
     date = DateField(input_formats=DATE_FORMATS, widget=Html5DateInput())
 
@@ -19,6 +19,7 @@ import csv
 import datetime
 import decimal
 import io
+import itertools
 import json
 import logging
 from collections import OrderedDict
@@ -39,52 +40,162 @@ from wger.weight.models import WeightEntry
 logger = logging.getLogger(__name__)
 
 
-def parse_weight_csv(request, cleaned_data):
+CSV_SNIFF_SIZE = 4096
+"""
+Number of characters used to guess the dialect of an imported CSV file
+"""
+
+CSV_IMPORT_BATCH_SIZE = 1000
+"""
+Number of weight entries inserted at a time when importing a CSV file
+"""
+
+CSV_IMPORT_MAX_ERRORS = 500
+"""
+Maximum number of rows that could not be converted kept when importing a CSV file
+"""
+
+
+def open_weight_csv(stream):
+    """
+    Returns a csv reader for the given text stream
+
+    Only the beginning of the stream is used to guess the dialect, so this also
+    works with very large files without reading them completely into memory.
+    """
+    sample = stream.read(CSV_SNIFF_SIZE)
+
+    # Complete the last line, so it's not split between the sample and the rest
+    if not sample.endswith('\n'):
+        sample += stream.readline()
 
     try:
-        dialect = csv.Sniffer().sniff(cleaned_data['csv_input'])
+        dialect = csv.Sniffer().sniff(sample)
     except csv.Error:
         dialect = 'excel'
 
-    # csv.reader expects a file-like object, so use StringIO
-    parsed_csv = csv.reader(io.StringIO(cleaned_data['csv_input']), dialect)
-    distinct_weight_entries = []
-    entry_dates = set()
-    weight_list = []
-    error_list = []
-    MAX_ROW_COUNT = 1000
-    row_count = 0
+    return csv.reader(itertools.chain(io.StringIO(sample), stream), dialect)
+
 
-    # Process the CSV items first
-    for row in parsed_csv:
+def iter_weight_csv(rows, date_format, existing_dates):
+    """
+    Lazily validates the rows of a weight CSV file
+
+    :param rows: iterable of rows, with the date and the weight in the first columns
+    :param date_format: format of the dates, as accepted by strptime
+    :param existing_dates: set with the dates that already have an entry in the DB.
+                           The dates of the valid rows are added to it
+    :return: a generator of (date, weight, row) tuples, date and weight are None
+             if the row could not be converted
+    """
+    for row in rows:
         try:
-            parsed_date = datetime.datetime.strptime(row[0], cleaned_data['date_format'])
+            parsed_date = datetime.datetime.strptime(row[0], date_format).date()
             parsed_weight = decimal.Decimal(row[1].replace(',', '.'))
-            duplicate_date_in_db = WeightEntry.objects.filter(date=parsed_date,
-                                                              user=request.user).exists()
-            # within the list there are no duplicate dates
-            unique_among_csv = parsed_date not in entry_dates
-
-            # there is no existing weight entry in the database for that date
-            unique_in_db = not duplicate_date_in_db
-
-            if unique_among_csv and unique_in_db and parsed_weight:
-                distinct_weight_entries.append((parsed_date, parsed_weight))
-                entry_dates.add(parsed_date)
-            else:
-                error_list.append(row)
-
         except (ValueError, IndexError, decimal.InvalidOperation):
+            yield None, None, row
+            continue
+
+        # No duplicate dates within the file or with the existing entries
+        if parsed_date in existing_dates or not parsed_weight:
+            yield None, None, row
+            continue
+
+        existing_dates.add(parsed_date)
+        yield parsed_date, parsed_weight, row
+
+
+def get_existing_weight_dates(user):
+    """
+    Returns a set with all the dates the user already has a weight entry for
+    """
+    return set(WeightEntry.objects.filter(user=user).values_list('date', flat=True))
+
+
+def parse_weight_csv(request, cleaned_data):
+    """
+    Parses the CSV input of the import form
+
+    :return: a tuple with the list of (unsaved) weight entries and a list of the
+             rows that could not be converted
+    """
+    weight_list = []
+    error_list = []
+
+    reader = open_weight_csv(io.StringIO(cleaned_data['csv_input']))
+    existing_dates = get_existing_weight_dates(request.user)
+    for date, weight, row in iter_weight_csv(
+        reader,
+        cleaned_data['date_format'],
+        existing_dates,
+    ):
+        if date is None:
             error_list.append(row)
-        row_count += 1
-        if row_count > MAX_ROW_COUNT:
-            break
+        else:
+            weight_list.append(WeightEntry(date=date, weight=weight, user=request.user))
+
+    return weight_list, error_list
+
+
+def insert_weight_entries(user, entries):
+    """
+    Inserts the weight entries whose date is not yet used by one of the user's entries
+
+    :return: the number of inserted entries
+    """
+    existing = set(
+        WeightEntry.objects.filter(user=user, date__in=[e.date for e in entries]) \
+        .values_list('date', flat=True)
+    )
+    entries = [e for e in entries if e.date not in existing]
+    WeightEntry.objects.bulk_create(entries, ignore_conflicts=True)
+    return len(entries)
+
+
+def import_weight_csv(
+    user,
+    stream,
+    date_format,
+    batch_size=CSV_IMPORT_BATCH_SIZE,
+    max_errors=CSV_IMPORT_MAX_ERRORS,
+):
+    """
+    Imports the weight entries from a CSV text stream
+
+    The file is processed row by row and the entries are inserted in batches,
+    so that the memory usage is bounded regardless of the size of the file.
+
+    :param user: the user the entries belong to
+    :param stream: a text stream, e.g. an uploaded file
+    :param date_format: format of the dates, as accepted by strptime
+    :param batch_size: number of entries to insert at a time
+    :param max_errors: number of rows that could not be converted that are returned
+    :return: a tuple with the number of imported entries, a list with the first
+             rows that could not be converted and the total number of these rows
+    """
+    error_list = []
+    error_count = 0
+    batch = []
+    count = 0
+
+    reader = open_weight_csv(stream)
+    existing_dates = get_existing_weight_dates(user)
+    for date, weight, row in iter_weight_csv(reader, date_format, existing_dates):
+        if date is None:
+            error_count += 1
+            if len(error_list) < max_errors:
+                error_list.append(row)
+            continue
+
+        batch.append(WeightEntry(date=date, weight=weight, user=user))
+        if len(batch) >= batch_size:
+            count += insert_weight_entries(user, batch)
+            batch = []
 
-    # Create the valid weight entries
-    for date, weight in distinct_weight_entries:
-        weight_list.append(WeightEntry(date=date, weight=weight, user=request.user))
+    if batch:
+        count += insert_weight_entries(user, batch)
 
-    return (weight_list, error_list)
+    return count, error_list, error_count
 
 
 def group_log_entries(user, year, month, day=None):
@@ -13,6 +13,7 @@
 # You should have received a copy of the GNU Affero General Public License
 
 # Standard Library
+import gzip
 import logging
 
 # Django
@@ -39,8 +40,9 @@ class WeightCsvExportTestCase(WgerTestCase):
         self.assertEqual(response.status_code, 200)
         self.assertEqual(response['Content-Type'], 'text/csv')
         self.assertEqual(response['Content-Disposition'], 'attachment; filename=Weightdata.csv')
-        self.assertGreaterEqual(len(response.content), 120)
-        self.assertLessEqual(len(response.content), 150)
+        content = b''.join(response.streaming_content)
+        self.assertGreaterEqual(len(content), 120)
+        self.assertLessEqual(len(content), 150)
 
     def test_export_csv_logged_in(self):
         """
@@ -49,3 +51,19 @@ class WeightCsvExportTestCase(WgerTestCase):
 
         self.user_login('test')
         self.export_csv()
+
+    def test_export_csv_gzip(self):
+        """
+        Test the compressed CSV export for weight entries
+        """
+        self.user_login('test')
+        response = self.client.get(reverse('weight:export-csv'), {'gzip': 1})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'application/gzip')
+        self.assertEqual(
+            response['Content-Disposition'], 'attachment; filename=Weightdata.csv.gz'
+        )
+        content = gzip.decompress(b''.join(response.streaming_content))
+        self.assertGreaterEqual(len(content), 120)
+        self.assertLessEqual(len(content), 150)
@@ -13,13 +13,21 @@
 # You should have received a copy of the GNU Affero General Public License
 
 # Standard Library
+import datetime
+import io
 import logging
+from unittest.mock import patch
 
 # Django
+from django.contrib.auth.models import User
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 
 # wger
 from wger.core.tests.base_testcase import WgerTestCase
+from wger.weight.helpers import import_weight_csv
 from wger.weight.models import WeightEntry
 
 
@@ -86,3 +94,96 @@ class WeightCsvImportTestCase(WgerTestCase):
 
         self.user_login('test')
         self.import_csv()
+
+
+class WeightCsvFileImportTestCase(WgerTestCase):
+    """
+    Test case for the CSV file import for weight entries
+    """
+
+    def test_import_file(self):
+        """
+        Test importing a CSV file
+        """
+        self.user_login('test')
+        user = User.objects.get(username='test')
+        count_before = WeightEntry.objects.filter(user=user).count()
+
+        csv_file = SimpleUploadedFile(
+            'weight.csv',
+            b'Datum;Gewicht\n'
+            b'05.01.10;error here\n'
+            b'27.01.10;69,6\n'
+            b'02.02.10;69\n'
+            b'02.02.10;70\n'
+            b'01.10.12;70\n',
+            content_type='text/csv',
+        )
+        response = self.client.post(
+            reverse('weight:import-csv-file'), {
+                'csv_file': csv_file,
+                'date_format': '%d.%m.%y'
+            }
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['imported_count'], 2)
+
+        # Header, wrong weight, duplicate date in file and existing entry in DB
+        self.assertEqual(len(response.context['error_list']), 4)
+        self.assertEqual(WeightEntry.objects.filter(user=user).count(), count_before + 2)
+
+    def test_import_large_file(self):
+        """
+        Test importing a large CSV file in batches with a fixed number of queries
+        """
+        user = User.objects.get(username='test')
+        count_before = WeightEntry.objects.filter(user=user).count()
+
+        start = datetime.date(1980, 1, 1)
+        lines = [
+            f'{start + datetime.timedelta(days=i):%Y-%m-%d},{70 + i % 10}\n' for i in range(5000)
+        ]
+        stream = io.StringIO(''.join(lines))
+
+        # The number of queries depends on the batches, not on the rows (the
+        # database backend might further split the batches)
+        with CaptureQueriesContext(connection) as queries:
+            count, errors, error_count = import_weight_csv(
+                user,
+                stream,
+                '%Y-%m-%d',
+                batch_size=1000,
+            )
+        self.assertLess(len(queries), 50)
+
+        self.assertEqual(count, 5000)
+        self.assertEqual(errors, [])
+        self.assertEqual(error_count, 0)
+        self.assertEqual(WeightEntry.objects.filter(user=user).count(), count_before + 5000)
+
+    def test_import_count_existing_dates(self):
+        """
+        Test that entries for dates added in the meantime are not counted
+        """
+        user = User.objects.get(username='test')
+        date = WeightEntry.objects.get(pk=1).date
+        stream = io.StringIO(f'{date:%Y-%m-%d},80\n1980-01-01,80\n')
+
+        with patch('wger.weight.helpers.get_existing_weight_dates', return_value=set()):
+            count, errors, error_count = import_weight_csv(user, stream, '%Y-%m-%d')
+
+        self.assertEqual(count, 1)
+        self.assertEqual(WeightEntry.objects.get(user=user, date=date).weight, 77)
+
+    def test_import_max_errors(self):
+        """
+        Test that only the first rows that could not be converted are kept
+        """
+        user = User.objects.get(username='test')
+        stream = io.StringIO(''.join(f'error {i},80\n' for i in range(20)))
+
+        count, errors, error_count = import_weight_csv(user, stream, '%Y-%m-%d', max_errors=5)
+        self.assertEqual(count, 0)
+        self.assertEqual(errors, [[f'error {i}', '80'] for i in range(5)])
+        self.assertEqual(error_count, 20)
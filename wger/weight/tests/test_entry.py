@@ -19,9 +19,14 @@ import decimal
 # Django
 from django.urls import reverse
 
+# Third Party
+from rest_framework import status
+
 # wger
 from wger.core.tests import api_base_test
+from wger.core.tests.api_base_test import ApiBaseTestCase
 from wger.core.tests.base_testcase import (
+    BaseTestCase,
     WgerAddTestCase,
     WgerDeleteTestCase,
     WgerEditTestCase,
@@ -93,5 +98,56 @@ class WeightEntryTestCase(api_base_test.ApiBaseResourceTestCase):
     """
     pk = 3
     resource = WeightEntry
+    query_budget_detail = 2
+    query_budget_overview = 2
     private_resource = True
     data = {'weight': 100, 'date': datetime.date(2013, 2, 1)}
+
+
+class WeightEntryTimeSeriesApiTestCase(BaseTestCase, ApiBaseTestCase):
+    """
+    Tests the time series endpoint for weight entries
+    """
+    url = '/api/v2/weightentry/timeseries/'
+
+    def test_access(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_month(self):
+        self.authenticate('test')
+        response = self.client.get(self.url, {'period': 'month'})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['results']), 3)
+        month = response.data['results'][2]
+        self.assertEqual(month['date'], datetime.date(2013, 1, 1))
+        self.assertEqual(month['count'], 4)
+        self.assertEqual(month['last'], float(WeightEntry.objects.get(pk=7).weight))
+
+    def test_points_and_moving_average(self):
+        self.authenticate('test')
+        response = self.client.get(self.url, {'points': 4, 'moving_average': 3})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['results']), 4)
+        self.assertIn('moving_average', response.data['results'][0])
+
+    def test_invalid_period(self):
+        self.authenticate('test')
+        response = self.client.get(self.url, {'period': 'decade'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_etag(self):
+        self.authenticate('test')
+        response = self.client.get(self.url)
+        etag = response['ETag']
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        # A new entry changes the tag
+        WeightEntry.objects.create(user_id=2, date=datetime.date(2020, 1, 1), weight=80)
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response['ETag'], etag)
@@ -0,0 +1,100 @@
+# This file is part of wger Workout Manager.
+#
+# wger Workout Manager is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# wger Workout Manager is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+
+# Standard Library
+import datetime
+
+# Django
+from django.urls import reverse
+
+# wger
+from wger.core.tests.base_testcase import WgerTestCase
+from wger.weight.models import WeightEntry
+
+
+class WeightQueryBudgetTestCase(WgerTestCase):
+    """
+    Tests the number of queries of the weight pages and endpoints
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.user_login('test')
+
+    def add_entries(self, count=30):
+        """
+        Adds weight entries on consecutive days
+        """
+        WeightEntry.objects.bulk_create(
+            [
+                WeightEntry(
+                    user_id=2,
+                    date=datetime.date(2020, 1, 1) + datetime.timedelta(days=i),
+                    weight=80 + i % 5,
+                ) for i in range(count)
+            ]
+        )
+
+    def test_overview(self):
+        """
+        Test the weight overview page
+        """
+        url = reverse('weight:overview')
+        self.client.get(url)
+        with self.assertQueryBudget(10):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertNoQueryGrowth(lambda: self.client.get(url), self.add_entries)
+
+    def test_entry_api(self):
+        """
+        Test the weight entry overview endpoint
+        """
+        url = reverse('weightentry-list')
+        self.client.get(url)
+        with self.assertQueryBudget(7):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertNoQueryGrowth(lambda: self.client.get(url), self.add_entries)
+
+    def test_time_series(self):
+        """
+        Test the time series endpoint
+        """
+        url = reverse('weightentry-timeseries')
+        self.client.get(url, {'period': 'week'})
+        with self.assertQueryBudget(6):
+            response = self.client.get(url, {'period': 'week'})
+        self.assertEqual(response.status_code, 200)
+        self.assertNoQueryGrowth(
+            lambda: self.client.get(url, {'period': 'week'}),
+            self.add_entries,
+        )
+
+    def test_csv_export(self):
+        """
+        Test the CSV export
+        """
+        url = reverse('weight:export-csv')
+
+        def export():
+            response = self.client.get(url)
+            b''.join(response.streaming_content)
+            return response
+
+        export()
+        with self.assertQueryBudget(6):
+            response = export()
+        self.assertEqual(response.status_code, 200)
+        self.assertNoQueryGrowth(export, self.add_entries)
@@ -15,17 +15,16 @@
 # You should have received a copy of the GNU Affero General Public License
 
 # Standard Library
-import csv
 import datetime
+import io
+import itertools
 import logging
 
 # Django
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.mixins import LoginRequiredMixin
-from django.http import (
-    HttpResponse,
-    HttpResponseRedirect,
-)
+from django.db import transaction
+from django.http import HttpResponseRedirect
 from django.shortcuts import render
 from django.urls import reverse
 from django.utils.translation import (
@@ -42,18 +41,31 @@ from django.views.generic import (
 from formtools.preview import FormPreview
 
 # wger
+from wger.utils.export import (
+    EXPORT_CHUNK_SIZE,
+    csv_streaming_response,
+    wants_gzip,
+)
 from wger.utils.generic_views import (
     WgerDeleteMixin,
     WgerFormMixin,
 )
 from wger.utils.helpers import check_access
 from wger.weight import helpers
-from wger.weight.forms import WeightForm
+from wger.weight.forms import (
+    WeightCsvFileImportForm,
+    WeightForm,
+)
 from wger.weight.models import WeightEntry
 
 
 logger = logging.getLogger(__name__)
 
+CSV_PREVIEW_ROWS = 500
+"""
+Maximum number of rows shown in the import previews
+"""
+
 
 class WeightAddView(WgerFormMixin, CreateView):
     """
@@ -132,24 +144,17 @@ class WeightDeleteView(WgerDeleteMixin, LoginRequiredMixin, DeleteView):
 def export_csv(request):
     """
     Exports the saved weight data as a CSV file
-    """
 
-    # Prepare the response headers
-    response = HttpResponse(content_type="text/csv")
-
-    # Convert all weight data to CSV
-    writer = csv.writer(response)
-
-    weights = WeightEntry.objects.filter(user=request.user)
-    writer.writerow([_("Date"), _("Weight")])
-
-    for entry in weights:
-        writer.writerow([entry.date, entry.weight])
+    The file is streamed to the browser, optionally compressed (?gzip=1)
+    """
+    weights = (
+        WeightEntry.objects.filter(user=request.user)
+        .values_list("date", "weight")
+        .iterator(chunk_size=EXPORT_CHUNK_SIZE)
+    )
+    rows = itertools.chain([[_("Date"), _("Weight")]], weights)
 
-    # Send the data to the browser
-    response["Content-Disposition"] = "attachment; filename=Weightdata.csv"
-    response["Content-Length"] = len(response.content)
-    return response
+    return csv_streaming_response(rows, "Weightdata.csv", compress=wants_gzip(request))
 
 
 @login_required
@@ -186,9 +191,53 @@ class WeightCsvImportFormPreview(FormPreview):
         context["weight_list"], context["error_list"] = helpers.parse_weight_csv(
             request, form.cleaned_data
         )
+        context["preview_rows"] = CSV_PREVIEW_ROWS
         return context
 
     def done(self, request, cleaned_data):
         weight_list, error_list = helpers.parse_weight_csv(request, cleaned_data)
-        WeightEntry.objects.bulk_create(weight_list)
+        WeightEntry.objects.bulk_create(
+            weight_list,
+            batch_size=helpers.CSV_IMPORT_BATCH_SIZE,
+            ignore_conflicts=True,
+        )
         return HttpResponseRedirect(reverse("weight:overview"))
+
+
+@login_required
+def import_csv_file(request):
+    """
+    Imports the weight entries from an uploaded CSV file
+
+    Unlike the form with the preview, this processes the file as a stream and
+    directly saves all valid entries, so it is suited for large files, e.g.
+    years of data from a smart scale.
+    """
+    form = WeightCsvFileImportForm(request.POST or None, request.FILES or None)
+    context = {"form": form}
+
+    if request.method == "POST" and form.is_valid():
+        stream = io.TextIOWrapper(
+            form.cleaned_data["csv_file"].file,
+            encoding="utf-8-sig",
+            errors="replace",
+            newline="",
+        )
+        with transaction.atomic():
+            count, error_list, error_count = helpers.import_weight_csv(
+                request.user,
+                stream,
+                form.cleaned_data["date_format"],
+            )
+
+        context.update(
+            {
+                "imported_count": count,
+                "error_list": error_list,
+                "error_count": error_count,
+                "preview_rows": CSV_PREVIEW_ROWS,
+            }
+        )
+        return render(request, "import_csv_file_result.html", context)
+
+    return render(request, "import_csv_file_form.html", context)